@@ -2,6 +2,26 @@
 Analytics: Módulo de KPIs e análises hospitalares.
 """
 
+from src.analytics.anomalies import AnomalyDetector
+from src.analytics.cache import KPICache
+from src.analytics.capacity import BedCapacity
+from src.analytics.census import BedCensus
+from src.analytics.cube import KPICube
+from src.analytics.executor import ParallelKPIExecutor
+from src.analytics.flows import FlowMatrix
 from src.analytics.kpis import KPICalculator
+from src.analytics.query import KPIQuery
+from src.analytics.timeseries import KPITimeSeries
 
-__all__ = ["KPICalculator"]
+__all__ = [
+    "AnomalyDetector",
+    "BedCapacity",
+    "BedCensus",
+    "FlowMatrix",
+    "KPICache",
+    "KPICalculator",
+    "KPICube",
+    "KPIQuery",
+    "KPITimeSeries",
+    "ParallelKPIExecutor",
+]
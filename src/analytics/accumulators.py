@@ -0,0 +1,565 @@
+"""
+Acumuladores de KPI: Estado parcial mergeável para dados em lotes.
+
+Cada acumulador implementa:
+    - update(batch): incorpora um lote (pd.DataFrame ou pyarrow RecordBatch/Table)
+    - merge(other): combina com o estado de outro acumulador (outro worker/processo)
+    - result(): KPI final, no mesmo formato do KPICalculator
+
+Os estados exatos são somas e contagens (associativos e comutativos),
+portanto update/merge em qualquer ordem produzem o mesmo resultado. Os
+acumuladores baseados em sketches (QuantileAccumulator com t-digest,
+DistinctCountAccumulator com HyperLogLog) são aproximados: o merge do
+HyperLogLog (máximo dos registros) também independe da ordem, mas a
+compressão do t-digest pode variar levemente conforme a ordem dos lotes,
+dentro do erro do sketch. Acumuladores são picklable e podem ser
+enviados entre processos.
+
+Exemplo:
+    >>> acc = MeanAccumulator("stay_days")
+    >>> for batch in pq.ParquetFile(path).iter_batches():
+    ...     acc.update(batch)
+    >>> acc.result()
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, TypeAlias, cast
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+import pyarrow as pa
+
+from src.analytics.sketches import (
+    DEFAULT_QUANTILES,
+    compress_centroids,
+    grouped_quantiles,
+    hll_estimate,
+    hll_observations,
+    quantile_label,
+)
+from src.config import SKETCH_CONFIG
+from src.transform.transformer import AGE_GROUPS
+
+Batch: TypeAlias = pd.DataFrame | pa.RecordBatch | pa.Table
+
+
+def column_names(batch: Batch) -> list[str]:
+    """Nomes das colunas do lote."""
+    if isinstance(batch, pd.DataFrame):
+        return list(batch.columns)
+    return list(batch.schema.names)
+
+
+def _num_rows(batch: Batch) -> int:
+    """Número de linhas do lote."""
+    return len(batch) if isinstance(batch, pd.DataFrame) else int(batch.num_rows)
+
+
+def _values(batch: Batch, column: str) -> npt.NDArray[np.float64]:
+    """Extrai coluna numérica como float64 (nulos → NaN)."""
+    if isinstance(batch, pd.DataFrame):
+        series = pd.to_numeric(batch[column], errors="coerce")
+    else:
+        series = batch.column(column).to_pandas()
+    return pd.Series(series).to_numpy(dtype=np.float64, na_value=np.nan)
+
+
+def column_series(batch: Batch, column: str) -> pd.Series:
+    """Extrai coluna do lote como Series (índice 0..n-1)."""
+    if isinstance(batch, pd.DataFrame):
+        return batch[column].reset_index(drop=True)
+    return pd.Series(batch.column(column).to_pandas())
+
+
+def group_series(batch: Batch, key: str) -> pd.Series:
+    """
+    Chave de agrupamento do lote, derivando 'month' e 'competencia' de DT_INTER
+    se ausentes (como kpis.group_keys).
+
+    Raises:
+        KeyError: Se a coluna (ou DT_INTER, para chaves derivadas) não existir no lote
+    """
+    names = column_names(batch)
+    if key in names:
+        return column_series(batch, key)
+    if key in ("month", "competencia"):
+        if "DT_INTER" not in names:
+            raise KeyError("Coluna 'DT_INTER' necessária para agrupamento por mês")
+        dates = pd.to_datetime(column_series(batch, "DT_INTER")).dt
+        derived = dates.month if key == "month" else dates.year * 100 + dates.month
+        return derived.astype("Int64").rename(key)
+    raise KeyError(f"Coluna '{key}' não encontrada no lote")
+
+
+class KPIAccumulator(ABC):
+    """Interface base dos acumuladores de KPI."""
+
+    @abstractmethod
+    def update(self, batch: Batch) -> "KPIAccumulator":
+        """Incorpora um lote de registros."""
+
+    @abstractmethod
+    def merge(self, other: "KPIAccumulator") -> "KPIAccumulator":
+        """Combina com o estado de outro acumulador do mesmo tipo."""
+
+    @abstractmethod
+    def result(self) -> Any:
+        """Retorna o KPI final."""
+
+    def _check_compatible(self, other: "KPIAccumulator") -> None:
+        """
+        Valida que os acumuladores podem ser combinados.
+
+        Raises:
+            TypeError: Se os tipos forem diferentes
+            ValueError: Se a configuração (colunas) for diferente
+        """
+        if type(other) is not type(self):
+            raise TypeError(
+                f"Não é possível combinar {type(self).__name__} com {type(other).__name__}"
+            )
+        if self._config() != other._config():
+            raise ValueError(f"Configuração incompatível: {self._config()} != {other._config()}")
+
+    def _config(self) -> tuple[Any, ...]:
+        return ()
+
+
+class CountAccumulator(KPIAccumulator):
+    """Contagem de registros (column=None) ou de valores não nulos de uma coluna."""
+
+    def __init__(self, column: str | None = None) -> None:
+        self.column = column
+        self.count = 0
+
+    def _config(self) -> tuple[Any, ...]:
+        return (self.column,)
+
+    def update(self, batch: Batch) -> "CountAccumulator":
+        if self.column is None:
+            self.count += _num_rows(batch)
+        elif self.column in column_names(batch):
+            self.count += int((~np.isnan(_values(batch, self.column))).sum())
+        return self
+
+    def merge(self, other: KPIAccumulator) -> "CountAccumulator":
+        self._check_compatible(other)
+        state = cast(CountAccumulator, other)
+        self.count += state.count
+        return self
+
+    def result(self) -> int:
+        return self.count
+
+
+class SumAccumulator(KPIAccumulator):
+    """Soma de uma coluna numérica (nulos ignorados)."""
+
+    def __init__(self, column: str) -> None:
+        self.column = column
+        self.total = 0.0
+
+    def _config(self) -> tuple[Any, ...]:
+        return (self.column,)
+
+    def update(self, batch: Batch) -> "SumAccumulator":
+        if self.column in column_names(batch):
+            self.total += float(np.nansum(_values(batch, self.column)))
+        return self
+
+    def merge(self, other: KPIAccumulator) -> "SumAccumulator":
+        self._check_compatible(other)
+        state = cast(SumAccumulator, other)
+        self.total += state.total
+        return self
+
+    def result(self) -> float:
+        return self.total
+
+
+class MeanAccumulator(KPIAccumulator):
+    """Média de uma coluna numérica (soma + contagem de não nulos)."""
+
+    def __init__(self, column: str) -> None:
+        self.column = column
+        self.total = 0.0
+        self.count = 0
+        self.rows = 0
+
+    def _config(self) -> tuple[Any, ...]:
+        return (self.column,)
+
+    def update(self, batch: Batch) -> "MeanAccumulator":
+        if self.column in column_names(batch):
+            values = _values(batch, self.column)
+            valid = ~np.isnan(values)
+            self.total += float(values[valid].sum())
+            self.count += int(valid.sum())
+            self.rows += len(values)
+        return self
+
+    def merge(self, other: KPIAccumulator) -> "MeanAccumulator":
+        self._check_compatible(other)
+        state = cast(MeanAccumulator, other)
+        self.total += state.total
+        self.count += state.count
+        self.rows += state.rows
+        return self
+
+    def result(self) -> float:
+        """
+        Média, como KPICalculator: NaN se a coluna só tem nulos, 0.0 se não
+        houver registros com a coluna (DataFrame vazio ou coluna ausente).
+        """
+        if self.count:
+            return self.total / self.count
+        return float("nan") if self.rows else 0.0
+
+
+class GroupedSumAccumulator(KPIAccumulator):
+    """
+    Somas e contagens por grupo.
+
+    result() retorna somas por grupo (column) ou contagem de registros por
+    grupo (column=None), com chaves str como KPICalculator.revenue/volume
+    (int para 'month'). 'month' e 'competencia' são derivadas de DT_INTER
+    se ausentes no lote.
+    """
+
+    def __init__(self, group_by: str, column: str | None = None) -> None:
+        self.group_by = group_by
+        self.column = column
+        self.sums: pd.Series = pd.Series(dtype=np.float64)
+        self.counts: pd.Series = pd.Series(dtype=np.int64)
+
+    def _config(self) -> tuple[Any, ...]:
+        return (self.group_by, self.column)
+
+    def update(self, batch: Batch) -> "GroupedSumAccumulator":
+        """
+        Incorpora um lote.
+
+        Raises:
+            KeyError: Se a coluna de agrupamento não existir no lote
+        """
+        keys = group_series(batch, self.group_by)
+        if _num_rows(batch) == 0:
+            return self
+
+        if self.column is None:
+            values = np.ones(len(keys))
+        elif self.column in column_names(batch):
+            values = _values(batch, self.column)
+        else:
+            values = np.full(len(keys), np.nan)
+
+        frame = pd.DataFrame({"sum": np.nan_to_num(values), "count": ~np.isnan(values)})
+        grouped = frame.groupby(keys.to_numpy(), sort=False).sum()
+        self.sums = self.sums.add(grouped["sum"], fill_value=0.0)
+        self.counts = self.counts.add(grouped["count"].astype(np.int64), fill_value=0)
+        return self
+
+    def merge(self, other: KPIAccumulator) -> "GroupedSumAccumulator":
+        self._check_compatible(other)
+        state = cast(GroupedSumAccumulator, other)
+        self.sums = self.sums.add(state.sums, fill_value=0.0)
+        self.counts = self.counts.add(state.counts, fill_value=0)
+        return self
+
+    def _key(self, key: Any) -> Any:
+        """Chave no formato do KPICalculator (int para 'month', str para as demais)."""
+        return int(key) if self.group_by == "month" else str(key)
+
+    def result(self) -> dict[Any, Any]:
+        if self.column is None:
+            return {self._key(k): int(v) for k, v in self.counts.sort_index().items()}
+        return {self._key(k): float(v) for k, v in self.sums.sort_index().items()}
+
+
+class GroupedMeanAccumulator(GroupedSumAccumulator):
+    """Médias por grupo (ex: TMP por especialidade)."""
+
+    def __init__(self, group_by: str, column: str) -> None:
+        super().__init__(group_by, column)
+
+    def result(self) -> dict[Any, Any]:
+        means = (self.sums / self.counts).sort_index()
+        return {self._key(k): float(v) for k, v in means.items()}
+
+
+class AgeGroupAccumulator(KPIAccumulator):
+    """Contagem por faixa etária (equivalente a KPICalculator.demographics)."""
+
+    def __init__(self, column: str = "age_group") -> None:
+        self.column = column
+        self.counts = np.zeros(len(AGE_GROUPS), dtype=np.int64)
+        self.unknown: dict[str, int] = {}
+
+    def _config(self) -> tuple[Any, ...]:
+        return (self.column,)
+
+    def update(self, batch: Batch) -> "AgeGroupAccumulator":
+        """
+        Incorpora um lote.
+
+        Raises:
+            KeyError: Se a coluna de faixa etária não existir no lote
+        """
+        if self.column not in column_names(batch):
+            raise KeyError(f"Coluna '{self.column}' não encontrada no lote")
+
+        labels = column_series(batch, self.column).astype("string")
+        codes = pd.Categorical(labels, categories=AGE_GROUPS).codes
+        self.counts += np.bincount(codes[codes >= 0], minlength=len(AGE_GROUPS))
+
+        # Rótulos fora do padrão (ex: faixas customizadas) contados à parte
+        unknown = labels[(codes < 0) & labels.notna().to_numpy()]
+        for label, count in unknown.value_counts().items():
+            self.unknown[str(label)] = self.unknown.get(str(label), 0) + int(count)
+        return self
+
+    def merge(self, other: KPIAccumulator) -> "AgeGroupAccumulator":
+        self._check_compatible(other)
+        state = cast(AgeGroupAccumulator, other)
+        self.counts += state.counts
+        for label, count in state.unknown.items():
+            self.unknown[label] = self.unknown.get(label, 0) + count
+        return self
+
+    def result(self) -> dict[str, int]:
+        result = {label: int(c) for label, c in zip(AGE_GROUPS, self.counts, strict=True)}
+        result.update(self.unknown)
+        return result
+
+
+class QuantileAccumulator(KPIAccumulator):
+    """
+    Quantis aproximados (t-digest) de uma coluna, geral ou por grupo.
+
+    result() retorna {'p50': ..., 'p90': ..., 'p99': ...} (geral) ou
+    {grupo: {...}} (por grupo), como KPICalculator.quantiles.
+    """
+
+    def __init__(
+        self,
+        column: str,
+        group_by: str | None = None,
+        quantiles: tuple[float, ...] = DEFAULT_QUANTILES,
+        compression: float = SKETCH_CONFIG["tdigest_compression"],
+    ) -> None:
+        self.column = column
+        self.group_by = group_by
+        self.quantiles = quantiles
+        self.compression = compression
+        self.keys: list[str] = []
+        self._positions: dict[str, int] = {}
+        self.groups = np.empty(0, dtype=np.int64)
+        self.means = np.empty(0, dtype=np.float64)
+        self.weights = np.empty(0, dtype=np.float64)
+
+    def _config(self) -> tuple[Any, ...]:
+        return (self.column, self.group_by, self.quantiles, self.compression)
+
+    def _codes(self, keys: list[str]) -> npt.NDArray[np.int64]:
+        """Código de cada grupo no estado, registrando grupos novos."""
+        for key in keys:
+            if key not in self._positions:
+                self._positions[key] = len(self.keys)
+                self.keys.append(key)
+        return np.array([self._positions[k] for k in keys], dtype=np.int64)
+
+    def _absorb(
+        self,
+        groups: npt.NDArray[np.int64],
+        means: npt.NDArray[np.float64],
+        weights: npt.NDArray[np.float64],
+    ) -> None:
+        self.groups, self.means, self.weights = compress_centroids(
+            np.concatenate([self.groups, groups]),
+            np.concatenate([self.means, means]),
+            np.concatenate([self.weights, weights]),
+            self.compression,
+        )
+
+    def update(self, batch: Batch) -> "QuantileAccumulator":
+        """
+        Incorpora um lote.
+
+        Raises:
+            KeyError: Se a coluna de agrupamento não existir no lote
+        """
+        if self.group_by is not None and self.group_by not in column_names(batch):
+            raise KeyError(f"Coluna '{self.group_by}' não encontrada no lote")
+        if self.column not in column_names(batch) or _num_rows(batch) == 0:
+            return self
+
+        values = _values(batch, self.column)
+        if self.group_by is None:
+            groups = self._codes([""])[np.zeros(len(values), dtype=np.int64)]
+        else:
+            codes, uniques = pd.factorize(column_series(batch, self.group_by).astype(str))
+            groups = self._codes([str(u) for u in uniques])[codes]
+            values = np.where(codes >= 0, values, np.nan)
+        self._absorb(groups, values, np.ones(len(values)))
+        return self
+
+    def merge(self, other: KPIAccumulator) -> "QuantileAccumulator":
+        self._check_compatible(other)
+        state = cast(QuantileAccumulator, other)
+        if len(state.groups):
+            self._absorb(self._codes(state.keys)[state.groups], state.means, state.weights)
+        return self
+
+    def result(self) -> dict[str, Any]:
+        labels = [quantile_label(q) for q in self.quantiles]
+        groups, values = grouped_quantiles(self.groups, self.means, self.weights, self.quantiles)
+        results = {
+            self.keys[g]: dict(zip(labels, map(float, row), strict=True))
+            for g, row in zip(groups, values, strict=True)
+        }
+        if self.group_by is None:
+            return results.get("", dict.fromkeys(labels, float("nan")))
+        return dict(sorted(results.items()))
+
+
+class DistinctCountAccumulator(KPIAccumulator):
+    """
+    Contagem aproximada de distintos (HyperLogLog), geral ou por grupo.
+
+    Estado: matriz grupos × 2^p registros de 1 byte; merge = máximo.
+    """
+
+    def __init__(
+        self,
+        column: str,
+        group_by: str | None = None,
+        precision: int = SKETCH_CONFIG["hll_precision"],
+    ) -> None:
+        self.column = column
+        self.group_by = group_by
+        self.precision = precision
+        self.keys: list[str] = []
+        self._positions: dict[str, int] = {}
+        self.registers = np.zeros((0, 1 << precision), dtype=np.uint8)
+
+    def _config(self) -> tuple[Any, ...]:
+        return (self.column, self.group_by, self.precision)
+
+    def _rows(self, keys: list[str]) -> npt.NDArray[np.int64]:
+        """Linha de cada grupo na matriz de registros, criando linhas novas."""
+        new = [k for k in keys if k not in self._positions]
+        for key in new:
+            self._positions[key] = len(self.keys)
+            self.keys.append(key)
+        if new:
+            padding = np.zeros((len(new), self.registers.shape[1]), dtype=np.uint8)
+            self.registers = np.vstack([self.registers, padding])
+        return np.array([self._positions[k] for k in keys], dtype=np.int64)
+
+    def update(self, batch: Batch) -> "DistinctCountAccumulator":
+        """
+        Incorpora um lote.
+
+        Raises:
+            KeyError: Se a coluna de agrupamento não existir no lote
+        """
+        if self.group_by is not None and self.group_by not in column_names(batch):
+            raise KeyError(f"Coluna '{self.group_by}' não encontrada no lote")
+        if self.column not in column_names(batch) or _num_rows(batch) == 0:
+            return self
+
+        values = column_series(batch, self.column)
+        if self.group_by is None:
+            rows = self._rows([""])[np.zeros(len(values), dtype=np.int64)]
+        else:
+            codes, uniques = pd.factorize(column_series(batch, self.group_by).astype(str))
+            rows = self._rows([str(u) for u in uniques])[codes]
+            values = values.where(codes >= 0)
+
+        present = values.notna().to_numpy()
+        registers, ranks = hll_observations(values[present].to_numpy(), self.precision)
+        np.maximum.at(self.registers, (rows[present], registers), ranks)
+        return self
+
+    def merge(self, other: KPIAccumulator) -> "DistinctCountAccumulator":
+        self._check_compatible(other)
+        state = cast(DistinctCountAccumulator, other)
+        rows = self._rows(state.keys)
+        self.registers[rows] = np.maximum(self.registers[rows], state.registers)
+        return self
+
+    def result(self) -> int | dict[str, int]:
+        estimates = (
+            {
+                key: int(round(float(value)))
+                for key, value in zip(self.keys, hll_estimate(self.registers), strict=True)
+            }
+            if self.keys
+            else {}
+        )
+        if self.group_by is None:
+            return estimates.get("", 0)
+        return dict(sorted(estimates.items()))
+
+
+class SummaryAccumulator(KPIAccumulator):
+    """
+    Estado mergeável de KPICalculator.summary.
+
+    Combina contagem de registros, médias de stay_days/VAL_TOT e faixas
+    etárias; result() produz o mesmo dicionário do summary.
+    """
+
+    def __init__(self, beds: int, days: int) -> None:
+        """
+        Inicializa acumulador.
+
+        Args:
+            beds: Número de leitos disponíveis
+            days: Número de dias no período
+
+        Raises:
+            ValueError: Se beds ou days forem zero ou negativos
+        """
+        if beds <= 0:
+            raise ValueError("Número de leitos deve ser maior que zero")
+        if days <= 0:
+            raise ValueError("Número de dias deve ser maior que zero")
+
+        self.beds = beds
+        self.days = days
+        self.records = CountAccumulator()
+        self.stay_days = MeanAccumulator("stay_days")
+        self.revenue = MeanAccumulator("VAL_TOT")
+        self.demographics = AgeGroupAccumulator()
+
+    def _config(self) -> tuple[Any, ...]:
+        return (self.beds, self.days)
+
+    def update(self, batch: Batch) -> "SummaryAccumulator":
+        self.records.update(batch)
+        self.stay_days.update(batch)
+        self.revenue.update(batch)
+        if "age_group" in column_names(batch):
+            self.demographics.update(batch)
+        return self
+
+    def merge(self, other: KPIAccumulator) -> "SummaryAccumulator":
+        self._check_compatible(other)
+        state = cast(SummaryAccumulator, other)
+        self.records.merge(state.records)
+        self.stay_days.merge(state.stay_days)
+        self.revenue.merge(state.revenue)
+        self.demographics.merge(state.demographics)
+        return self
+
+    def result(self) -> dict[str, Any]:
+        return {
+            "occupancy_rate": self.stay_days.total / (self.beds * self.days) * 100,
+            "average_length_of_stay": self.stay_days.result(),
+            "volume": self.records.result(),
+            "revenue": self.revenue.total,
+            "average_ticket": self.revenue.result(),
+            "demographics": self.demographics.result(),
+        }
@@ -0,0 +1,264 @@
+"""
+Detecção de anomalias de valores de AIH por procedimento.
+
+z-score robusto (Iglewicz e Hoaglin, 1993) de VAL_TOT e daily_cost dentro
+de cada PROC_REA:
+
+    z = (x - mediana) / (1,4826 · MAD)
+
+onde MAD é a mediana dos desvios absolutos em relação à mediana do grupo
+(1,4826 · MAD estima o desvio-padrão sob normalidade, sem ser arrastado
+pelos próprios outliers). Grupos com MAD zero (maioria dos valores
+iguais, comum em procedimentos com valor tabelado) usam 1,2533 · desvio
+absoluto médio. Também é verificada a consistência de VAL_TOT com a soma
+dos componentes (VAL_SH + VAL_SP + VAL_SADT; VAL_UTI está contido em VAL_SH).
+
+As estatísticas de referência (mediana, MAD, desvio médio por grupo) são
+calculadas uma vez, com uma única fatoração dos grupos, e podem ser
+memoizadas no KPICache pelo fingerprint da origem: pontuar um novo mês
+ou repetir a análise não recalcula a referência. A pontuação é um único
+passe vetorizado (alinhamento dos grupos por índice + operações em colunas).
+
+A referência não é chaveada por competência: estatísticas ajustadas em
+meses anteriores pontuam registros de um mês novo. Para sazonalidade,
+use by=["PROC_REA", "month"] (mês do calendário, derivado de DT_INTER).
+
+Exemplo:
+    >>> detector = AnomalyDetector(cache=KPICache())
+    >>> detector.fit(["data/processed/SIH_AC_202401.parquet"])
+    >>> flags = detector.detect(df)
+    >>> df[flags["anomaly"]]
+"""
+
+import logging
+from collections.abc import Sequence
+from pathlib import Path
+from typing import cast
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.cache import KPICache, Source
+from src.analytics.kpis import group_keys
+from src.config import ANOMALY_CONFIG
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BY = ["PROC_REA"]
+
+ANOMALY_MEASURES = ["VAL_TOT", "daily_cost"]
+
+# Componentes cuja soma deve igualar VAL_TOT
+TOTAL_COMPONENTS = ["VAL_SH", "VAL_SP", "VAL_SADT"]
+
+# Fatores de escala: desvio-padrão ≈ 1,4826 · MAD ≈ 1,2533 · desvio absoluto médio
+MAD_SCALE = 1.4826
+MEAN_AD_SCALE = 1.2533
+
+
+def anomaly_values(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Medidas pontuadas de cada internação (daily_cost derivado se ausente).
+
+    Args:
+        df: Internações com VAL_TOT (e stay_days ou daily_cost)
+
+    Returns:
+        DataFrame float64 com ANOMALY_MEASURES, alinhado a df
+
+    Raises:
+        KeyError: Se VAL_TOT não existir
+    """
+    if "VAL_TOT" not in df.columns:
+        raise KeyError("Coluna 'VAL_TOT' necessária para detecção de anomalias")
+    values = pd.DataFrame(index=df.index)
+    values["VAL_TOT"] = pd.to_numeric(df["VAL_TOT"], errors="coerce")
+    if "daily_cost" in df.columns:
+        values["daily_cost"] = pd.to_numeric(df["daily_cost"], errors="coerce")
+    elif "stay_days" in df.columns:
+        stay = pd.to_numeric(df["stay_days"], errors="coerce")
+        values["daily_cost"] = values["VAL_TOT"] / stay.replace(0, 1)
+    else:
+        values["daily_cost"] = np.nan
+    return values.astype(np.float64)
+
+
+def reference_statistics(df: pd.DataFrame, by: Sequence[str] = DEFAULT_BY) -> pd.DataFrame:
+    """
+    Mediana, MAD e desvio absoluto médio por grupo.
+
+    Args:
+        df: Internações de referência
+        by: Colunas do grupo ('month' derivado de DT_INTER)
+
+    Returns:
+        DataFrame indexado pelos grupos com records, {medida}_median,
+        {medida}_mad e {medida}_mean_ad para cada medida de ANOMALY_MEASURES
+
+    Raises:
+        KeyError: Se faltarem colunas
+    """
+    values = anomaly_values(df)
+    grouper = values.groupby(group_keys(df, list(by)), observed=True, sort=True)
+    codes = np.asarray(grouper.ngroup().fillna(-1), dtype=np.int64)
+    medians = grouper.median()
+
+    valid = codes >= 0
+    if not valid.any():
+        # Nenhum grupo válido (chaves nulas): estatísticas vazias
+        columns = [f"{m}_{s}" for m in ANOMALY_MEASURES for s in ("median", "mad", "mean_ad")]
+        empty = pd.DataFrame(index=medians.index, columns=["records", *columns])
+        return empty.astype({"records": np.int64, **dict.fromkeys(columns, np.float64)})
+    deviations = np.abs(values.to_numpy()[valid] - medians.to_numpy()[codes[valid]])
+    by_code = pd.DataFrame(deviations, columns=ANOMALY_MEASURES).groupby(codes[valid])
+    mad = by_code.median()
+    mean_ad = by_code.mean()
+
+    stats = pd.DataFrame({"records": grouper.size().to_numpy()}, index=medians.index)
+    for position, measure in enumerate(ANOMALY_MEASURES):
+        stats[f"{measure}_median"] = medians[measure].to_numpy()
+        stats[f"{measure}_mad"] = mad.iloc[:, position].to_numpy()
+        stats[f"{measure}_mean_ad"] = mean_ad.iloc[:, position].to_numpy()
+    return stats
+
+
+def _read(source: Source) -> pd.DataFrame:
+    """DataFrame da origem (lendo partições Parquet se necessário)."""
+    if isinstance(source, pd.DataFrame):
+        return source
+    paths = [source] if isinstance(source, str | Path) else list(source)
+    frames = [pd.read_parquet(p) for p in paths]
+    combined: pd.DataFrame = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    return combined
+
+
+class AnomalyDetector:
+    """
+    Pontua internações contra estatísticas robustas de referência por PROC_REA.
+
+    As estatísticas são calculadas em fit() (memoizadas no KPICache, se
+    informado) e reutilizadas em cada detect().
+    """
+
+    def __init__(
+        self,
+        by: Sequence[str] = DEFAULT_BY,
+        threshold: float = ANOMALY_CONFIG["z_threshold"],
+        min_records: int = int(ANOMALY_CONFIG["min_records"]),
+        tolerance: float = ANOMALY_CONFIG["component_tolerance"],
+        cache: KPICache | None = None,
+    ) -> None:
+        """
+        Inicializa detector sem referência.
+
+        Args:
+            by: Colunas do grupo de referência
+            threshold: |z| acima do qual o valor é anômalo
+            min_records: Mínimo de internações no grupo para pontuar
+            tolerance: Diferença relativa tolerada entre VAL_TOT e componentes
+            cache: Cache para memoizar as estatísticas de referência (opcional)
+        """
+        self.by = list(by)
+        self.threshold = threshold
+        self.min_records = min_records
+        self.tolerance = tolerance
+        self.cache = cache
+        self.statistics: pd.DataFrame | None = None
+
+    def fit(self, source: Source) -> "AnomalyDetector":
+        """
+        Calcula (ou recupera do cache) as estatísticas de referência.
+
+        Args:
+            source: DataFrame ou caminho(s) de partições Parquet
+
+        Returns:
+            O próprio detector
+        """
+
+        def compute() -> pd.DataFrame:
+            return reference_statistics(_read(source), self.by)
+
+        if self.cache is None:
+            self.statistics = compute()
+        else:
+            self.statistics = self.cache.memoize(
+                source, "anomaly_reference", compute, by=tuple(self.by)
+            )
+        logger.info(f"[ANOMALY] Referência com {len(self.statistics):,} grupo(s)")
+        return self
+
+    def detect(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Z-scores robustos e verificações de consistência por internação.
+
+        Sem fit() prévio, o próprio df é usado como referência.
+
+        Args:
+            df: Internações com VAL_TOT, colunas do grupo e componentes de valor
+
+        Returns:
+            DataFrame alinhado a df com {medida}_z e {medida}_outlier para
+            ANOMALY_MEASURES, component_gap (VAL_TOT - soma dos componentes),
+            component_mismatch e anomaly (qualquer flag)
+
+        Raises:
+            KeyError: Se faltarem colunas
+        """
+        if self.statistics is None:
+            self.fit(df)
+        stats = cast(pd.DataFrame, self.statistics)
+
+        values = anomaly_values(df)
+        keys = group_keys(df, self.by)
+        index = pd.MultiIndex.from_arrays(keys) if len(keys) > 1 else pd.Index(keys[0])
+        rows = stats.index.get_indexer(index)
+        known = rows >= 0
+        known[known] = stats["records"].to_numpy()[rows[known]] >= self.min_records
+        if len(stats):
+            matrix = stats.iloc[np.where(rows >= 0, rows, 0)].to_numpy(dtype=np.float64)
+        else:
+            matrix = np.full((len(df), len(stats.columns)), np.nan)
+        matrix[~known] = np.nan
+        aligned = pd.DataFrame(matrix, index=df.index, columns=stats.columns)
+
+        result = pd.DataFrame(index=df.index)
+        for measure in ANOMALY_MEASURES:
+            mad = aligned[f"{measure}_mad"] * MAD_SCALE
+            scale = mad.where(mad > 0, aligned[f"{measure}_mean_ad"] * MEAN_AD_SCALE)
+            z = (values[measure] - aligned[f"{measure}_median"]) / scale.where(scale > 0)
+            result[f"{measure}_z"] = z
+            result[f"{measure}_outlier"] = (z.abs() > self.threshold).to_numpy()
+
+        components = pd.DataFrame(
+            {c: pd.to_numeric(df[c], errors="coerce") for c in TOTAL_COMPONENTS if c in df}
+        )
+        if components.empty:
+            result["component_gap"] = np.nan
+        else:
+            result["component_gap"] = values["VAL_TOT"] - components.sum(axis=1, min_count=1)
+        allowed = values["VAL_TOT"].abs() * self.tolerance
+        result["component_mismatch"] = (result["component_gap"].abs() > allowed).to_numpy()
+
+        flags = [f"{m}_outlier" for m in ANOMALY_MEASURES] + ["component_mismatch"]
+        result["anomaly"] = result[flags].any(axis=1)
+        logger.info(f"[ANOMALY] {int(result['anomaly'].sum()):,} internação(ões) sinalizada(s)")
+        return result
+
+
+def detect_anomalies(
+    df: pd.DataFrame, reference: Source | None = None, cache: KPICache | None = None
+) -> pd.DataFrame:
+    """
+    Atalho para AnomalyDetector().fit(reference).detect(df).
+
+    Args:
+        df: Internações pontuadas
+        reference: Origem das estatísticas (padrão: o próprio df)
+        cache: Cache das estatísticas de referência (opcional)
+
+    Returns:
+        Saída de AnomalyDetector.detect
+    """
+    detector = AnomalyDetector(cache=cache)
+    return detector.fit(df if reference is None else reference).detect(df)
@@ -0,0 +1,297 @@
+"""
+Cache de KPIs: Memoização de resultados em dois níveis (memória + disco).
+
+Chave = fingerprint das partições de origem + nome do método + argumentos.
+
+- Nível 1: LRU em memória (número máximo de entradas)
+- Nível 2: Arquivos pickle em disco com orçamento de bytes (evicção LRU por mtime)
+
+O fingerprint de uma partição Parquet inclui tamanho e mtime do arquivo:
+quando o DataLoader reescreve a partição, a chave muda e entradas antigas
+deixam de ser usadas. Registrado como hook do DataLoader (como em main),
+partition_written remove essas entradas (invalidate) para liberar espaço
+em disco; sem o hook, elas só saem pela evicção do orçamento de bytes.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import os
+import pickle
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+
+from src.analytics.kpis import KPICalculator
+from src.config import CACHE_DIR, KPI_CACHE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "manifest.json"
+
+Source = pd.DataFrame | str | Path | Sequence[str | Path]
+
+
+def _partition_paths(source: str | Path | Sequence[str | Path]) -> list[Path]:
+    """Normaliza caminho único ou lista de caminhos em lista ordenada de Paths resolvidos."""
+    paths = [source] if isinstance(source, str | Path) else list(source)
+    return sorted(Path(p).resolve() for p in paths)
+
+
+class KPICache:
+    """
+    Memoização de KPIs com LRU em memória e store em disco com orçamento de bytes.
+
+    Exemplo:
+        >>> cache = KPICache()
+        >>> partitions = ["data/processed/SIH_AC_202401.parquet"]
+        >>> cache.call(partitions, "summary", beds=100, days=31)  # calcula
+        >>> cache.call(partitions, "summary", beds=100, days=31)  # hit em memória
+    """
+
+    def __init__(
+        self,
+        directory: str | Path = CACHE_DIR,
+        memory_entries: int = KPI_CACHE_CONFIG["memory_entries"],
+        disk_bytes: int = KPI_CACHE_CONFIG["disk_bytes"],
+        calculator: KPICalculator | None = None,
+    ) -> None:
+        """
+        Inicializa cache.
+
+        Args:
+            directory: Diretório do cache em disco
+            memory_entries: Máximo de entradas no LRU em memória
+            disk_bytes: Orçamento do cache em disco (bytes)
+            calculator: Calculador de KPIs usado em misses (padrão: KPICalculator())
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.memory_entries = memory_entries
+        self.disk_bytes = disk_bytes
+        self.calculator = calculator or KPICalculator()
+
+        self._memory: OrderedDict[str, Any] = OrderedDict()
+        self._manifest_path = self.directory / MANIFEST_NAME
+        self._manifest: dict[str, dict[str, Any]] = {}
+        if self._manifest_path.exists():
+            self._manifest = json.loads(self._manifest_path.read_text(encoding="utf-8"))
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def fingerprint(source: Source) -> str:
+        """
+        Calcula fingerprint da origem dos dados.
+
+        Partições Parquet usam caminho + tamanho + mtime (sem ler o arquivo);
+        DataFrames usam hash do conteúdo.
+
+        Args:
+            source: DataFrame, caminho de partição ou lista de caminhos
+
+        Returns:
+            Hash hexadecimal (sha256)
+        """
+        digest = hashlib.sha256()
+        if isinstance(source, pd.DataFrame):
+            digest.update(str(list(source.columns)).encode())
+            digest.update(pd.util.hash_pandas_object(source, index=False).to_numpy().tobytes())
+        else:
+            for path in _partition_paths(source):
+                stat = path.stat()
+                digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def make_key(fingerprint: str, method: str, *args: Any, **kwargs: Any) -> str:
+        """Combina fingerprint, método e argumentos em uma chave estável."""
+        payload = repr((fingerprint, method, args, sorted(kwargs.items())))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        return self.directory / f"{key}.pkl"
+
+    def _save_manifest(self) -> None:
+        self._manifest_path.write_text(json.dumps(self._manifest), encoding="utf-8")
+
+    def _remember(self, key: str, value: Any) -> None:
+        """Insere no LRU em memória, descartando a entrada menos recente se cheio."""
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """
+        Busca entrada (memória, depois disco).
+
+        Returns:
+            Tupla (encontrado, valor)
+        """
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            return True, copy.deepcopy(self._memory[key])
+
+        path = self._entry_path(key)
+        if key in self._manifest and path.exists():
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+            os.utime(path)  # Marca uso recente para evicção LRU
+            self._remember(key, value)
+            return True, copy.deepcopy(value)
+
+        return False, None
+
+    def put(self, key: str, value: Any, partitions: Sequence[str] = ()) -> None:
+        """
+        Armazena entrada nos dois níveis.
+
+        Args:
+            key: Chave da entrada
+            value: Resultado a memoizar (picklable)
+            partitions: Partições das quais o resultado depende (para invalidate)
+        """
+        self._remember(key, copy.deepcopy(value))
+
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.disk_bytes:
+            return
+
+        self._entry_path(key).write_bytes(payload)
+        self._manifest[key] = {"partitions": list(partitions), "size": len(payload)}
+        self._evict()
+        self._save_manifest()
+
+    def _evict(self) -> None:
+        """Remove entradas menos recentes do disco até caber no orçamento."""
+        total = sum(entry["size"] for entry in self._manifest.values())
+        if total <= self.disk_bytes:
+            return
+
+        def last_used(key: str) -> float:
+            path = self._entry_path(key)
+            return path.stat().st_mtime if path.exists() else 0.0
+
+        for key in sorted(self._manifest, key=last_used):
+            if total <= self.disk_bytes:
+                break
+            total -= self._manifest[key]["size"]
+            self._drop(key)
+
+    def _drop(self, key: str) -> None:
+        """Remove entrada dos dois níveis (sem salvar manifest)."""
+        self._memory.pop(key, None)
+        self._manifest.pop(key, None)
+        self._entry_path(key).unlink(missing_ok=True)
+
+    def invalidate(self, partition: str | Path) -> int:
+        """
+        Remove todas as entradas que dependem de uma partição.
+
+        Args:
+            partition: Caminho da partição reescrita
+
+        Returns:
+            Número de entradas removidas
+        """
+        target = str(Path(partition).resolve())
+        stale = [k for k, e in self._manifest.items() if target in e["partitions"]]
+        for key in stale:
+            self._drop(key)
+        if stale:
+            self._save_manifest()
+            logger.info(f"[CACHE] {len(stale)} entradas invalidadas: {Path(partition).name}")
+        return len(stale)
+
+    def partition_written(
+        self, df: pd.DataFrame, state: str, year: int, month: int, path: str | Path
+    ) -> None:
+        """
+        Hook pós-gravação do DataLoader: invalida resultados da versão anterior.
+
+        Args:
+            df: DataFrame gravado (não usado; assinatura do hook)
+            state: UF
+            year: Ano
+            month: Mês
+            path: Arquivo Parquet reescrito
+        """
+        self.invalidate(path)
+
+    def clear(self) -> None:
+        """Remove todas as entradas."""
+        for key in list(self._manifest):
+            self._drop(key)
+        self._memory.clear()
+        self._save_manifest()
+
+    def memoize(
+        self,
+        source: Source,
+        method: str,
+        compute: Callable[[], Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Retorna resultado memoizado ou calcula via compute().
+
+        Args:
+            source: Origem dos dados (define o fingerprint)
+            method: Nome do método (parte da chave)
+            compute: Função sem argumentos que calcula o resultado em caso de miss
+            *args: Argumentos posicionais (parte da chave)
+            **kwargs: Argumentos nomeados (parte da chave)
+
+        Returns:
+            Resultado do KPI
+        """
+        key = self.make_key(self.fingerprint(source), method, *args, **kwargs)
+        found, value = self.get(key)
+        if found:
+            self.hits += 1
+            return value
+
+        self.misses += 1
+        value = compute()
+        partitions = (
+            [] if isinstance(source, pd.DataFrame) else [str(p) for p in _partition_paths(source)]
+        )
+        self.put(key, value, partitions)
+        return value
+
+    def call(self, source: Source, method: str, *args: Any, **kwargs: Any) -> Any:
+        """
+        Executa método do KPICalculator com memoização.
+
+        Partições só são lidas do disco em caso de miss.
+
+        Args:
+            source: DataFrame ou caminho(s) de partições Parquet
+            method: Nome do método do KPICalculator (ex: 'summary')
+            *args: Argumentos do método (após o DataFrame)
+            **kwargs: Argumentos nomeados do método
+
+        Returns:
+            Resultado do KPI
+
+        Raises:
+            AttributeError: Se o método não existir no KPICalculator
+        """
+        function = getattr(self.calculator, method)
+
+        def compute() -> Any:
+            if isinstance(source, pd.DataFrame):
+                df = source
+            else:
+                frames = [pd.read_parquet(p) for p in _partition_paths(source)]
+                df = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+            return function(df, *args, **kwargs)
+
+        return self.memoize(source, method, compute, *args, **kwargs)
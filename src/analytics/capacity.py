@@ -0,0 +1,257 @@
+"""
+Capacidade de leitos: dimensão CNES × competência a partir dos extratos LT do CNES.
+
+Os arquivos LT (leitos) do CNES trazem uma linha por estabelecimento ×
+tipo de leito por competência, com leitos existentes (QT_EXIST),
+contratados (QT_CONTR) e SUS (QT_SUS). Os extratos locais (CSV ou Parquet,
+ex: LTAC2401.csv) são lidos uma vez, somados por CNES × competência e
+gravados em um Parquet compacto no CACHE_DIR (CNES como dicionário,
+contagens int32), reaproveitado enquanto for mais novo que os extratos.
+
+A dimensão é versionada por competência: a capacidade de um hospital em
+um mês é a do extrato mais recente até aquele mês (as-of), de modo que
+meses sem extrato usam a última versão conhecida.
+
+A ocupação de todos os hospitais é calculada de uma vez: pacientes-dia
+por CNES × competência (registros ou KPICube) são unidos aos leitos com um
+único merge_asof, com a mesma fórmula de KPICalculator.occupancy_rate:
+
+    ocupação = pacientes_dia / (leitos × dias do mês) × 100
+
+Exemplo:
+    >>> capacity = BedCapacity.load("data/reference/cnes_lt")
+    >>> capacity.beds(202401)  # Series: CNES → leitos
+    >>> hospital_occupancy(cube, capacity)
+"""
+
+import logging
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.cube import KPICube
+from src.analytics.kpis import grouped_measures
+from src.config import CACHE_DIR, CNES_BEDS_CONFIG
+
+logger = logging.getLogger(__name__)
+
+BED_COLUMNS = ["QT_EXIST", "QT_CONTR", "QT_SUS"]
+
+CAPACITY_COLUMNS = ["CNES", "competencia", *BED_COLUMNS]
+
+# Nome dos extratos do CNES: LT + UF + AAMM (ex: LTAC2401)
+_EXTRACT_NAME = re.compile(r"^LT[A-Z]{2}(\d{2})(\d{2})", re.IGNORECASE)
+
+
+def _extract_files(source: Path) -> list[Path]:
+    """Arquivos de extrato (o próprio arquivo ou CSV/Parquet do diretório)."""
+    if source.is_file():
+        return [source]
+    return sorted(p for p in source.iterdir() if p.suffix.lower() in (".csv", ".parquet"))
+
+
+def _read_extract(path: Path) -> pd.DataFrame:
+    """Lê um extrato; competência derivada do nome do arquivo se não houver COMPETEN."""
+    raw = (
+        pd.read_parquet(path) if path.suffix.lower() == ".parquet" else pd.read_csv(path, dtype=str)
+    )
+    raw = raw.rename(columns=lambda c: str(c).upper())
+    if "COMPETEN" not in raw.columns:
+        match = _EXTRACT_NAME.match(path.name)
+        if match is None:
+            raise KeyError(f"Competência ausente no extrato: {path.name} (sem COMPETEN)")
+        raw["COMPETEN"] = f"20{match.group(1)}{match.group(2)}"
+    return raw
+
+
+class BedCapacity:
+    """
+    Leitos por CNES × competência (dimensão versionada do CNES).
+
+    Exemplo:
+        >>> capacity = BedCapacity.load()
+        >>> capacity.lookup(df["CNES"], df["competencia"])
+    """
+
+    def __init__(self, data: pd.DataFrame) -> None:
+        """
+        Inicializa a partir de dados normalizados.
+
+        Args:
+            data: DataFrame com colunas CAPACITY_COLUMNS
+        """
+        self.data = data
+
+    @staticmethod
+    def normalize(raw: pd.DataFrame) -> pd.DataFrame:
+        """
+        Soma os leitos de um extrato LT por CNES × competência.
+
+        Args:
+            raw: Extrato(s) LT com CNES, COMPETEN (AAAAMM) e colunas de BED_COLUMNS
+                (ausentes contam como zero)
+
+        Returns:
+            DataFrame compacto com colunas CAPACITY_COLUMNS, ordenado por
+            competência e CNES
+
+        Raises:
+            KeyError: Se faltarem CNES ou COMPETEN
+        """
+        df = raw.rename(columns=lambda c: str(c).upper())
+        missing = [c for c in ("CNES", "COMPETEN") if c not in df.columns]
+        if missing:
+            raise KeyError(f"Colunas ausentes no extrato LT: {missing}")
+
+        work = pd.DataFrame(
+            {
+                "CNES": df["CNES"].astype("string").str.strip().astype(object),
+                "competencia": pd.to_numeric(df["COMPETEN"], errors="coerce"),
+            }
+        )
+        for column in BED_COLUMNS:
+            values = pd.to_numeric(df[column], errors="coerce") if column in df else 0
+            work[column] = values
+        work = work.dropna(subset=["CNES", "competencia"])
+
+        grouped = work.groupby(["competencia", "CNES"], sort=True)[BED_COLUMNS].sum().reset_index()
+        return grouped.astype(
+            {"CNES": "category", "competencia": np.int32, **dict.fromkeys(BED_COLUMNS, np.int32)}
+        )[CAPACITY_COLUMNS]
+
+    @classmethod
+    def load(
+        cls,
+        path: str | Path | None = None,
+        cache_dir: str | Path = CACHE_DIR,
+    ) -> "BedCapacity":
+        """
+        Carrega extratos LT locais, usando o cache normalizado se válido.
+
+        Args:
+            path: Arquivo ou diretório de extratos (padrão: CNES_BEDS_CONFIG)
+            cache_dir: Diretório do cache normalizado
+
+        Returns:
+            BedCapacity
+
+        Raises:
+            FileNotFoundError: Se não houver extratos
+        """
+        source = Path(path if path is not None else str(CNES_BEDS_CONFIG["path"]))
+        files = _extract_files(source) if source.exists() else []
+        if not files:
+            raise FileNotFoundError(f"Extratos de leitos do CNES não encontrados: {source}")
+
+        cached = Path(cache_dir) / f"cnes_beds_{source.stem}.parquet"
+        newest = max(p.stat().st_mtime_ns for p in files)
+        if cached.exists() and cached.stat().st_mtime_ns >= newest:
+            logger.info(f"[CAPACITY] Cache: {cached}")
+            return cls(pd.read_parquet(cached))
+
+        data = cls.normalize(pd.concat([_read_extract(p) for p in files], ignore_index=True))
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        data.to_parquet(cached, index=False)
+        logger.info(f"[CAPACITY] {len(data):,} hospitais × competências em {cached}")
+        return cls(data)
+
+    @property
+    def competencias(self) -> list[int]:
+        """Competências (AAAAMM) com extrato."""
+        return sorted(int(c) for c in self.data["competencia"].unique())
+
+    def lookup(
+        self,
+        cnes: pd.Series,
+        competencia: pd.Series,
+        column: str | None = None,
+    ) -> pd.Series:
+        """
+        Leitos vigentes de cada (CNES, competência), em um único merge as-of.
+
+        Args:
+            cnes: CNES de cada linha
+            competencia: Competência (AAAAMM) de cada linha
+            column: Coluna de leitos (padrão: CNES_BEDS_CONFIG)
+
+        Returns:
+            Series alinhada a cnes (NaN se não houver extrato até a competência)
+
+        Raises:
+            KeyError: Se a coluna de leitos não existir
+        """
+        column = column if column is not None else str(CNES_BEDS_CONFIG["bed_column"])
+        if column not in BED_COLUMNS:
+            raise KeyError(f"Coluna de leitos '{column}' inválida (use {BED_COLUMNS})")
+
+        left = pd.DataFrame(
+            {
+                "CNES": cnes.astype("string").to_numpy(),
+                "competencia": pd.to_numeric(competencia).to_numpy(dtype=np.int64),
+                "row": np.arange(len(cnes)),
+            }
+        ).sort_values("competencia", kind="stable")
+        right = self.data[["CNES", "competencia", column]].astype(
+            {"CNES": object, "competencia": np.int64}
+        )
+        joined = pd.merge_asof(left, right, on="competencia", by="CNES", direction="backward")
+        values = np.full(len(cnes), np.nan)
+        values[joined["row"].to_numpy()] = joined[column].to_numpy(dtype=np.float64)
+        return pd.Series(values, index=cnes.index, name=column)
+
+    def beds(self, competencia: int | None = None, column: str | None = None) -> pd.Series:
+        """
+        Leitos vigentes de todos os hospitais em uma competência.
+
+        Args:
+            competencia: AAAAMM (padrão: a mais recente)
+            column: Coluna de leitos (padrão: CNES_BEDS_CONFIG)
+
+        Returns:
+            Series CNES → leitos (hospitais com extrato até a competência)
+        """
+        target = competencia if competencia is not None else self.competencias[-1]
+        hospitals = pd.Series(self.data["CNES"].astype("string").unique())
+        values = self.lookup(hospitals, pd.Series(target, index=hospitals.index), column)
+        result = pd.Series(values.to_numpy(), index=pd.Index(hospitals, name="CNES"), name="beds")
+        return result.dropna().astype(np.int64).sort_index()
+
+
+def hospital_occupancy(
+    source: pd.DataFrame | KPICube,
+    capacity: BedCapacity,
+    column: str | None = None,
+) -> pd.DataFrame:
+    """
+    Taxa de ocupação de todos os hospitais por competência com leitos do CNES.
+
+    Args:
+        source: DataFrame processado (CNES, DT_INTER, stay_days) ou KPICube
+        capacity: Dimensão de leitos do CNES
+        column: Coluna de leitos (padrão: CNES_BEDS_CONFIG)
+
+    Returns:
+        DataFrame indexado por (CNES, competencia) com patient_days, beds,
+        bed_days e occupancy_rate (%); hospitais sem extrato ficam com NaN
+
+    Raises:
+        KeyError: Se faltarem colunas ou a coluna de leitos for inválida
+    """
+    if isinstance(source, KPICube):
+        measures = source.aggregate(["CNES", "competencia"])
+    else:
+        measures = grouped_measures(source, ["CNES", "competencia"], ["stay_days"])
+
+    keys = measures.index.to_frame(index=False)
+    competencia = keys["competencia"].astype(np.int64)
+    days = pd.to_datetime(competencia.astype(str), format="%Y%m").dt.days_in_month
+
+    result = pd.DataFrame(index=measures.index)
+    result["patient_days"] = measures["stay_days_sum"].to_numpy(dtype=np.float64)
+    result["beds"] = capacity.lookup(keys["CNES"], competencia, column).to_numpy()
+    result["bed_days"] = result["beds"] * days.to_numpy()
+    result["occupancy_rate"] = result["patient_days"] / result["bed_days"].replace(0, np.nan) * 100
+    logger.info(f"[CAPACITY] Ocupação de {keys['CNES'].nunique():,} hospital(is)")
+    return result
@@ -0,0 +1,243 @@
+"""
+Censo Diário de Leitos: Ocupação dia a dia por hospital a partir dos intervalos de internação.
+
+Cada internação ocupa um leito no intervalo [DT_INTER, DT_SAIDA). A contagem
+diária é obtida com arrays de diferenças (+1 na admissão, -1 na saída) e soma
+prefixada, com custo O(n + hospitais × dias) para todos os hospitais de uma vez.
+
+Duas contagens por dia:
+    - census: pacientes internados à meia-noite (convenção do censo
+      hospitalar; a soma dos dias equivale à soma de stay_days)
+    - peak: pacientes presentes em algum momento do dia, incluindo admitidos
+      e com alta no próprio dia (pico diário; DATASUS não registra horário)
+
+Internações são recortadas à janela [start, end]: uma permanência de
+janeiro a fevereiro conta apenas nos dias de janeiro quando a janela é
+janeiro. Partições mensais são acumuladas com update() e combinadas com
+merge() (a mesma internação aparece na partição do mês de saída).
+
+Exemplo:
+    >>> census = BedCensus("2024-01-01", "2024-01-31")
+    >>> for path in ["SIH_SP_202401.parquet", "SIH_SP_202402.parquet"]:
+    ...     census.update(pd.read_parquet(path, columns=["CNES", "DT_INTER", "DT_SAIDA"]))
+    >>> census.census()  # DataFrame: datas × CNES
+"""
+
+import logging
+from numbers import Number
+from typing import Any, cast
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from src.analytics.accumulators import Batch, KPIAccumulator, column_names, column_series
+
+logger = logging.getLogger(__name__)
+
+
+def _day_offsets(values: pd.Series, origin: np.datetime64) -> npt.NDArray[np.int64]:
+    """Converte datas em deslocamento (dias) a partir da origem."""
+    dates = pd.to_datetime(values, errors="coerce").to_numpy(dtype="datetime64[D]")
+    return (dates - origin).astype(np.int64)
+
+
+class BedCensus(KPIAccumulator):
+    """
+    Acumulador mergeável do censo diário de leitos por hospital.
+
+    O estado guarda os arrays de diferenças (hospitais × dias + 1); as
+    contagens diárias são materializadas apenas em census()/peak().
+    """
+
+    def __init__(
+        self,
+        start: str | pd.Timestamp,
+        end: str | pd.Timestamp,
+        group_by: str = "CNES",
+    ) -> None:
+        """
+        Inicializa censo para a janela de datas.
+
+        Args:
+            start: Primeiro dia da janela (inclusive)
+            end: Último dia da janela (inclusive)
+            group_by: Coluna que identifica o hospital
+
+        Raises:
+            ValueError: Se end for anterior a start
+        """
+        self.start = pd.Timestamp(start).normalize()
+        self.end = pd.Timestamp(end).normalize()
+        if self.end < self.start:
+            raise ValueError("Data final deve ser maior ou igual à data inicial")
+
+        self.group_by = group_by
+        self.days = (self.end - self.start).days + 1
+        self.keys: list[str] = []
+        self._positions: dict[str, int] = {}
+        self._midnight = np.zeros((0, self.days + 1), dtype=np.int32)
+        self._present = np.zeros((0, self.days + 1), dtype=np.int32)
+
+    def _config(self) -> tuple[Any, ...]:
+        return (self.start, self.end, self.group_by)
+
+    def _rows_for(self, keys: list[str]) -> npt.NDArray[np.int64]:
+        """Posição de cada hospital no estado, criando linhas para hospitais novos."""
+        new = [k for k in keys if k not in self._positions]
+        if new:
+            for key in new:
+                self._positions[key] = len(self.keys)
+                self.keys.append(key)
+            padding = np.zeros((len(new), self.days + 1), dtype=np.int32)
+            self._midnight = np.vstack([self._midnight, padding])
+            self._present = np.vstack([self._present, padding])
+        return np.array([self._positions[k] for k in keys], dtype=np.int64)
+
+    def _accumulate(
+        self,
+        target: npt.NDArray[np.int32],
+        rows: npt.NDArray[np.int64],
+        lo: npt.NDArray[np.int64],
+        hi: npt.NDArray[np.int64],
+    ) -> None:
+        """Soma +1 em lo e -1 em hi para cada intervalo válido (lo < hi)."""
+        valid = lo < hi
+        width = self.days + 1
+        flat = np.concatenate([rows[valid] * width + lo[valid], rows[valid] * width + hi[valid]])
+        weights = np.concatenate([np.ones(valid.sum()), -np.ones(valid.sum())])
+        diff = np.bincount(flat, weights=weights, minlength=target.size)
+        target += diff.reshape(target.shape).astype(np.int32)
+
+    def update(self, batch: Batch) -> "BedCensus":
+        """
+        Incorpora internações de um lote (partição ou row group).
+
+        Registros sem datas são ignorados.
+
+        Raises:
+            KeyError: Se faltarem colunas DT_INTER, DT_SAIDA ou de hospital
+        """
+        missing = {self.group_by, "DT_INTER", "DT_SAIDA"} - set(column_names(batch))
+        if missing:
+            raise KeyError(f"Colunas ausentes para o censo: {sorted(missing)}")
+
+        origin = np.datetime64(self.start.date(), "D")
+        admission = _day_offsets(column_series(batch, "DT_INTER"), origin)
+        discharge = _day_offsets(column_series(batch, "DT_SAIDA"), origin)
+        hospitals = column_series(batch, self.group_by).astype(str).to_numpy()
+
+        # NaT vira o menor int64; descartar antes de recortar
+        known = (admission > np.iinfo(np.int64).min) & (discharge > np.iinfo(np.int64).min)
+        admission, discharge, hospitals = admission[known], discharge[known], hospitals[known]
+        if len(admission) == 0:
+            return self
+
+        codes, uniques = pd.factorize(hospitals)
+        rows = self._rows_for([str(u) for u in uniques])[codes]
+
+        lo = np.clip(admission, 0, self.days)
+        self._accumulate(self._midnight, rows, lo, np.clip(discharge, 0, self.days))
+        self._accumulate(self._present, rows, lo, np.clip(discharge + 1, 0, self.days))
+        return self
+
+    def merge(self, other: KPIAccumulator) -> "BedCensus":
+        self._check_compatible(other)
+        state = cast(BedCensus, other)
+        rows = self._rows_for(state.keys)
+        self._midnight[rows] += state._midnight
+        self._present[rows] += state._present
+        return self
+
+    def _frame(self, diff: npt.NDArray[np.int32]) -> pd.DataFrame:
+        counts = np.cumsum(diff[:, : self.days], axis=1).T
+        index = pd.date_range(self.start, periods=self.days, freq="D", name="date")
+        frame = pd.DataFrame(counts, index=index, columns=pd.Index(self.keys, name=self.group_by))
+        return frame.sort_index(axis=1)
+
+    def census(self) -> pd.DataFrame:
+        """
+        Leitos ocupados à meia-noite de cada dia.
+
+        Returns:
+            DataFrame com índice de datas e uma coluna por hospital
+        """
+        return self._frame(self._midnight)
+
+    def peak(self) -> pd.DataFrame:
+        """
+        Pico diário: pacientes presentes em algum momento do dia.
+
+        Returns:
+            DataFrame com índice de datas e uma coluna por hospital
+        """
+        return self._frame(self._present)
+
+    def result(self) -> pd.DataFrame:
+        return self.census()
+
+    def occupancy(self, beds: int | dict[str, int] | pd.Series) -> pd.DataFrame:
+        """
+        Taxa de ocupação diária (%) por hospital.
+
+        Args:
+            beds: Leitos disponíveis (único valor ou por hospital)
+
+        Returns:
+            DataFrame datas × hospitais com ocupação em %; hospitais sem
+            número de leitos ficam NaN
+
+        Raises:
+            ValueError: Se algum número de leitos for zero ou negativo
+        """
+        # Escalar (int, np.int64, float...) divide todas as colunas; mapeamento alinha por hospital
+        capacity = float(beds) if isinstance(beds, Number) else pd.Series(beds, dtype=np.float64)
+        if np.any(np.asarray(capacity) <= 0):
+            raise ValueError("Número de leitos deve ser maior que zero")
+        return self.census().div(capacity) * 100
+
+    def monthly(self) -> pd.DataFrame:
+        """
+        Indicadores mensais por hospital derivados da série diária.
+
+        Internações que cruzam a virada do mês contam em cada mês apenas
+        pelos dias em que o paciente esteve internado nele.
+
+        Returns:
+            DataFrame com índice (competencia, hospital) e colunas
+            patient_days, mean_census, max_census e peak
+        """
+        census, peak = self.census(), self.peak()
+        dates = pd.DatetimeIndex(census.index)
+        month = pd.Index(dates.year * 100 + dates.month, name="competencia")
+        return pd.DataFrame(
+            {
+                "patient_days": census.groupby(month).sum().stack(),
+                "mean_census": census.groupby(month).mean().stack(),
+                "max_census": census.groupby(month).max().stack(),
+                "peak": peak.groupby(month).max().stack(),
+            }
+        )
+
+
+def daily_census(
+    df: pd.DataFrame,
+    start: str | pd.Timestamp | None = None,
+    end: str | pd.Timestamp | None = None,
+    group_by: str = "CNES",
+) -> pd.DataFrame:
+    """
+    Censo diário (leitos ocupados à meia-noite) para um DataFrame.
+
+    Args:
+        df: DataFrame com DT_INTER, DT_SAIDA e coluna de hospital
+        start: Início da janela (padrão: menor DT_INTER)
+        end: Fim da janela (padrão: maior DT_SAIDA)
+        group_by: Coluna que identifica o hospital
+
+    Returns:
+        DataFrame com índice de datas e uma coluna por hospital
+    """
+    start = start if start is not None else df["DT_INTER"].min()
+    end = end if end is not None else df["DT_SAIDA"].max()
+    return BedCensus(start, end, group_by).update(df).census()
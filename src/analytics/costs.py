@@ -0,0 +1,156 @@
+"""
+Composição de custos e uso de UTI por hospital, especialidade e mês.
+
+KPIs (por grupo):
+    - {VAL_SH,VAL_SP,VAL_SADT,VAL_UTI}_share: participação do componente em
+      VAL_TOT (%); no SIH o valor de UTI está contido em VAL_SH, portanto as
+      participações não somam necessariamente 100%
+    - icu_days: diárias de UTI (soma de UTI_MES_TO)
+    - icu_rate: internações com UTI / internações (%)
+    - icu_days_per_stay: diárias de UTI por internação com UTI
+    - icu_cost_per_day: VAL_UTI / diárias de UTI
+
+Registros: as colunas de valor são empilhadas em uma matriz n × k e somadas
+por grupo com um único np.add.reduceat sobre as linhas ordenadas pelo
+código do grupo (uma passada para todas as medidas). Cubo: as mesmas
+medidas já estão nas células (COST_MEASURES), atualizadas a cada carga.
+
+Exemplo:
+    >>> cost_composition(df)  # CNES × ESPEC × competencia
+    >>> cost_composition(cube, group_by="CNES")
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.cube import COST_COLUMNS, COST_MEASURES, KPICube
+from src.analytics.kpis import group_keys
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GROUP_BY = ["CNES", "ESPEC", "competencia"]
+
+# Medidas aditivas usadas pelos KPIs de custo (mesmos nomes do KPICube)
+COST_SOURCE_MEASURES = ["records", "VAL_TOT_sum", *COST_MEASURES]
+
+COST_KPIS = [
+    *[f"{c}_share" for c in COST_COLUMNS],
+    "icu_days",
+    "icu_rate",
+    "icu_days_per_stay",
+    "icu_cost_per_day",
+]
+
+
+def _numeric(df: pd.DataFrame, column: str) -> np.ndarray:
+    """Coluna como float64 com nulos (ou coluna ausente) valendo zero."""
+    if column not in df.columns:
+        return np.zeros(len(df))
+    values = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=np.float64)
+    return np.nan_to_num(values)
+
+
+def cost_measures(df: pd.DataFrame, group_by: str | list[str] | None = None) -> pd.DataFrame:
+    """
+    Medidas aditivas de custo por grupo em uma única passada vetorizada.
+
+    Args:
+        df: DataFrame com VAL_TOT, componentes de valor e UTI_MES_TO
+            (colunas ausentes contam como zero)
+        group_by: Coluna(s) de agrupamento ('competencia'/'month' derivados de
+            DT_INTER); None = total geral
+
+    Returns:
+        DataFrame com COST_SOURCE_MEASURES indexado pelos grupos
+
+    Raises:
+        KeyError: Se coluna de agrupamento não existir
+    """
+    keys = [] if group_by is None else [group_by] if isinstance(group_by, str) else group_by
+
+    icu_days = _numeric(df, "UTI_MES_TO")
+    matrix = np.column_stack(
+        [
+            np.ones(len(df)),
+            _numeric(df, "VAL_TOT"),
+            *[_numeric(df, c) for c in COST_COLUMNS],
+            icu_days,
+            (icu_days > 0).astype(np.float64),
+        ]
+    )
+
+    if not keys:
+        return pd.DataFrame([matrix.sum(axis=0)], columns=COST_SOURCE_MEASURES)
+
+    grouper = df.groupby(group_keys(df, keys), observed=True, sort=True)
+    codes = grouper.ngroup().to_numpy()
+    index = grouper.size().index
+
+    valid = codes >= 0
+    order = np.argsort(codes[valid], kind="stable")
+    sorted_codes = codes[valid][order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    if len(sorted_codes) == 0:
+        sums = np.zeros((0, matrix.shape[1]))
+    else:
+        sums = np.add.reduceat(matrix[valid][order], starts, axis=0)
+
+    return pd.DataFrame(sums, index=index, columns=COST_SOURCE_MEASURES)
+
+
+def cost_kpis(measures: pd.DataFrame) -> pd.DataFrame:
+    """
+    KPIs de custo e UTI a partir de medidas aditivas.
+
+    Args:
+        measures: Saída de cost_measures ou KPICube.aggregate
+
+    Returns:
+        DataFrame com COST_KPIS, mesmo índice de measures (NaN sem base)
+    """
+    total = measures["VAL_TOT_sum"].replace(0, np.nan)
+    icu_days = measures["icu_days"].replace(0, np.nan)
+    icu_stays = measures["icu_stays"].replace(0, np.nan)
+
+    result = pd.DataFrame(index=measures.index)
+    for column in COST_COLUMNS:
+        result[f"{column}_share"] = measures[f"{column}_sum"] / total * 100
+    result["icu_days"] = measures["icu_days"].astype(float)
+    result["icu_rate"] = measures["icu_stays"] / measures["records"].replace(0, np.nan) * 100
+    result["icu_days_per_stay"] = measures["icu_days"] / icu_stays
+    result["icu_cost_per_day"] = measures["VAL_UTI_sum"] / icu_days
+    return result
+
+
+def cost_composition(
+    source: pd.DataFrame | KPICube,
+    group_by: str | list[str] | None = DEFAULT_GROUP_BY,
+) -> pd.DataFrame:
+    """
+    Composição de custos e indicadores de UTI por grupo.
+
+    Args:
+        source: DataFrame processado ou KPICube
+        group_by: Coluna(s) de agrupamento (padrão: CNES × ESPEC × competencia)
+
+    Returns:
+        DataFrame indexado pelos grupos com records, VAL_TOT_sum, icu_stays
+        e COST_KPIS
+
+    Raises:
+        KeyError: Se coluna de agrupamento não existir
+    """
+    if isinstance(source, KPICube):
+        measures = source.aggregate(group_by)
+    else:
+        measures = cost_measures(source, group_by)
+
+    result = pd.concat(
+        [measures[["records", "VAL_TOT_sum", "icu_stays"]].astype(float), cost_kpis(measures)],
+        axis=1,
+    )
+    result[["records", "icu_stays"]] = result[["records", "icu_stays"]].astype("int64")
+    logger.info(f"[COSTS] Composição de custos para {len(result):,} grupo(s)")
+    return result
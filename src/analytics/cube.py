@@ -0,0 +1,722 @@
+"""
+Cubo de KPIs: Agregados pré-computados e mergeáveis por partição.
+
+Granularidade: UF × competência (ano-mês de DT_INTER) × CNES × ESPEC × age_group × SEXO.
+
+Cada célula guarda apenas medidas aditivas (contagens e somas, incluindo
+componentes de valor e diárias de UTI), de modo que qualquer rollup é uma
+soma de células e KPIs derivados (médias, taxas) são calculados no final.
+O cubo é atualizado incrementalmente a cada partição carregada;
+recarregar uma partição substitui sua contribuição.
+
+Distribuições (stay_days, VAL_TOT, daily_cost) são guardadas como centróides
+de t-digest por célula, em formato longo (uma linha por centróide). Quantis
+de qualquer rollup recomprimem os centróides dos grupos (ver sketches).
+Contagens de distintos (MUNIC_RES, CNES, PROC_REA) são guardadas como
+registros não nulos de HyperLogLog por célula; o rollup toma o máximo
+por registro. Itens mais frequentes (DIAG_PRINC, PROC_REA) são guardados
+como contadores Space-Saving por célula; o top-K de qualquer rollup
+combina os contadores dos grupos sem reler registros.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from src.analytics.sketches import (
+    DEFAULT_QUANTILES,
+    compress_centroids,
+    exact_counters,
+    grouped_quantiles,
+    hll_estimate,
+    hll_observations,
+    merge_counters,
+    quantile_label,
+)
+from src.config import SKETCH_CONFIG
+
+logger = logging.getLogger(__name__)
+
+DIMENSIONS = ["UF", "competencia", "CNES", "ESPEC", "age_group", "SEXO"]
+
+# Componentes de valor do SIH somados por célula (VAL_UTI está contido em VAL_SH)
+COST_COLUMNS = ["VAL_SH", "VAL_SP", "VAL_SADT", "VAL_UTI"]
+
+# Medidas de custo e UTI: somas dos componentes, diárias de UTI (UTI_MES_TO)
+# e internações com UTI
+COST_MEASURES = [f"{c}_sum" for c in COST_COLUMNS] + ["icu_days", "icu_stays"]
+
+MEASURES = [
+    "records",
+    "stay_days_sum",
+    "stay_days_count",
+    "VAL_TOT_sum",
+    "VAL_TOT_count",
+    "deaths",
+    *COST_MEASURES,
+]
+
+SKETCH_MEASURES = ["stay_days", "VAL_TOT", "daily_cost"]
+
+SKETCH_COLUMNS = ["measure", "mean", "weight"]
+
+DISTINCT_MEASURES = ["MUNIC_RES", "CNES", "PROC_REA"]
+
+DISTINCT_COLUMNS = ["measure", "register", "rank"]
+
+HEAVY_MEASURES = ["DIAG_PRINC", "PROC_REA"]
+
+HEAVY_COLUMNS = ["measure", "item", "count", "error", "floor"]
+
+
+def sidecar_path(path: Path, kind: str) -> Path:
+    """
+    Arquivo Parquet auxiliar ao lado do arquivo do cubo ({nome}.{kind}.parquet).
+
+    Args:
+        path: Arquivo Parquet do cubo
+        kind: Tipo do auxiliar (ex: 'sketches', 'forecast')
+
+    Returns:
+        Caminho do arquivo auxiliar
+    """
+    return path.with_name(f"{path.stem}.{kind}.parquet")
+
+
+def _concat(frames: list[pd.DataFrame], columns: list[str]) -> pd.DataFrame:
+    """Concatena frames não vazios (ou frame vazio com as colunas)."""
+    frames = [f for f in frames if not f.empty]
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    combined: pd.DataFrame = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+    return combined
+
+
+class KPICube:
+    """
+    Cubo multidimensional de medidas aditivas para consultas de KPI em milissegundos.
+
+    Exemplo:
+        >>> cube = KPICube()
+        >>> cube.update(df, state="AC", year=2024, month=1)
+        >>> KPICalculator().revenue(cube, group_by="ESPEC")
+        >>> KPICalculator().volume(cube.filter(UF="AC"), group_by="CNES")
+    """
+
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        cells: pd.DataFrame | None = None,
+        sketches: pd.DataFrame | None = None,
+        distinct: pd.DataFrame | None = None,
+        heavy: pd.DataFrame | None = None,
+    ) -> None:
+        """
+        Inicializa cubo vazio (ou a partir de células já agregadas).
+
+        Args:
+            path: Arquivo Parquet para persistência (opcional)
+            cells: Células pré-agregadas (colunas DIMENSIONS + MEASURES)
+            sketches: Centróides pré-agregados (colunas DIMENSIONS + SKETCH_COLUMNS)
+            distinct: Registros HLL pré-agregados (colunas DIMENSIONS + DISTINCT_COLUMNS)
+            heavy: Contadores pré-agregados (colunas DIMENSIONS + HEAVY_COLUMNS)
+        """
+        self.path = Path(path) if path is not None else None
+        self._partitions: dict[str, pd.DataFrame] = {}
+        self._sketches: dict[str, pd.DataFrame] = {}
+        self._distinct: dict[str, pd.DataFrame] = {}
+        self._heavy: dict[str, pd.DataFrame] = {}
+        if cells is not None:
+            self._partitions["_base"] = cells
+        if sketches is not None:
+            self._sketches["_base"] = sketches
+        if distinct is not None:
+            self._distinct["_base"] = distinct
+        if heavy is not None:
+            self._heavy["_base"] = heavy
+        self._cells: pd.DataFrame | None = None
+
+    @staticmethod
+    def partition_key(state: str, year: int, month: int) -> str:
+        """Chave de partição (ex: 'AC_202401')."""
+        return f"{state}_{year}{month:02d}"
+
+    @staticmethod
+    def aggregate_partition(df: pd.DataFrame, state: str, year: int, month: int) -> pd.DataFrame:
+        """
+        Agrega registros de uma partição na granularidade do cubo.
+
+        Args:
+            df: DataFrame processado (saída do DataTransformer)
+            state: UF da partição
+            year: Ano da partição
+            month: Mês da partição
+
+        Returns:
+            DataFrame com colunas DIMENSIONS + MEASURES
+        """
+        n = len(df)
+        work = KPICube._dimension_frame(df, state, year, month)
+
+        for column in ("stay_days", "VAL_TOT"):
+            if column in df.columns:
+                work[column] = pd.to_numeric(df[column], errors="coerce")
+            else:
+                work[column] = np.full(n, np.nan)
+        work["death"] = df["death"].astype(float) if "death" in df.columns else 0.0
+        for column in COST_COLUMNS:
+            work[column] = pd.to_numeric(df[column], errors="coerce") if column in df else 0.0
+        icu_days = pd.to_numeric(df["UTI_MES_TO"], errors="coerce") if "UTI_MES_TO" in df else 0.0
+        work["icu_days"] = icu_days
+        work["icu_stays"] = (work["icu_days"] > 0).astype(np.int64)
+
+        cells = (
+            work.groupby(DIMENSIONS, dropna=False, observed=True, sort=False)
+            .agg(
+                records=("UF", "size"),
+                stay_days_sum=("stay_days", "sum"),
+                stay_days_count=("stay_days", "count"),
+                VAL_TOT_sum=("VAL_TOT", "sum"),
+                VAL_TOT_count=("VAL_TOT", "count"),
+                deaths=("death", "sum"),
+                **{f"{c}_sum": (c, "sum") for c in COST_COLUMNS},
+                icu_days=("icu_days", "sum"),
+                icu_stays=("icu_stays", "sum"),
+            )
+            .reset_index()
+        )
+        cells[["deaths", "icu_stays"]] = cells[["deaths", "icu_stays"]].astype("int64")
+        return cells
+
+    @staticmethod
+    def _dimension_frame(df: pd.DataFrame, state: str, year: int, month: int) -> pd.DataFrame:
+        """Colunas de dimensão do cubo para cada registro da partição."""
+        work = pd.DataFrame(index=df.index)
+        work["UF"] = state
+
+        if "DT_INTER" in df.columns:
+            dt = pd.to_datetime(df["DT_INTER"], errors="coerce").dt
+            work["competencia"] = (dt.year * 100 + dt.month).astype("Int64")
+        else:
+            work["competencia"] = year * 100 + month
+        work["competencia"] = work["competencia"].astype("Int64")
+
+        for dim in ("CNES", "ESPEC", "age_group", "SEXO"):
+            work[dim] = df[dim].astype("string") if dim in df.columns else pd.NA
+        return work.astype(dict.fromkeys(("UF", "CNES", "ESPEC", "age_group", "SEXO"), "string"))
+
+    @staticmethod
+    def sketch_partition(
+        df: pd.DataFrame,
+        state: str,
+        year: int,
+        month: int,
+        compression: float = SKETCH_CONFIG["tdigest_compression"],
+    ) -> pd.DataFrame:
+        """
+        Constrói t-digests por célula para as medidas de distribuição.
+
+        daily_cost ausente é derivado como no DataTransformer
+        (VAL_TOT / stay_days, com permanência zero contando como 1 dia).
+
+        Args:
+            df: DataFrame processado da partição
+            state: UF da partição
+            year: Ano da partição
+            month: Mês da partição
+            compression: Parâmetro δ do t-digest
+
+        Returns:
+            DataFrame longo com colunas DIMENSIONS + SKETCH_COLUMNS
+        """
+        codes, cells = KPICube._cell_codes(df, state, year, month)
+
+        values: dict[str, pd.Series] = {
+            c: pd.to_numeric(df[c], errors="coerce") for c in SKETCH_MEASURES if c in df.columns
+        }
+        if "daily_cost" not in values and {"stay_days", "VAL_TOT"} <= values.keys():
+            values["daily_cost"] = values["VAL_TOT"] / values["stay_days"].replace(0, 1)
+
+        frames = []
+        for measure, series in values.items():
+            groups, means, weights = compress_centroids(
+                codes,
+                series.to_numpy(dtype=np.float64, na_value=np.nan),
+                np.ones(len(codes)),
+                compression,
+            )
+            frame = cells.loc[groups, DIMENSIONS].reset_index(drop=True)
+            frame["measure"] = measure
+            frame["mean"] = means
+            frame["weight"] = weights
+            frames.append(frame)
+
+        return _concat(frames, DIMENSIONS + SKETCH_COLUMNS)
+
+    @staticmethod
+    def distinct_partition(
+        df: pd.DataFrame,
+        state: str,
+        year: int,
+        month: int,
+        precision: int = SKETCH_CONFIG["hll_precision"],
+    ) -> pd.DataFrame:
+        """
+        Constrói registros HyperLogLog por célula para as colunas de DISTINCT_MEASURES.
+
+        Apenas registros não nulos são guardados (uma linha por registro),
+        de modo que células pequenas ocupam poucas linhas.
+
+        Args:
+            df: DataFrame processado da partição
+            state: UF da partição
+            year: Ano da partição
+            month: Mês da partição
+            precision: Bits de registro do HyperLogLog
+
+        Returns:
+            DataFrame longo com colunas DIMENSIONS + DISTINCT_COLUMNS
+        """
+        codes, cells = KPICube._cell_codes(df, state, year, month)
+        size = 1 << precision
+
+        frames = []
+        for measure in (c for c in DISTINCT_MEASURES if c in df.columns):
+            present = df[measure].notna().to_numpy()
+            registers, ranks = hll_observations(df[measure].to_numpy()[present], precision)
+            keys = codes[present] * size + registers
+            unique, inverse = np.unique(keys, return_inverse=True)
+            best = np.zeros(len(unique), dtype=np.uint8)
+            np.maximum.at(best, inverse, ranks)
+
+            frame = cells.loc[unique // size, DIMENSIONS].reset_index(drop=True)
+            frame["measure"] = measure
+            frame["register"] = (unique % size).astype(np.int32)
+            frame["rank"] = best
+            frames.append(frame)
+
+        return _concat(frames, DIMENSIONS + DISTINCT_COLUMNS)
+
+    @staticmethod
+    def heavy_partition(
+        df: pd.DataFrame,
+        state: str,
+        year: int,
+        month: int,
+        capacity: int = SKETCH_CONFIG["heavy_hitters_capacity"],
+    ) -> pd.DataFrame:
+        """
+        Constrói contadores Space-Saving por célula para as colunas de HEAVY_MEASURES.
+
+        Células com até `capacity` itens distintos guardam contagens exatas.
+
+        Args:
+            df: DataFrame processado da partição
+            state: UF da partição
+            year: Ano da partição
+            month: Mês da partição
+            capacity: Número máximo de contadores por célula
+
+        Returns:
+            DataFrame longo com colunas DIMENSIONS + HEAVY_COLUMNS
+        """
+        codes, cells = KPICube._cell_codes(df, state, year, month)
+
+        frames = []
+        for measure in (c for c in HEAVY_MEASURES if c in df.columns):
+            counters = merge_counters(exact_counters(codes, df[measure].to_numpy()), capacity)
+            frame = cells.loc[counters["group"], DIMENSIONS].reset_index(drop=True)
+            frame["measure"] = measure
+            for column in HEAVY_COLUMNS[1:]:
+                frame[column] = counters[column].to_numpy()
+            frames.append(frame)
+
+        return _concat(frames, DIMENSIONS + HEAVY_COLUMNS)
+
+    @staticmethod
+    def _cell_codes(
+        df: pd.DataFrame, state: str, year: int, month: int
+    ) -> tuple[npt.NDArray[np.int64], pd.DataFrame]:
+        """
+        Código da célula de cada registro e dimensões de cada célula.
+
+        Returns:
+            Tupla (códigos por registro, DataFrame de dimensões indexado pelo código)
+        """
+        work = KPICube._dimension_frame(df, state, year, month)
+        grouper = work.groupby(DIMENSIONS, dropna=False, observed=True, sort=False)
+        codes: npt.NDArray[np.int64] = np.asarray(grouper.ngroup(), dtype=np.int64)
+        first = np.unique(codes, return_index=True)[1]
+        cells = work[DIMENSIONS].iloc[first]
+        cells.index = pd.Index(codes[first])
+        return codes, cells
+
+    def update(self, df: pd.DataFrame, state: str, year: int, month: int) -> None:
+        """
+        Incorpora (ou substitui) a contribuição de uma partição.
+
+        Args:
+            df: DataFrame processado da partição
+            state: UF
+            year: Ano
+            month: Mês
+        """
+        key = self.partition_key(state, year, month)
+        self._partitions[key] = self.aggregate_partition(df, state, year, month)
+        self._sketches[key] = self.sketch_partition(df, state, year, month)
+        self._distinct[key] = self.distinct_partition(df, state, year, month)
+        self._heavy[key] = self.heavy_partition(df, state, year, month)
+        self._cells = None
+        logger.info(f"[CUBE] Partição {key}: {len(self._partitions[key]):,} células")
+
+    def partition_written(
+        self, df: pd.DataFrame, state: str, year: int, month: int, path: str | Path
+    ) -> None:
+        """
+        Hook pós-gravação do DataLoader: atualiza o cubo e o persiste (se tiver path).
+
+        Args:
+            df: DataFrame processado da partição
+            state: UF
+            year: Ano
+            month: Mês
+            path: Arquivo Parquet gravado (não usado; assinatura do hook)
+        """
+        self.update(df, state, year, month)
+        if self.path is not None:
+            self.save()
+
+    def remove(self, state: str, year: int, month: int) -> None:
+        """Remove a contribuição de uma partição."""
+        self._partitions.pop(self.partition_key(state, year, month), None)
+        self._sketches.pop(self.partition_key(state, year, month), None)
+        self._distinct.pop(self.partition_key(state, year, month), None)
+        self._heavy.pop(self.partition_key(state, year, month), None)
+        self._cells = None
+
+    @property
+    def partitions(self) -> list[str]:
+        """Chaves das partições incorporadas."""
+        return sorted(k for k in self._partitions if k != "_base")
+
+    @property
+    def cells(self) -> pd.DataFrame:
+        """Células do cubo (rollup de todas as partições na granularidade base)."""
+        if self._cells is None:
+            frames = [f for f in self._partitions.values() if not f.empty]
+            if not frames:
+                self._cells = pd.DataFrame(columns=DIMENSIONS + MEASURES)
+            elif len(frames) == 1:
+                self._cells = frames[0]
+            else:
+                self._cells = (
+                    pd.concat(frames, ignore_index=True)
+                    .groupby(DIMENSIONS, dropna=False, sort=False)[MEASURES]
+                    .sum()
+                    .reset_index()
+                )
+        return self._cells
+
+    @property
+    def sketches(self) -> pd.DataFrame:
+        """Centróides de t-digest de todas as partições (formato longo)."""
+        return _concat(list(self._sketches.values()), DIMENSIONS + SKETCH_COLUMNS)
+
+    @property
+    def distinct(self) -> pd.DataFrame:
+        """Registros HyperLogLog de todas as partições (formato longo)."""
+        return _concat(list(self._distinct.values()), DIMENSIONS + DISTINCT_COLUMNS)
+
+    @property
+    def heavy(self) -> pd.DataFrame:
+        """Contadores Space-Saving de todas as partições (formato longo)."""
+        return _concat(list(self._heavy.values()), DIMENSIONS + HEAVY_COLUMNS)
+
+    @property
+    def empty(self) -> bool:
+        """True se o cubo não tem registros."""
+        return self.cells.empty
+
+    def filter(self, **criteria: Any) -> "KPICube":
+        """
+        Retorna sub-cubo com as células que satisfazem os critérios.
+
+        Args:
+            **criteria: Dimensão = valor (ou lista de valores), ex: UF="SP"
+
+        Returns:
+            Novo KPICube (somente leitura das células filtradas)
+
+        Raises:
+            KeyError: Se alguma dimensão não existir no cubo
+        """
+        for dim in criteria:
+            if dim not in DIMENSIONS:
+                raise KeyError(f"Dimensão '{dim}' não existe no cubo")
+
+        def select(frame: pd.DataFrame) -> pd.DataFrame:
+            mask = np.ones(len(frame), dtype=bool)
+            for dim, value in criteria.items():
+                values = value if isinstance(value, list | tuple | set) else [value]
+                if dim != "competencia":
+                    values = [str(v) for v in values]
+                mask &= frame[dim].isin(values).to_numpy(dtype=bool)
+            return frame[mask].reset_index(drop=True)
+
+        return KPICube(
+            cells=select(self.cells),
+            sketches=select(self.sketches),
+            distinct=select(self.distinct),
+            heavy=select(self.heavy),
+        )
+
+    def aggregate(self, group_by: str | list[str] | None = None) -> pd.DataFrame:
+        """
+        Rollup das medidas aditivas.
+
+        Args:
+            group_by: Dimensão(ões) de agrupamento; 'month' agrupa pelo número
+                do mês (compatível com KPICalculator.volume); None = total geral
+
+        Returns:
+            DataFrame de medidas indexado pelo(s) grupo(s) (uma linha se None)
+
+        Raises:
+            KeyError: Se a dimensão de agrupamento não existir no cubo
+        """
+        cells = self.cells
+        if group_by is None:
+            return cells[MEASURES].sum().to_frame().T
+
+        keys = [group_by] if isinstance(group_by, str) else list(group_by)
+        frame = cells
+        if "month" in keys:
+            frame = cells.assign(month=cells["competencia"] % 100)
+        for key in keys:
+            if key not in frame.columns:
+                raise KeyError(f"Coluna '{key}' não encontrada no cubo")
+
+        return frame.groupby(keys, dropna=True, sort=True)[MEASURES].sum()
+
+    @staticmethod
+    def _group_codes(
+        frame: pd.DataFrame, group_by: str | list[str] | None
+    ) -> tuple[pd.DataFrame, npt.NDArray[np.int64], pd.Index]:
+        """
+        Código do grupo de cada linha de um store em formato longo.
+
+        Returns:
+            Tupla (linhas com grupo definido, códigos, índice dos grupos)
+
+        Raises:
+            KeyError: Se a dimensão de agrupamento não existir no cubo
+        """
+        if group_by is None:
+            return frame, np.zeros(len(frame), dtype=np.int64), pd.RangeIndex(1)
+
+        keys = [group_by] if isinstance(group_by, str) else list(group_by)
+        if "month" in keys:
+            frame = frame.assign(month=frame["competencia"] % 100)
+        for key in keys:
+            if key not in frame.columns:
+                raise KeyError(f"Coluna '{key}' não encontrada no cubo")
+        grouper = frame.groupby(keys, dropna=True, sort=True)
+        codes: npt.NDArray[np.int64] = np.asarray(grouper.ngroup(), dtype=np.int64)
+        valid = codes >= 0
+        return frame[valid], codes[valid], grouper.size().index
+
+    def quantiles(
+        self,
+        measure: str = "stay_days",
+        group_by: str | list[str] | None = None,
+        quantiles: tuple[float, ...] = DEFAULT_QUANTILES,
+    ) -> pd.DataFrame:
+        """
+        Quantis aproximados de uma medida de distribuição (t-digest).
+
+        Args:
+            measure: Medida (ver SKETCH_MEASURES)
+            group_by: Dimensão(ões) de agrupamento ('month' = número do mês); None = geral
+            quantiles: Quantis desejados (0-1)
+
+        Returns:
+            DataFrame com uma coluna por quantil ('p50', 'p90', ...) indexado
+            pelo(s) grupo(s) (uma linha se None)
+
+        Raises:
+            KeyError: Se a medida ou a dimensão de agrupamento não existir
+        """
+        if measure not in SKETCH_MEASURES:
+            raise KeyError(f"Medida '{measure}' não possui sketch no cubo")
+
+        sketches = self.sketches
+        frame = sketches[sketches["measure"] == measure]
+        labels = [quantile_label(q) for q in quantiles]
+
+        frame, codes, index = self._group_codes(frame, group_by)
+        groups, means, weights = compress_centroids(
+            codes,
+            frame["mean"].to_numpy(dtype=np.float64),
+            frame["weight"].to_numpy(dtype=np.float64),
+        )
+        present, values = grouped_quantiles(groups, means, weights, quantiles)
+
+        result = pd.DataFrame(np.nan, index=index, columns=labels)
+        result.iloc[present] = values
+        return result
+
+    def distinct_count(
+        self, measure: str = "MUNIC_RES", group_by: str | list[str] | None = None
+    ) -> pd.Series:
+        """
+        Número aproximado de valores distintos (HyperLogLog).
+
+        Args:
+            measure: Coluna (ver DISTINCT_MEASURES)
+            group_by: Dimensão(ões) de agrupamento ('month' = número do mês); None = geral
+
+        Returns:
+            Series de contagens indexada pelo(s) grupo(s) (um elemento se None)
+
+        Raises:
+            KeyError: Se a coluna ou a dimensão de agrupamento não existir
+        """
+        if measure not in DISTINCT_MEASURES:
+            raise KeyError(f"Coluna '{measure}' não possui HyperLogLog no cubo")
+
+        distinct = self.distinct
+        frame, codes, index = self._group_codes(distinct[distinct["measure"] == measure], group_by)
+        size = 1 << SKETCH_CONFIG["hll_precision"]
+        if len(frame):
+            size = max(size, int(frame["register"].max()) + 1)
+
+        registers = np.zeros((len(index), size), dtype=np.uint8)
+        np.maximum.at(
+            registers,
+            (codes, frame["register"].to_numpy(dtype=np.int64)),
+            frame["rank"].to_numpy(dtype=np.uint8),
+        )
+        estimates = np.where(registers.any(axis=1), np.round(hll_estimate(registers)), 0)
+        return pd.Series(estimates.astype(np.int64), index=index, name=measure)
+
+    def top_k(
+        self,
+        measure: str = "DIAG_PRINC",
+        k: int = 10,
+        group_by: str | list[str] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Itens mais frequentes de uma coluna (Space-Saving).
+
+        Args:
+            measure: Coluna (ver HEAVY_MEASURES)
+            k: Número de itens por grupo
+            group_by: Dimensão(ões) de agrupamento ('month' = número do mês); None = geral
+
+        Returns:
+            DataFrame com 'count' (estimativa, limite superior) e 'error'
+            (count - error é limite inferior), indexado pelo item (ou por
+            grupo(s) × item), em ordem decrescente de contagem
+
+        Raises:
+            KeyError: Se a coluna ou a dimensão de agrupamento não existir
+        """
+        if measure not in HEAVY_MEASURES:
+            raise KeyError(f"Coluna '{measure}' não possui contadores no cubo")
+
+        heavy = self.heavy
+        frame, codes, index = self._group_codes(heavy[heavy["measure"] == measure], group_by)
+        counters = merge_counters(
+            pd.DataFrame(
+                {
+                    "group": codes,
+                    **{c: frame[c].to_numpy() for c in HEAVY_COLUMNS[1:]},
+                }
+            ),
+            SKETCH_CONFIG["heavy_hitters_capacity"],
+        )
+        top = counters[counters["item"].notna()].groupby("group", sort=False).head(k)
+
+        result = top[["count", "error"]].astype(np.int64).reset_index(drop=True)
+        if group_by is None:
+            result.index = pd.Index(top["item"].to_numpy(), name=measure)
+        else:
+            keys = index.take(top["group"].to_numpy(dtype=np.int64)).to_frame(index=False)
+            keys[measure] = top["item"].to_numpy()
+            result.index = pd.MultiIndex.from_frame(keys)
+        return result
+
+    def save(self, path: str | Path | None = None) -> Path:
+        """
+        Persiste o cubo em Parquet (uma coluna 'partition' identifica a origem).
+
+        Centróides, registros HyperLogLog e contadores Space-Saving são
+        gravados ao lado, em {nome}.sketches.parquet, {nome}.distinct.parquet
+        e {nome}.heavy.parquet.
+
+        Args:
+            path: Destino (padrão: self.path)
+
+        Returns:
+            Caminho do arquivo salvo
+
+        Raises:
+            ValueError: Se nenhum caminho for informado
+        """
+        target = Path(path) if path is not None else self.path
+        if target is None:
+            raise ValueError("Caminho do cubo não informado")
+
+        for store, columns, destination in (
+            (self._partitions, MEASURES, target),
+            (self._sketches, SKETCH_COLUMNS, sidecar_path(target, "sketches")),
+            (self._distinct, DISTINCT_COLUMNS, sidecar_path(target, "distinct")),
+            (self._heavy, HEAVY_COLUMNS, sidecar_path(target, "heavy")),
+        ):
+            frames = [f.assign(partition=key) for key, f in store.items()]
+            table = (
+                pd.concat(frames, ignore_index=True)
+                if frames
+                else pd.DataFrame(columns=DIMENSIONS + columns + ["partition"])
+            )
+            table.to_parquet(destination, index=False, engine="pyarrow")
+        return target
+
+    @classmethod
+    def load(cls, path: str | Path) -> "KPICube":
+        """
+        Carrega cubo persistido (ou vazio se o arquivo não existir).
+
+        Args:
+            path: Arquivo Parquet do cubo
+
+        Returns:
+            KPICube com as partições salvas
+        """
+        cube = cls(path=path)
+        if not Path(path).exists():
+            return cube
+
+        table = pd.read_parquet(path)
+        for column in MEASURES:
+            # Cubos salvos antes de novas medidas: células sem a medida valem zero
+            if column not in table.columns:
+                table[column] = 0
+        for key, frame in table.groupby("partition", sort=False):
+            cube._partitions[str(key)] = frame.drop(columns="partition").reset_index(drop=True)
+
+        for store, kind in (
+            (cube._sketches, "sketches"),
+            (cube._distinct, "distinct"),
+            (cube._heavy, "heavy"),
+        ):
+            sidecar = sidecar_path(Path(path), kind)
+            if not sidecar.exists():
+                continue
+            for key, frame in pd.read_parquet(sidecar).groupby("partition", sort=False):
+                store[str(key)] = frame.drop(columns="partition").reset_index(drop=True)
+        return cube
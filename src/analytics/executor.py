@@ -0,0 +1,370 @@
+"""
+Executor paralelo de KPIs: map-reduce sobre partições Parquet em um pool de processos.
+
+1. Map: as partições (SIH_{UF}_{AAAAMM}.parquet) são distribuídas entre os
+   workers, balanceadas por tamanho em disco; cada worker lê os próprios
+   arquivos em record batches e atualiza um acumulador local
+2. Reduce: os estados parciais (um por worker) voltam ao processo principal
+   e são combinados com merge()
+
+Os acumuladores (src.analytics.accumulators) são associativos e
+comutativos, portanto o resultado independe da divisão entre workers e é
+igual ao do KPICalculator sobre o DataFrame completo.
+
+Cada worker tem um teto de memória: o tamanho dos batches é calculado a
+partir do teto e, quando o sistema permite (Linux/macOS), o espaço de
+endereçamento do processo é limitado (RLIMIT_AS), de modo que um worker
+que exceda o teto falha com MemoryError em vez de derrubar a máquina.
+
+Exemplo:
+    >>> executor = ParallelKPIExecutor(workers=8, memory_limit=2 * 1024**3)
+    >>> executor.summary(KPIQuery().filter(year=2024), beds=120_000, days=366)
+"""
+
+import copy
+import logging
+import os
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.analytics.accumulators import (
+    CountAccumulator,
+    GroupedMeanAccumulator,
+    GroupedSumAccumulator,
+    KPIAccumulator,
+    MeanAccumulator,
+    SumAccumulator,
+    SummaryAccumulator,
+)
+from src.analytics.query import KPIQuery, filter_expression
+from src.config import EXECUTOR_CONFIG, PROCESSED_DIR
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+# Limites do tamanho de batch derivado do teto de memória
+MIN_BATCH_ROWS = 1_024
+MAX_BATCH_ROWS = 1_048_576
+
+# Fração do teto de memória reservada a um batch (o restante cobre o
+# interpretador, bibliotecas, cópias temporárias e o estado do acumulador)
+BATCH_MEMORY_FRACTION = 0.125
+
+Partitions = KPIQuery | Sequence[str | Path] | str | Path | None
+
+
+def limit_memory(memory_limit: int) -> None:
+    """
+    Inicializador de workers: limita o espaço de endereçamento do processo.
+
+    Usado por todos os pools de processos do projeto (executor, simulação,
+    renderização de gráficos).
+
+    Args:
+        memory_limit: Teto em bytes (0 = sem teto; ignorado sem o módulo resource)
+    """
+    if memory_limit <= 0 or resource is None:
+        return
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        memory_limit = min(memory_limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (memory_limit, hard))
+
+
+def batch_rows(path: str | Path, columns: Sequence[str] | None, memory_limit: int) -> int:
+    """
+    Linhas por batch que cabem na fração do teto de memória.
+
+    Usa o tamanho descomprimido das colunas lidas, registrado nos metadados
+    do Parquet, para estimar bytes por linha.
+
+    Args:
+        path: Arquivo Parquet
+        columns: Colunas lidas (None = todas)
+        memory_limit: Teto de memória do worker em bytes (0 = sem teto)
+
+    Returns:
+        Número de linhas por batch
+    """
+    if memory_limit <= 0:
+        return MAX_BATCH_ROWS
+
+    metadata = pq.ParquetFile(path).metadata
+    if metadata.num_rows == 0:
+        return MAX_BATCH_ROWS
+
+    wanted = None if columns is None else set(columns)
+    size = 0
+    for i in range(metadata.num_row_groups):
+        row_group = metadata.row_group(i)
+        for j in range(row_group.num_columns):
+            column = row_group.column(j)
+            if wanted is None or column.path_in_schema in wanted:
+                size += column.total_uncompressed_size
+
+    row_bytes = max(size / metadata.num_rows, 1.0)
+    rows = int(memory_limit * BATCH_MEMORY_FRACTION / row_bytes)
+    return int(np.clip(rows, MIN_BATCH_ROWS, MAX_BATCH_ROWS))
+
+
+def map_partitions(
+    accumulator: KPIAccumulator,
+    paths: Sequence[str | Path],
+    columns: Sequence[str] | None = None,
+    memory_limit: int = 0,
+    filters: dict[str, list[Any]] | None = None,
+) -> KPIAccumulator:
+    """
+    Etapa map: incorpora as partições de um worker em um acumulador.
+
+    Executada no processo do worker; apenas as colunas necessárias
+    presentes em cada arquivo são lidas. Filtros de coluna são empurrados
+    ao pyarrow.dataset (row groups descartados por estatísticas).
+
+    Args:
+        accumulator: Acumulador vazio (cópia local do worker)
+        paths: Arquivos Parquet do worker
+        columns: Colunas lidas (None = todas)
+        memory_limit: Teto de memória do worker em bytes (0 = sem teto)
+        filters: Filtros de igualdade/pertinência (coluna -> valores aceitos)
+
+    Returns:
+        Acumulador com o estado parcial das partições
+
+    Raises:
+        KeyError: Se uma coluna de filtro não existir na partição
+        MemoryError: Se o worker exceder o teto de memória
+    """
+    for path in paths:
+        parquet = pq.ParquetFile(path)
+        names = set(parquet.schema_arrow.names)
+        selected = None if columns is None else [c for c in columns if c in names]
+        rows = batch_rows(path, selected, memory_limit)
+        missing = [c for c in filters or {} if c not in names]
+        if missing:
+            raise KeyError(f"Colunas de filtro não encontradas em {path}: {missing}")
+        if filters:
+            batches = ds.dataset(str(path), format="parquet").to_batches(
+                columns=selected, filter=filter_expression(filters), batch_size=rows
+            )
+        else:
+            batches = parquet.iter_batches(batch_size=rows, columns=selected)
+        try:
+            for batch in batches:
+                accumulator.update(batch)
+        except MemoryError as e:
+            raise MemoryError(f"Teto de memória excedido ao processar {path}") from e
+    return accumulator
+
+
+def assign_partitions(paths: Sequence[str | Path], workers: int) -> list[list[Path]]:
+    """
+    Distribui partições entre workers balanceando o volume em disco.
+
+    Heurística LPT: arquivos em ordem decrescente de tamanho, cada um
+    atribuído ao worker com menos bytes até o momento.
+
+    Args:
+        paths: Arquivos Parquet
+        workers: Número de workers
+
+    Returns:
+        Lista (não vazia) de arquivos por worker
+    """
+    files = sorted((Path(p) for p in paths), key=lambda p: p.stat().st_size, reverse=True)
+    groups: list[list[Path]] = [[] for _ in range(max(1, min(workers, len(files))))]
+    loads = np.zeros(len(groups))
+    for path in files:
+        target = int(np.argmin(loads))
+        groups[target].append(path)
+        loads[target] += path.stat().st_size
+    return [group for group in groups if group]
+
+
+def group_columns(group_by: str) -> list[str]:
+    """Colunas lidas para agrupar por group_by ('month'/'competencia' vêm de DT_INTER)."""
+    if group_by in ("month", "competencia"):
+        return [group_by, "DT_INTER"]
+    return [group_by]
+
+
+class ParallelKPIExecutor:
+    """
+    Executa KPIs em paralelo sobre partições do data lake.
+
+    Os métodos de KPI espelham o KPICalculator (mesmos formatos de
+    retorno); run() aceita qualquer KPIAccumulator.
+    """
+
+    def __init__(
+        self,
+        workers: int | None = None,
+        memory_limit: int | None = None,
+        source: str | Path = PROCESSED_DIR,
+    ) -> None:
+        """
+        Inicializa executor.
+
+        Args:
+            workers: Número de processos (padrão: EXECUTOR_CONFIG ou núcleos da máquina)
+            memory_limit: Teto de memória por worker em bytes (0 = sem teto)
+            source: Diretório de partições usado quando nenhuma é informada
+
+        Raises:
+            ValueError: Se workers for menor que 1 ou memory_limit negativo
+        """
+        workers = workers if workers is not None else EXECUTOR_CONFIG["workers"]
+        self.workers = workers or os.cpu_count() or 1
+        self.memory_limit = (
+            memory_limit if memory_limit is not None else EXECUTOR_CONFIG["memory_limit"]
+        )
+        if self.workers < 1:
+            raise ValueError("Número de workers deve ser maior que zero")
+        if self.memory_limit < 0:
+            raise ValueError("Teto de memória não pode ser negativo")
+        self.source = Path(source)
+
+    def _paths(self, partitions: Partitions) -> list[Path]:
+        """Resolve partições (KPIQuery, diretório, arquivo ou lista)."""
+        if partitions is None:
+            return KPIQuery(self.source).partitions()
+        if isinstance(partitions, KPIQuery):
+            return partitions.partitions()
+        if isinstance(partitions, str | Path):
+            return KPIQuery(partitions).partitions()
+        return [Path(p) for p in partitions]
+
+    def run(
+        self,
+        accumulator: KPIAccumulator,
+        partitions: Partitions = None,
+        columns: Sequence[str] | None = None,
+    ) -> KPIAccumulator:
+        """
+        Map-reduce de um acumulador sobre as partições.
+
+        Args:
+            accumulator: Acumulador vazio (usado como modelo pelos workers)
+            partitions: KPIQuery (pruning por UF/ano/mês; filtros de coluna
+                aplicados em cada worker), diretório, arquivo ou lista de
+                arquivos; None = todas as partições de source
+            columns: Colunas lidas por partição (None = todas)
+
+        Returns:
+            Acumulador com o estado combinado de todas as partições
+
+        Raises:
+            KeyError: Se uma coluna de filtro não existir em alguma partição
+            MemoryError: Se algum worker exceder o teto de memória
+        """
+        paths = self._paths(partitions)
+        filters = partitions.column_filters if isinstance(partitions, KPIQuery) else None
+        if not paths:
+            return accumulator
+
+        groups = assign_partitions(paths, self.workers)
+        logger.info(
+            f"[EXECUTOR] {len(paths)} partição(ões) em {len(groups)} worker(s), "
+            f"teto de {self.memory_limit / 1024**2:,.0f} MB por worker"
+        )
+
+        with ProcessPoolExecutor(
+            max_workers=len(groups), initializer=limit_memory, initargs=(self.memory_limit,)
+        ) as pool:
+            futures = [
+                pool.submit(
+                    map_partitions,
+                    copy.deepcopy(accumulator),
+                    group,
+                    columns,
+                    self.memory_limit,
+                    filters,
+                )
+                for group in groups
+            ]
+            for future in futures:
+                accumulator.merge(future.result())
+
+        return accumulator
+
+    def volume(self, partitions: Partitions = None, group_by: str | None = None) -> Any:
+        """
+        Volume de internações (equivalente a KPICalculator.volume).
+
+        Args:
+            partitions: Partições (ver run)
+            group_by: Coluna de agrupamento (opcional; 'month' e 'competencia'
+                derivadas de DT_INTER)
+
+        Returns:
+            Volume total (int) ou por grupo (dict)
+        """
+        if group_by is None:
+            return self.run(CountAccumulator(), partitions, columns=[]).result()
+        accumulator = GroupedSumAccumulator(group_by)
+        return self.run(accumulator, partitions, group_columns(group_by)).result()
+
+    def revenue(self, partitions: Partitions = None, group_by: str | None = None) -> Any:
+        """
+        Receita total (equivalente a KPICalculator.revenue).
+
+        Args:
+            partitions: Partições (ver run)
+            group_by: Coluna de agrupamento (opcional; 'month' e 'competencia'
+                derivadas de DT_INTER)
+
+        Returns:
+            Receita total (float) ou por grupo (dict)
+        """
+        if group_by is None:
+            return self.run(SumAccumulator("VAL_TOT"), partitions, ["VAL_TOT"]).result()
+        accumulator = GroupedSumAccumulator(group_by, "VAL_TOT")
+        return self.run(accumulator, partitions, [*group_columns(group_by), "VAL_TOT"]).result()
+
+    def average_length_of_stay(
+        self, partitions: Partitions = None, group_by: str | None = None
+    ) -> Any:
+        """
+        Tempo médio de permanência (equivalente a KPICalculator.average_length_of_stay).
+
+        Args:
+            partitions: Partições (ver run)
+            group_by: Coluna de agrupamento (opcional; 'month' e 'competencia'
+                derivadas de DT_INTER)
+
+        Returns:
+            TMP geral (float) ou por grupo (dict)
+        """
+        if group_by is None:
+            return self.run(MeanAccumulator("stay_days"), partitions, ["stay_days"]).result()
+        accumulator = GroupedMeanAccumulator(group_by, "stay_days")
+        return self.run(accumulator, partitions, [*group_columns(group_by), "stay_days"]).result()
+
+    def summary(self, partitions: Partitions, beds: int, days: int) -> Any:
+        """
+        Resumo consolidado (equivalente a KPICalculator.summary).
+
+        Args:
+            partitions: Partições (ver run; None = todas)
+            beds: Número de leitos disponíveis
+            days: Número de dias no período
+
+        Returns:
+            Dicionário com todos os KPIs
+
+        Raises:
+            ValueError: Se beds ou days forem zero ou negativos
+        """
+        accumulator = SummaryAccumulator(beds, days)
+        columns = ["stay_days", "VAL_TOT", "age_group"]
+        return self.run(accumulator, partitions, columns).result()
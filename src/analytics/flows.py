@@ -0,0 +1,263 @@
+"""
+Fluxo de pacientes: matriz origem-destino entre municípios.
+
+Origem = município de residência (MUNIC_RES); destino = município do
+estabelecimento (MUNIC_MOV, ou outra coluna com o município do hospital).
+Os códigos são normalizados para 6 dígitos (IBGE sem dígito verificador).
+
+Com 5.570 municípios a matriz densa teria ~31 milhões de células por
+período e especialidade, quase todas vazias. Aqui ela é esparsa, em
+arrays COO (origem, destino, camada) ordenados por (origem, destino,
+camada), onde cada camada é uma combinação de período × especialidade:
+
+    - a agregação é um único np.unique sobre uma chave inteira combinada
+      (origem · n + destino) · camadas + camada, com somas por np.bincount
+    - ponteiros de linha (como CSR) dão o fatiamento por origem; uma
+      permutação ordenada por destino (como CSC) dá o fatiamento por destino
+    - consultas somam as camadas selecionadas (ex: um ano inteiro) com
+      np.add.reduceat sobre entradas contíguas
+
+Exemplo:
+    >>> flows = FlowMatrix(df, by=["competencia", "ESPEC"])
+    >>> flows.outflows("120040", competencia=202401)  # para onde vão
+    >>> flows.inflows("120040", ESPEC="03")            # de onde vêm
+    >>> flows.top_flows(10, include_local=False)
+"""
+
+import logging
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from src.analytics.kpis import group_keys
+from src.analytics.standardization import normalize_municipality
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BY = ["competencia", "ESPEC"]
+
+IntArray = npt.NDArray[np.int64]
+
+
+class FlowMatrix:
+    """
+    Matriz origem-destino esparsa de internações por camada (período × especialidade).
+
+    As entradas são agregadas uma única vez no construtor; outflows(),
+    inflows(), flows() e top_flows() somam as camadas selecionadas.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        origin: str = "MUNIC_RES",
+        destination: str = "MUNIC_MOV",
+        by: str | Sequence[str] | None = DEFAULT_BY,
+    ) -> None:
+        """
+        Agrega internações por origem, destino e camada.
+
+        Registros sem origem ou destino (ou sem valor nas colunas de camada)
+        são ignorados.
+
+        Args:
+            df: DataFrame processado
+            origin: Coluna do município de residência
+            destination: Coluna do município de atendimento
+            by: Coluna(s) de camada ('competencia' derivada de DT_INTER);
+                None = camada única
+
+        Raises:
+            KeyError: Se alguma coluna não existir
+        """
+        keys = [] if by is None else [by] if isinstance(by, str) else list(by)
+        for column in (origin, destination):
+            if column not in df.columns:
+                raise KeyError(f"Coluna '{column}' não encontrada no DataFrame")
+
+        origins = normalize_municipality(df[origin])
+        destinations = normalize_municipality(df[destination])
+        self.municipalities = pd.Index(
+            np.union1d(origins.dropna().unique(), destinations.dropna().unique()),
+            name="municipality",
+        )
+        n = len(self.municipalities)
+        origin_codes = self.municipalities.get_indexer(pd.Index(origins))
+        destination_codes = self.municipalities.get_indexer(pd.Index(destinations))
+
+        if keys:
+            grouper = df.groupby(group_keys(df, keys), observed=True, sort=True)
+            layer_codes: IntArray = np.asarray(grouper.ngroup(), dtype=np.int64)
+            self.layers: pd.Index = grouper.size().index
+        else:
+            layer_codes = np.zeros(len(df), dtype=np.int64)
+            self.layers = pd.RangeIndex(1)
+        self.by = keys
+        size = len(self.layers)
+
+        valid = (origin_codes >= 0) & (destination_codes >= 0) & (layer_codes >= 0)
+        combined = (
+            origin_codes[valid].astype(np.int64) * n + destination_codes[valid]
+        ) * size + layer_codes[valid]
+        unique, inverse = np.unique(combined, return_inverse=True)
+
+        values = (
+            pd.to_numeric(df["VAL_TOT"], errors="coerce").to_numpy(dtype=np.float64)
+            if "VAL_TOT" in df.columns
+            else np.zeros(len(df))
+        )
+        self.layer: IntArray = unique % size
+        self.destination: IntArray = unique // size % n
+        self.origin: IntArray = unique // size // n
+        self.admissions: IntArray = np.bincount(inverse, minlength=len(unique)).astype(np.int64)
+        self.value = np.bincount(
+            inverse, weights=np.nan_to_num(values[valid]), minlength=len(unique)
+        )
+
+        # Ponteiros por origem (entradas já ordenadas) e permutação por destino
+        self._row_ptr = np.searchsorted(self.origin, np.arange(n + 1))
+        self._column_order = np.lexsort((self.layer, self.origin, self.destination))
+        self._column_ptr = np.searchsorted(self.destination[self._column_order], np.arange(n + 1))
+
+        logger.info(f"[FLOWS] {len(unique):,} fluxos entre {n:,} municípios em {size:,} camada(s)")
+
+    def __len__(self) -> int:
+        """Número de entradas não nulas (origem, destino, camada)."""
+        return len(self.layer)
+
+    def _layer_mask(self, criteria: dict[str, Any]) -> npt.NDArray[np.bool_]:
+        """
+        Camadas que satisfazem os critérios (todas se vazio).
+
+        Raises:
+            KeyError: Se alguma coluna não for de camada
+        """
+        mask = np.ones(len(self.layers), dtype=bool)
+        for column, value in criteria.items():
+            if column not in self.by:
+                raise KeyError(f"Coluna '{column}' não é camada da matriz (use {self.by})")
+            values = value if isinstance(value, list | tuple | set) else [value]
+            level = self.layers.get_level_values(column)
+            mask &= level.isin(values)
+        return mask
+
+    def _code(self, municipality: str) -> int:
+        """
+        Posição do município na matriz.
+
+        Raises:
+            KeyError: Se o município não tiver fluxos
+        """
+        code = self.municipalities.get_indexer(pd.Index([str(municipality)[:6]]))[0]
+        if code < 0:
+            raise KeyError(f"Município '{municipality}' sem fluxos na matriz")
+        return int(code)
+
+    def _reduce(
+        self, positions: IntArray, keys: IntArray, criteria: dict[str, Any]
+    ) -> tuple[IntArray, IntArray, npt.NDArray[np.float64]]:
+        """
+        Soma entradas (já ordenadas por keys) das camadas selecionadas.
+
+        Returns:
+            Tupla (chaves, internações, valor) com uma posição por chave
+        """
+        positions = positions[self._layer_mask(criteria)[self.layer[positions]]]
+        keys = keys[positions]
+        if len(keys) == 0:
+            return keys, np.zeros(0, dtype=np.int64), np.zeros(0)
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        return (
+            keys[starts],
+            np.add.reduceat(self.admissions[positions], starts),
+            np.add.reduceat(self.value[positions], starts),
+        )
+
+    def _frame(
+        self, index: pd.Index, admissions: IntArray, value: npt.NDArray[np.float64]
+    ) -> pd.DataFrame:
+        """DataFrame de fluxos em ordem decrescente de internações."""
+        frame = pd.DataFrame({"admissions": admissions, "value": value}, index=index)
+        return frame.sort_values("admissions", ascending=False, kind="stable")
+
+    def outflows(self, origin: str, **criteria: Any) -> pd.DataFrame:
+        """
+        Destinos dos residentes de um município (fatia da linha).
+
+        Args:
+            origin: Código do município de residência (6 ou 7 dígitos)
+            **criteria: Camada = valor (ou lista), ex: competencia=202401
+
+        Returns:
+            DataFrame com admissions e value indexado pelo destino
+
+        Raises:
+            KeyError: Se o município não tiver fluxos ou o critério não for camada
+        """
+        code = self._code(origin)
+        positions = np.arange(self._row_ptr[code], self._row_ptr[code + 1])
+        keys, admissions, value = self._reduce(positions, self.destination, criteria)
+        return self._frame(self.municipalities[keys].rename("destination"), admissions, value)
+
+    def inflows(self, destination: str, **criteria: Any) -> pd.DataFrame:
+        """
+        Origens dos pacientes atendidos em um município (fatia da coluna).
+
+        Args:
+            destination: Código do município de atendimento (6 ou 7 dígitos)
+            **criteria: Camada = valor (ou lista), ex: ESPEC="03"
+
+        Returns:
+            DataFrame com admissions e value indexado pela origem
+
+        Raises:
+            KeyError: Se o município não tiver fluxos ou o critério não for camada
+        """
+        code = self._code(destination)
+        positions = self._column_order[self._column_ptr[code] : self._column_ptr[code + 1]]
+        keys, admissions, value = self._reduce(positions, self.origin, criteria)
+        return self._frame(self.municipalities[keys].rename("origin"), admissions, value)
+
+    def flows(self, **criteria: Any) -> pd.DataFrame:
+        """
+        Matriz esparsa em formato COO, somando as camadas selecionadas.
+
+        Args:
+            **criteria: Camada = valor (ou lista); vazio = todas as camadas
+
+        Returns:
+            DataFrame com origin, destination, admissions e value
+            (ordenado por origem e destino)
+        """
+        n = len(self.municipalities)
+        pairs = self.origin * n + self.destination
+        keys, admissions, value = self._reduce(np.arange(len(self)), pairs, criteria)
+        return pd.DataFrame(
+            {
+                "origin": self.municipalities[keys // n],
+                "destination": self.municipalities[keys % n],
+                "admissions": admissions,
+                "value": value,
+            }
+        )
+
+    def top_flows(self, k: int = 10, include_local: bool = True, **criteria: Any) -> pd.DataFrame:
+        """
+        Maiores fluxos origem-destino.
+
+        Args:
+            k: Número de fluxos
+            include_local: Se False, ignora internações no próprio município
+            **criteria: Camada = valor (ou lista)
+
+        Returns:
+            DataFrame com origin, destination, admissions e value, em ordem
+            decrescente de internações
+        """
+        flows = self.flows(**criteria)
+        if not include_local:
+            flows = flows[flows["origin"] != flows["destination"]]
+        return flows.nlargest(k, "admissions", keep="first").reset_index(drop=True)
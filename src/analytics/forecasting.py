@@ -0,0 +1,259 @@
+"""
+Previsão de volume: modelos sazonais de referência para milhares de CNES de uma vez.
+
+Modelos:
+    - seasonal_naive: repete o valor do mesmo período do último ciclo
+      (12 meses ou 7 dias); erro = desvio dos resíduos sazonais
+    - holt_winters: suavização exponencial aditiva (nível, tendência e
+      sazonalidade); α, β e γ escolhidos por série em uma grade, pelo
+      menor erro quadrático de previsão um passo à frente
+
+As séries são linhas de uma matriz grupos × períodos (saída de
+KPITimeSeries.wide). Não há laço sobre hospitais: a recursão do
+Holt-Winters avança período a período sobre arrays de todas as séries ×
+combinações da grade ao mesmo tempo, e a escolha dos parâmetros é um
+argmin por linha.
+
+Intervalos de previsão (normais):
+    - sazonal ingênuo: σ · sqrt(k + 1), k = ciclos completos à frente
+    - Holt-Winters: σ · sqrt(1 + Σ c_j²), c_j = α(1 + jβ) + γ·[j mod m = 0]
+      (Hyndman et al., 2008, classe ETS(A,A,A))
+
+O resultado, em formato longo, pode ser gravado ao lado do cubo
+({nome}.forecast.parquet) com save_forecasts.
+
+Exemplo:
+    >>> forecasts = forecast_volume(cube, group_by="CNES", horizon=6)
+    >>> save_forecasts(forecasts, "data/processed/kpi_cube.parquet")
+"""
+
+import itertools
+import logging
+from collections.abc import Sequence
+from pathlib import Path
+from statistics import NormalDist
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from src.analytics.cube import KPICube, sidecar_path
+from src.analytics.timeseries import FREQUENCIES, Frequency, KPITimeSeries
+from src.config import FORECAST_CONFIG
+
+logger = logging.getLogger(__name__)
+
+FloatMatrix = npt.NDArray[np.float64]
+
+# Períodos por ciclo sazonal
+SEASONS = {"month": 12, "day": 7}
+
+METHODS = ["seasonal_naive", "holt_winters"]
+
+# Grade de parâmetros do Holt-Winters (α nível, β tendência, γ sazonalidade)
+HW_GRID = list(itertools.product((0.1, 0.3, 0.5, 0.8), (0.01, 0.1), (0.05, 0.2, 0.5)))
+
+FORECAST_COLUMNS = ["method", "forecast", "lower", "upper"]
+
+
+def seasonal_naive(y: FloatMatrix, season: int, horizon: int) -> tuple[FloatMatrix, FloatMatrix]:
+    """
+    Previsão sazonal ingênua de várias séries.
+
+    Args:
+        y: Matriz séries × períodos (pelo menos um ciclo)
+        season: Períodos por ciclo
+        horizon: Períodos previstos
+
+    Returns:
+        Tupla (previsões, desvios-padrão), matrizes séries × horizonte
+        (desvio NaN sem ciclo anterior para medir os resíduos)
+    """
+    steps = np.arange(horizon)
+    columns = y.shape[1] - season + steps % season
+    forecast = y[:, columns]
+
+    residuals = y[:, season:] - y[:, :-season]
+    if residuals.shape[1]:
+        sigma = np.sqrt((residuals**2).mean(axis=1))
+    else:
+        sigma = np.full(len(y), np.nan)
+    return forecast, sigma[:, None] * np.sqrt(steps // season + 1)
+
+
+def _holt_winters_pass(
+    y: FloatMatrix,
+    season: int,
+    alpha: FloatMatrix,
+    beta: FloatMatrix,
+    gamma: FloatMatrix,
+) -> tuple[FloatMatrix, FloatMatrix, FloatMatrix, FloatMatrix]:
+    """
+    Recursão do Holt-Winters aditivo para todas as linhas de uma vez.
+
+    Returns:
+        Tupla (nível final, tendência final, sazonais finais, erros um
+        passo à frente a partir do segundo ciclo)
+    """
+    periods = y.shape[1]
+    mean = y[:, :season].mean(axis=1)
+    if periods >= 2 * season:
+        trend = (y[:, season : 2 * season].mean(axis=1) - mean) / season
+    else:
+        trend = np.zeros(len(y))
+    # Média do primeiro ciclo fica no meio do ciclo: sazonais sem a tendência,
+    # nível levado ao último período do ciclo
+    offsets = np.arange(season) - (season - 1) / 2
+    seasonal = y[:, :season] - mean[:, None] - trend[:, None] * offsets
+    level = mean + trend * (season - 1) / 2
+
+    errors = np.empty((len(y), periods - season))
+    for t in range(season, periods):
+        index = t % season
+        errors[:, t - season] = y[:, t] - (level + trend + seasonal[:, index])
+        previous = level
+        level = alpha * (y[:, t] - seasonal[:, index]) + (1 - alpha) * (level + trend)
+        trend = beta * (level - previous) + (1 - beta) * trend
+        seasonal[:, index] = gamma * (y[:, t] - level) + (1 - gamma) * seasonal[:, index]
+    return level, trend, seasonal, errors
+
+
+def holt_winters(
+    y: FloatMatrix,
+    season: int,
+    horizon: int,
+    grid: Sequence[tuple[float, float, float]] = HW_GRID,
+) -> tuple[FloatMatrix, FloatMatrix, FloatMatrix]:
+    """
+    Holt-Winters aditivo de várias séries com parâmetros escolhidos por série.
+
+    Args:
+        y: Matriz séries × períodos (pelo menos um ciclo)
+        season: Períodos por ciclo
+        horizon: Períodos previstos
+        grid: Combinações (α, β, γ) avaliadas
+
+    Returns:
+        Tupla (previsões, desvios-padrão, parâmetros), com previsões e
+        desvios séries × horizonte e parâmetros séries × 3
+    """
+    n, periods = y.shape
+    params = np.asarray(grid, dtype=np.float64)
+    # Cada série é replicada para cada combinação: linha = combinação · n + série
+    stacked = np.tile(y, (len(params), 1))
+    alpha, beta, gamma = (np.repeat(params[:, i], n) for i in range(3))
+    level, trend, seasonal, errors = _holt_winters_pass(stacked, season, alpha, beta, gamma)
+
+    sse = (errors**2).sum(axis=1).reshape(len(params), n)
+    best = sse.argmin(axis=0) * n + np.arange(n)
+
+    steps = np.arange(1, horizon + 1)
+    season_index = (periods - 1 + steps) % season
+    forecast = level[best, None] + steps * trend[best, None] + seasonal[best][:, season_index]
+
+    sigma = np.sqrt((errors[best] ** 2).mean(axis=1)) if errors.shape[1] else np.full(n, np.nan)
+    j = np.arange(1, horizon)
+    c = alpha[best, None] * (1 + j * beta[best, None]) + gamma[best, None] * (j % season == 0)
+    cumulative = np.concatenate([np.zeros((n, 1)), np.cumsum(c**2, axis=1)], axis=1)
+    return forecast, sigma[:, None] * np.sqrt(1 + cumulative), params[best // n]
+
+
+def forecast_volume(
+    source: pd.DataFrame | KPICube,
+    group_by: str | list[str] | None = "CNES",
+    freq: Frequency = "month",
+    horizon: int | None = None,
+    methods: Sequence[str] = METHODS,
+    level: float | None = None,
+    kpi: str = "volume",
+) -> pd.DataFrame:
+    """
+    Previsões e intervalos de previsão de volume por grupo.
+
+    Args:
+        source: DataFrame com DT_INTER ou KPICube (apenas mensal)
+        group_by: Coluna(s) de agrupamento (padrão: CNES); None = total
+        freq: 'month' (sazonalidade anual) ou 'day' (sazonalidade semanal)
+        horizon: Períodos previstos (padrão: FORECAST_CONFIG)
+        methods: Modelos (ver METHODS)
+        level: Nível do intervalo (padrão: FORECAST_CONFIG)
+        kpi: KPI aditivo previsto (padrão: volume)
+
+    Returns:
+        DataFrame longo com colunas de grupo, period e FORECAST_COLUMNS
+        (limite inferior truncado em zero)
+
+    Raises:
+        ValueError: Se algum método não existir ou a série tiver menos de um ciclo
+    """
+    horizon = horizon if horizon is not None else int(FORECAST_CONFIG["horizon"])
+    level = level if level is not None else FORECAST_CONFIG["interval_level"]
+    unknown = [m for m in methods if m not in METHODS]
+    if unknown:
+        raise ValueError(f"Métodos de previsão não suportados: {unknown} (use {METHODS})")
+
+    wide = KPITimeSeries(source, freq=freq, group_by=group_by).wide(kpi)
+    season = SEASONS[freq]
+    if len(wide) < season:
+        raise ValueError(
+            f"Séries com {len(wide)} período(s): mínimo de um ciclo sazonal ({season})"
+        )
+
+    y = wide.to_numpy(dtype=np.float64).T
+    z = NormalDist().inv_cdf(0.5 + level / 2)
+    future = pd.date_range(
+        wide.index[-1], periods=horizon + 1, freq=FREQUENCIES[freq], name="period"
+    )[1:]
+
+    frames = []
+    for method in methods:
+        if method == "seasonal_naive":
+            forecast, sigma = seasonal_naive(y, season, horizon)
+        else:
+            forecast, sigma, _ = holt_winters(y, season, horizon)
+        frame = pd.DataFrame(
+            {
+                "period": np.tile(future, len(y)),
+                "method": method,
+                "forecast": forecast.ravel(),
+                "lower": np.clip(forecast - z * sigma, 0, None).ravel(),
+                "upper": (forecast + z * sigma).ravel(),
+            }
+        )
+        groups = wide.columns.to_frame(index=False).loc[np.repeat(np.arange(len(y)), horizon)]
+        frames.append(pd.concat([groups.reset_index(drop=True), frame], axis=1))
+
+    result: pd.DataFrame = pd.concat(frames, ignore_index=True)
+    if group_by is None:
+        result = result.drop(columns=result.columns[0])
+    logger.info(f"[FORECAST] {len(y):,} série(s) × {horizon} período(s) com {list(methods)}")
+    return result
+
+
+def save_forecasts(forecasts: pd.DataFrame, cube_path: str | Path) -> Path:
+    """
+    Grava previsões ao lado do cubo ({nome}.forecast.parquet).
+
+    Args:
+        forecasts: Saída de forecast_volume
+        cube_path: Arquivo Parquet do cubo
+
+    Returns:
+        Caminho do arquivo gravado
+    """
+    path = sidecar_path(Path(cube_path), "forecast")
+    forecasts.to_parquet(path, index=False, engine="pyarrow")
+    return path
+
+
+def load_forecasts(cube_path: str | Path) -> pd.DataFrame:
+    """
+    Carrega previsões gravadas ao lado do cubo.
+
+    Raises:
+        FileNotFoundError: Se não houver previsões para o cubo
+    """
+    path = sidecar_path(Path(cube_path), "forecast")
+    if not path.exists():
+        raise FileNotFoundError(f"Previsões não encontradas: {path}")
+    return pd.read_parquet(path)
@@ -4,9 +4,132 @@ KPIs: Indicadores-chave de performance hospitalar.
 Referência: docs/DATA_GUIDE.md seção "KPIs Implementados"
 """
 
-from typing import Any, overload
+from collections.abc import Mapping, Sequence
+from typing import Any, Literal, TypeAlias, overload
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+
+from src.analytics.cube import KPICube
+from src.analytics.sketches import DEFAULT_QUANTILES, quantile_label
+from src.transform.transformer import AGE_GROUPS
+
+# Formato de retorno dos KPIs agrupados: dict (padrão), DataFrame ou Arrow Table
+OutputMode: TypeAlias = Literal["dict", "frame", "arrow"]
+
+# KPIs disponíveis em kpi_table → coluna de origem (None = contagem de registros)
+TABLE_KPIS: dict[str, str | None] = {
+    "volume": None,
+    "revenue": "VAL_TOT",
+    "average_ticket": "VAL_TOT",
+    "average_length_of_stay": "stay_days",
+}
+
+
+def group_keys(df: pd.DataFrame, keys: list[str]) -> list[pd.Series]:
+    """
+    Séries de agrupamento, derivando 'month' e 'competencia' de DT_INTER se ausentes.
+
+    Args:
+        df: DataFrame com dados de internações
+        keys: Colunas de agrupamento
+
+    Returns:
+        Lista de Series (uma por chave)
+
+    Raises:
+        KeyError: Se alguma coluna não existir
+    """
+    by = []
+    for key in keys:
+        if key in df.columns:
+            by.append(df[key])
+        elif key in ("month", "competencia"):
+            if "DT_INTER" not in df.columns:
+                raise KeyError("Coluna 'DT_INTER' necessária para agrupamento por mês")
+            dates = df["DT_INTER"].dt
+            derived: pd.Series = dates.month if key == "month" else dates.year * 100 + dates.month
+            by.append(derived.rename(key))
+        else:
+            raise KeyError(f"Coluna '{key}' não encontrada no DataFrame")
+    return by
+
+
+def grouped_measures(df: pd.DataFrame, keys: list[str], sources: Sequence[str]) -> pd.DataFrame:
+    """
+    Medidas aditivas por grupo em um único groupby (mesmo formato do KPICube.aggregate).
+
+    Args:
+        df: DataFrame com dados de internações
+        keys: Colunas de agrupamento; 'month' (mês de DT_INTER) e 'competencia'
+            (AAAAMM de DT_INTER) são derivadas se ausentes
+        sources: Colunas numéricas somadas (ex: 'stay_days', 'VAL_TOT')
+
+    Returns:
+        DataFrame com records, {coluna}_sum e {coluna}_count, indexado pelos
+        grupos (uma linha se keys vazio)
+
+    Raises:
+        KeyError: Se coluna de agrupamento ou de origem não existir
+    """
+    missing = [c for c in sources if c not in df.columns]
+    if missing:
+        raise KeyError(f"Colunas não encontradas no DataFrame: {missing}")
+
+    by = group_keys(df, keys)
+    values = df[list(sources)]
+    records: pd.Series
+    if by:
+        grouped = values.groupby(by, observed=True, sort=True)
+        sums, counts, records = grouped.sum(), grouped.count(), grouped.size()
+    else:
+        sums = values.sum().to_frame().T
+        counts = values.count().to_frame().T
+        records = pd.Series([len(df)])
+
+    measures = pd.DataFrame({"records": records.astype("int64")}, index=records.index)
+    for column in sources:
+        measures[f"{column}_sum"] = sums[column].astype(float)
+        measures[f"{column}_count"] = counts[column].astype("int64")
+    return measures
+
+
+def derive_kpi(measures: pd.DataFrame | Mapping[str, Any], kpi: str) -> Any:
+    """
+    Um KPI de TABLE_KPIS a partir de medidas aditivas.
+
+    Args:
+        measures: Mapeamento (DataFrame ou dict) com records, {coluna}_sum e
+            {coluna}_count; os valores podem ser Series ou matrizes
+        kpi: Nome do KPI
+
+    Returns:
+        Valores do KPI, no mesmo formato das medidas
+    """
+    if kpi == "volume":
+        return measures["records"].astype("int64")
+    if kpi == "revenue":
+        return measures["VAL_TOT_sum"].astype(float)
+    column = TABLE_KPIS[kpi]
+    return measures[f"{column}_sum"] / measures[f"{column}_count"]
+
+
+def kpis_from_measures(measures: pd.DataFrame, kpis: Sequence[str]) -> pd.DataFrame:
+    """
+    KPIs derivados de medidas aditivas (saída de grouped_measures ou KPICube.aggregate).
+
+    Args:
+        measures: DataFrame com records, {coluna}_sum e {coluna}_count
+        kpis: KPIs a calcular (ver TABLE_KPIS)
+
+    Returns:
+        DataFrame com uma coluna por KPI, mesmo índice de measures
+    """
+    result = pd.DataFrame(index=measures.index)
+    for kpi in kpis:
+        result[kpi] = derive_kpi(measures, kpi)
+    return result
 
 
 class KPICalculator:
@@ -19,19 +142,35 @@ class KPICalculator:
         3. Volume de Atendimentos (volume)
         4. Receita Total (revenue)
         5. Distribuição Demográfica (demographics)
+        6. Quantis de Distribuição - mediana/p90/p99 (quantiles)
+        7. Contagem de Distintos (distinct_count)
 
     Exemplo:
         >>> calculator = KPICalculator()
         >>> df = pd.read_parquet("data/processed/SIH_AC_202401.parquet")
         >>> print(calculator.summary(df, beds=100, days=31))
+
+    Todos os métodos aceitam também um KPICube no lugar do DataFrame,
+    respondendo a partir dos agregados pré-computados (sem reler registros).
     """
 
-    def occupancy_rate(self, df: pd.DataFrame, beds: int, days: int) -> float:
+    def _from_cube(self, values: pd.Series, group_by: str | None, cast: type) -> Any:
+        """Converte rollup do cubo no formato de retorno dos métodos de KPI."""
+        if group_by is None:
+            return cast(values.iloc[0])
+        if group_by == "month":
+            return {int(str(k)): cast(v) for k, v in values.items()}
+        return {str(k): cast(v) for k, v in values.items()}
+
+    def occupancy_rate(self, df: pd.DataFrame | KPICube, beds: int, days: int) -> float:
         """
         Calcula taxa de ocupação de leitos.
 
         Fórmula: (pacientes_dia / leitos_disponiveis) * 100
 
+        Para todos os hospitais com leitos do CNES, ver
+        capacity.hospital_occupancy.
+
         Args:
             df: DataFrame com coluna 'stay_days'
             beds: Número de leitos disponíveis
@@ -48,6 +187,12 @@ class KPICalculator:
         if days <= 0:
             raise ValueError("Número de dias deve ser maior que zero")
 
+        if isinstance(df, KPICube):
+            if df.empty:
+                return 0.0
+            patient_days = df.aggregate()["stay_days_sum"].iloc[0]
+            return float((patient_days / (beds * days)) * 100)
+
         if df.empty or "stay_days" not in df.columns:
             return 0.0
 
@@ -56,30 +201,61 @@ class KPICalculator:
         return float((patient_days / capacity) * 100)
 
     @overload
-    def average_length_of_stay(self, df: pd.DataFrame) -> float: ...
+    def average_length_of_stay(self, df: pd.DataFrame | KPICube) -> float: ...
 
     @overload
-    def average_length_of_stay(self, df: pd.DataFrame, group_by: None) -> float: ...
+    def average_length_of_stay(
+        self, df: pd.DataFrame | KPICube, group_by: None, *, output: Literal["dict"] = ...
+    ) -> float: ...
 
     @overload
-    def average_length_of_stay(self, df: pd.DataFrame, group_by: str) -> dict[str, float]: ...
+    def average_length_of_stay(
+        self, df: pd.DataFrame | KPICube, group_by: str, *, output: Literal["dict"] = ...
+    ) -> dict[str, float]: ...
 
+    @overload
     def average_length_of_stay(
-        self, df: pd.DataFrame, group_by: str | None = None
-    ) -> float | dict[str, float]:
+        self,
+        df: pd.DataFrame | KPICube,
+        group_by: str | list[str] | None = ...,
+        *,
+        output: Literal["frame", "arrow"],
+    ) -> Any: ...
+
+    def average_length_of_stay(
+        self,
+        df: pd.DataFrame | KPICube,
+        group_by: str | list[str] | None = None,
+        *,
+        output: OutputMode = "dict",
+    ) -> Any:
         """
         Calcula Tempo Médio de Permanência (TMP).
 
         Args:
             df: DataFrame com coluna 'stay_days'
-            group_by: Coluna para agrupamento (opcional)
+            group_by: Coluna para agrupamento (opcional; lista com output colunar)
+            output: 'dict' (padrão), 'frame' (DataFrame) ou 'arrow' (pyarrow Table),
+                ver kpi_table
 
         Returns:
-            TMP geral (float) ou por grupo (dict)
+            TMP geral (float) ou por grupo (dict); DataFrame/Table no modo colunar
 
         Raises:
             KeyError: Se group_by especificado não existir
         """
+        if output != "dict":
+            return self.kpi_table(df, group_by, ["average_length_of_stay"], output)
+        if isinstance(group_by, list):
+            raise TypeError("Múltiplas colunas de agrupamento exigem output='frame' ou 'arrow'")
+
+        if isinstance(df, KPICube):
+            if df.empty:
+                return 0.0
+            totals = df.aggregate(group_by)
+            mean = totals["stay_days_sum"] / totals["stay_days_count"]
+            return self._from_cube(mean, group_by, float)  # type: ignore[no-any-return]
+
         if df.empty or "stay_days" not in df.columns:
             return 0.0
 
@@ -90,28 +266,61 @@ class KPICalculator:
             raise KeyError(f"Coluna '{group_by}' não encontrada no DataFrame")
 
         grouped = df.groupby(group_by)["stay_days"].mean()
-        return {str(k): float(v) for k, v in grouped.items()}
+        return dict(zip(grouped.index.astype(str), grouped.astype(float).tolist(), strict=True))
 
     @overload
-    def volume(self, df: pd.DataFrame) -> int: ...
+    def volume(self, df: pd.DataFrame | KPICube) -> int: ...
 
     @overload
-    def volume(self, df: pd.DataFrame, group_by: None) -> int: ...
+    def volume(
+        self, df: pd.DataFrame | KPICube, group_by: None, *, output: Literal["dict"] = ...
+    ) -> int: ...
 
     @overload
-    def volume(self, df: pd.DataFrame, group_by: str) -> dict[Any, int]: ...
+    def volume(
+        self, df: pd.DataFrame | KPICube, group_by: str, *, output: Literal["dict"] = ...
+    ) -> dict[Any, int]: ...
 
-    def volume(self, df: pd.DataFrame, group_by: str | None = None) -> int | dict[Any, int]:
+    @overload
+    def volume(
+        self,
+        df: pd.DataFrame | KPICube,
+        group_by: str | list[str] | None = ...,
+        *,
+        output: Literal["frame", "arrow"],
+    ) -> Any: ...
+
+    def volume(
+        self,
+        df: pd.DataFrame | KPICube,
+        group_by: str | list[str] | None = None,
+        *,
+        output: OutputMode = "dict",
+    ) -> Any:
         """
         Calcula volume de atendimentos (internações).
 
         Args:
             df: DataFrame com dados de internações
             group_by: Coluna para agrupamento ou 'month' para agrupar por mês
+                (lista com output colunar)
+            output: 'dict' (padrão), 'frame' (DataFrame) ou 'arrow' (pyarrow Table),
+                ver kpi_table
 
         Returns:
-            Volume total (int) ou por grupo (dict com chaves int para mês, str para outros)
+            Volume total (int) ou por grupo (dict com chaves int para mês, str para outros);
+            DataFrame/Table no modo colunar
         """
+        if output != "dict":
+            return self.kpi_table(df, group_by, ["volume"], output)
+        if isinstance(group_by, list):
+            raise TypeError("Múltiplas colunas de agrupamento exigem output='frame' ou 'arrow'")
+
+        if isinstance(df, KPICube):
+            if df.empty:
+                return 0
+            return self._from_cube(df.aggregate(group_by)["records"], group_by, int)  # type: ignore[no-any-return]
+
         if df.empty:
             return 0
 
@@ -124,37 +333,65 @@ class KPICalculator:
             # Nota: reportAttributeAccessIssue configurado em pyproject.toml
             month_series = df["DT_INTER"].dt.month
             grouped = df.groupby(month_series).size()
-            result: dict[Any, int] = {}
-            for k, v in grouped.items():
-                result[int(str(k))] = int(v)
-            return result
+            return dict(zip(grouped.index.astype(int).tolist(), grouped.tolist(), strict=True))
 
         if group_by not in df.columns:
             raise KeyError(f"Coluna '{group_by}' não encontrada no DataFrame")
 
         grouped = df.groupby(group_by).size()
-        return {str(k): int(v) for k, v in grouped.items()}
+        return dict(zip(grouped.index.astype(str), grouped.tolist(), strict=True))
 
     @overload
-    def revenue(self, df: pd.DataFrame) -> float: ...
+    def revenue(self, df: pd.DataFrame | KPICube) -> float: ...
 
     @overload
-    def revenue(self, df: pd.DataFrame, group_by: None) -> float: ...
+    def revenue(
+        self, df: pd.DataFrame | KPICube, group_by: None, *, output: Literal["dict"] = ...
+    ) -> float: ...
 
     @overload
-    def revenue(self, df: pd.DataFrame, group_by: str) -> dict[str, float]: ...
+    def revenue(
+        self, df: pd.DataFrame | KPICube, group_by: str, *, output: Literal["dict"] = ...
+    ) -> dict[str, float]: ...
 
-    def revenue(self, df: pd.DataFrame, group_by: str | None = None) -> float | dict[str, float]:
+    @overload
+    def revenue(
+        self,
+        df: pd.DataFrame | KPICube,
+        group_by: str | list[str] | None = ...,
+        *,
+        output: Literal["frame", "arrow"],
+    ) -> Any: ...
+
+    def revenue(
+        self,
+        df: pd.DataFrame | KPICube,
+        group_by: str | list[str] | None = None,
+        *,
+        output: OutputMode = "dict",
+    ) -> Any:
         """
         Calcula receita total (valores SUS).
 
         Args:
             df: DataFrame com coluna 'VAL_TOT'
-            group_by: Coluna para agrupamento (opcional)
+            group_by: Coluna para agrupamento (opcional; lista com output colunar)
+            output: 'dict' (padrão), 'frame' (DataFrame) ou 'arrow' (pyarrow Table),
+                ver kpi_table
 
         Returns:
-            Receita total (float) ou por grupo (dict)
+            Receita total (float) ou por grupo (dict); DataFrame/Table no modo colunar
         """
+        if output != "dict":
+            return self.kpi_table(df, group_by, ["revenue"], output)
+        if isinstance(group_by, list):
+            raise TypeError("Múltiplas colunas de agrupamento exigem output='frame' ou 'arrow'")
+
+        if isinstance(df, KPICube):
+            if df.empty:
+                return 0.0
+            return self._from_cube(df.aggregate(group_by)["VAL_TOT_sum"], group_by, float)  # type: ignore[no-any-return]
+
         if df.empty or "VAL_TOT" not in df.columns:
             return 0.0
 
@@ -165,9 +402,58 @@ class KPICalculator:
             raise KeyError(f"Coluna '{group_by}' não encontrada no DataFrame")
 
         grouped = df.groupby(group_by)["VAL_TOT"].sum()
-        return {str(k): float(v) for k, v in grouped.items()}
+        return dict(zip(grouped.index.astype(str), grouped.astype(float).tolist(), strict=True))
+
+    def kpi_table(
+        self,
+        df: pd.DataFrame | KPICube,
+        group_by: str | list[str] | None = None,
+        kpis: Sequence[str] = ("volume", "revenue", "average_length_of_stay"),
+        output: Literal["frame", "arrow"] = "frame",
+    ) -> Any:
+        """
+        Calcula vários KPIs agrupados em um único groupby, em formato colunar.
+
+        Somas e contagens de 'stay_days' e 'VAL_TOT' são calculadas uma vez
+        para todos os grupos; médias são divisões vetorizadas. Evita a
+        conversão para dict, que domina o custo com milhares de grupos
+        (ex: CNES, DIAG_PRINC).
+
+        Args:
+            df: DataFrame com dados de internações (ou KPICube)
+            group_by: Coluna(s) de agrupamento ('month' = mês de DT_INTER,
+                'competencia' = AAAAMM de DT_INTER); None = total
+            kpis: KPIs a calcular (ver TABLE_KPIS)
+            output: 'frame' (DataFrame indexado pelos grupos) ou 'arrow'
+                (pyarrow Table com os grupos como colunas)
 
-    def average_ticket(self, df: pd.DataFrame) -> float:
+        Returns:
+            DataFrame ou pyarrow Table com uma coluna por KPI
+
+        Raises:
+            ValueError: Se algum KPI não for suportado
+            KeyError: Se coluna de agrupamento ou de origem não existir
+        """
+        unknown = [k for k in kpis if k not in TABLE_KPIS]
+        if unknown:
+            raise ValueError(f"KPIs não suportados em kpi_table: {unknown}")
+
+        keys = [] if group_by is None else [group_by] if isinstance(group_by, str) else group_by
+        sources = sorted({c for k in kpis if (c := TABLE_KPIS[k]) is not None})
+
+        if isinstance(df, KPICube):
+            measures = df.aggregate(keys or None)
+        else:
+            measures = grouped_measures(df, keys, sources)
+        result = kpis_from_measures(measures, kpis)
+
+        if output == "arrow":
+            return pa.Table.from_pandas(
+                result.reset_index() if keys else result, preserve_index=False
+            )
+        return result
+
+    def average_ticket(self, df: pd.DataFrame | KPICube) -> float:
         """
         Calcula ticket médio (valor médio por internação).
 
@@ -177,12 +463,18 @@ class KPICalculator:
         Returns:
             Ticket médio em reais
         """
+        if isinstance(df, KPICube):
+            if df.empty:
+                return 0.0
+            totals = df.aggregate()
+            return float(totals["VAL_TOT_sum"].iloc[0] / totals["VAL_TOT_count"].iloc[0])
+
         if df.empty or "VAL_TOT" not in df.columns:
             return 0.0
 
         return float(df["VAL_TOT"].mean())
 
-    def demographics(self, df: pd.DataFrame) -> dict[str, int]:
+    def demographics(self, df: pd.DataFrame | KPICube) -> dict[str, int]:
         """
         Calcula distribuição por faixa etária.
 
@@ -195,6 +487,13 @@ class KPICalculator:
         Raises:
             KeyError: Se coluna 'age_group' não existir
         """
+        if isinstance(df, KPICube):
+            age_counts = dict.fromkeys(AGE_GROUPS, 0)
+            if not df.empty:
+                grouped = df.aggregate("age_group")["records"]
+                age_counts.update({str(k): int(v) for k, v in grouped.items()})
+            return age_counts
+
         if "age_group" not in df.columns:
             raise KeyError("Coluna 'age_group' não encontrada no DataFrame")
 
@@ -205,10 +504,156 @@ class KPICalculator:
         counts = df["age_group"].value_counts()
         return {str(k): int(v) for k, v in counts.items()}
 
-    def summary(self, df: pd.DataFrame, beds: int, days: int) -> dict[str, Any]:
+    def quantiles(
+        self,
+        df: pd.DataFrame | KPICube,
+        column: str = "stay_days",
+        group_by: str | None = None,
+        quantiles: tuple[float, ...] = DEFAULT_QUANTILES,
+    ) -> dict[Any, Any]:
+        """
+        Calcula quantis (mediana, p90, p99) de uma medida.
+
+        Com DataFrame o cálculo é exato; com KPICube os quantis vêm dos
+        t-digests do cubo (aproximados, sem reler registros).
+
+        Args:
+            df: DataFrame com a coluna (ex: 'stay_days', 'VAL_TOT', 'daily_cost')
+            column: Medida
+            group_by: Coluna para agrupamento (opcional)
+            quantiles: Quantis desejados (0-1)
+
+        Returns:
+            {'p50': ..., 'p90': ..., 'p99': ...} ou {grupo: {...}} por grupo;
+            NaN quando não há valores
+
+        Raises:
+            KeyError: Se group_by especificado não existir
+        """
+        labels = [quantile_label(q) for q in quantiles]
+
+        if isinstance(df, KPICube):
+            if df.empty:
+                return {} if group_by else dict.fromkeys(labels, float("nan"))
+            table = df.quantiles(column, group_by, quantiles)
+            rows: dict[Any, dict[str, float]] = {
+                (int(str(k)) if group_by == "month" else str(k)): {
+                    str(label): float(v) for label, v in row.items()
+                }
+                for k, row in table.iterrows()
+            }
+            return next(iter(rows.values())) if group_by is None else rows
+
+        if df.empty or column not in df.columns:
+            return {} if group_by else dict.fromkeys(labels, float("nan"))
+
+        if group_by is None:
+            values = df[column].quantile(list(quantiles))
+            return {label: float(v) for label, v in zip(labels, values, strict=True)}
+
+        if group_by not in df.columns:
+            raise KeyError(f"Coluna '{group_by}' não encontrada no DataFrame")
+
+        grouped = (
+            df.groupby(group_by, observed=True)[column].quantile(np.array(quantiles)).unstack()
+        )
+        return {
+            str(k): {label: float(v) for label, v in zip(labels, row, strict=True)}
+            for k, row in grouped.iterrows()
+        }
+
+    def distinct_count(
+        self, df: pd.DataFrame | KPICube, column: str = "MUNIC_RES", group_by: str | None = None
+    ) -> int | dict[Any, int]:
+        """
+        Conta valores distintos de uma coluna (ex: municípios de residência por CNES).
+
+        Com DataFrame a contagem é exata; com KPICube vem dos sketches
+        HyperLogLog do cubo (erro relativo ~1.6%, sem reler registros).
+
+        Args:
+            df: DataFrame com a coluna
+            column: Coluna cujos valores distintos são contados
+            group_by: Coluna para agrupamento (opcional)
+
+        Returns:
+            Contagem total (int) ou por grupo (dict)
+
+        Raises:
+            KeyError: Se column ou group_by não existirem
+        """
+        if isinstance(df, KPICube):
+            if df.empty:
+                return {} if group_by else 0
+            return self._from_cube(df.distinct_count(column, group_by), group_by, int)  # type: ignore[no-any-return]
+
+        if column not in df.columns:
+            raise KeyError(f"Coluna '{column}' não encontrada no DataFrame")
+
+        if group_by is None:
+            return int(df[column].nunique())
+
+        if group_by not in df.columns:
+            raise KeyError(f"Coluna '{group_by}' não encontrada no DataFrame")
+
+        grouped = df.groupby(group_by, observed=True)[column].nunique()
+        return {str(k): int(v) for k, v in grouped.items()}
+
+    def _fused_aggregates(self, df: pd.DataFrame) -> tuple[dict[str, float], dict[str, int]]:
+        """
+        Calcula somas e contagens de 'stay_days' e 'VAL_TOT' e a distribuição
+        por faixa etária em uma única passada.
+
+        As colunas numéricas são lidas uma vez como matriz numpy; somas e
+        contagens de não-nulos são compartilhadas por todos os KPIs do resumo.
+        As faixas etárias são contadas sobre os códigos da coluna (bincount),
+        sem um value_counts separado.
+
+        Args:
+            df: DataFrame com dados de internações
+
+        Returns:
+            Tupla (somas e contagens, NaN ignorado como no pandas; contagem
+            por faixa etária, como em demographics)
+
+        Raises:
+            KeyError: Se coluna 'age_group' não existir
+        """
+        if "age_group" not in df.columns:
+            raise KeyError("Coluna 'age_group' não encontrada no DataFrame")
+
+        ages = df["age_group"]
+        if isinstance(ages.dtype, pd.CategoricalDtype):
+            codes, labels = ages.cat.codes.to_numpy(), ages.cat.categories
+        else:
+            codes, labels = pd.factorize(ages)
+        age_counts = np.bincount(codes[codes >= 0], minlength=len(labels))
+        order = np.argsort(-age_counts, kind="stable")
+        demographics = {str(labels[i]): int(age_counts[i]) for i in order}
+
+        columns = [c for c in ("stay_days", "VAL_TOT") if c in df.columns]
+        aggregates: dict[str, float] = {}
+        if not columns:
+            return aggregates, demographics
+
+        values = df[columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        valid = ~np.isnan(values)
+        sums = np.where(valid, values, 0.0).sum(axis=0)
+        counts = valid.sum(axis=0)
+
+        for i, column in enumerate(columns):
+            aggregates[f"{column}_sum"] = float(sums[i])
+            aggregates[f"{column}_count"] = float(counts[i])
+        return aggregates, demographics
+
+    def summary(self, df: pd.DataFrame | KPICube, beds: int, days: int) -> dict[str, Any]:
         """
         Gera resumo consolidado de todos os KPIs.
 
+        Os KPIs, incluindo a distribuição por faixa etária, são calculados em
+        uma única passada colunar (ver _fused_aggregates), com o mesmo
+        resultado dos métodos individuais.
+
         Args:
             df: DataFrame com dados de internações
             beds: Número de leitos disponíveis
@@ -216,12 +661,49 @@ class KPICalculator:
 
         Returns:
             Dicionário com todos os KPIs calculados
+
+        Note:
+            Com KPICube, os agregados vêm do rollup do cubo (sem reler registros).
         """
+        if beds <= 0:
+            raise ValueError("Número de leitos deve ser maior que zero")
+        if days <= 0:
+            raise ValueError("Número de dias deve ser maior que zero")
+
+        aggregates: dict[str, float]
+        if isinstance(df, KPICube):
+            totals = {} if df.empty else df.aggregate().iloc[0].to_dict()
+            aggregates = {str(k): float(v) for k, v in totals.items()}
+            volume = int(aggregates.get("records", 0))
+            demographics = self.demographics(df)
+        elif df.empty:
+            aggregates, volume = {}, 0
+            demographics = self.demographics(df)
+        else:
+            aggregates, demographics = self._fused_aggregates(df)
+            volume = len(df)
+
+        stay_sum = aggregates.get("stay_days_sum", 0.0)
+        stay_count = aggregates.get("stay_days_count", 0.0)
+        revenue = aggregates.get("VAL_TOT_sum", 0.0)
+        revenue_count = aggregates.get("VAL_TOT_count", 0.0)
+
+        # Sem coluna: 0.0 (como os métodos individuais); só nulos: NaN (como pandas mean)
+        if "stay_days_count" not in aggregates:
+            average_length_of_stay = 0.0
+        else:
+            average_length_of_stay = stay_sum / stay_count if stay_count else float("nan")
+
+        if "VAL_TOT_count" not in aggregates:
+            average_ticket = 0.0
+        else:
+            average_ticket = revenue / revenue_count if revenue_count else float("nan")
+
         return {
-            "occupancy_rate": self.occupancy_rate(df, beds, days),
-            "average_length_of_stay": self.average_length_of_stay(df),
-            "volume": self.volume(df),
-            "revenue": self.revenue(df),
-            "average_ticket": self.average_ticket(df),
-            "demographics": self.demographics(df),
+            "occupancy_rate": float(stay_sum / (beds * days) * 100),
+            "average_length_of_stay": float(average_length_of_stay),
+            "volume": volume,
+            "revenue": float(revenue),
+            "average_ticket": float(average_ticket),
+            "demographics": demographics,
         }
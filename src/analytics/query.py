@@ -0,0 +1,304 @@
+"""
+KPIQuery: Consultas de KPI lazy sobre o data lake Parquet.
+
+Em vez de materializar um DataFrame completo, a consulta:
+
+1. Seleciona apenas as partições (SIH_{UF}_{AAAAMM}.parquet) do filtro de UF/ano/mês
+2. Lê apenas as colunas necessárias ao KPI (column pushdown)
+3. Empurra filtros de coluna ao pyarrow.dataset (row groups descartados por estatísticas)
+4. Agrega lote a lote (record batches), mantendo em memória só os parciais
+
+Exemplo:
+    >>> KPIQuery().filter(uf="SP", year=2024).revenue(group_by="ESPEC")
+"""
+
+import logging
+import re
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+
+from src.config import PROCESSED_DIR
+
+logger = logging.getLogger(__name__)
+
+PARTITION_PATTERN = re.compile(r"^SIH_(?P<uf>[A-Z]{2})_(?P<year>\d{4})(?P<month>\d{2})\.parquet$")
+
+# Medida -> coluna de origem
+MEASURE_SOURCES = {"stay_days": "stay_days", "VAL_TOT": "VAL_TOT"}
+
+
+def filter_expression(filters: dict[str, list[Any]]) -> ds.Expression | None:
+    """
+    Expressão pyarrow de filtros de igualdade/pertinência em colunas.
+
+    Args:
+        filters: Coluna -> valores aceitos
+
+    Returns:
+        Conjunção dos filtros (None se não houver filtros)
+    """
+    expression = None
+    for column, values in filters.items():
+        term = ds.field(column).isin(values)
+        expression = term if expression is None else expression & term
+    return expression
+
+
+def _as_list(value: Any) -> list[Any]:
+    """Normaliza escalar ou iterável em lista."""
+    if isinstance(value, str) or not isinstance(value, Iterable):
+        return [value]
+    return list(value)
+
+
+class KPIQuery:
+    """
+    Front-end lazy de KPIs com pushdown de predicados e colunas.
+
+    Cada chamada a filter() retorna uma nova consulta (imutável); a leitura
+    só acontece quando um KPI é solicitado.
+    """
+
+    def __init__(
+        self,
+        source: str | Path = PROCESSED_DIR,
+        batch_size: int = 131_072,
+    ) -> None:
+        """
+        Inicializa consulta sobre um diretório de partições Parquet.
+
+        Args:
+            source: Diretório do data lake (ou arquivo Parquet único)
+            batch_size: Linhas por record batch na leitura
+        """
+        self.source = Path(source)
+        self.batch_size = batch_size
+        self._partition_filters: dict[str, list[Any]] = {}
+        self._column_filters: dict[str, list[Any]] = {}
+
+    def filter(
+        self,
+        uf: str | list[str] | None = None,
+        year: int | list[int] | None = None,
+        month: int | list[int] | None = None,
+        **columns: Any,
+    ) -> "KPIQuery":
+        """
+        Restringe a consulta (filtros acumulam com os anteriores).
+
+        Args:
+            uf: UF(s) da partição
+            year: Ano(s) de competência da partição
+            month: Mês(es) de competência da partição
+            **columns: Filtros de igualdade/pertinência em colunas (ex: ESPEC="03")
+
+        Returns:
+            Nova KPIQuery com os filtros aplicados
+        """
+        query = KPIQuery(self.source, self.batch_size)
+        query._partition_filters = dict(self._partition_filters)
+        query._column_filters = dict(self._column_filters)
+
+        for key, value in (("uf", uf), ("year", year), ("month", month)):
+            if value is not None:
+                query._partition_filters[key] = _as_list(value)
+        for column, value in columns.items():
+            query._column_filters[column] = _as_list(value)
+
+        return query
+
+    def partitions(self) -> list[Path]:
+        """
+        Lista partições que satisfazem os filtros de UF/ano/mês (pruning por nome).
+
+        Returns:
+            Caminhos das partições selecionadas
+        """
+        if self.source.is_file():
+            return [self.source]
+
+        selected = []
+        for path in sorted(self.source.glob("SIH_*.parquet")):
+            match = PARTITION_PATTERN.match(path.name)
+            if match is None:
+                continue
+            attributes = {
+                "uf": match["uf"],
+                "year": int(match["year"]),
+                "month": int(match["month"]),
+            }
+            if all(attributes[k] in values for k, values in self._partition_filters.items()):
+                selected.append(path)
+        return selected
+
+    @property
+    def column_filters(self) -> dict[str, list[Any]]:
+        """Filtros de coluna (coluna -> valores aceitos), além do pruning de partições."""
+        return dict(self._column_filters)
+
+    def _dataset(self) -> ds.Dataset | None:
+        """Abre dataset pyarrow sobre as partições selecionadas."""
+        paths = self.partitions()
+        if not paths:
+            return None
+        return ds.dataset([str(p) for p in paths], format="parquet")
+
+    def _expression(self) -> ds.Expression | None:
+        """Monta expressão de filtro pyarrow a partir dos filtros de coluna."""
+        return filter_expression(self._column_filters)
+
+    def _aggregate(self, measures: list[str], group_by: str | None = None) -> pd.DataFrame | None:
+        """
+        Agrega medidas aditivas lote a lote.
+
+        Args:
+            measures: Medidas necessárias ('stay_days', 'VAL_TOT')
+            group_by: Coluna de agrupamento ('month' usa o mês de DT_INTER)
+
+        Returns:
+            DataFrame com records e {medida}_sum/{medida}_count (indexado pelo
+            grupo, ou uma linha se group_by=None); None se nenhum registro
+
+        Raises:
+            KeyError: Se group_by (ou coluna de filtro) não existir no dataset
+        """
+        dataset = self._dataset()
+        if dataset is None:
+            return None
+
+        names = set(dataset.schema.names)
+        for column in self._column_filters:
+            if column not in names:
+                raise KeyError(f"Coluna '{column}' não encontrada no dataset")
+
+        group_column = "DT_INTER" if group_by == "month" else group_by
+        if group_column is not None and group_column not in names:
+            if group_by == "month":
+                raise KeyError("Coluna 'DT_INTER' necessária para agrupamento por mês")
+            raise KeyError(f"Coluna '{group_by}' não encontrada no DataFrame")
+
+        present = [m for m in measures if MEASURE_SOURCES[m] in names]
+        columns = [MEASURE_SOURCES[m] for m in present]
+        if group_column is not None:
+            columns.append(group_column)
+
+        scanner = dataset.scanner(
+            columns=columns, filter=self._expression(), batch_size=self.batch_size
+        )
+
+        total: pd.DataFrame | None = None
+        for batch in scanner.to_batches():
+            if batch.num_rows == 0:
+                continue
+            frame = batch.to_pandas()
+            work = pd.DataFrame({"records": np.ones(batch.num_rows, dtype=np.int64)})
+            for measure in present:
+                values = pd.to_numeric(frame[MEASURE_SOURCES[measure]], errors="coerce")
+                work[f"{measure}_sum"] = values.fillna(0.0).to_numpy()
+                work[f"{measure}_count"] = values.notna().to_numpy(dtype=np.int64)
+
+            if group_column is None:
+                partial = work.sum().to_frame().T
+            else:
+                keys = frame[group_column]
+                if group_by == "month":
+                    keys = pd.to_datetime(keys).dt.month
+                partial = work.groupby(keys.to_numpy(), sort=False).sum()
+
+            total = partial if total is None else total.add(partial, fill_value=0)
+
+        if total is not None:
+            logger.info(f"[QUERY] {int(total['records'].sum()):,} registros agregados")
+        return total
+
+    @staticmethod
+    def _format(values: pd.Series, group_by: str | None, cast: type) -> Any:
+        """Converte parciais no formato de retorno do KPICalculator."""
+        if group_by is None:
+            return cast(values.iloc[0])
+        values = values.sort_index()
+        if group_by == "month":
+            return {int(str(k)): cast(v) for k, v in values.items()}
+        return {str(k): cast(v) for k, v in values.items()}
+
+    def volume(self, group_by: str | None = None) -> int | dict[Any, int]:
+        """
+        Volume de internações (equivalente a KPICalculator.volume).
+
+        Args:
+            group_by: Coluna de agrupamento ou 'month'
+
+        Returns:
+            Volume total (int) ou por grupo (dict)
+        """
+        totals = self._aggregate([], group_by)
+        if totals is None:
+            return 0
+        return self._format(totals["records"], group_by, int)  # type: ignore[no-any-return]
+
+    def revenue(self, group_by: str | None = None) -> float | dict[str, float]:
+        """
+        Receita total (equivalente a KPICalculator.revenue).
+
+        Args:
+            group_by: Coluna de agrupamento (opcional)
+
+        Returns:
+            Receita total (float) ou por grupo (dict)
+        """
+        totals = self._aggregate(["VAL_TOT"], group_by)
+        if totals is None or "VAL_TOT_sum" not in totals.columns:
+            return 0.0
+        return self._format(totals["VAL_TOT_sum"], group_by, float)  # type: ignore[no-any-return]
+
+    def average_length_of_stay(self, group_by: str | None = None) -> float | dict[str, float]:
+        """
+        Tempo médio de permanência (equivalente a KPICalculator.average_length_of_stay).
+
+        Args:
+            group_by: Coluna de agrupamento (opcional)
+
+        Returns:
+            TMP geral (float) ou por grupo (dict)
+        """
+        totals = self._aggregate(["stay_days"], group_by)
+        if totals is None or "stay_days_sum" not in totals.columns:
+            return 0.0
+        mean = totals["stay_days_sum"] / totals["stay_days_count"]
+        return self._format(mean, group_by, float)  # type: ignore[no-any-return]
+
+    def average_ticket(self) -> float:
+        """Ticket médio (equivalente a KPICalculator.average_ticket)."""
+        totals = self._aggregate(["VAL_TOT"])
+        if totals is None or "VAL_TOT_sum" not in totals.columns:
+            return 0.0
+        return float(totals["VAL_TOT_sum"].iloc[0] / totals["VAL_TOT_count"].iloc[0])
+
+    def occupancy_rate(self, beds: int, days: int) -> float:
+        """
+        Taxa de ocupação (equivalente a KPICalculator.occupancy_rate).
+
+        Args:
+            beds: Número de leitos disponíveis
+            days: Número de dias no período
+
+        Returns:
+            Taxa de ocupação em percentual
+
+        Raises:
+            ValueError: Se beds ou days forem zero ou negativos
+        """
+        if beds <= 0:
+            raise ValueError("Número de leitos deve ser maior que zero")
+        if days <= 0:
+            raise ValueError("Número de dias deve ser maior que zero")
+
+        totals = self._aggregate(["stay_days"])
+        if totals is None or "stay_days_sum" not in totals.columns:
+            return 0.0
+        return float(totals["stay_days_sum"].iloc[0] / (beds * days) * 100)
@@ -0,0 +1,153 @@
+"""
+Ajuste de risco do tempo de permanência: TMP esperado e razão O/E por hospital.
+
+O TMP bruto por CNES penaliza hospitais com casos mais complexos. Aqui
+cada internação recebe um TMP esperado = média de referência (nacional)
+da sua célula de risco:
+
+    grupo do diagnóstico (categoria CID-10, 3 caracteres de DIAG_PRINC)
+    × faixa etária (age_group) × caráter da internação (CAR_INT)
+
+Quando a referência é o próprio DataFrame (base nacional), o esperado de
+todos os registros sai de um único groupby().transform("mean"); com uma
+referência externa, as médias por célula são alinhadas aos registros por
+índice. Os totais por hospital são uma segunda agregação, de modo que
+todos os hospitais são avaliados no mesmo job vetorizado.
+
+KPIs (por hospital):
+    - observed_los: TMP observado
+    - expected_los: TMP esperado pelo case mix
+    - oe_ratio: permanência observada / esperada (> 1 = acima do esperado)
+    - percentile: posição da razão O/E entre os hospitais (0-100, menor = melhor)
+
+Exemplo:
+    >>> los_benchmark(df)  # por CNES, referência = todas as internações
+    >>> los_benchmark(df_estado, reference=df_nacional, min_admissions=30)
+"""
+
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Colunas da célula de risco (DIAG_PRINC é reduzido à categoria CID-10)
+RISK_COLUMNS = ["DIAG_PRINC", "age_group", "CAR_INT"]
+
+# Caracteres de DIAG_PRINC que definem o grupo do diagnóstico (categoria CID-10)
+DIAGNOSIS_GROUP_LENGTH = 3
+
+
+def _require(df: pd.DataFrame, columns: list[str]) -> None:
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise KeyError(f"Colunas ausentes para ajuste de risco: {missing}")
+
+
+def risk_cells(df: pd.DataFrame) -> list[pd.Series]:
+    """
+    Chaves da célula de risco de cada internação.
+
+    Args:
+        df: Internações com DIAG_PRINC, age_group e CAR_INT
+
+    Returns:
+        Lista de Series (grupo do diagnóstico, faixa etária, caráter)
+
+    Raises:
+        KeyError: Se faltarem colunas
+    """
+    _require(df, RISK_COLUMNS)
+    diagnosis = df["DIAG_PRINC"].astype("string").str.strip().str[:DIAGNOSIS_GROUP_LENGTH]
+    return [
+        diagnosis.rename("diagnosis_group"),
+        df["age_group"].astype("string"),
+        df["CAR_INT"].astype("string").str.strip(),
+    ]
+
+
+def expected_length_of_stay(df: pd.DataFrame, reference: pd.DataFrame | None = None) -> pd.Series:
+    """
+    TMP esperado de cada internação pela média de referência da sua célula de risco.
+
+    Args:
+        df: Internações com stay_days e RISK_COLUMNS
+        reference: Internações de referência (padrão: o próprio df, ex: base nacional)
+
+    Returns:
+        Series alinhada a df (NaN se a célula for desconhecida ou ausente da referência)
+
+    Raises:
+        KeyError: Se faltarem colunas
+    """
+    _require(df, ["stay_days"])
+    keys = risk_cells(df)
+    if reference is None:
+        stay = pd.to_numeric(df["stay_days"], errors="coerce")
+        expected: pd.Series = stay.groupby(keys, dropna=True).transform("mean")
+        return expected.rename("expected_los")
+
+    _require(reference, ["stay_days"])
+    stay = pd.to_numeric(reference["stay_days"], errors="coerce")
+    means = stay.groupby(risk_cells(reference), dropna=True).mean()
+    cells = pd.MultiIndex.from_arrays(keys)
+    return pd.Series(
+        means.reindex(cells).to_numpy(dtype=np.float64), index=df.index, name="expected_los"
+    )
+
+
+def los_benchmark(
+    df: pd.DataFrame,
+    group_by: str = "CNES",
+    reference: pd.DataFrame | None = None,
+    min_admissions: int = 1,
+) -> pd.DataFrame:
+    """
+    TMP observado, esperado e razão O/E por hospital, com ranking percentil.
+
+    Apenas internações com TMP esperado (célula de risco conhecida) entram
+    nos totais, para que observado e esperado tenham o mesmo denominador.
+
+    Args:
+        df: Internações com stay_days, RISK_COLUMNS e a coluna de grupo
+        group_by: Unidade avaliada (padrão: CNES)
+        reference: Internações de referência (padrão: o próprio df)
+        min_admissions: Mínimo de internações para entrar no ranking
+            (grupos menores ficam com percentile NaN)
+
+    Returns:
+        DataFrame indexado pelo grupo com admissions, observed_los,
+        expected_los, oe_ratio e percentile, em ordem de oe_ratio
+
+    Raises:
+        KeyError: Se faltarem colunas
+    """
+    _require(df, ["stay_days", group_by])
+    expected = expected_length_of_stay(df, reference)
+    observed = pd.to_numeric(df["stay_days"], errors="coerce")
+    valid = expected.notna() & observed.notna()
+
+    totals = (
+        pd.DataFrame({"observed": observed[valid], "expected": expected[valid]})
+        .groupby(df.loc[valid, group_by], sort=True)
+        .agg(
+            admissions=("observed", "size"),
+            observed=("observed", "sum"),
+            expected=("expected", "sum"),
+        )
+    )
+
+    admissions = totals["admissions"]
+    result = pd.DataFrame(
+        {
+            "admissions": admissions.astype(np.int64),
+            "observed_los": totals["observed"] / admissions,
+            "expected_los": totals["expected"] / admissions,
+            "oe_ratio": totals["observed"] / totals["expected"].replace(0, np.nan),
+        }
+    )
+    ranked = result["oe_ratio"].where(admissions >= min_admissions)
+    result["percentile"] = ranked.rank(pct=True, method="average") * 100
+    logger.info(f"[RISK] TMP ajustado por risco para {len(result):,} grupo(s) de {group_by}")
+    return result.sort_values("oe_ratio", kind="stable")
@@ -0,0 +1,242 @@
+"""
+Simulação Monte Carlo de demanda de leitos por hospital e especialidade.
+
+Para cada unidade (CNES × ESPEC), chegadas e permanências são reamostradas
+das distribuições empíricas observadas:
+
+    - chegadas: número de internações por dia (DT_INTER), incluindo dias
+      sem internação, na janela observada da própria unidade
+    - permanência: stay_days das internações da unidade
+
+Cada cenário é um calendário de aquecimento + horizonte. Todos os cenários
+de uma unidade são simulados de uma vez: as chegadas formam uma matriz
+cenários × dias, cada internação sorteia uma permanência e a ocupação
+diária (pacientes à meia-noite, como no BedCensus) sai de arrays de
+diferenças (+1 na admissão, -1 na saída) e soma prefixada. O sistema parte
+vazio; os dias de aquecimento são descartados.
+
+As unidades são distribuídas entre processos (ProcessPoolExecutor); cada
+unidade tem sua própria semente derivada da semente global, de modo que o
+resultado independe do número de workers.
+
+Leitos seguem o parâmetro beds de KPICalculator.occupancy_rate (valor
+único) ou BedCensus.occupancy (valor por unidade).
+
+Exemplo:
+    >>> simulate_bed_demand(df, beds={"2000121": 40, "2001586": 25}, group_by="CNES")
+    >>> simulate_bed_demand(df, beds=20, scenarios=5_000, seed=42)
+"""
+
+import logging
+import os
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from numbers import Number
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from src.analytics.executor import limit_memory
+from src.config import EXECUTOR_CONFIG, SIMULATION_CONFIG
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GROUP_BY = ["CNES", "ESPEC"]
+
+SIMULATION_COLUMNS = [
+    "beds",
+    "mean_census",
+    "p95_peak",
+    "mean_occupancy",
+    "prob_exceed",
+    "prob_exceed_day",
+]
+
+IntArray = npt.NDArray[np.int64]
+
+# Unidade: (posição no índice, chegadas diárias, permanências, leitos, semente)
+Unit = tuple[int, IntArray, IntArray, float, np.random.SeedSequence]
+
+
+def simulate_census(
+    arrivals: IntArray,
+    stays: IntArray,
+    scenarios: int,
+    days: int,
+    rng: np.random.Generator,
+) -> IntArray:
+    """
+    Ocupação diária simulada de uma unidade para vários cenários.
+
+    Args:
+        arrivals: Internações por dia observadas (distribuição empírica)
+        stays: Permanências observadas em dias (distribuição empírica)
+        scenarios: Número de cenários
+        days: Dias simulados (incluindo aquecimento)
+        rng: Gerador de números aleatórios
+
+    Returns:
+        Matriz cenários × dias com pacientes internados à meia-noite
+    """
+    counts = rng.choice(arrivals, size=(scenarios, days))
+    slots = np.repeat(np.arange(scenarios * days), counts.ravel())
+    lengths = rng.choice(stays, size=len(slots)) if len(stays) else np.zeros(len(slots), int)
+
+    # Leito ocupado nas noites [admissão, admissão + permanência), recortado ao calendário
+    scenario, start = np.divmod(slots, days)
+    end = np.minimum(start + lengths, days)
+    width = days + 1
+    diff = np.bincount(scenario * width + start, minlength=scenarios * width) - np.bincount(
+        scenario * width + end, minlength=scenarios * width
+    )
+    census: IntArray = np.cumsum(diff.reshape(scenarios, width), axis=1)[:, :days]
+    return census
+
+
+def _simulate_units(
+    units: list[Unit], scenarios: int, horizon: int, warmup: int
+) -> list[tuple[int, list[float]]]:
+    """Worker: simula um lote de unidades e resume cada uma."""
+    rows = []
+    for position, arrivals, stays, beds, seed in units:
+        rng = np.random.default_rng(seed)
+        census = simulate_census(arrivals, stays, scenarios, warmup + horizon, rng)[:, warmup:]
+        peak = census.max(axis=1)
+        rows.append(
+            (
+                position,
+                [
+                    beds,
+                    float(census.mean()),
+                    float(np.quantile(peak, 0.95)),
+                    float(census.mean() / beds * 100),
+                    float((peak > beds).mean()),
+                    float((census > beds).mean()),
+                ],
+            )
+        )
+    return rows
+
+
+def _unit_beds(beds: int | dict[Any, int] | pd.Series, index: pd.Index) -> npt.NDArray[np.float64]:
+    """
+    Leitos de cada unidade (NaN se não informado).
+
+    Raises:
+        ValueError: Se algum número de leitos for zero ou negativo
+    """
+    if isinstance(beds, Number):
+        values = np.full(len(index), float(beds))
+    else:
+        values = pd.Series(beds, dtype=np.float64).reindex(index).to_numpy(dtype=np.float64)
+    if np.any(values[~np.isnan(values)] <= 0):
+        raise ValueError("Número de leitos deve ser maior que zero")
+    return values
+
+
+def simulate_bed_demand(
+    df: pd.DataFrame,
+    beds: int | dict[Any, int] | pd.Series,
+    group_by: str | Sequence[str] = DEFAULT_GROUP_BY,
+    scenarios: int | None = None,
+    horizon: int | None = None,
+    warmup: int | None = None,
+    workers: int | None = None,
+    seed: int | None = None,
+) -> pd.DataFrame:
+    """
+    Probabilidade de a ocupação exceder a capacidade, por unidade.
+
+    Args:
+        df: Internações com DT_INTER, stay_days e colunas de agrupamento
+        beds: Leitos (valor único, ou por unidade: chave = valor de group_by,
+            tupla se várias colunas); unidades sem leitos não são simuladas
+        group_by: Unidade simulada (padrão: CNES × ESPEC)
+        scenarios: Cenários por unidade (padrão: SIMULATION_CONFIG)
+        horizon: Dias avaliados por cenário (padrão: SIMULATION_CONFIG)
+        warmup: Dias de aquecimento descartados (padrão: SIMULATION_CONFIG)
+        workers: Processos (padrão: EXECUTOR_CONFIG ou núcleos; 1 = sem pool)
+        seed: Semente global (reprodutível para qualquer número de workers)
+
+    Returns:
+        DataFrame indexado pela unidade com SIMULATION_COLUMNS: leitos,
+        ocupação média (pacientes e %), pico p95, probabilidade de o pico
+        do horizonte exceder os leitos e fração de dias acima da capacidade
+
+    Raises:
+        KeyError: Se faltarem colunas
+        ValueError: Se leitos, cenários ou dias não forem positivos
+    """
+    keys = [group_by] if isinstance(group_by, str) else list(group_by)
+    missing = [c for c in ["DT_INTER", "stay_days", *keys] if c not in df.columns]
+    if missing:
+        raise KeyError(f"Colunas ausentes para simulação: {missing}")
+    scenarios = scenarios if scenarios is not None else SIMULATION_CONFIG["scenarios"]
+    horizon = horizon if horizon is not None else SIMULATION_CONFIG["horizon_days"]
+    warmup = warmup if warmup is not None else SIMULATION_CONFIG["warmup_days"]
+    if scenarios <= 0 or horizon <= 0 or warmup < 0:
+        raise ValueError("Cenários e horizonte devem ser maiores que zero")
+
+    dates = pd.to_datetime(df["DT_INTER"], errors="coerce").to_numpy(dtype="datetime64[D]")
+    stays = pd.to_numeric(df["stay_days"], errors="coerce").to_numpy(dtype=np.float64)
+    grouper = df.groupby([df[k] for k in keys], observed=True, sort=True)
+    codes = np.asarray(grouper.ngroup(), dtype=np.int64)
+    index = grouper.size().index
+    valid = (codes >= 0) & ~np.isnat(dates) & ~np.isnan(stays)
+
+    # Chegadas diárias por unidade na sua própria janela observada (primeira à
+    # última internação da unidade; dias sem internação = 0). Uma janela global
+    # diluiria as chegadas com dias de outras unidades
+    days = dates[valid].astype(np.int64)
+    first = np.full(len(index), np.iinfo(np.int64).max)
+    last = np.full(len(index), np.iinfo(np.int64).min)
+    np.minimum.at(first, codes[valid], days)
+    np.maximum.at(last, codes[valid], days)
+    windows = np.where(last >= first, last - first + 1, 1)
+    offsets = days - first[codes[valid]]
+    width = int(windows.max()) if len(windows) else 1
+    arrivals = np.bincount(codes[valid] * width + offsets, minlength=len(index) * width).reshape(
+        len(index), width
+    )
+
+    capacity = _unit_beds(beds, index)
+    order = np.argsort(codes[valid], kind="stable")
+    sizes = np.bincount(codes[valid], minlength=len(index))
+    unit_stays = np.split(
+        np.clip(stays[valid][order], 0, None).astype(np.int64), np.cumsum(sizes)[:-1]
+    )
+    seeds = np.random.SeedSequence(seed).spawn(len(index))
+    units: list[Unit] = [
+        (i, arrivals[i, : windows[i]], unit_stays[i], float(capacity[i]), seeds[i])
+        for i in range(len(index))
+        if not np.isnan(capacity[i])
+    ]
+
+    workers = workers if workers is not None else EXECUTOR_CONFIG["workers"]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(units)))
+    if workers == 1:
+        rows = _simulate_units(units, scenarios, horizon, warmup)
+    else:
+        chunks = [units[i::workers] for i in range(workers)]
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=limit_memory,
+            initargs=(EXECUTOR_CONFIG["memory_limit"],),
+        ) as pool:
+            futures = [
+                pool.submit(_simulate_units, chunk, scenarios, horizon, warmup) for chunk in chunks
+            ]
+            rows = [row for future in futures for row in future.result()]
+
+    rows.sort(key=lambda row: row[0])
+    result = pd.DataFrame(
+        [values for _, values in rows],
+        index=index.take([position for position, _ in rows]),
+        columns=SIMULATION_COLUMNS,
+    )
+    logger.info(
+        f"[SIMULATION] {len(result):,} unidade(s) × {scenarios:,} cenário(s) em {workers} processo(s)"
+    )
+    return result
@@ -0,0 +1,463 @@
+"""
+Sketches: Resumos aproximados e mergeáveis de distribuições.
+
+t-digest (Dunning, 2019): representa uma distribuição por centróides
+(média, peso), com centróides pequenos nas caudas e grandes no centro,
+mantendo erro relativo baixo em quantis extremos (p99). Dois digests são
+combinados concatenando centróides e recomprimindo, sem reler registros.
+
+A compressão é vetorizada para muitos grupos de uma vez (ex: um digest
+por CNES × mês): centróides de todos os grupos são ordenados por
+(grupo, valor) e cada centróide é atribuído a um bin da função de escala
+k1(q) = δ/2π · asin(2q - 1); bins vizinhos são somados com np.add.reduceat.
+
+HyperLogLog (Flajolet et al., 2007): contagem aproximada de valores
+distintos com 2^p registros de 1 byte. Cada valor é hasheado; os p bits
+iniciais escolhem o registro, que guarda o maior número de zeros à
+esquerda observado no restante do hash. Merge = máximo registro a registro.
+
+Space-Saving (Metwally et al., 2005) em lotes: itens frequentes (heavy
+hitters) com no máximo `capacity` contadores por resumo. Cada contador
+guarda a contagem estimada (limite superior) e o erro máximo; o piso
+(floor) limita a contagem de qualquer item fora do resumo. No merge
+(Agarwal et al., 2012), um item ausente de um resumo recebe o piso desse
+resumo como contagem e erro; os `capacity` maiores contadores são
+mantidos e o maior descartado eleva o piso. O piso de cada resumo é uma
+linha com item nulo, de modo que resumos de grupos diferentes podem ser
+concatenados em formato longo e combinados com um único groupby.
+"""
+
+from collections.abc import Sequence
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from src.config import SKETCH_CONFIG
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+
+# Chave fixa (16 caracteres) para hashing determinístico entre execuções
+_HLL_HASH_KEY = "datasus-hll-key."
+
+COUNTER_COLUMNS = ["group", "item", "count", "error", "floor"]
+
+
+def quantile_label(q: float) -> str:
+    """Rótulo do quantil (0.5 → 'p50', 0.99 → 'p99')."""
+    return f"p{q * 100:g}"
+
+
+def compress_centroids(
+    groups: IntArray,
+    means: FloatArray,
+    weights: FloatArray,
+    compression: float = SKETCH_CONFIG["tdigest_compression"],
+) -> tuple[IntArray, FloatArray, FloatArray]:
+    """
+    Comprime centróides de vários digests de uma vez.
+
+    Args:
+        groups: Código do grupo (digest) de cada centróide
+        means: Média de cada centróide (valores brutos têm peso 1)
+        weights: Peso de cada centróide
+        compression: Parâmetro δ do t-digest (~δ/2 centróides por grupo)
+
+    Returns:
+        Tupla (groups, means, weights) comprimida, ordenada por grupo e média
+    """
+    valid = ~np.isnan(means) & (weights > 0)
+    groups, means, weights = groups[valid], means[valid], weights[valid]
+    if len(means) == 0:
+        return groups, means, weights
+
+    order = np.lexsort((means, groups))
+    groups, means, weights = groups[order], means[order], weights[order]
+
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    segment = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(groups)]))
+    cumulative = np.cumsum(weights)
+    within = cumulative - (cumulative - weights)[starts][segment]
+    totals = np.add.reduceat(weights, starts)[segment]
+
+    q = (within - weights / 2) / totals
+    bins = np.floor(compression / (2 * np.pi) * np.arcsin(np.clip(2 * q - 1, -1.0, 1.0)))
+
+    boundaries = np.flatnonzero(np.r_[True, (groups[1:] != groups[:-1]) | (bins[1:] != bins[:-1])])
+    merged_weights = np.add.reduceat(weights, boundaries)
+    merged_means = np.add.reduceat(means * weights, boundaries) / merged_weights
+    return groups[boundaries], merged_means, merged_weights
+
+
+def centroid_quantiles(
+    means: FloatArray, weights: FloatArray, quantiles: Sequence[float]
+) -> FloatArray:
+    """
+    Quantis de um digest (centróides ordenados por média).
+
+    Interpola linearmente entre centróides; com centróides unitários
+    (digest não comprimido) o resultado é igual ao pandas/numpy 'linear'.
+
+    Returns:
+        Array com um valor por quantil (NaN se o digest estiver vazio)
+    """
+    if len(means) == 0:
+        return np.full(len(quantiles), np.nan)
+    total = weights.sum()
+    positions = np.cumsum(weights) - weights / 2 - 0.5
+    targets = np.asarray(quantiles, dtype=np.float64) * (total - 1)
+    return np.interp(targets, positions, means)
+
+
+def grouped_quantiles(
+    groups: IntArray,
+    means: FloatArray,
+    weights: FloatArray,
+    quantiles: Sequence[float] = DEFAULT_QUANTILES,
+) -> tuple[IntArray, FloatArray]:
+    """
+    Quantis de vários digests comprimidos (saída de compress_centroids).
+
+    Returns:
+        Tupla (grupos, matriz grupos × quantis)
+    """
+    if len(groups) == 0:
+        return groups, np.empty((0, len(quantiles)))
+    starts = np.flatnonzero(np.r_[True, groups[1:] != groups[:-1]])
+    bounds = np.r_[starts, len(groups)]
+    values = np.vstack(
+        [
+            centroid_quantiles(means[lo:hi], weights[lo:hi], quantiles)
+            for lo, hi in zip(bounds[:-1], bounds[1:], strict=True)
+        ]
+    )
+    return groups[starts], values
+
+
+class TDigest:
+    """
+    t-digest de uma distribuição numérica.
+
+    Exemplo:
+        >>> digest = TDigest().update(df["stay_days"].to_numpy())
+        >>> digest.merge(other).quantile([0.5, 0.9, 0.99])
+    """
+
+    def __init__(
+        self,
+        compression: float = SKETCH_CONFIG["tdigest_compression"],
+        means: FloatArray | None = None,
+        weights: FloatArray | None = None,
+    ) -> None:
+        """
+        Inicializa digest vazio (ou a partir de centróides).
+
+        Args:
+            compression: Parâmetro δ (maior = mais preciso)
+            means: Médias dos centróides (opcional)
+            weights: Pesos dos centróides (opcional)
+
+        Raises:
+            ValueError: Se compression não for positivo
+        """
+        if compression <= 0:
+            raise ValueError("Compressão deve ser maior que zero")
+        self.compression = compression
+        self.means: FloatArray = np.empty(0) if means is None else np.asarray(means, np.float64)
+        self.weights: FloatArray = (
+            np.empty(0) if weights is None else np.asarray(weights, np.float64)
+        )
+
+    def _absorb(self, means: FloatArray, weights: FloatArray) -> "TDigest":
+        all_means = np.concatenate([self.means, means])
+        all_weights = np.concatenate([self.weights, weights])
+        _, self.means, self.weights = compress_centroids(
+            np.zeros(len(all_means), dtype=np.int64), all_means, all_weights, self.compression
+        )
+        return self
+
+    def update(self, values: npt.ArrayLike) -> "TDigest":
+        """Incorpora valores brutos (NaN ignorado)."""
+        array = np.asarray(values, dtype=np.float64).ravel()
+        return self._absorb(array, np.ones(len(array)))
+
+    def merge(self, other: "TDigest") -> "TDigest":
+        """Combina com outro digest."""
+        return self._absorb(other.means, other.weights)
+
+    @property
+    def count(self) -> float:
+        """Número de valores incorporados."""
+        return float(self.weights.sum())
+
+    def quantile(self, q: float | Sequence[float]) -> float | FloatArray:
+        """
+        Quantil(is) aproximado(s).
+
+        Args:
+            q: Quantil (0-1) ou sequência de quantis
+
+        Returns:
+            Valor (float) ou array de valores; NaN se o digest estiver vazio
+        """
+        if isinstance(q, float | int):
+            return float(centroid_quantiles(self.means, self.weights, [q])[0])
+        return centroid_quantiles(self.means, self.weights, q)
+
+
+def _bit_length(values: npt.NDArray[np.uint64]) -> IntArray:
+    """Número de bits significativos de cada valor (exato, sem float)."""
+    values = values.copy()
+    length = np.zeros(len(values), dtype=np.int64)
+    for shift in (32, 16, 8, 4, 2, 1):
+        high = values >= (np.uint64(1) << np.uint64(shift))
+        length[high] += shift
+        values[high] >>= np.uint64(shift)
+    return length + (values > 0)
+
+
+def hll_observations(
+    values: npt.ArrayLike, precision: int = SKETCH_CONFIG["hll_precision"]
+) -> tuple[IntArray, npt.NDArray[np.uint8]]:
+    """
+    Registro e posto (zeros à esquerda + 1) de cada valor.
+
+    Valores nulos são ignorados.
+
+    Args:
+        values: Valores (qualquer tipo hasheável pelo pandas)
+        precision: Bits de registro (p)
+
+    Returns:
+        Tupla (registros, postos), uma posição por valor não nulo
+    """
+    series = pd.Series(np.asarray(values, dtype=object)).dropna().astype(str)
+    hashes = pd.util.hash_array(series.to_numpy(dtype=object), hash_key=_HLL_HASH_KEY)
+    width = 64 - precision
+    registers = (hashes >> np.uint64(width)).astype(np.int64)
+    remainder = hashes & np.uint64((1 << width) - 1)
+    ranks = (width - _bit_length(remainder) + 1).astype(np.uint8)
+    return registers, ranks
+
+
+def hll_estimate(registers: npt.NDArray[np.uint8]) -> FloatArray:
+    """
+    Estimativa de cardinalidade para cada linha de uma matriz de registros.
+
+    Args:
+        registers: Matriz grupos × 2^p
+
+    Returns:
+        Array com a estimativa de cada grupo
+    """
+    registers = np.atleast_2d(registers)
+    m = registers.shape[1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.power(2.0, -registers.astype(np.float64)).sum(axis=1)
+
+    # Correção para cardinalidades pequenas (linear counting)
+    zeros = (registers == 0).sum(axis=1)
+    small = (raw <= 2.5 * m) & (zeros > 0)
+    linear = m * np.log(m / np.maximum(zeros, 1))
+    return np.where(small, linear, raw)
+
+
+class HyperLogLog:
+    """
+    Sketch HyperLogLog de contagem de distintos.
+
+    Exemplo:
+        >>> hll = HyperLogLog().update(df["MUNIC_RES"])
+        >>> hll.merge(other).count()
+    """
+
+    def __init__(
+        self,
+        precision: int = SKETCH_CONFIG["hll_precision"],
+        registers: npt.NDArray[np.uint8] | None = None,
+    ) -> None:
+        """
+        Inicializa sketch vazio (ou a partir de registros).
+
+        Args:
+            precision: Bits de registro (4-18); erro relativo ~1.04 / sqrt(2^p)
+            registers: Registros pré-existentes (opcional)
+
+        Raises:
+            ValueError: Se precision estiver fora do intervalo suportado
+        """
+        if not 4 <= precision <= 18:
+            raise ValueError("Precisão do HyperLogLog deve estar entre 4 e 18")
+        self.precision = precision
+        self.registers = (
+            np.zeros(1 << precision, dtype=np.uint8) if registers is None else registers
+        )
+
+    def update(self, values: npt.ArrayLike) -> "HyperLogLog":
+        """Incorpora valores (nulos ignorados)."""
+        registers, ranks = hll_observations(values, self.precision)
+        np.maximum.at(self.registers, registers, ranks)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        """
+        Combina com outro sketch (união dos conjuntos).
+
+        Raises:
+            ValueError: Se as precisões forem diferentes
+        """
+        if other.precision != self.precision:
+            raise ValueError(f"Precisão incompatível: {self.precision} != {other.precision}")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def count(self) -> int:
+        """Número estimado de valores distintos."""
+        return int(round(float(hll_estimate(self.registers)[0])))
+
+
+def merge_counters(
+    counters: pd.DataFrame, capacity: int = SKETCH_CONFIG["heavy_hitters_capacity"]
+) -> pd.DataFrame:
+    """
+    Combina resumos Space-Saving de vários grupos de uma vez.
+
+    Args:
+        counters: DataFrame com COUNTER_COLUMNS; cada linha é um contador de
+            um resumo (item não nulo, com o piso do seu resumo em 'floor') ou
+            o piso de um resumo (item nulo, piso em 'floor'). Contagens exatas
+            são contadores com erro e piso zero.
+        capacity: Número máximo de contadores por grupo
+
+    Returns:
+        DataFrame com COUNTER_COLUMNS: contadores de cada grupo ordenados por
+        contagem decrescente, seguidos de uma linha de piso se piso > 0
+    """
+    rest = counters["item"].isna().to_numpy()
+    groups = counters["group"].to_numpy(dtype=np.int64)
+    size = int(groups.max()) + 1 if len(groups) else 0
+    total_floor = np.bincount(
+        groups[rest], weights=counters["floor"].to_numpy(dtype=np.float64)[rest], minlength=size
+    ).astype(np.int64)
+
+    merged = (
+        counters[~rest]
+        .groupby(["group", "item"], sort=False)[["count", "error", "floor"]]
+        .sum()
+        .reset_index()
+    )
+    # Piso dos resumos do grupo em que o item não aparece
+    missing = total_floor[merged["group"].to_numpy(dtype=np.int64)] - merged["floor"]
+    merged["count"] = (merged["count"] + missing).astype(np.int64)
+    merged["error"] = (merged["error"] + missing).astype(np.int64)
+    merged = merged.sort_values(
+        ["group", "count", "item"], ascending=[True, False, True], ignore_index=True
+    )
+
+    rank = merged.groupby("group", sort=False).cumcount().to_numpy()
+    dropped = merged[rank >= capacity]
+    floor = total_floor.copy()
+    np.maximum.at(
+        floor,
+        dropped["group"].to_numpy(dtype=np.int64),
+        dropped["count"].to_numpy(dtype=np.int64),
+    )
+
+    kept = merged[rank < capacity].copy()
+    kept["floor"] = floor[kept["group"].to_numpy(dtype=np.int64)]
+    floored = np.flatnonzero(floor > 0)
+    rests = pd.DataFrame(
+        {"group": floored, "item": None, "count": 0, "error": 0, "floor": floor[floored]}
+    )
+    if rests.empty:
+        return kept[COUNTER_COLUMNS].reset_index(drop=True)
+    combined: pd.DataFrame = pd.concat([kept, rests], ignore_index=True)
+    return combined.sort_values("group", kind="stable", ignore_index=True)[COUNTER_COLUMNS]
+
+
+def exact_counters(groups: IntArray, values: npt.ArrayLike) -> pd.DataFrame:
+    """
+    Contadores exatos (erro e piso zero) de valores por grupo; nulos ignorados.
+
+    Args:
+        groups: Código do grupo de cada valor
+        values: Valores (convertidos para texto)
+
+    Returns:
+        DataFrame com COUNTER_COLUMNS (sem truncar; ver merge_counters)
+    """
+    series = pd.Series(values, dtype="object")
+    present = series.notna().to_numpy()
+    counts = (
+        pd.DataFrame({"group": groups[present], "item": series[present].astype(str).to_numpy()})
+        .groupby(["group", "item"], sort=False)
+        .size()
+        .reset_index(name="count")
+    )
+    counts["error"] = 0
+    counts["floor"] = 0
+    return counts[COUNTER_COLUMNS]
+
+
+class SpaceSaving:
+    """
+    Sketch Space-Saving de itens mais frequentes (heavy hitters).
+
+    Exemplo:
+        >>> sketch = SpaceSaving().update(df["DIAG_PRINC"])
+        >>> sketch.merge(other).top(10)
+    """
+
+    def __init__(self, capacity: int = SKETCH_CONFIG["heavy_hitters_capacity"]) -> None:
+        """
+        Inicializa sketch vazio.
+
+        Args:
+            capacity: Número máximo de contadores; itens com frequência acima
+                de N / capacity estão garantidamente no resumo
+
+        Raises:
+            ValueError: Se capacity não for positivo
+        """
+        if capacity < 1:
+            raise ValueError("Capacidade do Space-Saving deve ser positiva")
+        self.capacity = capacity
+        self.counters = pd.DataFrame(columns=COUNTER_COLUMNS)
+
+    def _absorb(self, counters: pd.DataFrame) -> "SpaceSaving":
+        frames = [f for f in (self.counters, counters) if not f.empty]
+        if frames:
+            self.counters = merge_counters(pd.concat(frames, ignore_index=True), self.capacity)
+        return self
+
+    def update(self, values: npt.ArrayLike) -> "SpaceSaving":
+        """Incorpora um lote de valores (nulos ignorados)."""
+        series = pd.Series(values, dtype="object")
+        return self._absorb(exact_counters(np.zeros(len(series), dtype=np.int64), series))
+
+    def merge(self, other: "SpaceSaving") -> "SpaceSaving":
+        """Combina com outro sketch (contagens somadas, capacidade deste sketch)."""
+        return self._absorb(other.counters)
+
+    @property
+    def floor(self) -> int:
+        """Limite superior da contagem de qualquer item fora do resumo."""
+        rest = self.counters[self.counters["item"].isna()]
+        return int(rest["floor"].sum())
+
+    def top(self, k: int = 10) -> pd.DataFrame:
+        """
+        Itens mais frequentes.
+
+        Args:
+            k: Número de itens
+
+        Returns:
+            DataFrame indexado pelo item com 'count' (estimativa, limite
+            superior) e 'error' (count - error é limite inferior)
+        """
+        items = self.counters[self.counters["item"].notna()].head(k)
+        return items.set_index("item")[["count", "error"]].astype(np.int64)
@@ -0,0 +1,410 @@
+"""
+Padronização por idade e sexo: razões de mortalidade e taxas de internação.
+
+Estratos = faixa etária (AGE_GROUPS) × sexo (1 = masculino, 3 = feminino).
+Contagens por grupo × estrato são montadas em uma matriz com um único
+np.bincount (sem groupby por grupo); as padronizações são operações
+matriciais sobre essa matriz, viáveis para ~5.570 municípios ou ~10 mil
+CIDs em segundos.
+
+- Padronização direta: taxas específicas por estrato do grupo ponderadas
+  pela distribuição de uma população padrão
+- Padronização indireta: óbitos/internações esperados aplicando taxas de
+  referência por estrato à composição do grupo; razão observado/esperado
+  (SMR para mortalidade)
+
+Mortalidade hospitalar usa internações como denominador (referência: todas
+as internações informadas). Taxas de internação por município de residência
+usam a população do IBGE como denominador, lida de uma tabela local
+(CSV ou Parquet) e normalizada em cache Parquet no CACHE_DIR.
+
+Exemplo:
+    >>> mortality_ratios(df, group_by="CNES")
+    >>> hospitalization_rates(df, PopulationTable.load(), year=2024)
+"""
+
+import logging
+from pathlib import Path
+from statistics import NormalDist
+from typing import cast
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from src.config import CACHE_DIR, POPULATION_CONFIG
+from src.transform.transformer import AGE_GROUPS, age_groups
+
+logger = logging.getLogger(__name__)
+
+FloatMatrix = npt.NDArray[np.float64]
+
+# Códigos de sexo do SIH (1 = masculino, 3 = feminino)
+SEXES = ["1", "3"]
+
+STRATA = pd.MultiIndex.from_product([AGE_GROUPS, SEXES], names=["age_group", "SEXO"])
+
+# Grafias de sexo aceitas (SIH usa 1/3; tabelas do IBGE costumam usar 1/2 ou M/F)
+SEX_CODES = {
+    "1": "1",
+    "M": "1",
+    "MASCULINO": "1",
+    "HOMENS": "1",
+    "2": "3",
+    "3": "3",
+    "F": "3",
+    "FEMININO": "3",
+    "MULHERES": "3",
+}
+
+# Nomes de colunas aceitos na tabela de população → nome canônico
+POPULATION_ALIASES = {
+    "cod_municipio": "MUNIC_RES",
+    "municipio": "MUNIC_RES",
+    "ano": "year",
+    "sexo": "SEXO",
+    "idade": "IDADE",
+    "faixa_etaria": "age_group",
+    "populacao": "population",
+}
+
+POPULATION_COLUMNS = ["MUNIC_RES", "year", "SEXO", "age_group", "population"]
+
+
+def normalize_sex(values: pd.Series) -> pd.Series:
+    """Códigos de sexo no padrão do SIH ('1'/'3'; demais → NA)."""
+    text = values.astype("string").str.strip().str.upper()
+    return text.map(SEX_CODES).astype("string")
+
+
+def normalize_municipality(values: pd.Series) -> pd.Series:
+    """Código de município com 6 dígitos (código IBGE sem dígito verificador)."""
+    return values.astype("string").str.strip().str[:6]
+
+
+def stratum_codes(age_group: pd.Series, sexo: pd.Series) -> npt.NDArray[np.int64]:
+    """
+    Posição de cada registro em STRATA (-1 se idade ou sexo desconhecido).
+
+    Args:
+        age_group: Faixa etária (rótulos de AGE_GROUPS)
+        sexo: Sexo (qualquer grafia de SEX_CODES)
+
+    Returns:
+        Array de códigos de estrato
+    """
+    age = pd.Categorical(age_group.astype("string"), categories=AGE_GROUPS).codes
+    sex = pd.Categorical(normalize_sex(sexo), categories=SEXES).codes
+    codes = age.astype(np.int64) * len(SEXES) + sex
+    codes[(age < 0) | (sex < 0)] = -1
+    return codes
+
+
+def stratum_matrix(
+    groups: pd.Series,
+    codes: npt.NDArray[np.int64],
+    weights: npt.ArrayLike | None = None,
+    index: pd.Index | None = None,
+) -> tuple[pd.Index, FloatMatrix]:
+    """
+    Soma de pesos por grupo × estrato em um único bincount.
+
+    Args:
+        groups: Grupo de cada registro
+        codes: Estrato de cada registro (saída de stratum_codes)
+        weights: Peso de cada registro (padrão: 1 = contagem)
+        index: Grupos das linhas (padrão: grupos observados, ordenados);
+            registros de outros grupos são ignorados
+
+    Returns:
+        Tupla (grupos, matriz grupos × estratos)
+    """
+    values = np.ones(len(codes)) if weights is None else np.asarray(weights, dtype=np.float64)
+    if index is None:
+        index = pd.Index(groups.dropna().unique()).sort_values()
+    rows = index.get_indexer(pd.Index(groups))
+    valid = (rows >= 0) & (codes >= 0) & ~np.isnan(values)
+
+    size = len(STRATA)
+    flat = rows[valid] * size + codes[valid]
+    matrix = np.bincount(flat, weights=values[valid], minlength=len(index) * size)
+    return index, matrix.astype(np.float64).reshape(len(index), size)
+
+
+def _ratio(numerator: FloatMatrix, denominator: FloatMatrix) -> FloatMatrix:
+    """Divisão elemento a elemento com 0 onde o denominador é zero."""
+    return np.divide(numerator, denominator, out=np.zeros_like(numerator), where=denominator > 0)
+
+
+def _require(df: pd.DataFrame, columns: list[str]) -> None:
+    missing = [c for c in columns if c not in df.columns]
+    if missing:
+        raise KeyError(f"Colunas ausentes para padronização: {missing}")
+
+
+class PopulationTable:
+    """
+    População residente por município × ano × sexo × faixa etária (IBGE).
+
+    A tabela de origem é lida uma vez e normalizada (códigos de 6 dígitos,
+    sexo 1/3, faixas de AGE_GROUPS) em um Parquet de cache, reaproveitado
+    enquanto for mais novo que a origem.
+    """
+
+    def __init__(self, data: pd.DataFrame) -> None:
+        """
+        Inicializa a partir de dados normalizados.
+
+        Args:
+            data: DataFrame com colunas POPULATION_COLUMNS
+        """
+        self.data = data
+
+    @staticmethod
+    def normalize(raw: pd.DataFrame) -> pd.DataFrame:
+        """
+        Normaliza uma tabela de população do IBGE.
+
+        Aceita idade simples (IDADE/idade) ou faixa etária (age_group/faixa_etaria)
+        e colunas com os nomes de POPULATION_ALIASES.
+
+        Args:
+            raw: Tabela de origem
+
+        Returns:
+            DataFrame agregado com colunas POPULATION_COLUMNS
+
+        Raises:
+            KeyError: Se faltarem município, sexo, idade ou população
+        """
+        df = raw.rename(columns=lambda c: POPULATION_ALIASES.get(str(c).lower(), c))
+        if "age_group" not in df.columns and "IDADE" in df.columns:
+            df["age_group"] = age_groups(df["IDADE"])
+        _require(df, ["MUNIC_RES", "SEXO", "age_group", "population"])
+
+        work = pd.DataFrame(
+            {
+                "MUNIC_RES": normalize_municipality(df["MUNIC_RES"]),
+                "year": pd.to_numeric(df["year"]).astype("Int64") if "year" in df else pd.NA,
+                "SEXO": normalize_sex(df["SEXO"]),
+                "age_group": df["age_group"].astype("string"),
+                "population": pd.to_numeric(df["population"], errors="coerce"),
+            }
+        )
+        work = work.dropna(subset=["MUNIC_RES", "SEXO", "age_group", "population"])
+        work["year"] = work["year"].astype("Int64")
+        grouped: pd.DataFrame = (
+            work.groupby(POPULATION_COLUMNS[:-1], dropna=False, observed=True)["population"]
+            .sum()
+            .reset_index()
+        )
+        return grouped
+
+    @classmethod
+    def load(
+        cls,
+        path: str | Path | None = None,
+        cache_dir: str | Path = CACHE_DIR,
+    ) -> "PopulationTable":
+        """
+        Carrega tabela local (CSV ou Parquet), usando o cache normalizado se válido.
+
+        Args:
+            path: Arquivo de população do IBGE (padrão: POPULATION_CONFIG)
+            cache_dir: Diretório do cache normalizado
+
+        Returns:
+            PopulationTable
+
+        Raises:
+            FileNotFoundError: Se o arquivo não existir
+        """
+        source = Path(path if path is not None else str(POPULATION_CONFIG["path"]))
+        if not source.exists():
+            raise FileNotFoundError(f"Tabela de população não encontrada: {source}")
+
+        cached = Path(cache_dir) / f"population_{source.stem}.parquet"
+        if cached.exists() and cached.stat().st_mtime_ns >= source.stat().st_mtime_ns:
+            logger.info(f"[POPULATION] Cache: {cached}")
+            return cls(pd.read_parquet(cached))
+
+        if source.suffix == ".parquet":
+            raw = pd.read_parquet(source)
+        else:
+            raw = pd.read_csv(source, dtype=str)
+        data = cls.normalize(raw)
+
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        data.to_parquet(cached, index=False)
+        logger.info(f"[POPULATION] {len(data):,} linhas normalizadas em {cached}")
+        return cls(data)
+
+    @property
+    def years(self) -> list[int]:
+        """Anos disponíveis (vazio se a tabela não tiver ano)."""
+        return sorted(int(y) for y in self.data["year"].dropna().unique())
+
+    def matrix(self, year: int | None = None) -> tuple[pd.Index, FloatMatrix]:
+        """
+        População por município × estrato.
+
+        Args:
+            year: Ano da estimativa (padrão: o mais recente da tabela)
+
+        Returns:
+            Tupla (municípios, matriz municípios × estratos)
+
+        Raises:
+            ValueError: Se o ano não existir na tabela
+        """
+        data = self.data
+        if self.years:
+            year = year if year is not None else self.years[-1]
+            if year not in self.years:
+                raise ValueError(f"Ano {year} ausente na tabela de população: {self.years}")
+            data = data[data["year"] == year]
+
+        codes = stratum_codes(data["age_group"], data["SEXO"])
+        return stratum_matrix(data["MUNIC_RES"], codes, data["population"].to_numpy())
+
+
+def mortality_ratios(
+    df: pd.DataFrame,
+    group_by: str = "DIAG_PRINC",
+    reference: pd.DataFrame | None = None,
+    alpha: float = 0.05,
+) -> pd.DataFrame:
+    """
+    Mortalidade hospitalar padronizada por idade e sexo.
+
+    Args:
+        df: Internações com death, age_group, SEXO e a coluna de grupo
+        group_by: Grupo comparado (ex: 'DIAG_PRINC', 'CNES')
+        reference: Internações de referência para as taxas por estrato
+            (padrão: o próprio df, ex: base nacional)
+        alpha: Nível de significância do intervalo da SMR
+
+    Returns:
+        DataFrame indexado pelo grupo com admissions, deaths,
+        expected_deaths, smr, smr_lower, smr_upper (aproximação de Byar),
+        crude_mortality e standardized_mortality (direta, em %)
+
+    Raises:
+        KeyError: Se faltarem colunas
+    """
+    _require(df, ["death", "age_group", "SEXO", group_by])
+    reference = df if reference is None else reference
+    _require(reference, ["death", "age_group", "SEXO"])
+
+    codes = stratum_codes(df["age_group"], df["SEXO"])
+    deaths_flag = df["death"].astype(float).to_numpy()
+    index, admissions = stratum_matrix(df[group_by], codes)
+    _, deaths = stratum_matrix(df[group_by], codes, deaths_flag, index=index)
+
+    ref_codes = stratum_codes(reference["age_group"], reference["SEXO"])
+    valid = ref_codes >= 0
+    ref_admissions = np.bincount(ref_codes[valid], minlength=len(STRATA)).astype(np.float64)
+    ref_deaths = np.bincount(
+        ref_codes[valid],
+        weights=reference["death"].astype(float).to_numpy()[valid],
+        minlength=len(STRATA),
+    ).astype(np.float64)
+    ref_rates = _ratio(ref_deaths, ref_admissions)
+    weights = ref_admissions / ref_admissions.sum() if ref_admissions.sum() else ref_admissions
+
+    observed = deaths.sum(axis=1)
+    total = admissions.sum(axis=1)
+    expected = admissions @ ref_rates
+    smr = _ratio(observed, expected)
+
+    # Intervalo de confiança (Byar) para contagem Poisson de óbitos
+    z = NormalDist().inv_cdf(1 - alpha / 2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lower_count = np.where(
+            observed > 0,
+            observed * (1 - 1 / (9 * observed) - z / (3 * np.sqrt(observed))) ** 3,
+            0.0,
+        )
+        upper = observed + 1
+        upper_count = upper * (1 - 1 / (9 * upper) + z / (3 * np.sqrt(upper))) ** 3
+
+    result = pd.DataFrame(
+        {
+            "admissions": total.astype(np.int64),
+            "deaths": observed.astype(np.int64),
+            "expected_deaths": expected,
+            "smr": np.where(expected > 0, smr, np.nan),
+            "smr_lower": np.where(expected > 0, _ratio(lower_count, expected), np.nan),
+            "smr_upper": np.where(expected > 0, _ratio(upper_count, expected), np.nan),
+            "crude_mortality": _ratio(observed, total) * 100,
+            "standardized_mortality": _ratio(deaths, admissions) @ weights * 100,
+        },
+        index=index.rename(group_by),
+    )
+    logger.info(f"[STANDARDIZE] SMR para {len(result):,} grupo(s) de {group_by}")
+    return result
+
+
+def hospitalization_rates(
+    df: pd.DataFrame,
+    population: PopulationTable,
+    year: int | None = None,
+    per: int | None = None,
+) -> pd.DataFrame:
+    """
+    Taxas de internação por município de residência, padronizadas por idade e sexo.
+
+    A população padrão (direta) e as taxas de referência (indireta) são as
+    do conjunto de municípios da tabela de população.
+
+    Args:
+        df: Internações com MUNIC_RES, age_group e SEXO
+        population: Tabela de população do IBGE
+        year: Ano da população (padrão: o mais recente)
+        per: Base da taxa (padrão: POPULATION_CONFIG, 100.000 habitantes)
+
+    Returns:
+        DataFrame indexado por MUNIC_RES (todos os municípios da tabela) com
+        admissions, population, crude_rate, direct_rate, expected,
+        ratio (observado/esperado) e indirect_rate
+
+    Raises:
+        KeyError: Se faltarem colunas
+        ValueError: Se o ano não existir na tabela de população
+    """
+    _require(df, ["MUNIC_RES", "age_group", "SEXO"])
+    per = per if per is not None else cast(int, POPULATION_CONFIG["rate_base"])
+    index, people = population.matrix(year)
+
+    municipalities = normalize_municipality(df["MUNIC_RES"])
+    codes = stratum_codes(df["age_group"], df["SEXO"])
+    _, admissions = stratum_matrix(municipalities, codes, index=index)
+
+    unmatched = int((~municipalities.isin(index)).sum())
+    if unmatched:
+        logger.warning(f"[STANDARDIZE] {unmatched:,} internações sem município na população")
+
+    observed = admissions.sum(axis=1)
+    residents = people.sum(axis=1)
+    standard = people.sum(axis=0)
+    weights = standard / standard.sum() if standard.sum() else standard
+    reference_rates = _ratio(admissions.sum(axis=0), standard)
+    overall = admissions.sum() / standard.sum() if standard.sum() else 0.0
+
+    expected = people @ reference_rates
+    ratio = np.where(expected > 0, _ratio(observed, expected), np.nan)
+
+    result = pd.DataFrame(
+        {
+            "admissions": observed.astype(np.int64),
+            "population": residents,
+            "crude_rate": np.where(residents > 0, _ratio(observed, residents) * per, np.nan),
+            "direct_rate": _ratio(admissions, people) @ weights * per,
+            "expected": expected,
+            "ratio": ratio,
+            "indirect_rate": ratio * overall * per,
+        },
+        index=index.rename("MUNIC_RES"),
+    )
+    logger.info(f"[STANDARDIZE] Taxas de internação para {len(result):,} município(s)")
+    return result
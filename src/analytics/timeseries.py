@@ -0,0 +1,278 @@
+"""
+Séries temporais de KPIs: buckets por ano-mês ou dia, janelas móveis e variações.
+
+KPICalculator.volume(group_by="month") agrupa pelo número do mês (janeiro de
+2023 e de 2024 caem no mesmo grupo). Aqui cada período é uma data
+(primeiro dia do mês ou o próprio dia) e as medidas aditivas (contagens e
+somas) são guardadas em matrizes períodos × grupos com o calendário
+completo (períodos sem internação = 0). Assim:
+
+    - janelas móveis (7/30 dias) são rolling().sum() das medidas, para
+      todos os grupos de uma vez; médias (TMP, ticket) são razões das
+      somas móveis, não médias de médias
+    - variações mês a mês (MoM) e ano a ano (YoY) são shift(1) e shift(12)
+      da matriz mensal
+
+Fontes: DataFrame (mensal ou diário, a partir de DT_INTER) ou KPICube
+(mensal, a partir da competência das células).
+
+Exemplo:
+    >>> series = KPITimeSeries(df, freq="day", group_by="CNES")
+    >>> series.rolling(window=7, kpis=["volume", "revenue"])
+    >>> series.deltas(["volume"])  # volume, volume_mom, volume_mom_pct, volume_yoy, ...
+"""
+
+import logging
+from collections.abc import Sequence
+from typing import Literal, TypeAlias
+
+import numpy as np
+import pandas as pd
+
+from src.analytics.cube import KPICube
+from src.analytics.kpis import TABLE_KPIS, derive_kpi, grouped_measures
+
+logger = logging.getLogger(__name__)
+
+Frequency: TypeAlias = Literal["month", "day"]
+
+# Frequência → alias do pandas (período identificado pelo primeiro dia)
+FREQUENCIES = {"month": "MS", "day": "D"}
+
+# Medidas aditivas usadas pelos KPIs de TABLE_KPIS
+SERIES_MEASURES = ["records", "stay_days_sum", "stay_days_count", "VAL_TOT_sum", "VAL_TOT_count"]
+
+# Variação → deslocamento em meses
+DELTA_LAGS = {"mom": 1, "yoy": 12}
+
+
+def bucket_dates(dates: pd.Series, freq: Frequency = "month") -> pd.Series:
+    """
+    Data do período de cada registro (primeiro dia do mês ou o próprio dia).
+
+    Args:
+        dates: Datas (ex: DT_INTER)
+        freq: 'month' ou 'day'
+
+    Returns:
+        Series datetime64 com o início do período (NaT preservado)
+
+    Raises:
+        ValueError: Se a frequência não for suportada
+    """
+    if freq not in FREQUENCIES:
+        raise ValueError(f"Frequência não suportada: {freq} (use {list(FREQUENCIES)})")
+    unit = "M" if freq == "month" else "D"
+    values = pd.to_datetime(dates, errors="coerce").to_numpy(dtype=f"datetime64[{unit}]")
+    return pd.Series(values.astype("datetime64[ns]"), index=dates.index, name="period")
+
+
+class KPITimeSeries:
+    """
+    Séries de KPIs por período e grupo, em formato longo (grupos, period).
+
+    As medidas são agregadas uma única vez no construtor; rolling() e
+    deltas() operam sobre as matrizes períodos × grupos.
+    """
+
+    def __init__(
+        self,
+        source: pd.DataFrame | KPICube,
+        freq: Frequency = "month",
+        group_by: str | list[str] | None = None,
+    ) -> None:
+        """
+        Agrega medidas por período e grupo.
+
+        Args:
+            source: DataFrame com DT_INTER (ou KPICube, apenas freq='month')
+            freq: 'month' (ano-mês) ou 'day'
+            group_by: Coluna(s) de agrupamento (opcional)
+
+        Raises:
+            ValueError: Se a frequência não for suportada (ou 'day' com KPICube)
+            KeyError: Se DT_INTER ou coluna de agrupamento não existir
+        """
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Frequência não suportada: {freq} (use {list(FREQUENCIES)})")
+        self.freq = freq
+        self.keys = (
+            [] if group_by is None else [group_by] if isinstance(group_by, str) else group_by
+        )
+
+        if isinstance(source, KPICube):
+            measures = self._cube_measures(source)
+        else:
+            measures = self._frame_measures(source)
+
+        self._measures = self._complete(measures)
+        logger.info(
+            f"[SERIES] {len(self.periods)} período(s) × {self._measures['records'].shape[1]} grupo(s)"
+        )
+
+    def _frame_measures(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Medidas por (grupos, period) a partir de registros."""
+        if "DT_INTER" not in df.columns:
+            raise KeyError("Coluna 'DT_INTER' necessária para séries temporais")
+        sources = [c for c in ("stay_days", "VAL_TOT") if c in df.columns]
+        missing = [k for k in self.keys if k not in df.columns]
+        if missing:
+            raise KeyError(f"Colunas não encontradas no DataFrame: {missing}")
+
+        frame = df[[*self.keys, *sources]].assign(period=bucket_dates(df["DT_INTER"], self.freq))
+        return grouped_measures(frame, [*self.keys, "period"], sources)
+
+    def _cube_measures(self, cube: KPICube) -> pd.DataFrame:
+        """Medidas por (grupos, period) a partir das células do cubo."""
+        if self.freq != "month":
+            raise ValueError("KPICube só permite séries mensais (granularidade de competência)")
+        measures = cube.aggregate([*self.keys, "competencia"])
+        competencia = measures.index.get_level_values("competencia").astype(int)
+        period = pd.to_datetime(competencia.astype(str), format="%Y%m").rename("period")
+        if self.keys:
+            levels = [measures.index.get_level_values(k) for k in self.keys]
+            measures.index = pd.MultiIndex.from_arrays([*levels, period])
+        else:
+            measures.index = period
+        return measures
+
+    def _complete(self, measures: pd.DataFrame) -> dict[str, pd.DataFrame]:
+        """Matrizes períodos × grupos com o calendário completo (zeros nos buracos)."""
+        for column in SERIES_MEASURES:
+            if column not in measures.columns:
+                measures[column] = 0
+
+        if measures.empty:
+            periods = pd.DatetimeIndex([], name="period")
+        else:
+            dates = measures.index.get_level_values("period")
+            periods = pd.date_range(
+                dates.min(), dates.max(), freq=FREQUENCIES[self.freq], name="period"
+            )
+
+        wide = {}
+        for column in SERIES_MEASURES:
+            values = measures[column]
+            matrix = values.unstack(self.keys) if self.keys else values.to_frame("total")
+            wide[column] = matrix.reindex(periods, fill_value=0).fillna(0)
+        return wide
+
+    @property
+    def periods(self) -> pd.DatetimeIndex:
+        """Períodos da série (calendário completo)."""
+        return pd.DatetimeIndex(self._measures["records"].index)
+
+    def _long(self, wide: dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """Converte matrizes períodos × grupos em DataFrame longo (grupos, period)."""
+        if not self.keys:
+            return pd.DataFrame({name: matrix.iloc[:, 0] for name, matrix in wide.items()})
+        columns = {}
+        for name, matrix in wide.items():
+            stacked = matrix.stack(list(range(len(self.keys))), future_stack=True)
+            columns[name] = stacked
+        frame = pd.DataFrame(columns)
+        order = [*range(1, len(self.keys) + 1), 0]
+        return frame.reorder_levels(order).sort_index()
+
+    def _kpis(
+        self, measures: dict[str, pd.DataFrame], kpis: Sequence[str]
+    ) -> dict[str, pd.DataFrame]:
+        """KPIs (matrizes períodos × grupos) a partir das matrizes de medidas."""
+        unknown = [k for k in kpis if k not in TABLE_KPIS]
+        if unknown:
+            raise ValueError(f"KPIs não suportados em séries temporais: {unknown}")
+        return {kpi: derive_kpi(measures, kpi) for kpi in kpis}
+
+    def frame(self, kpis: Sequence[str] = ("volume", "revenue")) -> pd.DataFrame:
+        """
+        KPIs por período.
+
+        Args:
+            kpis: KPIs a calcular (ver TABLE_KPIS)
+
+        Returns:
+            DataFrame indexado por (grupos, period) com uma coluna por KPI;
+            médias de períodos sem internação ficam NaN
+
+        Raises:
+            ValueError: Se algum KPI não for suportado
+        """
+        return self._long(self._kpis(self._measures, kpis))
+
+    def wide(self, kpi: str = "volume") -> pd.DataFrame:
+        """
+        Matriz períodos × grupos de um KPI (calendário completo).
+
+        Args:
+            kpi: KPI (ver TABLE_KPIS)
+
+        Returns:
+            DataFrame indexado por period com uma coluna por grupo ('total'
+            sem agrupamento)
+
+        Raises:
+            ValueError: Se o KPI não for suportado
+        """
+        return self._kpis(self._measures, [kpi])[kpi]
+
+    def rolling(self, window: int = 7, kpis: Sequence[str] = ("volume", "revenue")) -> pd.DataFrame:
+        """
+        KPIs em janela móvel de `window` períodos (dias com freq='day').
+
+        Somas móveis das medidas; a janela é parcial no início da série.
+
+        Args:
+            window: Tamanho da janela em períodos (ex: 7 ou 30 dias)
+            kpis: KPIs a calcular (ver TABLE_KPIS)
+
+        Returns:
+            DataFrame indexado por (grupos, period) com colunas {kpi}_{window}d
+            (ou {kpi}_{window}m com freq='month')
+
+        Raises:
+            ValueError: Se window não for positivo ou algum KPI não for suportado
+        """
+        if window <= 0:
+            raise ValueError("Janela deve ser maior que zero")
+        rolled = {
+            column: matrix.rolling(window, min_periods=1).sum()
+            for column, matrix in self._measures.items()
+        }
+        suffix = "d" if self.freq == "day" else "m"
+        values = self._kpis(rolled, kpis)
+        return self._long({f"{kpi}_{window}{suffix}": m for kpi, m in values.items()})
+
+    def monthly(self) -> dict[str, pd.DataFrame]:
+        """Matrizes de medidas por ano-mês (série diária somada por mês)."""
+        if self.freq == "month":
+            return self._measures
+        return {column: matrix.resample("MS").sum() for column, matrix in self._measures.items()}
+
+    def deltas(self, kpis: Sequence[str] = ("volume", "revenue")) -> pd.DataFrame:
+        """
+        Variações mês a mês (MoM) e ano a ano (YoY) por grupo.
+
+        Séries diárias são somadas por mês antes da comparação.
+
+        Args:
+            kpis: KPIs a comparar (ver TABLE_KPIS)
+
+        Returns:
+            DataFrame indexado por (grupos, period) com colunas {kpi},
+            {kpi}_mom, {kpi}_mom_pct, {kpi}_yoy e {kpi}_yoy_pct (diferença
+            absoluta e percentual); NaN sem período de comparação ou com
+            base zero
+
+        Raises:
+            ValueError: Se algum KPI não for suportado
+        """
+        current = self._kpis(self.monthly(), kpis)
+        columns: dict[str, pd.DataFrame] = {}
+        for kpi, matrix in current.items():
+            values = matrix.astype(float)
+            columns[kpi] = matrix
+            for name, lag in DELTA_LAGS.items():
+                previous = values.shift(lag)
+                columns[f"{kpi}_{name}"] = values - previous
+                columns[f"{kpi}_{name}_pct"] = (values / previous.replace(0, np.nan) - 1) * 100
+        return self._long(columns)
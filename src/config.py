@@ -11,9 +11,19 @@ RAW_DIR = os.path.join(DATA_DIR, "raw")
 PROCESSED_DIR = os.path.join(DATA_DIR, "processed")
 LOGS_DIR = os.path.join(BASE_DIR, "logs")
 OUTPUTS_DIR = os.path.join(BASE_DIR, "outputs")
+CACHE_DIR = os.path.join(DATA_DIR, "cache")
+REFERENCE_DIR = os.path.join(DATA_DIR, "reference")
 
 # Criar diretórios se não existirem
-for directory in [DATA_DIR, RAW_DIR, PROCESSED_DIR, LOGS_DIR, OUTPUTS_DIR]:
+for directory in [
+    DATA_DIR,
+    RAW_DIR,
+    PROCESSED_DIR,
+    LOGS_DIR,
+    OUTPUTS_DIR,
+    CACHE_DIR,
+    REFERENCE_DIR,
+]:
     os.makedirs(directory, exist_ok=True)
 
 # Configurações DataSUS
@@ -22,3 +32,70 @@ DATASUS_CONFIG = {
     "default_year": 2024,
     "default_month": 1,
 }
+
+# Configurações do data lake (Parquet)
+LAKE_CONFIG = {
+    "row_group_size": 50_000,  # Linhas por row group (granularidade de leitura)
+    "bloom_fp_rate": 0.01,  # Taxa de falso positivo do Bloom filter do índice AIH
+}
+
+# Configurações do data warehouse (star schema)
+WAREHOUSE_CONFIG = {
+    "batch_size": 10_000,  # Linhas por executemany (array binding)
+}
+
+# Configurações do cache de resultados de KPI
+KPI_CACHE_CONFIG = {
+    "memory_entries": 256,  # Entradas no LRU em memória
+    "disk_bytes": 256 * 1024 * 1024,  # Orçamento do cache em disco (256 MB)
+}
+
+# Cubo de KPIs pré-agregado (atualizado pelo pipeline a cada partição carregada)
+KPI_CUBE_CONFIG = {
+    "path": os.path.join(PROCESSED_DIR, "kpi_cube.parquet"),  # Parquet do cubo (+ sidecars)
+}
+
+# Configurações dos sketches (estruturas aproximadas e mergeáveis)
+SKETCH_CONFIG = {
+    "tdigest_compression": 100,  # Compressão do t-digest (maior = mais preciso, mais centróides)
+    "hll_precision": 12,  # Bits de registro do HyperLogLog (2^12 registros, erro ~1.6%)
+    "heavy_hitters_capacity": 100,  # Contadores Space-Saving por resumo (itens mais frequentes)
+}
+
+# Configurações do executor paralelo de KPIs (map-reduce sobre partições)
+EXECUTOR_CONFIG = {
+    "workers": 0,  # Processos do pool (0 = número de núcleos da máquina)
+    "memory_limit": 2 * 1024**3,  # Teto de memória por worker em bytes (0 = sem teto)
+}
+
+# Leitos do CNES (arquivos LT locais, um por UF × competência, CSV ou Parquet)
+CNES_BEDS_CONFIG = {
+    "path": os.path.join(REFERENCE_DIR, "cnes_lt"),  # Arquivo ou diretório de extratos LT
+    "bed_column": "QT_EXIST",  # Leitos existentes (QT_SUS = apenas leitos SUS)
+}
+
+# Detecção de anomalias de valores de AIH (z-score robusto por PROC_REA)
+ANOMALY_CONFIG = {
+    "z_threshold": 3.5,  # |z| robusto acima do qual o valor é anômalo (Iglewicz-Hoaglin)
+    "min_records": 5,  # Mínimo de internações no grupo para calcular z-scores
+    "component_tolerance": 0.01,  # Diferença relativa tolerada entre VAL_TOT e componentes
+}
+
+# Previsão de volume (sazonal ingênuo e Holt-Winters aditivo em lote)
+FORECAST_CONFIG = {
+    "horizon": 12,  # Períodos previstos (meses ou dias, conforme a série)
+    "interval_level": 0.95,  # Nível dos intervalos de previsão
+}
+
+# Simulação Monte Carlo de demanda de leitos
+SIMULATION_CONFIG = {
+    "scenarios": 1_000,  # Cenários simulados por hospital × especialidade
+    "horizon_days": 30,  # Dias simulados após o aquecimento
+    "warmup_days": 30,  # Dias descartados até a ocupação estabilizar (sistema parte vazio)
+}
+
+# Tabela de população do IBGE (denominadores de taxas por habitante)
+POPULATION_CONFIG = {
+    "path": os.path.join(REFERENCE_DIR, "populacao_ibge.csv"),  # CSV ou Parquet local
+    "rate_base": 100_000,  # Taxas por 100 mil habitantes
+}
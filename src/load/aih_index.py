@@ -0,0 +1,319 @@
+"""
+Índice AIH: Consulta pontual de N_AIH no data lake Parquet.
+
+Cada partição (SIH_{UF}_{AAAAMM}.parquet) ganha um índice sidecar
+(SIH_{UF}_{AAAAMM}.aih.npz) construído no momento do load, contendo:
+
+- Bloom filter: descarta partições que certamente não contêm o N_AIH
+- Mapa ordenado N_AIH → row group: localiza o row group via busca binária
+
+Uma consulta lê apenas o row group que contém o registro, sem varrer
+os demais arquivos do lake.
+"""
+
+import logging
+import math
+import os
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.config import LAKE_CONFIG, PROCESSED_DIR
+
+logger = logging.getLogger(__name__)
+
+INDEX_SUFFIX = ".aih.npz"
+
+# Chaves fixas (16 caracteres) para hashing determinístico entre execuções
+_HASH_KEY_1 = "datasus-aih-h1.."
+_HASH_KEY_2 = "datasus-aih-h2.."
+
+
+def index_path_for(parquet_path: str | Path) -> Path:
+    """Retorna o caminho do índice sidecar de uma partição Parquet."""
+    path = Path(parquet_path)
+    return path.with_name(path.stem + INDEX_SUFFIX)
+
+
+class BloomFilter:
+    """
+    Bloom filter vetorizado sobre numpy (double hashing).
+
+    Responde "talvez contenha" ou "certamente não contém". Falsos
+    positivos são possíveis (taxa configurável); falsos negativos não.
+    """
+
+    def __init__(
+        self, num_bits: int, num_hashes: int, bits: npt.NDArray[np.bool_] | None = None
+    ) -> None:
+        """
+        Inicializa filtro vazio (ou a partir de bits existentes).
+
+        Args:
+            num_bits: Tamanho do array de bits
+            num_hashes: Número de funções hash
+            bits: Array de bits pré-existente (opcional)
+        """
+        if num_bits <= 0:
+            raise ValueError("Número de bits deve ser maior que zero")
+        if num_hashes <= 0:
+            raise ValueError("Número de hashes deve ser maior que zero")
+
+        self.num_bits = num_bits
+        self.num_hashes = num_hashes
+        self.bits = bits if bits is not None else np.zeros(num_bits, dtype=bool)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, fp_rate: float) -> "BloomFilter":
+        """
+        Dimensiona filtro para a capacidade e taxa de falso positivo desejadas.
+
+        Args:
+            capacity: Número esperado de chaves
+            fp_rate: Taxa de falso positivo (0 < fp_rate < 1)
+
+        Returns:
+            BloomFilter vazio dimensionado
+        """
+        if not 0 < fp_rate < 1:
+            raise ValueError("Taxa de falso positivo deve estar entre 0 e 1")
+
+        capacity = max(capacity, 1)
+        num_bits = math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))
+        num_hashes = max(1, round(num_bits / capacity * math.log(2)))
+        return cls(num_bits, num_hashes)
+
+    def _positions(self, keys: npt.NDArray[Any]) -> npt.NDArray[np.uint64]:
+        """Calcula posições (n_keys x num_hashes) de cada chave no array de bits."""
+        h1 = pd.util.hash_array(keys, hash_key=_HASH_KEY_1)
+        h2 = pd.util.hash_array(keys, hash_key=_HASH_KEY_2)
+        steps = np.arange(self.num_hashes, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            combined = h1[:, None] + steps[None, :] * h2[:, None]
+        return combined % np.uint64(self.num_bits)
+
+    def add(self, keys: npt.NDArray[Any]) -> None:
+        """Adiciona chaves ao filtro (vetorizado)."""
+        if len(keys) == 0:
+            return
+        self.bits[self._positions(np.asarray(keys, dtype=object)).ravel()] = True
+
+    def might_contain(self, key: str) -> bool:
+        """Retorna False se a chave certamente não está no filtro."""
+        positions = self._positions(np.array([key], dtype=object))
+        return bool(self.bits[positions].all())
+
+    def __contains__(self, key: object) -> bool:
+        return self.might_contain(str(key))
+
+
+class AIHIndex:
+    """
+    Índice sidecar de uma partição Parquet (Bloom filter + mapa N_AIH → row group).
+
+    Exemplo:
+        >>> index = AIHIndex.build("data/processed/SIH_AC_202401.parquet")
+        >>> index.save()
+        >>> df = index.lookup("1224100061118")
+    """
+
+    def __init__(
+        self,
+        parquet_path: str | Path,
+        bloom: BloomFilter,
+        keys: npt.NDArray[np.str_],
+        row_groups: npt.NDArray[np.int32],
+    ) -> None:
+        """
+        Inicializa índice.
+
+        Args:
+            parquet_path: Caminho da partição indexada
+            bloom: Bloom filter com todos os N_AIH da partição
+            keys: N_AIH ordenados
+            row_groups: Row group de cada chave (mesma ordem de keys)
+        """
+        self.parquet_path = Path(parquet_path)
+        self.bloom = bloom
+        self.keys = keys
+        self.row_groups = row_groups
+
+    @classmethod
+    def build(
+        cls, parquet_path: str | Path, key_column: str = "N_AIH", fp_rate: float | None = None
+    ) -> "AIHIndex":
+        """
+        Constrói índice lendo apenas a coluna de chave e o metadata do Parquet.
+
+        Args:
+            parquet_path: Caminho da partição Parquet
+            key_column: Coluna com o número da AIH
+            fp_rate: Taxa de falso positivo (padrão: LAKE_CONFIG)
+
+        Returns:
+            AIHIndex construído (não salvo)
+
+        Raises:
+            KeyError: Se key_column não existir no arquivo
+        """
+        parquet_file = pq.ParquetFile(parquet_path)
+        if key_column not in parquet_file.schema_arrow.names:
+            raise KeyError(f"Coluna '{key_column}' não encontrada em {parquet_path}")
+
+        column = parquet_file.read(columns=[key_column]).column(0)
+        keys = np.asarray(column.to_pandas().astype(str).to_numpy(), dtype=str)
+
+        rows_per_group = [
+            parquet_file.metadata.row_group(i).num_rows
+            for i in range(parquet_file.metadata.num_row_groups)
+        ]
+        row_groups = np.repeat(np.arange(len(rows_per_group), dtype=np.int32), rows_per_group)
+
+        order = np.argsort(keys, kind="stable")
+        bloom = BloomFilter.for_capacity(len(keys), fp_rate or LAKE_CONFIG["bloom_fp_rate"])
+        bloom.add(keys.astype(object))
+
+        logger.info(f"[INDEX] Índice AIH: {len(keys):,} chaves, {len(rows_per_group)} row groups")
+        return cls(parquet_path, bloom, keys[order], row_groups[order])
+
+    def save(self, path: str | Path | None = None) -> Path:
+        """
+        Salva índice em arquivo .npz ao lado da partição.
+
+        Args:
+            path: Caminho de destino (padrão: sidecar da partição)
+
+        Returns:
+            Caminho do arquivo salvo
+        """
+        target = Path(path) if path is not None else index_path_for(self.parquet_path)
+        with open(target, "wb") as f:
+            np.savez_compressed(
+                f,
+                bits=np.packbits(self.bloom.bits),
+                num_bits=np.int64(self.bloom.num_bits),
+                num_hashes=np.int64(self.bloom.num_hashes),
+                keys=self.keys,
+                row_groups=self.row_groups,
+            )
+        return target
+
+    @classmethod
+    def load(cls, path: str | Path, parquet_path: str | Path | None = None) -> "AIHIndex":
+        """
+        Carrega índice salvo.
+
+        Args:
+            path: Caminho do arquivo .npz
+            parquet_path: Partição indexada (padrão: inferida do nome do sidecar)
+
+        Returns:
+            AIHIndex carregado
+        """
+        path = Path(path)
+        if parquet_path is None:
+            parquet_path = path.with_name(path.name.removesuffix(INDEX_SUFFIX) + ".parquet")
+
+        with np.load(path, allow_pickle=False) as data:
+            num_bits = int(data["num_bits"])
+            bits = np.unpackbits(data["bits"])[:num_bits].astype(bool)
+            bloom = BloomFilter(num_bits, int(data["num_hashes"]), bits)
+            return cls(parquet_path, bloom, data["keys"], data["row_groups"])
+
+    def row_groups_for(self, n_aih: str) -> list[int]:
+        """
+        Localiza row groups que contêm o N_AIH (busca binária).
+
+        Args:
+            n_aih: Número da AIH
+
+        Returns:
+            Lista de row groups (vazia se o N_AIH não estiver na partição)
+        """
+        if not self.bloom.might_contain(n_aih):
+            return []
+
+        left = np.searchsorted(self.keys, n_aih, side="left")
+        right = np.searchsorted(self.keys, n_aih, side="right")
+        return sorted({int(rg) for rg in self.row_groups[left:right]})
+
+    def lookup(self, n_aih: str, key_column: str = "N_AIH") -> pd.DataFrame:
+        """
+        Retorna os registros do N_AIH lendo apenas o(s) row group(s) necessário(s).
+
+        Args:
+            n_aih: Número da AIH
+            key_column: Coluna com o número da AIH
+
+        Returns:
+            DataFrame com os registros encontrados (vazio se não encontrado)
+        """
+        row_groups = self.row_groups_for(n_aih)
+        if not row_groups:
+            return pd.DataFrame()
+
+        table = pq.ParquetFile(self.parquet_path).read_row_groups(row_groups)
+        df: pd.DataFrame = table.to_pandas()
+        return df[df[key_column].astype(str) == n_aih].reset_index(drop=True)
+
+
+class AIHLookup:
+    """
+    Consulta pontual de AIH em todas as partições do lake.
+
+    Os índices sidecar são carregados sob demanda e mantidos em memória
+    (invalidados quando o arquivo é reescrito).
+
+    Exemplo:
+        >>> lookup = AIHLookup()
+        >>> df = lookup.find("1224100061118")
+    """
+
+    def __init__(self, directory: str | Path = PROCESSED_DIR) -> None:
+        """
+        Inicializa consulta.
+
+        Args:
+            directory: Diretório com partições Parquet e índices sidecar
+        """
+        self.directory = Path(directory)
+        self._indexes: dict[Path, tuple[float, AIHIndex]] = {}
+
+    def _index(self, path: Path) -> AIHIndex:
+        """Carrega índice (com cache por mtime)."""
+        mtime = os.path.getmtime(path)
+        cached = self._indexes.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, AIHIndex.load(path))
+            self._indexes[path] = cached
+        return cached[1]
+
+    def find(self, n_aih: str) -> pd.DataFrame | None:
+        """
+        Busca N_AIH em todas as partições indexadas.
+
+        Args:
+            n_aih: Número da AIH
+
+        Returns:
+            DataFrame com os registros (coluna 'partition' indica a origem)
+            ou None se não encontrado
+        """
+        n_aih = str(n_aih)
+        frames = []
+        for path in sorted(self.directory.glob(f"*{INDEX_SUFFIX}")):
+            index = self._index(path)
+            df = index.lookup(n_aih)
+            if not df.empty:
+                df["partition"] = index.parquet_path.stem
+                frames.append(df)
+
+        if not frames:
+            logger.info(f"[INDEX] AIH não encontrada: {n_aih}")
+            return None
+
+        return pd.concat(frames, ignore_index=True)
@@ -1,22 +1,42 @@
 """
-Load: Salvamento em formato dual (CSV + Parquet)
+Load: Salvamento em formato dual (CSV + Parquet) + índices AIH e de internações
+
+Consumidores das partições gravadas (ex: KPICube.partition_written,
+KPICache.partition_written) são registrados como hooks pós-gravação, sem
+que a camada de carga dependa da camada de análise.
 """
 
 import logging
 import os
+from collections.abc import Callable, Sequence
 from datetime import datetime
 from typing import Any
 
 import pandas as pd
 
-from src.config import PROCESSED_DIR
+from src.config import LAKE_CONFIG, PROCESSED_DIR
+from src.load.aih_index import AIHIndex
+from src.load.stay_index import INDEX_COLUMNS, StayIndex
 
 logger = logging.getLogger(__name__)
 
+# Hook pós-gravação: (df, UF, ano, mês, caminho do Parquet) -> None
+PostWriteHook = Callable[[pd.DataFrame, str, int, int, str], None]
+
 
 class DataLoader:
     """Carrega dados processados em storage dual-format"""
 
+    def __init__(self, hooks: Sequence[PostWriteHook] = ()) -> None:
+        """
+        Inicializa loader.
+
+        Args:
+            hooks: Funções chamadas após gravar cada partição, na ordem
+                (ex: atualização do cubo, invalidação do cache)
+        """
+        self.hooks = list(hooks)
+
     def load(self, df: pd.DataFrame, state: str, year: int, month: int) -> dict[str, Any]:
         """
         Salva dados em CSV e Parquet
@@ -47,7 +67,28 @@ class DataLoader:
 
             # Salvar Parquet
             logger.info(f"[LOAD] Salvando Parquet: {parquet_path}")
-            df.to_parquet(parquet_path, index=False, engine="pyarrow")
+            df.to_parquet(
+                parquet_path,
+                index=False,
+                engine="pyarrow",
+                row_group_size=LAKE_CONFIG["row_group_size"],
+            )
+
+            # Índice sidecar N_AIH (Bloom filter + mapa de row groups)
+            index_path = None
+            if "N_AIH" in df.columns:
+                index_path = str(AIHIndex.build(parquet_path).save())
+                logger.info(f"[LOAD] Índice AIH: {index_path}")
+
+            # Índice sidecar de intervalos (DT_INTER, DT_SAIDA) por CNES
+            stay_index_path = None
+            if set(INDEX_COLUMNS) <= set(df.columns):
+                stay_index_path = str(StayIndex.from_frame(df, parquet_path).save())
+                logger.info(f"[LOAD] Índice de internações: {stay_index_path}")
+
+            # Consumidores da partição (cubo, cache...)
+            for hook in self.hooks:
+                hook(df, state, year, month, parquet_path)
 
             # Metadata
             metadata = {
@@ -58,6 +99,8 @@ class DataLoader:
                 "columns": len(df.columns),
                 "csv_path": csv_path,
                 "parquet_path": parquet_path,
+                "index_path": index_path,
+                "stay_index_path": stay_index_path,
                 "csv_size_mb": os.path.getsize(csv_path) / (1024 * 1024),
                 "parquet_size_mb": os.path.getsize(parquet_path) / (1024 * 1024),
                 "timestamp": datetime.now().isoformat(),
@@ -0,0 +1,440 @@
+"""
+Índice de Internações: Consultas "quem estava internado na data X" sem varrer o lake.
+
+Cada partição (SIH_{UF}_{AAAAMM}.parquet) ganha um índice sidecar
+(SIH_{UF}_{AAAAMM}.stays.npz) com os intervalos [DT_INTER, DT_SAIDA]
+(datas inclusivas) agrupados por CNES:
+
+- Arrays ordenados de início e de fim por CNES: contagem de internações
+  ativas em uma data/período com duas buscas binárias por hospital
+- Arrays ordenados por (CNES, classe de duração, início): listagem das
+  internações com busca binária por classe. A classe agrupa durações por
+  potência de 2, limitando os candidatos descartados ao próprio resultado
+
+Chaves compostas (código CNES << 32 | dia) permitem buscar todos os
+hospitais de uma vez com um único np.searchsorted vetorizado.
+"""
+
+import logging
+import os
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.config import PROCESSED_DIR
+
+logger = logging.getLogger(__name__)
+
+INDEX_SUFFIX = ".stays.npz"
+
+INDEX_COLUMNS = ["CNES", "DT_INTER", "DT_SAIDA"]
+
+_SHIFT = np.int64(32)
+
+
+def stay_index_path_for(parquet_path: str | Path) -> Path:
+    """Retorna o caminho do índice de internações de uma partição Parquet."""
+    path = Path(parquet_path)
+    return path.with_name(path.stem + INDEX_SUFFIX)
+
+
+def _to_day(date: str | pd.Timestamp) -> int:
+    """Converte data em dias desde 1970-01-01."""
+    return int(pd.Timestamp(date).normalize().value // 86_400_000_000_000)
+
+
+def _expand_ranges(lo: npt.NDArray[np.int64], hi: npt.NDArray[np.int64]) -> npt.NDArray[np.int64]:
+    """Concatena os intervalos [lo, hi) em um único array de posições."""
+    lengths = np.maximum(hi - lo, 0)
+    total = int(lengths.sum())
+    if total == 0:
+        return np.empty(0, dtype=np.int64)
+    offsets = np.repeat(lo - (np.cumsum(lengths) - lengths), lengths)
+    positions: npt.NDArray[np.int64] = np.arange(total, dtype=np.int64) + offsets
+    return positions
+
+
+class StayIndex:
+    """
+    Índice de intervalos de internação de uma partição Parquet.
+
+    Exemplo:
+        >>> index = StayIndex.build("data/processed/SIH_SP_202401.parquet")
+        >>> index.save()
+        >>> index.count("2024-01-15")  # internados por CNES em 15/01
+        >>> index.stays("2024-01-10", "2024-01-20", cnes="2077485")
+    """
+
+    def __init__(
+        self,
+        parquet_path: str | Path,
+        hospitals: npt.NDArray[np.str_],
+        start_keys: npt.NDArray[np.int64],
+        end_keys: npt.NDArray[np.int64],
+        class_keys: npt.NDArray[np.int64],
+        class_ends: npt.NDArray[np.int64],
+        class_rows: npt.NDArray[np.int64],
+        max_lengths: npt.NDArray[np.int64],
+    ) -> None:
+        """
+        Inicializa índice.
+
+        Args:
+            parquet_path: Caminho da partição indexada
+            hospitals: CNES ordenados (posição = código usado nas chaves)
+            start_keys: Chaves (código << 32 | início) ordenadas
+            end_keys: Chaves (código << 32 | fim) ordenadas
+            class_keys: Chaves ((código × classes + classe) << 32 | início) ordenadas
+            class_ends: Fim de cada internação, na ordem de class_keys
+            class_rows: Linha da partição, na ordem de class_keys
+            max_lengths: Maior duração (dias) de cada classe
+        """
+        self.parquet_path = Path(parquet_path)
+        self.hospitals = hospitals
+        self.start_keys = start_keys
+        self.end_keys = end_keys
+        self.class_keys = class_keys
+        self.class_ends = class_ends
+        self.class_rows = class_rows
+        self.max_lengths = max_lengths
+
+    @property
+    def num_classes(self) -> int:
+        return len(self.max_lengths)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, parquet_path: str | Path) -> "StayIndex":
+        """
+        Constrói índice a partir das colunas CNES, DT_INTER e DT_SAIDA.
+
+        Registros sem datas são ignorados; as linhas indexadas mantêm a
+        posição original no DataFrame (= linha na partição).
+
+        Args:
+            df: DataFrame da partição
+            parquet_path: Caminho da partição correspondente
+
+        Returns:
+            StayIndex construído (não salvo)
+
+        Raises:
+            KeyError: Se faltarem colunas
+        """
+        missing = set(INDEX_COLUMNS) - set(df.columns)
+        if missing:
+            raise KeyError(f"Colunas ausentes para o índice de internações: {sorted(missing)}")
+
+        start = pd.to_datetime(df["DT_INTER"], errors="coerce").to_numpy(dtype="datetime64[D]")
+        end = pd.to_datetime(df["DT_SAIDA"], errors="coerce").to_numpy(dtype="datetime64[D]")
+        valid = ~(np.isnat(start) | np.isnat(end)) & (start <= end)
+
+        rows = np.flatnonzero(valid).astype(np.int64)
+        start_days = start[valid].astype(np.int64)
+        end_days = end[valid].astype(np.int64)
+        codes, uniques = pd.factorize(df["CNES"].astype(str).to_numpy()[valid], sort=True)
+        codes = codes.astype(np.int64)
+
+        lengths = end_days - start_days
+        classes = np.zeros(len(lengths), dtype=np.int64)
+        if len(lengths):
+            classes = np.ceil(np.log2(lengths + 1)).astype(np.int64)
+        num_classes = int(classes.max()) + 1 if len(classes) else 1
+        max_lengths = np.zeros(num_classes, dtype=np.int64)
+        np.maximum.at(max_lengths, classes, lengths)
+
+        class_keys = ((codes * num_classes + classes) << _SHIFT) | start_days
+        order = np.argsort(class_keys, kind="stable")
+
+        logger.info(f"[INDEX] Índice de internações: {len(rows):,} intervalos, {len(uniques)} CNES")
+        return cls(
+            parquet_path,
+            np.asarray(uniques, dtype=str),
+            np.sort((codes << _SHIFT) | start_days),
+            np.sort((codes << _SHIFT) | end_days),
+            class_keys[order],
+            end_days[order],
+            rows[order],
+            max_lengths,
+        )
+
+    @classmethod
+    def build(cls, parquet_path: str | Path) -> "StayIndex":
+        """
+        Constrói índice lendo apenas as colunas de CNES e datas.
+
+        Args:
+            parquet_path: Caminho da partição Parquet
+
+        Returns:
+            StayIndex construído (não salvo)
+        """
+        df: pd.DataFrame = pq.read_table(parquet_path, columns=INDEX_COLUMNS).to_pandas()
+        return cls.from_frame(df, parquet_path)
+
+    def save(self, path: str | Path | None = None) -> Path:
+        """
+        Salva índice em arquivo .npz ao lado da partição.
+
+        Args:
+            path: Caminho de destino (padrão: sidecar da partição)
+
+        Returns:
+            Caminho do arquivo salvo
+        """
+        target = Path(path) if path is not None else stay_index_path_for(self.parquet_path)
+        with open(target, "wb") as f:
+            np.savez_compressed(
+                f,
+                hospitals=self.hospitals,
+                start_keys=self.start_keys,
+                end_keys=self.end_keys,
+                class_keys=self.class_keys,
+                class_ends=self.class_ends,
+                class_rows=self.class_rows,
+                max_lengths=self.max_lengths,
+            )
+        return target
+
+    @classmethod
+    def load(cls, path: str | Path, parquet_path: str | Path | None = None) -> "StayIndex":
+        """
+        Carrega índice salvo.
+
+        Args:
+            path: Caminho do arquivo .npz
+            parquet_path: Partição indexada (padrão: inferida do nome do sidecar)
+
+        Returns:
+            StayIndex carregado
+        """
+        path = Path(path)
+        if parquet_path is None:
+            parquet_path = path.with_name(path.name.removesuffix(INDEX_SUFFIX) + ".parquet")
+
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                parquet_path,
+                data["hospitals"],
+                data["start_keys"],
+                data["end_keys"],
+                data["class_keys"],
+                data["class_ends"],
+                data["class_rows"],
+                data["max_lengths"],
+            )
+
+    def _codes(self, cnes: str | list[str] | None) -> npt.NDArray[np.int64]:
+        """Códigos dos hospitais consultados (todos se cnes=None)."""
+        if cnes is None:
+            return np.arange(len(self.hospitals), dtype=np.int64)
+        wanted = np.asarray([cnes] if isinstance(cnes, str) else cnes, dtype=str)
+        if len(self.hospitals) == 0:
+            return np.empty(0, dtype=np.int64)
+        positions = np.minimum(np.searchsorted(self.hospitals, wanted), len(self.hospitals) - 1)
+        found = self.hospitals[positions] == wanted
+        codes: npt.NDArray[np.int64] = np.unique(positions[found]).astype(np.int64)
+        return codes
+
+    def count(
+        self,
+        start: str | pd.Timestamp,
+        end: str | pd.Timestamp | None = None,
+        cnes: str | list[str] | None = None,
+    ) -> pd.Series:
+        """
+        Conta internações que se sobrepõem a [start, end] por CNES.
+
+        Com end=None, conta os internados na data start. Custo O(h log n)
+        para h hospitais consultados.
+
+        Args:
+            start: Data inicial (inclusive)
+            end: Data final (inclusive; padrão: start)
+            cnes: CNES ou lista de CNES (padrão: todos)
+
+        Returns:
+            Series CNES → número de internações
+        """
+        first = _to_day(start)
+        last = _to_day(end) if end is not None else first
+        codes = self._codes(cnes)
+        base = codes << _SHIFT
+
+        # Sobrepõe [first, last] ⟺ início <= last e não (fim < first)
+        started = np.searchsorted(self.start_keys, base | last, side="right") - np.searchsorted(
+            self.start_keys, base, side="left"
+        )
+        ended = np.searchsorted(self.end_keys, base | first, side="left") - np.searchsorted(
+            self.end_keys, base, side="left"
+        )
+        return pd.Series(
+            started - ended, index=pd.Index(self.hospitals[codes], name="CNES"), dtype=np.int64
+        )
+
+    def rows(
+        self,
+        start: str | pd.Timestamp,
+        end: str | pd.Timestamp | None = None,
+        cnes: str | list[str] | None = None,
+    ) -> npt.NDArray[np.int64]:
+        """
+        Linhas da partição cujas internações se sobrepõem a [start, end].
+
+        Args:
+            start: Data inicial (inclusive)
+            end: Data final (inclusive; padrão: start)
+            cnes: CNES ou lista de CNES (padrão: todos)
+
+        Returns:
+            Array ordenado de posições de linha na partição
+        """
+        first = _to_day(start)
+        last = _to_day(end) if end is not None else first
+
+        # Um segmento por (hospital, classe de duração)
+        codes = self._codes(cnes)
+        classes = np.arange(self.num_classes, dtype=np.int64)
+        segments = (codes[:, None] * self.num_classes + classes[None, :]).ravel()
+        lower = np.maximum(first - np.tile(self.max_lengths, len(codes)), 0)
+
+        lo = np.searchsorted(self.class_keys, (segments << _SHIFT) | lower, side="left")
+        hi = np.searchsorted(self.class_keys, (segments << _SHIFT) | last, side="right")
+        candidates = _expand_ranges(lo.astype(np.int64), hi.astype(np.int64))
+        hits = candidates[self.class_ends[candidates] >= first]
+        return np.sort(self.class_rows[hits])
+
+    def stays(
+        self,
+        start: str | pd.Timestamp,
+        end: str | pd.Timestamp | None = None,
+        cnes: str | list[str] | None = None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Registros das internações que se sobrepõem a [start, end].
+
+        Lê apenas os row groups que contêm as linhas encontradas.
+
+        Args:
+            start: Data inicial (inclusive)
+            end: Data final (inclusive; padrão: start)
+            cnes: CNES ou lista de CNES (padrão: todos)
+            columns: Colunas a ler (padrão: todas)
+
+        Returns:
+            DataFrame com as internações (vazio se nenhuma)
+        """
+        rows = self.rows(start, end, cnes)
+        if len(rows) == 0:
+            return pd.DataFrame(columns=columns)
+
+        parquet_file = pq.ParquetFile(self.parquet_path)
+        metadata = parquet_file.metadata
+        sizes = [metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)]
+        boundaries = np.concatenate([[0], np.cumsum(sizes)])
+
+        groups = np.unique(np.searchsorted(boundaries, rows, side="right") - 1)
+        table = parquet_file.read_row_groups([int(g) for g in groups], columns=columns)
+
+        # Posição de cada linha dentro dos row groups lidos
+        group_offsets = np.concatenate([[0], np.cumsum([sizes[g] for g in groups])])
+        group_of_row = np.searchsorted(boundaries, rows, side="right") - 1
+        local = (
+            rows - boundaries[group_of_row] + group_offsets[np.searchsorted(groups, group_of_row)]
+        )
+        df: pd.DataFrame = table.take(local).to_pandas()
+        return df
+
+
+class StayLookup:
+    """
+    Consultas de internações ativas em todas as partições indexadas do lake.
+
+    Uma internação aparece na partição do mês de processamento, então uma
+    data pode ter internações em várias partições; os resultados são
+    combinados. Índices são carregados sob demanda (cache por mtime).
+
+    Exemplo:
+        >>> lookup = StayLookup()
+        >>> lookup.census("2024-01-15")  # internados por CNES em 15/01
+        >>> lookup.active_on("2024-01-15", cnes="2077485")
+    """
+
+    def __init__(self, directory: str | Path = PROCESSED_DIR) -> None:
+        """
+        Inicializa consulta.
+
+        Args:
+            directory: Diretório com partições Parquet e índices sidecar
+        """
+        self.directory = Path(directory)
+        self._indexes: dict[Path, tuple[float, StayIndex]] = {}
+
+    def _index(self, path: Path) -> StayIndex:
+        """Carrega índice (com cache por mtime)."""
+        mtime = os.path.getmtime(path)
+        cached = self._indexes.get(path)
+        if cached is None or cached[0] != mtime:
+            cached = (mtime, StayIndex.load(path))
+            self._indexes[path] = cached
+        return cached[1]
+
+    def indexes(self) -> list[StayIndex]:
+        """Índices de todas as partições do diretório."""
+        return [self._index(p) for p in sorted(self.directory.glob(f"*{INDEX_SUFFIX}"))]
+
+    def census(
+        self,
+        start: str | pd.Timestamp,
+        end: str | pd.Timestamp | None = None,
+        cnes: str | list[str] | None = None,
+    ) -> pd.Series:
+        """
+        Número de internações ativas por CNES na data (ou período).
+
+        Args:
+            start: Data inicial (inclusive)
+            end: Data final (inclusive; padrão: start)
+            cnes: CNES ou lista de CNES (padrão: todos)
+
+        Returns:
+            Series CNES → número de internações (ordenada por CNES)
+        """
+        counts = [index.count(start, end, cnes) for index in self.indexes()]
+        if not counts:
+            return pd.Series(dtype=np.int64, index=pd.Index([], name="CNES"))
+        total: pd.Series = pd.concat(counts).groupby(level=0).sum()
+        return total[total > 0].astype(np.int64)
+
+    def active_on(
+        self,
+        start: str | pd.Timestamp,
+        end: str | pd.Timestamp | None = None,
+        cnes: str | list[str] | None = None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Registros das internações ativas na data (ou período).
+
+        Args:
+            start: Data inicial (inclusive)
+            end: Data final (inclusive; padrão: start)
+            cnes: CNES ou lista de CNES (padrão: todos)
+            columns: Colunas a ler (padrão: todas)
+
+        Returns:
+            DataFrame com as internações (coluna 'partition' indica a origem)
+        """
+        frames = []
+        for index in self.indexes():
+            df = index.stays(start, end, cnes, columns)
+            if not df.empty:
+                df["partition"] = index.parquet_path.stem
+                frames.append(df)
+
+        if not frames:
+            return pd.DataFrame(columns=[*(columns or []), "partition"])
+        return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,308 @@
+"""
+Warehouse: Carga em star schema via DB-API (SQLite/DuckDB local, Oracle no MVP).
+
+Modelo dimensional:
+    fact_internacao ──┬── dim_hospital      (CNES)
+                      ├── dim_date          (DT_INTER, DT_SAIDA)
+                      ├── dim_diagnosis     (DIAG_PRINC)
+                      ├── dim_procedure     (PROC_REA)
+                      ├── dim_municipality  (MUNIC_RES)
+                      └── dim_specialty     (ESPEC)
+
+Surrogate keys são atribuídas por hash maps em memória (chave natural → SK)
+e as inserções usam executemany em lotes (array binding), nunca linha a linha.
+"""
+
+import logging
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from typing import Any
+
+import pandas as pd
+
+from src.config import WAREHOUSE_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Dimensões: tabela -> (coluna SK, coluna chave natural, coluna de origem no DataFrame)
+DIMENSIONS: dict[str, tuple[str, str, str]] = {
+    "dim_hospital": ("sk_hospital", "cnes", "CNES"),
+    "dim_diagnosis": ("sk_diagnosis", "cid10", "DIAG_PRINC"),
+    "dim_procedure": ("sk_procedure", "proc_code", "PROC_REA"),
+    "dim_municipality": ("sk_municipality", "ibge_code", "MUNIC_RES"),
+    "dim_specialty": ("sk_specialty", "espec_code", "ESPEC"),
+}
+
+# Medidas do fato: coluna no fato -> coluna de origem no DataFrame
+FACT_MEASURES: dict[str, str] = {
+    "stay_days": "stay_days",
+    "val_tot": "VAL_TOT",
+    "val_uti": "VAL_UTI",
+    "idade": "IDADE",
+    "sexo": "SEXO",
+    "death": "death",
+}
+
+DDL = [
+    """CREATE TABLE IF NOT EXISTS dim_hospital (
+        sk_hospital INTEGER PRIMARY KEY,
+        cnes VARCHAR(7) NOT NULL UNIQUE
+    )""",
+    """CREATE TABLE IF NOT EXISTS dim_diagnosis (
+        sk_diagnosis INTEGER PRIMARY KEY,
+        cid10 VARCHAR(4) NOT NULL UNIQUE
+    )""",
+    """CREATE TABLE IF NOT EXISTS dim_procedure (
+        sk_procedure INTEGER PRIMARY KEY,
+        proc_code VARCHAR(10) NOT NULL UNIQUE
+    )""",
+    """CREATE TABLE IF NOT EXISTS dim_municipality (
+        sk_municipality INTEGER PRIMARY KEY,
+        ibge_code VARCHAR(7) NOT NULL UNIQUE
+    )""",
+    """CREATE TABLE IF NOT EXISTS dim_specialty (
+        sk_specialty INTEGER PRIMARY KEY,
+        espec_code VARCHAR(2) NOT NULL UNIQUE
+    )""",
+    """CREATE TABLE IF NOT EXISTS dim_date (
+        date_key INTEGER PRIMARY KEY,
+        full_date VARCHAR(10) NOT NULL,
+        year INTEGER NOT NULL,
+        month INTEGER NOT NULL,
+        day INTEGER NOT NULL,
+        weekday INTEGER NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS fact_internacao (
+        n_aih VARCHAR(13),
+        uf VARCHAR(2) NOT NULL,
+        competencia INTEGER NOT NULL,
+        sk_hospital INTEGER REFERENCES dim_hospital (sk_hospital),
+        sk_diagnosis INTEGER REFERENCES dim_diagnosis (sk_diagnosis),
+        sk_procedure INTEGER REFERENCES dim_procedure (sk_procedure),
+        sk_municipality INTEGER REFERENCES dim_municipality (sk_municipality),
+        sk_specialty INTEGER REFERENCES dim_specialty (sk_specialty),
+        date_key_inter INTEGER REFERENCES dim_date (date_key),
+        date_key_saida INTEGER REFERENCES dim_date (date_key),
+        stay_days INTEGER,
+        val_tot DOUBLE PRECISION,
+        val_uti DOUBLE PRECISION,
+        idade INTEGER,
+        sexo INTEGER,
+        death INTEGER
+    )""",
+]
+
+
+class WarehouseLoader:
+    """
+    Carrega dados processados em star schema através de uma conexão DB-API 2.0.
+
+    Funciona com qualquer driver DB-API (sqlite3, duckdb, oracledb/cx_Oracle),
+    bastando informar o paramstyle do driver.
+
+    Exemplo:
+        >>> import sqlite3
+        >>> loader = WarehouseLoader(sqlite3.connect("data/warehouse.db"))
+        >>> loader.create_schema()
+        >>> loader.load(df, state="AC", year=2024, month=1)
+    """
+
+    def __init__(
+        self,
+        connection: Any,
+        batch_size: int = WAREHOUSE_CONFIG["batch_size"],
+        paramstyle: str = "qmark",
+    ) -> None:
+        """
+        Inicializa loader.
+
+        Args:
+            connection: Conexão DB-API 2.0 aberta
+            batch_size: Linhas por chamada executemany
+            paramstyle: 'qmark' (sqlite3/duckdb), 'numeric' (Oracle) ou 'format'
+
+        Raises:
+            ValueError: Se batch_size <= 0 ou paramstyle não suportado
+        """
+        if batch_size <= 0:
+            raise ValueError("Tamanho do lote deve ser maior que zero")
+        if paramstyle not in ("qmark", "numeric", "format"):
+            raise ValueError(f"Paramstyle não suportado: {paramstyle}")
+
+        self.connection = connection
+        self.batch_size = batch_size
+        self.paramstyle = paramstyle
+        self._keys: dict[str, dict[str, int]] = {table: {} for table in DIMENSIONS}
+        self._dates: set[int] = set()
+
+    def _placeholders(self, count: int) -> str:
+        """Gera placeholders conforme o paramstyle do driver."""
+        if self.paramstyle == "numeric":
+            return ", ".join(f":{i}" for i in range(1, count + 1))
+        marker = "?" if self.paramstyle == "qmark" else "%s"
+        return ", ".join([marker] * count)
+
+    def _insert_many(self, table: str, columns: Sequence[str], rows: Iterable[tuple]) -> int:
+        """
+        Insere linhas em lotes via executemany (array binding).
+
+        Returns:
+            Número de linhas inseridas
+        """
+        sql = (
+            f"INSERT INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({self._placeholders(len(columns))})"
+        )
+        cursor = self.connection.cursor()
+        total = 0
+        batch: list[tuple] = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                cursor.executemany(sql, batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+            total += len(batch)
+        return total
+
+    def create_schema(self) -> None:
+        """Cria tabelas do star schema (idempotente) e carrega surrogate keys existentes."""
+        cursor = self.connection.cursor()
+        for statement in DDL:
+            cursor.execute(statement)
+        self.connection.commit()
+
+        for table, (sk_column, natural_column, _) in DIMENSIONS.items():
+            cursor.execute(f"SELECT {natural_column}, {sk_column} FROM {table}")
+            self._keys[table] = {str(natural): int(sk) for natural, sk in cursor.fetchall()}
+        cursor.execute("SELECT date_key FROM dim_date")
+        self._dates = {int(row[0]) for row in cursor.fetchall()}
+
+    def _assign_keys(self, table: str, values: pd.Series) -> pd.Series:
+        """
+        Mapeia chaves naturais para surrogate keys, inserindo membros novos na dimensão.
+
+        Args:
+            table: Nome da tabela de dimensão
+            values: Chaves naturais (uma por linha do fato)
+
+        Returns:
+            Series de surrogate keys (NA onde a chave natural é nula)
+        """
+        keys = self._keys[table]
+        natural = values.astype("string")
+        new_members = [v for v in natural.dropna().unique() if v not in keys]
+
+        next_sk = max(keys.values(), default=0) + 1
+        new_rows = []
+        for offset, value in enumerate(new_members):
+            keys[value] = next_sk + offset
+            new_rows.append((next_sk + offset, value))
+
+        if new_rows:
+            sk_column, natural_column, _ = DIMENSIONS[table]
+            self._insert_many(table, (sk_column, natural_column), new_rows)
+
+        return natural.map(keys).astype("Int64")
+
+    def _date_keys(self, dates: pd.Series) -> pd.Series:
+        """Converte datas em date_key (YYYYMMDD), inserindo novas datas em dim_date."""
+        parsed = pd.to_datetime(dates, errors="coerce")
+        date_keys = (
+            parsed.dt.year * 10_000 + parsed.dt.month * 100 + parsed.dt.day  # type: ignore[attr-defined]
+        ).astype("Int64")
+
+        new_keys = sorted(set(date_keys.dropna().unique().tolist()) - self._dates)
+        if new_keys:
+            rows = []
+            for key in new_keys:
+                day = datetime.strptime(str(key), "%Y%m%d")
+                rows.append(
+                    (int(key), day.date().isoformat(), day.year, day.month, day.day, day.weekday())
+                )
+            self._insert_many(
+                "dim_date", ("date_key", "full_date", "year", "month", "day", "weekday"), rows
+            )
+            self._dates.update(int(k) for k in new_keys)
+
+        return date_keys
+
+    def load(self, df: pd.DataFrame, state: str, year: int, month: int) -> dict[str, Any]:
+        """
+        Carrega DataFrame processado no star schema.
+
+        A carga é idempotente por partição: fatos existentes de (UF, competência)
+        são removidos antes da inserção.
+
+        Args:
+            df: DataFrame processado
+            state: UF
+            year: Ano
+            month: Mês
+
+        Returns:
+            Dict com contagens e metadata da carga
+        """
+        # Snapshot das surrogate keys: membros inseridos nesta carga são
+        # descartados do cache se a transação for desfeita
+        keys_snapshot = {table: dict(keys) for table, keys in self._keys.items()}
+        dates_snapshot = set(self._dates)
+        try:
+            logger.info(f"[WAREHOUSE] Carregando: {state} {year}/{month:02d}")
+            competencia = year * 100 + month
+
+            fact = pd.DataFrame(index=df.index)
+            fact["n_aih"] = df["N_AIH"].astype("string") if "N_AIH" in df.columns else pd.NA
+            fact["uf"] = state
+            fact["competencia"] = competencia
+
+            for table, (sk_column, _, source) in DIMENSIONS.items():
+                if source in df.columns:
+                    fact[sk_column] = self._assign_keys(table, df[source])
+                else:
+                    fact[sk_column] = pd.NA
+
+            for fact_column, source in (
+                ("date_key_inter", "DT_INTER"),
+                ("date_key_saida", "DT_SAIDA"),
+            ):
+                fact[fact_column] = self._date_keys(df[source]) if source in df.columns else pd.NA
+
+            for fact_column, source in FACT_MEASURES.items():
+                fact[fact_column] = df[source] if source in df.columns else pd.NA
+            if "death" in df.columns:
+                fact["death"] = df["death"].astype("Int64")
+
+            uf_param, competencia_param = self._placeholders(2).split(", ")
+            cursor = self.connection.cursor()
+            cursor.execute(
+                f"DELETE FROM fact_internacao WHERE uf = {uf_param} "
+                f"AND competencia = {competencia_param}",
+                (state, competencia),
+            )
+
+            # NA -> None para binding; tuplas com tipos Python nativos
+            rows = fact.astype(object).where(fact.notna(), None).itertuples(index=False, name=None)
+            inserted = self._insert_many("fact_internacao", list(fact.columns), rows)
+            self.connection.commit()
+
+            metadata = {
+                "state": state,
+                "year": year,
+                "month": month,
+                "records": inserted,
+                "dimensions": {table: len(keys) for table, keys in self._keys.items()},
+                "dates": len(self._dates),
+                "timestamp": datetime.now().isoformat(),
+            }
+            logger.info(f"[WAREHOUSE] Concluído: {inserted:,} fatos")
+            return metadata
+
+        except Exception as e:
+            self.connection.rollback()
+            self._keys = keys_snapshot
+            self._dates = dates_snapshot
+            logger.error(f"[WAREHOUSE] Erro: {e}")
+            raise
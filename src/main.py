@@ -4,7 +4,9 @@ Main: Ponto de entrada do pipeline ETL
 
 import argparse
 
-from src.config import DATASUS_CONFIG
+from src.analytics.cache import KPICache
+from src.analytics.cube import KPICube
+from src.config import DATASUS_CONFIG, KPI_CUBE_CONFIG
 from src.extract.extractor import DataSUSExtractor
 from src.load.loader import DataLoader
 from src.transform.transformer import DataTransformer
@@ -40,16 +42,20 @@ def main(state: str, year: int, month: int):
         df_clean = transformer.transform(df_raw)
         logger.info(f"[TRANSFORM] ✓ Registros limpos: {len(df_clean):,}")
 
-        # 3. LOAD
-        loader = DataLoader()
+        # 3. LOAD (cubo atualizado e cache invalidado a cada partição gravada)
+        cube = KPICube.load(KPI_CUBE_CONFIG["path"])
+        cache = KPICache()
+        loader = DataLoader(hooks=[cube.partition_written, cache.partition_written])
         metadata = loader.load(df_clean, state, year, month)
         logger.info(f"[LOAD] ✓ Salvos: {metadata['records']:,} registros")
+        cube_path = cube.save()
 
         # SUCESSO
         logger.info("=" * 70)
         logger.info("[SUCCESS] Pipeline concluído com sucesso!")
         logger.info(f"CSV: {metadata['csv_path']}")
         logger.info(f"Parquet: {metadata['parquet_path']}")
+        logger.info(f"Cubo KPI: {cube_path}")
         logger.info("=" * 70)
 
     except Exception as e:
@@ -4,10 +4,37 @@ Transform: Limpeza, validação e enriquecimento de dados
 
 import logging
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+AGE_GROUPS = ["0-17", "18-29", "30-44", "45-59", "60+"]
+
+# Limites das faixas de AGE_GROUPS, fechados à esquerda: [0, 18), [18, 30), ...
+AGE_BINS = [0, 18, 30, 45, 60, np.inf]
+
+
+def age_groups(idade: pd.Series) -> pd.Series:
+    """
+    Faixa etária (AGE_GROUPS) de cada idade em anos.
+
+    Fonte única das faixas: registros (enrich_data) e população
+    (PopulationTable) precisam cair no mesmo estrato para a mesma idade.
+
+    Args:
+        idade: Idades em anos (valores não numéricos viram NaN)
+
+    Returns:
+        Series categórica com as faixas (NaN para idade ausente ou negativa)
+    """
+    return pd.cut(
+        pd.to_numeric(idade, errors="coerce"),
+        bins=AGE_BINS,
+        labels=AGE_GROUPS,
+        right=False,
+    )
+
 
 class DataTransformer:
     """
@@ -93,7 +120,15 @@ class DataTransformer:
         logger.info("[CONVERT] Convertendo tipos...")
 
         # Campos numéricos
-        numeric_fields = ["IDADE", "VAL_TOT", "VAL_UTI", "VAL_SH", "VAL_SP", "VAL_SADT"]
+        numeric_fields = [
+            "IDADE",
+            "VAL_TOT",
+            "VAL_UTI",
+            "VAL_SH",
+            "VAL_SP",
+            "VAL_SADT",
+            "UTI_MES_TO",
+        ]
         for field in numeric_fields:
             if field in df.columns:
                 df[field] = pd.to_numeric(df[field], errors="coerce")
@@ -164,11 +199,7 @@ class DataTransformer:
 
         # Criar faixa etária
         if "IDADE" in df.columns:
-            df["age_group"] = pd.cut(
-                df["IDADE"],
-                bins=[0, 18, 30, 45, 60, 120],
-                labels=["0-17", "18-29", "30-44", "45-59", "60+"],
-            )
+            df["age_group"] = age_groups(df["IDADE"])
 
         # Flag óbito
         if "MORTE" in df.columns:
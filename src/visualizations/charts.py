@@ -1,8 +1,32 @@
-"""Gerador de gráficos para análise hospitalar."""
-
+"""Gerador de gráficos para análise hospitalar.
+
+Os gráficos dependem apenas de agregados pequenos (contagens e somas por
+faixa etária, especialidade, sexo e dia). ``chart_aggregates`` calcula
+todos de uma vez, a partir dos registros (um groupby compartilhado por
+faixa etária × especialidade × sexo) ou do KPICube (rollups das células,
+sem reler registros), e cada método aceita o agregado já pronto (Series)
+além do DataFrame bruto.
+
+A renderização (matplotlib, single-threaded) pode ser distribuída entre
+processos (ProcessPoolExecutor, backend Agg): os agregados são calculados
+no processo principal e cada worker recebe apenas as Series de um
+gráfico. generate_many renderiza o mesmo conjunto de gráficos para várias
+UFs ou períodos em um único pool.
+
+Exemplo:
+    >>> generator = ChartGenerator(subtitle="SP - 2024")
+    >>> generator.generate_all(cube.filter(UF="SP"), workers=6)
+    >>> generator.generate_many({uf: cube.filter(UF=uf) for uf in ufs})
+"""
+
+import logging
+import os
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import cast
 
+import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
 import numpy.typing as npt
@@ -10,6 +34,13 @@ import pandas as pd
 from matplotlib.text import Text
 from matplotlib.ticker import FuncFormatter
 
+from src.analytics.cube import KPICube
+from src.analytics.executor import limit_memory
+from src.analytics.standardization import normalize_sex
+from src.config import EXECUTOR_CONFIG
+
+logger = logging.getLogger(__name__)
+
 # Configurações globais matplotlib
 plt.rcParams["figure.dpi"] = 300
 plt.rcParams["savefig.dpi"] = 300
@@ -17,17 +48,137 @@ plt.rcParams["font.size"] = 10
 plt.rcParams["axes.titlesize"] = 12
 plt.rcParams["axes.labelsize"] = 10
 
+GENDER_LABELS = {"1": "Masculino", "3": "Feminino"}
+
+# Gráficos de generate_all, na ordem: (agregado de chart_aggregates, método)
+CHARTS = [
+    ("age", "demographics_by_age"),
+    ("revenue", "revenue_by_specialty"),
+    ("avg_stay", "avg_stay_by_specialty"),
+    ("diagnoses", "top_diagnoses"),
+    ("volume", "volume_by_day"),
+    ("gender", "gender_distribution"),
+]
+
+# Tarefa de renderização: (diretório de saída, subtítulo, método, agregado)
+RenderTask = tuple[Path, str, str, pd.Series]
+
+ChartSource = pd.DataFrame | KPICube | dict[str, pd.Series]
+
+
+def _daily_volume(df: pd.DataFrame) -> pd.Series:
+    """Internações por dia de DT_INTER."""
+    dates = pd.to_datetime(df["DT_INTER"], errors="coerce").dt.normalize()
+    daily: pd.Series = df.groupby(dates.rename("date")).size()
+    return daily
+
+
+def _gender_counts(counts: pd.Series) -> pd.Series:
+    """Contagens por código de sexo reindexadas pelos rótulos (códigos desconhecidos saem)."""
+    labels = normalize_sex(counts.index.to_series()).map(GENDER_LABELS)
+    named: pd.Series = counts.groupby(labels.to_numpy(), dropna=True).sum()
+    return named.sort_values(ascending=False)
+
+
+def chart_aggregates(source: pd.DataFrame | KPICube, top_n: int = 10) -> dict[str, pd.Series]:
+    """Calcula de uma vez os agregados de todos os gráficos.
+
+    Args:
+        source: DataFrame de internações (age_group, ESPEC, SEXO, VAL_TOT,
+            stay_days, DIAG_PRINC, DT_INTER) ou KPICube (volume mensal por
+            competência e diagnósticos pelos contadores Space-Saving).
+        top_n: Número de diagnósticos.
+
+    Returns:
+        Dicionário de Series (age, revenue, avg_stay, diagnoses, volume,
+        gender), aceitas pelos métodos de ChartGenerator.
+    """
+    if isinstance(source, KPICube):
+        cells = source.aggregate(["age_group", "ESPEC", "SEXO"])
+        monthly = source.aggregate("competencia")["records"]
+        months = pd.to_datetime(monthly.index.astype(str), format="%Y%m")
+        volume = pd.Series(monthly.to_numpy(), index=months.rename("month"))
+        diagnoses = source.top_k("DIAG_PRINC", top_n)["count"]
+    else:
+        values = pd.DataFrame(
+            {
+                "records": 1,
+                "VAL_TOT_sum": pd.to_numeric(source["VAL_TOT"], errors="coerce"),
+                "stay_days_sum": pd.to_numeric(source["stay_days"], errors="coerce"),
+            }
+        )
+        values["stay_days_count"] = values["stay_days_sum"].notna().astype("int64")
+        keys = [source["age_group"], source["ESPEC"], source["SEXO"]]
+        cells = values.groupby(keys, dropna=False, observed=True).sum()
+        volume = _daily_volume(source)
+        diagnoses = source["DIAG_PRINC"].value_counts().head(top_n)
+
+    by_specialty = cells.groupby(level="ESPEC", observed=True).sum()
+    return {
+        "age": cells.groupby(level="age_group", observed=True)["records"].sum().sort_index(),
+        "revenue": by_specialty["VAL_TOT_sum"].sort_values(ascending=True),
+        "avg_stay": (
+            by_specialty["stay_days_sum"] / by_specialty["stay_days_count"].replace(0, np.nan)
+        ).sort_values(ascending=True),
+        "diagnoses": diagnoses,
+        "volume": volume,
+        "gender": _gender_counts(cells.groupby(level="SEXO", observed=True)["records"].sum()),
+    }
+
+
+def _init_renderer(memory_limit: int) -> None:
+    """Inicializador do worker: backend Agg (sem display) e teto de memória."""
+    matplotlib.use("Agg")
+    limit_memory(memory_limit)
+
+
+def _render(task: RenderTask) -> Path:
+    """Worker: renderiza um gráfico a partir do seu agregado."""
+    output_dir, subtitle, method, data = task
+    generator = ChartGenerator(output_dir=output_dir, subtitle=subtitle)
+    path: Path = getattr(generator, method)(data)
+    return path
+
+
+def render_charts(tasks: list[RenderTask], workers: int | None = None) -> list[Path]:
+    """Renderiza gráficos independentes em um pool de processos.
+
+    Args:
+        tasks: Tarefas (diretório, subtítulo, método do ChartGenerator, agregado).
+        workers: Processos (padrão: EXECUTOR_CONFIG ou núcleos; 1 = sem pool).
+
+    Returns:
+        Caminhos dos arquivos salvos, na ordem das tarefas.
+    """
+    workers = workers if workers is not None else EXECUTOR_CONFIG["workers"]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(tasks)))
+    if workers == 1:
+        return [_render(task) for task in tasks]
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_renderer,
+        initargs=(EXECUTOR_CONFIG["memory_limit"],),
+    ) as pool:
+        paths = list(pool.map(_render, tasks))
+    logger.info(f"[CHARTS] {len(paths):,} gráfico(s) em {workers} processo(s)")
+    return paths
+
 
 class ChartGenerator:
     """Gera visualizações estáticas para análise hospitalar."""
 
-    def __init__(self, output_dir: str | Path = "outputs/charts") -> None:
+    def __init__(
+        self, output_dir: str | Path = "outputs/charts", subtitle: str = "AC - Janeiro 2024"
+    ) -> None:
         """Inicializa o gerador de gráficos.
 
         Args:
             output_dir: Diretório para salvar os gráficos.
+            subtitle: Segunda linha dos títulos (UF e período).
         """
         self.output_dir = Path(output_dir)
+        self.subtitle = subtitle
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
     def _to_array(self, series: pd.Series) -> npt.NDArray[np.float64]:  # type: ignore[type-arg]
@@ -41,18 +192,19 @@ class ChartGenerator:
         """
         return cast(npt.NDArray[np.float64], series.to_numpy())
 
-    def demographics_by_age(self, df: pd.DataFrame) -> Path:
+    def demographics_by_age(self, df: pd.DataFrame | pd.Series) -> Path:
         """Gera gráfico de distribuição por faixa etária.
 
         Args:
-            df: DataFrame com coluna 'age_group'.
+            df: DataFrame com coluna 'age_group' ou contagens por faixa
+                (agregado 'age' de chart_aggregates).
 
         Returns:
             Caminho do arquivo salvo.
         """
         fig, ax = plt.subplots(figsize=(10, 6))
 
-        counts = df["age_group"].value_counts().sort_index()
+        counts = df if isinstance(df, pd.Series) else df["age_group"].value_counts().sort_index()
         values = self._to_array(counts)
         colors = plt.cm.Blues(  # type: ignore[attr-defined]  # pyright: ignore[reportAttributeAccessIssue]
             [0.3 + i * 0.1 for i in range(len(counts))]
@@ -64,7 +216,7 @@ class ChartGenerator:
 
         ax.set_xlabel("Faixa Etária")
         ax.set_ylabel("Número de Internações")
-        ax.set_title("Distribuição de Internações por Faixa Etária\nAC - Janeiro 2024")
+        ax.set_title(f"Distribuição de Internações por Faixa Etária\n{self.subtitle}")
 
         # Adicionar valores nas barras
         for bar, val in zip(bars, values, strict=False):
@@ -82,18 +234,22 @@ class ChartGenerator:
         plt.close(fig)
         return filepath
 
-    def revenue_by_specialty(self, df: pd.DataFrame) -> Path:
+    def revenue_by_specialty(self, df: pd.DataFrame | pd.Series) -> Path:
         """Gera gráfico de receita por especialidade.
 
         Args:
-            df: DataFrame com colunas 'ESPEC' e 'VAL_TOT'.
+            df: DataFrame com colunas 'ESPEC' e 'VAL_TOT' ou receita por
+                especialidade em ordem crescente (agregado 'revenue').
 
         Returns:
             Caminho do arquivo salvo.
         """
         fig, ax = plt.subplots(figsize=(10, 6))
 
-        revenue = df.groupby("ESPEC")["VAL_TOT"].sum().sort_values(ascending=True)
+        if isinstance(df, pd.Series):
+            revenue = df
+        else:
+            revenue = df.groupby("ESPEC")["VAL_TOT"].sum().sort_values(ascending=True)
         values = self._to_array(revenue)
         colors = plt.cm.Greens(  # type: ignore[attr-defined]  # pyright: ignore[reportAttributeAccessIssue]
             [0.3 + i * 0.05 for i in range(len(revenue))]
@@ -105,7 +261,7 @@ class ChartGenerator:
 
         ax.set_xlabel("Receita Total (R$)")
         ax.set_ylabel("Especialidade")
-        ax.set_title("Receita Total por Especialidade\nAC - Janeiro 2024")
+        ax.set_title(f"Receita Total por Especialidade\n{self.subtitle}")
 
         # Formatar eixo X para milhares
         def format_currency(x: float, pos: int) -> str:  # noqa: ARG001
@@ -119,18 +275,22 @@ class ChartGenerator:
         plt.close(fig)
         return filepath
 
-    def avg_stay_by_specialty(self, df: pd.DataFrame) -> Path:
+    def avg_stay_by_specialty(self, df: pd.DataFrame | pd.Series) -> Path:
         """Gera gráfico de tempo médio de permanência por especialidade.
 
         Args:
-            df: DataFrame com colunas 'ESPEC' e 'stay_days'.
+            df: DataFrame com colunas 'ESPEC' e 'stay_days' ou TMP por
+                especialidade em ordem crescente (agregado 'avg_stay').
 
         Returns:
             Caminho do arquivo salvo.
         """
         fig, ax = plt.subplots(figsize=(10, 6))
 
-        avg_stay = df.groupby("ESPEC")["stay_days"].mean().sort_values(ascending=True)
+        if isinstance(df, pd.Series):
+            avg_stay = df
+        else:
+            avg_stay = df.groupby("ESPEC")["stay_days"].mean().sort_values(ascending=True)
         values = self._to_array(avg_stay)
         colors = plt.cm.Oranges(  # type: ignore[attr-defined]  # pyright: ignore[reportAttributeAccessIssue]
             [0.3 + i * 0.05 for i in range(len(avg_stay))]
@@ -142,7 +302,7 @@ class ChartGenerator:
 
         ax.set_xlabel("Tempo Médio de Permanência (dias)")
         ax.set_ylabel("Especialidade")
-        ax.set_title("Tempo Médio de Permanência por Especialidade\nAC - Janeiro 2024")
+        ax.set_title(f"Tempo Médio de Permanência por Especialidade\n{self.subtitle}")
 
         # Adicionar valores nas barras
         for bar, val in zip(bars, values, strict=False):
@@ -160,11 +320,13 @@ class ChartGenerator:
         plt.close(fig)
         return filepath
 
-    def top_diagnoses(self, df: pd.DataFrame, top_n: int = 10) -> Path:
+    def top_diagnoses(self, df: pd.DataFrame | pd.Series | KPICube, top_n: int = 10) -> Path:
         """Gera gráfico dos diagnósticos mais frequentes.
 
         Args:
-            df: DataFrame com coluna 'DIAG_PRINC'.
+            df: DataFrame com coluna 'DIAG_PRINC', contagens em ordem
+                decrescente (agregado 'diagnoses') ou KPICube (contagens
+                estimadas pelos contadores Space-Saving, sem reler registros).
             top_n: Número de diagnósticos a exibir.
 
         Returns:
@@ -172,7 +334,12 @@ class ChartGenerator:
         """
         fig, ax = plt.subplots(figsize=(10, 6))
 
-        diag_counts = df["DIAG_PRINC"].value_counts().head(top_n)
+        if isinstance(df, pd.Series):
+            diag_counts = df.head(top_n)
+        elif isinstance(df, KPICube):
+            diag_counts = df.top_k("DIAG_PRINC", top_n)["count"]
+        else:
+            diag_counts = df["DIAG_PRINC"].value_counts().head(top_n)
         values = self._to_array(diag_counts)
         colors = plt.cm.Reds(  # type: ignore[attr-defined]  # pyright: ignore[reportAttributeAccessIssue]
             [0.3 + i * 0.05 for i in range(len(diag_counts))]
@@ -188,7 +355,7 @@ class ChartGenerator:
 
         ax.set_xlabel("Número de Internações")
         ax.set_ylabel("Código CID-10")
-        ax.set_title(f"Top {top_n} Diagnósticos Principais (CID-10)\nAC - Janeiro 2024")
+        ax.set_title(f"Top {top_n} Diagnósticos Principais (CID-10)\n{self.subtitle}")
 
         # Adicionar valores nas barras
         for bar, val in zip(bars, values[::-1], strict=False):
@@ -206,20 +373,20 @@ class ChartGenerator:
         plt.close(fig)
         return filepath
 
-    def volume_by_day(self, df: pd.DataFrame) -> Path:
+    def volume_by_day(self, df: pd.DataFrame | pd.Series) -> Path:
         """Gera gráfico de volume de internações por dia.
 
         Args:
-            df: DataFrame com coluna 'DT_INTER'.
+            df: DataFrame com coluna 'DT_INTER' ou contagens por período
+                (agregado 'volume'; índice 'month' = volume mensal do cubo).
 
         Returns:
             Caminho do arquivo salvo.
         """
         fig, ax = plt.subplots(figsize=(12, 5))
 
-        # Nota: pyright não reconhece .dt.date corretamente
-        dt_series = df["DT_INTER"].dt  # pyright: ignore[reportAttributeAccessIssue]
-        daily = df.groupby(dt_series.date).size()
+        daily = df if isinstance(df, pd.Series) else _daily_volume(df)
+        period = "Mensal" if daily.index.name == "month" else "Diário"
         daily_values = cast(npt.NDArray[np.float64], daily.values)
 
         ax.plot(daily.index, daily_values, marker="o", markersize=3, linewidth=1.5)
@@ -227,7 +394,7 @@ class ChartGenerator:
 
         ax.set_xlabel("Data")
         ax.set_ylabel("Número de Internações")
-        ax.set_title("Volume Diário de Internações\nAC - Janeiro 2024")
+        ax.set_title(f"Volume {period} de Internações\n{self.subtitle}")
 
         # Rotacionar labels do eixo X
         plt.xticks(rotation=45, ha="right")
@@ -249,19 +416,22 @@ class ChartGenerator:
         plt.close(fig)
         return filepath
 
-    def gender_distribution(self, df: pd.DataFrame) -> Path:
+    def gender_distribution(self, df: pd.DataFrame | pd.Series) -> Path:
         """Gera gráfico de distribuição por sexo.
 
         Args:
-            df: DataFrame com coluna 'SEXO'.
+            df: DataFrame com coluna 'SEXO' ou contagens por rótulo de sexo
+                (agregado 'gender').
 
         Returns:
             Caminho do arquivo salvo.
         """
         fig, ax = plt.subplots(figsize=(8, 6))
 
-        gender_map = {1: "Masculino", 3: "Feminino"}
-        gender_counts = df["SEXO"].map(gender_map).value_counts()
+        if isinstance(df, pd.Series):
+            gender_counts = df
+        else:
+            gender_counts = _gender_counts(df["SEXO"].value_counts())
         values = self._to_array(gender_counts)
 
         colors = ["#3498db", "#e74c3c"]
@@ -284,7 +454,7 @@ class ChartGenerator:
             autotext.set_fontsize(11)
             autotext.set_fontweight("bold")
 
-        ax.set_title("Distribuição de Internações por Sexo\nAC - Janeiro 2024")
+        ax.set_title(f"Distribuição de Internações por Sexo\n{self.subtitle}")
 
         # Adicionar legenda com valores absolutos
         legend_labels = [
@@ -299,21 +469,50 @@ class ChartGenerator:
         plt.close(fig)
         return filepath
 
-    def generate_all(self, df: pd.DataFrame) -> list[Path]:
-        """Gera todos os gráficos.
+    def generate_all(self, df: ChartSource, workers: int | None = 1) -> list[Path]:
+        """Gera todos os gráficos a partir de agregados compartilhados.
 
         Args:
-            df: DataFrame com dados de internações.
+            df: DataFrame com dados de internações, KPICube (ex: filtrado
+                por UF ou competência) ou saída de chart_aggregates.
+            workers: Processos de renderização (1 = sequencial; 0 ou None =
+                EXECUTOR_CONFIG/núcleos).
 
         Returns:
             Lista de caminhos dos arquivos salvos.
         """
-        charts = [
-            self.demographics_by_age(df),
-            self.revenue_by_specialty(df),
-            self.avg_stay_by_specialty(df),
-            self.top_diagnoses(df),
-            self.volume_by_day(df),
-            self.gender_distribution(df),
-        ]
-        return charts
+        aggregates = df if isinstance(df, dict) else chart_aggregates(df)
+        if workers == 1:
+            return [getattr(self, method)(aggregates[name]) for name, method in CHARTS]
+        return render_charts(self._tasks(self.output_dir, self.subtitle, aggregates), workers)
+
+    def generate_many(
+        self, sources: Mapping[str, ChartSource], workers: int | None = None
+    ) -> dict[str, list[Path]]:
+        """Gera o conjunto de gráficos para várias UFs ou períodos em um único pool.
+
+        Args:
+            sources: Rótulo (ex: UF ou competência) → DataFrame, KPICube ou
+                agregados; cada rótulo vira subdiretório e subtítulo.
+            workers: Processos (padrão: EXECUTOR_CONFIG ou núcleos; 1 = sem pool).
+
+        Returns:
+            Dicionário rótulo → caminhos dos gráficos, na ordem de generate_all.
+        """
+        tasks: list[RenderTask] = []
+        for label, source in sources.items():
+            aggregates = source if isinstance(source, dict) else chart_aggregates(source)
+            tasks.extend(self._tasks(self.output_dir / label, label, aggregates))
+
+        paths = render_charts(tasks, workers)
+        return {
+            label: paths[i * len(CHARTS) : (i + 1) * len(CHARTS)] for i, label in enumerate(sources)
+        }
+
+    @staticmethod
+    def _tasks(
+        output_dir: Path, subtitle: str, aggregates: dict[str, pd.Series]
+    ) -> list[RenderTask]:
+        """Tarefas de renderização de todos os gráficos de um conjunto de agregados."""
+        output_dir.mkdir(parents=True, exist_ok=True)
+        return [(output_dir, subtitle, method, aggregates[name]) for name, method in CHARTS]
@@ -0,0 +1,217 @@
+"""Testes para acumuladores de KPI mergeáveis."""
+
+import pickle
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from src.analytics.accumulators import (
+    AgeGroupAccumulator,
+    CountAccumulator,
+    DistinctCountAccumulator,
+    GroupedMeanAccumulator,
+    GroupedSumAccumulator,
+    KPIAccumulator,
+    MeanAccumulator,
+    QuantileAccumulator,
+    SumAccumulator,
+    SummaryAccumulator,
+)
+from src.analytics.kpis import KPICalculator
+
+
+@pytest.fixture
+def sample_df() -> pd.DataFrame:
+    """DataFrame de exemplo (com nulos)."""
+    return pd.DataFrame(
+        {
+            "stay_days": [5.0, 3.0, np.nan, 2.0, 3.0, 9.0],
+            "VAL_TOT": [1000.0, 1500.0, 2000.0, np.nan, 1200.0, 700.0],
+            "ESPEC": ["01", "01", "03", "03", "08", "01"],
+            "age_group": pd.Categorical(
+                ["0-17", "18-29", "30-44", "45-59", "60+", "60+"],
+                categories=["0-17", "18-29", "30-44", "45-59", "60+"],
+            ),
+        }
+    )
+
+
+def _chunks(df: pd.DataFrame, size: int) -> list[pd.DataFrame]:
+    return [df.iloc[i : i + size] for i in range(0, len(df), size)]
+
+
+class TestScalarAccumulators:
+    """Testes para acumuladores escalares."""
+
+    def test_chunked_equals_full(self, sample_df: pd.DataFrame) -> None:
+        """Atualização em lotes equivale ao cálculo sobre o DataFrame inteiro."""
+        count, total, mean = (
+            CountAccumulator(),
+            SumAccumulator("VAL_TOT"),
+            MeanAccumulator("stay_days"),
+        )
+        for chunk in _chunks(sample_df, 4):
+            for acc in (count, total, mean):
+                acc.update(chunk)
+
+        calculator = KPICalculator()
+        assert count.result() == calculator.volume(sample_df)
+        assert total.result() == pytest.approx(calculator.revenue(sample_df))
+        assert mean.result() == pytest.approx(calculator.average_length_of_stay(sample_df))
+
+    def test_merge_across_workers(self, sample_df: pd.DataFrame) -> None:
+        """merge de estados parciais equivale a um único acumulador."""
+        left, right = _chunks(sample_df, 3)
+        merged = (
+            MeanAccumulator("VAL_TOT").update(left).merge(MeanAccumulator("VAL_TOT").update(right))
+        )
+
+        assert merged.result() == pytest.approx(sample_df["VAL_TOT"].mean())
+
+    def test_accepts_arrow_batches(self, sample_df: pd.DataFrame) -> None:
+        """Aceita pyarrow RecordBatch."""
+        batch = pa.RecordBatch.from_pandas(sample_df[["VAL_TOT"]], preserve_index=False)
+        assert SumAccumulator("VAL_TOT").update(batch).result() == pytest.approx(6400.0)
+
+    def test_non_null_count(self, sample_df: pd.DataFrame) -> None:
+        """Contagem de não nulos de uma coluna."""
+        assert CountAccumulator("stay_days").update(sample_df).result() == 5
+
+    def test_merge_incompatible_raises(self) -> None:
+        """Erro ao combinar acumuladores incompatíveis."""
+        with pytest.raises(TypeError):
+            SumAccumulator("VAL_TOT").merge(CountAccumulator())
+        with pytest.raises(ValueError, match="incompatível"):
+            SumAccumulator("VAL_TOT").merge(SumAccumulator("stay_days"))
+
+    def test_incomplete_subclass_cannot_be_instantiated(self) -> None:
+        """Subclasse sem merge/result falha na instanciação."""
+
+        class UpdateOnly(KPIAccumulator):
+            def update(self, batch: pd.DataFrame) -> "UpdateOnly":
+                return self
+
+        with pytest.raises(TypeError):
+            UpdateOnly()  # type: ignore[abstract]
+
+
+class TestGroupedAccumulators:
+    """Testes para acumuladores agrupados."""
+
+    def test_grouped_sum_matches_revenue(self, sample_df: pd.DataFrame) -> None:
+        """Somas por grupo equivalem a KPICalculator.revenue(group_by)."""
+        parts = [GroupedSumAccumulator("ESPEC", "VAL_TOT").update(c) for c in _chunks(sample_df, 2)]
+        merged = parts[0].merge(parts[1]).merge(parts[2])
+
+        assert merged.result() == KPICalculator().revenue(sample_df, group_by="ESPEC")
+
+    def test_grouped_count_matches_volume(self, sample_df: pd.DataFrame) -> None:
+        """Contagem por grupo equivale a KPICalculator.volume(group_by)."""
+        acc = GroupedSumAccumulator("ESPEC")
+        for chunk in _chunks(sample_df, 4):
+            acc.update(chunk)
+
+        assert acc.result() == KPICalculator().volume(sample_df, group_by="ESPEC")
+
+    def test_grouped_mean_matches_alos(self, sample_df: pd.DataFrame) -> None:
+        """Médias por grupo equivalem ao TMP por grupo."""
+        acc = GroupedMeanAccumulator("ESPEC", "stay_days")
+        for chunk in _chunks(sample_df, 5):
+            acc.update(chunk)
+
+        expected = KPICalculator().average_length_of_stay(sample_df, group_by="ESPEC")
+        assert acc.result() == pytest.approx(expected)
+
+    def test_missing_group_column_raises(self, sample_df: pd.DataFrame) -> None:
+        """Erro quando a coluna de agrupamento não existe."""
+        with pytest.raises(KeyError, match="CNES"):
+            GroupedSumAccumulator("CNES", "VAL_TOT").update(sample_df)
+
+    def test_age_groups_match_demographics(self, sample_df: pd.DataFrame) -> None:
+        """Faixas etárias equivalem a KPICalculator.demographics."""
+        parts = [AgeGroupAccumulator().update(c) for c in _chunks(sample_df, 4)]
+        merged = parts[0].merge(parts[1])
+
+        assert merged.result() == KPICalculator().demographics(sample_df)
+
+
+class TestSummaryAccumulator:
+    """Testes para o acumulador do resumo consolidado."""
+
+    def test_summary_matches_calculator(self, sample_df: pd.DataFrame) -> None:
+        """Resumo acumulado em lotes equivale ao KPICalculator.summary."""
+        parts = [SummaryAccumulator(10, 30).update(c) for c in _chunks(sample_df, 4)]
+        result = parts[0].merge(parts[1]).result()
+        expected = KPICalculator().summary(sample_df, beds=10, days=30)
+
+        assert result["volume"] == expected["volume"]
+        assert result["demographics"] == expected["demographics"]
+        for key in ("occupancy_rate", "average_length_of_stay", "revenue", "average_ticket"):
+            assert result[key] == pytest.approx(expected[key])
+
+    def test_all_null_values_match_calculator(self, sample_df: pd.DataFrame) -> None:
+        """Só nulos: médias NaN; sem registros: 0.0 (como KPICalculator.summary)."""
+        calculator = KPICalculator()
+        for df in (sample_df.assign(stay_days=np.nan, VAL_TOT=np.nan), sample_df.iloc[:0]):
+            result = SummaryAccumulator(10, 30).update(df).result()
+            expected = calculator.summary(df, beds=10, days=30)
+
+            for key in ("average_length_of_stay", "average_ticket"):
+                assert result[key] == pytest.approx(expected[key], nan_ok=True)
+
+    def test_picklable_for_process_pools(self, sample_df: pd.DataFrame) -> None:
+        """Estado sobrevive a pickle (envio entre processos)."""
+        acc = SummaryAccumulator(10, 30).update(sample_df)
+        restored = pickle.loads(pickle.dumps(acc))
+
+        assert restored.result() == acc.result()
+
+    def test_invalid_beds_raises(self) -> None:
+        """Erro com zero leitos."""
+        with pytest.raises(ValueError, match="leitos"):
+            SummaryAccumulator(0, 30)
+
+
+class TestQuantileAccumulator:
+    """Testes para quantis acumulados em lotes."""
+
+    def test_grouped_quantiles_match_calculator(self, sample_df: pd.DataFrame) -> None:
+        """Quantis por grupo (amostra pequena, exatos) iguais ao KPICalculator."""
+        parts = [QuantileAccumulator("VAL_TOT", "ESPEC").update(c) for c in _chunks(sample_df, 2)]
+        merged = parts[0].merge(parts[1]).merge(parts[2])
+
+        expected = KPICalculator().quantiles(sample_df, "VAL_TOT", group_by="ESPEC")
+        pd.testing.assert_frame_equal(
+            pd.json_normalize(merged.result()), pd.json_normalize(expected)
+        )
+
+    def test_overall_quantiles(self, sample_df: pd.DataFrame) -> None:
+        """Quantis gerais com rótulos p50/p90/p99."""
+        result = QuantileAccumulator("stay_days").update(sample_df).result()
+
+        assert list(result) == ["p50", "p90", "p99"]
+        assert result["p50"] == pytest.approx(sample_df["stay_days"].median())
+
+
+class TestDistinctCountAccumulator:
+    """Testes para contagem de distintos acumulada em lotes."""
+
+    def test_grouped_distinct_match_calculator(self, sample_df: pd.DataFrame) -> None:
+        """Distintos por grupo (poucos valores, exatos) iguais ao KPICalculator."""
+        parts = [
+            DistinctCountAccumulator("stay_days", "ESPEC").update(c) for c in _chunks(sample_df, 3)
+        ]
+        merged = parts[0].merge(parts[1])
+
+        expected = KPICalculator().distinct_count(sample_df, "stay_days", "ESPEC")
+        assert merged.result() == expected
+
+    def test_overall_distinct_across_batches(self) -> None:
+        """Valores repetidos entre lotes contam uma vez."""
+        acc = DistinctCountAccumulator("MUNIC_RES")
+        for chunk in range(4):
+            acc.update(pd.DataFrame({"MUNIC_RES": [str(v) for v in range(chunk, chunk + 100)]}))
+
+        assert acc.result() == pytest.approx(103, abs=2)
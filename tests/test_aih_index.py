@@ -0,0 +1,127 @@
+"""Testes para o índice sidecar de N_AIH."""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.load.aih_index import AIHIndex, AIHLookup, BloomFilter, index_path_for
+
+
+@pytest.fixture
+def partition(tmp_path: Path) -> Path:
+    """Partição Parquet com 4 row groups de 25 registros."""
+    df = pd.DataFrame(
+        {
+            "N_AIH": [f"1224{i:09d}" for i in range(100)],
+            "VAL_TOT": [float(i) for i in range(100)],
+        }
+    )
+    path = tmp_path / "SIH_AC_202401.parquet"
+    df.to_parquet(path, index=False, engine="pyarrow", row_group_size=25)
+    return path
+
+
+class TestBloomFilter:
+    """Testes para o Bloom filter."""
+
+    def test_no_false_negatives(self) -> None:
+        """Todas as chaves adicionadas são encontradas."""
+        bloom = BloomFilter.for_capacity(1000, fp_rate=0.01)
+        keys = [f"K{i}" for i in range(1000)]
+        bloom.add(pd.Series(keys).to_numpy(dtype=object))
+
+        assert all(bloom.might_contain(k) for k in keys)
+
+    def test_false_positive_rate_bounded(self) -> None:
+        """Taxa de falso positivo próxima da configurada."""
+        bloom = BloomFilter.for_capacity(1000, fp_rate=0.01)
+        bloom.add(pd.Series([f"K{i}" for i in range(1000)]).to_numpy(dtype=object))
+
+        false_positives = sum(bloom.might_contain(f"X{i}") for i in range(5000))
+        assert false_positives / 5000 < 0.03
+
+    def test_invalid_fp_rate_raises(self) -> None:
+        """Erro com taxa de falso positivo inválida."""
+        with pytest.raises(ValueError, match="falso positivo"):
+            BloomFilter.for_capacity(100, fp_rate=1.5)
+
+
+class TestAIHIndex:
+    """Testes para o índice de uma partição."""
+
+    def test_row_group_located(self, partition: Path) -> None:
+        """N_AIH mapeado para o row group correto."""
+        index = AIHIndex.build(partition)
+        assert index.row_groups_for("1224000000060") == [2]
+
+    def test_lookup_returns_record(self, partition: Path) -> None:
+        """Lookup retorna apenas o registro consultado."""
+        index = AIHIndex.build(partition)
+        df = index.lookup("1224000000099")
+
+        assert len(df) == 1
+        assert df["VAL_TOT"].iloc[0] == 99.0
+
+    def test_lookup_missing_returns_empty(self, partition: Path) -> None:
+        """Lookup de N_AIH inexistente retorna DataFrame vazio."""
+        index = AIHIndex.build(partition)
+        assert index.lookup("9999999999999").empty
+
+    def test_save_and_load_roundtrip(self, partition: Path) -> None:
+        """Índice salvo ao lado da partição e recarregado."""
+        saved = AIHIndex.build(partition).save()
+        assert saved == index_path_for(partition)
+
+        loaded = AIHIndex.load(saved)
+        assert loaded.parquet_path == partition
+        assert loaded.row_groups_for("1224000000010") == [0]
+
+    def test_missing_key_column_raises(self, tmp_path: Path) -> None:
+        """Erro quando a partição não tem coluna N_AIH."""
+        path = tmp_path / "SIH_AC_202402.parquet"
+        pd.DataFrame({"col": [1, 2]}).to_parquet(path)
+
+        with pytest.raises(KeyError, match="N_AIH"):
+            AIHIndex.build(path)
+
+
+class TestAIHLookup:
+    """Testes para consulta no lake inteiro."""
+
+    def test_find_across_partitions(self, partition: Path, tmp_path: Path) -> None:
+        """Encontra AIH na partição correta entre várias."""
+        other = tmp_path / "SIH_ES_202401.parquet"
+        pd.DataFrame({"N_AIH": ["3224000000001"], "VAL_TOT": [500.0]}).to_parquet(other)
+        AIHIndex.build(partition).save()
+        AIHIndex.build(other).save()
+
+        df = AIHLookup(tmp_path).find("3224000000001")
+
+        assert df is not None
+        assert len(df) == 1
+        assert df["partition"].iloc[0] == "SIH_ES_202401"
+
+    def test_find_not_found_returns_none(self, partition: Path, tmp_path: Path) -> None:
+        """Retorna None quando AIH não existe no lake."""
+        AIHIndex.build(partition).save()
+        assert AIHLookup(tmp_path).find("0000000000000") is None
+
+
+class TestLoaderBuildsIndex:
+    """Testes de integração com DataLoader."""
+
+    def test_load_writes_sidecar_index(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """DataLoader gera índice sidecar quando há coluna N_AIH."""
+        from src.load import loader as loader_module
+
+        monkeypatch.setattr(loader_module, "PROCESSED_DIR", str(tmp_path))
+        df = pd.DataFrame({"N_AIH": ["123", "456"], "VAL_TOT": [100.0, 200.0]})
+
+        metadata = loader_module.DataLoader().load(df, state="AC", year=2024, month=1)
+
+        assert metadata["index_path"] is not None
+        assert Path(metadata["index_path"]).exists()
+        assert AIHLookup(tmp_path).find("456") is not None
@@ -0,0 +1,134 @@
+"""Testes para detecção de anomalias de valores de AIH."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.anomalies import AnomalyDetector, detect_anomalies, reference_statistics
+from src.analytics.cache import KPICache
+
+
+@pytest.fixture
+def stays() -> pd.DataFrame:
+    """Dois procedimentos em janeiro; um valor faturado fora do padrão."""
+    values = [1000.0, 1010.0, 990.0, 1005.0, 995.0, 9000.0, 300.0, 300.0, 300.0, 300.0, 300.0]
+    return pd.DataFrame(
+        {
+            "PROC_REA": ["0303"] * 6 + ["0406"] * 5,
+            "VAL_TOT": values,
+            "VAL_SH": [v * 0.8 for v in values[:-1]] + [100.0],
+            "VAL_SP": [v * 0.2 for v in values],
+            "stay_days": [5, 5, 5, 5, 5, 5, 1, 1, 1, 1, 30],
+            "DT_INTER": pd.Timestamp("2024-01-10"),
+        }
+    )
+
+
+class TestReferenceStatistics:
+    """Testes para reference_statistics."""
+
+    def test_median_and_mad_match_pandas(self, stays: pd.DataFrame) -> None:
+        """Mediana e MAD por PROC_REA."""
+        stats = reference_statistics(stays)
+        group = stays[stays["PROC_REA"] == "0303"]["VAL_TOT"]
+
+        assert stats.index.name == "PROC_REA"
+        row = stats.loc["0303"]
+        assert row["records"] == 6
+        assert row["VAL_TOT_median"] == group.median()
+        assert row["VAL_TOT_mad"] == (group - group.median()).abs().median()
+
+    def test_all_null_keys_give_empty_statistics(self, stays: pd.DataFrame) -> None:
+        """Sem grupo válido, estatísticas vazias e nenhuma internação pontuada."""
+        stays["PROC_REA"] = None
+
+        stats = reference_statistics(stays)
+        result = AnomalyDetector().fit(stays).detect(stays)
+
+        assert stats.empty
+        assert stats["records"].dtype == np.int64
+        assert result["VAL_TOT_z"].isna().all()
+
+
+class TestAnomalyDetector:
+    """Testes para AnomalyDetector."""
+
+    def test_flags_outlier_value(self, stays: pd.DataFrame) -> None:
+        """Valor muito acima da mediana do procedimento é sinalizado."""
+        flags = detect_anomalies(stays)
+
+        assert flags["VAL_TOT_outlier"].tolist() == [False] * 5 + [True] + [False] * 5
+        assert flags.loc[5, "VAL_TOT_z"] > 100
+
+    def test_reference_from_earlier_months_scores_new_month(self, stays: pd.DataFrame) -> None:
+        """Referência de jan+fev sinaliza outlier de março (competência nova)."""
+        february = stays.assign(DT_INTER=pd.Timestamp("2024-02-10"))
+        march = stays.head(2).assign(DT_INTER=pd.Timestamp("2024-03-10"))
+        march.loc[1, "VAL_TOT"] = 100_000.0
+
+        detector = AnomalyDetector().fit(pd.concat([stays, february], ignore_index=True))
+        flags = detector.detect(march)
+
+        assert flags["VAL_TOT_outlier"].tolist() == [False, True]
+
+    def test_seasonal_reference_by_calendar_month(self, stays: pd.DataFrame) -> None:
+        """Com by=['PROC_REA', 'month'], janeiro de outro ano usa a referência de janeiro."""
+        next_year = stays.head(2).assign(DT_INTER=pd.Timestamp("2025-01-10"))
+        next_year.loc[1, "VAL_TOT"] = 100_000.0
+
+        flags = AnomalyDetector(by=["PROC_REA", "month"]).fit(stays).detect(next_year)
+
+        assert flags["VAL_TOT_outlier"].tolist() == [False, True]
+
+    def test_zero_mad_uses_mean_absolute_deviation(self, stays: pd.DataFrame) -> None:
+        """Valor tabelado (MAD zero): desvio médio como escala do daily_cost."""
+        flags = detect_anomalies(stays)
+
+        assert flags.loc[10, "daily_cost_outlier"]
+        assert not flags.loc[6:9, "daily_cost_outlier"].any()
+
+    def test_component_mismatch(self, stays: pd.DataFrame) -> None:
+        """VAL_TOT diferente da soma dos componentes."""
+        flags = detect_anomalies(stays)
+
+        assert flags.loc[10, "component_gap"] == pytest.approx(140.0)
+        assert flags["component_mismatch"].tolist() == [False] * 10 + [True]
+        assert flags["anomaly"].sum() == 2
+
+    def test_small_groups_not_scored(self, stays: pd.DataFrame) -> None:
+        """Grupos abaixo do mínimo de internações ficam sem z-score."""
+        flags = AnomalyDetector(min_records=6).detect(stays)
+
+        assert flags.loc[:5, "VAL_TOT_z"].notna().all()
+        assert flags.loc[6:, "VAL_TOT_z"].isna().all()
+
+    def test_reference_statistics_are_cached(
+        self, stays: pd.DataFrame, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Estatísticas da mesma partição vêm do cache no segundo fit."""
+        path = tmp_path / "SIH_AC_202401.parquet"
+        stays.to_parquet(path)
+        cache = KPICache(directory=tmp_path / "cache")
+
+        first = AnomalyDetector(cache=cache).fit(path).detect(stays)
+        monkeypatch.setattr(pd, "read_parquet", lambda *a, **k: pytest.fail("releu partição"))
+        second = AnomalyDetector(cache=cache).fit(path).detect(stays)
+
+        assert cache.hits == 1
+        pd.testing.assert_frame_equal(first, second)
+
+    def test_unknown_group_not_scored(self, stays: pd.DataFrame) -> None:
+        """Procedimento ausente da referência não recebe z-score."""
+        detector = AnomalyDetector().fit(stays)
+        flags = detector.detect(stays.assign(PROC_REA="9999"))
+
+        assert flags["VAL_TOT_z"].isna().all()
+        assert not flags["VAL_TOT_outlier"].any()
+        assert np.isnan(flags.loc[0, "daily_cost_z"])
+
+    def test_missing_value_column_raises(self, stays: pd.DataFrame) -> None:
+        """Erro sem VAL_TOT."""
+        with pytest.raises(KeyError, match="VAL_TOT"):
+            detect_anomalies(stays.drop(columns="VAL_TOT"))
@@ -0,0 +1,127 @@
+"""Testes para o cache de resultados de KPI."""
+
+import os
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.analytics.cache import KPICache
+
+
+@pytest.fixture
+def sample_df() -> pd.DataFrame:
+    """DataFrame de exemplo."""
+    return pd.DataFrame(
+        {
+            "stay_days": [5, 3, 7],
+            "VAL_TOT": [1000.0, 1500.0, 2000.0],
+            "age_group": pd.Categorical(["0-17", "18-29", "60+"]),
+        }
+    )
+
+
+@pytest.fixture
+def partition(tmp_path: Path, sample_df: pd.DataFrame) -> Path:
+    """Partição Parquet gravada em disco."""
+    path = tmp_path / "SIH_AC_202401.parquet"
+    sample_df.to_parquet(path, index=False)
+    return path
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> KPICache:
+    """Cache com diretório temporário."""
+    return KPICache(directory=tmp_path / "cache", memory_entries=2)
+
+
+class TestKPICache:
+    """Testes para KPICache."""
+
+    def test_second_call_is_hit(self, cache: KPICache, partition: Path) -> None:
+        """Segunda chamada com mesmos argumentos é servida do cache."""
+        first = cache.call([partition], "summary", beds=10, days=30)
+        second = cache.call([partition], "summary", beds=10, days=30)
+
+        assert first == second
+        assert first["revenue"] == 4500.0
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_different_arguments_are_different_keys(self, cache: KPICache, partition: Path) -> None:
+        """Argumentos diferentes geram entradas diferentes."""
+        cache.call([partition], "summary", beds=10, days=30)
+        result = cache.call([partition], "summary", beds=20, days=30)
+
+        assert cache.misses == 2
+        assert result["occupancy_rate"] == pytest.approx(15 / 600 * 100)
+
+    def test_disk_tier_survives_new_instance(
+        self, tmp_path: Path, cache: KPICache, partition: Path
+    ) -> None:
+        """Nova instância encontra a entrada no disco."""
+        cache.call(partition, "revenue")
+
+        reopened = KPICache(directory=tmp_path / "cache")
+        assert reopened.call(partition, "revenue") == 4500.0
+        assert reopened.hits == 1
+
+    def test_rewritten_partition_changes_key(
+        self, cache: KPICache, partition: Path, sample_df: pd.DataFrame
+    ) -> None:
+        """Partição reescrita não reaproveita resultado antigo."""
+        cache.call(partition, "revenue")
+
+        sample_df.assign(VAL_TOT=[1.0, 2.0, 3.0]).to_parquet(partition, index=False)
+        stat = partition.stat()
+        os.utime(partition, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert cache.call(partition, "revenue") == 6.0
+
+    def test_invalidate_removes_dependent_entries(self, cache: KPICache, partition: Path) -> None:
+        """invalidate remove entradas da partição nos dois níveis."""
+        cache.call(partition, "revenue")
+        cache.call(partition, "volume")
+
+        assert cache.invalidate(partition) == 2
+        assert list(cache.directory.glob("*.pkl")) == []
+
+    def test_memory_lru_bounded(self, cache: KPICache, sample_df: pd.DataFrame) -> None:
+        """LRU em memória respeita número máximo de entradas."""
+        for beds in (10, 20, 30):
+            cache.call(sample_df, "occupancy_rate", beds, 30)
+
+        assert len(cache._memory) == 2
+
+    def test_disk_budget_evicts_oldest(self, tmp_path: Path, sample_df: pd.DataFrame) -> None:
+        """Orçamento em disco remove entradas menos recentes."""
+        cache = KPICache(directory=tmp_path / "small", disk_bytes=200)
+        for beds in range(1, 20):
+            cache.call(sample_df, "occupancy_rate", beds, 30)
+
+        total = sum(p.stat().st_size for p in cache.directory.glob("*.pkl"))
+        assert total <= 200
+
+    def test_returned_values_are_copies(self, cache: KPICache, sample_df: pd.DataFrame) -> None:
+        """Mutação do resultado não corrompe o cache."""
+        cache.call(sample_df, "demographics")["0-17"] = 999
+        assert cache.call(sample_df, "demographics")["0-17"] == 1
+
+    def test_loader_invalidates_on_rewrite(
+        self,
+        tmp_path: Path,
+        cache: KPICache,
+        sample_df: pd.DataFrame,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Hook do DataLoader invalida entradas ao reescrever a partição."""
+        from src.load import loader as loader_module
+
+        monkeypatch.setattr(loader_module, "PROCESSED_DIR", str(tmp_path))
+        loader = loader_module.DataLoader(hooks=[cache.partition_written])
+        metadata = loader.load(sample_df, state="AC", year=2024, month=1)
+        cache.call(metadata["parquet_path"], "revenue")
+
+        loader.load(sample_df.head(1), state="AC", year=2024, month=1)
+
+        assert cache._manifest == {}
+        assert cache.call(metadata["parquet_path"], "revenue") == 1000.0
@@ -0,0 +1,137 @@
+"""Testes para a dimensão de leitos do CNES e a ocupação por hospital."""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.capacity import BedCapacity, hospital_occupancy
+from src.analytics.cube import KPICube
+from src.analytics.kpis import KPICalculator
+
+
+@pytest.fixture
+def lt_dir(tmp_path: Path) -> Path:
+    """Extratos LT de jan/2024 (com COMPETEN) e mar/2024 (competência no nome)."""
+    directory = tmp_path / "cnes_lt"
+    directory.mkdir()
+    pd.DataFrame(
+        {
+            "CNES": ["2000121", "2000121", "2001586"],
+            "COMPETEN": ["202401", "202401", "202401"],
+            "TP_LEITO": ["1", "3", "1"],
+            "QT_EXIST": ["20", "10", "15"],
+            "QT_SUS": ["18", "10", "5"],
+        }
+    ).to_csv(directory / "LTAC2401.csv", index=False)
+    pd.DataFrame(
+        {"cnes": ["2000121"], "tp_leito": ["1"], "qt_exist": ["40"], "qt_sus": ["30"]}
+    ).to_csv(directory / "LTAC2403.csv", index=False)
+    return directory
+
+
+def stays() -> pd.DataFrame:
+    """Internações de dois hospitais em jan e fev/2024 (e um sem CNES no LT)."""
+    return pd.DataFrame(
+        {
+            "CNES": ["2000121", "2000121", "2001586", "2000121", "9999999"],
+            "DT_INTER": pd.to_datetime(
+                ["2024-01-05", "2024-01-20", "2024-01-10", "2024-02-03", "2024-01-02"]
+            ),
+            "stay_days": [100, 86, 93, 58, 10],
+        }
+    )
+
+
+class TestBedCapacity:
+    """Testes para BedCapacity."""
+
+    def test_normalizes_and_caches(self, lt_dir: Path, tmp_path: Path) -> None:
+        """Soma tipos de leito por CNES × competência e grava o cache Parquet."""
+        capacity = BedCapacity.load(lt_dir, cache_dir=tmp_path / "cache")
+
+        assert capacity.competencias == [202401, 202403]
+        row = capacity.data[(capacity.data["CNES"] == "2000121")].iloc[0]
+        assert (row["QT_EXIST"], row["QT_SUS"], row["QT_CONTR"]) == (30, 28, 0)
+        assert capacity.data["QT_EXIST"].dtype == np.int32
+        cached = tmp_path / "cache" / "cnes_beds_cnes_lt.parquet"
+        assert cached.exists()
+
+        reloaded = BedCapacity.load(lt_dir, cache_dir=tmp_path / "cache")
+        pd.testing.assert_frame_equal(reloaded.data, capacity.data)
+
+    def test_newer_extract_invalidates_cache(self, lt_dir: Path, tmp_path: Path) -> None:
+        """Extrato mais novo que o cache força nova normalização."""
+        BedCapacity.load(lt_dir, cache_dir=tmp_path)
+        extract = lt_dir / "LTAC2401.csv"
+        pd.DataFrame({"CNES": ["2001586"], "COMPETEN": ["202401"], "QT_EXIST": ["7"]}).to_csv(
+            extract, index=False
+        )
+        future = (tmp_path / "cnes_beds_cnes_lt.parquet").stat().st_mtime_ns + 10**9
+        os.utime(extract, ns=(future, future))
+
+        capacity = BedCapacity.load(lt_dir, cache_dir=tmp_path)
+
+        assert capacity.beds(202401).to_dict() == {"2001586": 7}
+
+    def test_missing_source_raises(self, tmp_path: Path) -> None:
+        """Sem extratos, FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            BedCapacity.load(tmp_path / "nao_existe", cache_dir=tmp_path)
+
+    def test_beds_as_of_competencia(self, lt_dir: Path, tmp_path: Path) -> None:
+        """Meses sem extrato usam a última versão; antes do primeiro, sem leitos."""
+        capacity = BedCapacity.load(lt_dir, cache_dir=tmp_path)
+
+        assert capacity.beds(202402).to_dict() == {"2000121": 30, "2001586": 15}
+        assert capacity.beds().to_dict() == {"2000121": 40, "2001586": 15}
+        assert capacity.beds(202403, column="QT_SUS").to_dict() == {"2000121": 30, "2001586": 5}
+        assert capacity.beds(202312).empty
+
+    def test_invalid_column_raises(self, lt_dir: Path, tmp_path: Path) -> None:
+        """Coluna de leitos desconhecida gera KeyError."""
+        capacity = BedCapacity.load(lt_dir, cache_dir=tmp_path)
+
+        with pytest.raises(KeyError):
+            capacity.beds(202401, column="TP_LEITO")
+
+    def test_missing_competencia_raises(self, tmp_path: Path) -> None:
+        """Extrato sem COMPETEN e com nome fora do padrão gera KeyError."""
+        pd.DataFrame({"CNES": ["1"], "QT_EXIST": ["1"]}).to_csv(tmp_path / "leitos.csv")
+
+        with pytest.raises(KeyError):
+            BedCapacity.load(tmp_path / "leitos.csv", cache_dir=tmp_path)
+
+
+class TestHospitalOccupancy:
+    """Testes para hospital_occupancy."""
+
+    def test_occupancy_for_every_hospital(self, lt_dir: Path, tmp_path: Path) -> None:
+        """Mesma fórmula de occupancy_rate, com leitos do CNES e dias do mês."""
+        capacity = BedCapacity.load(lt_dir, cache_dir=tmp_path)
+        df = stays()
+
+        result = hospital_occupancy(df, capacity)
+
+        jan = result.loc[("2000121", 202401)]
+        january = df[(df["CNES"] == "2000121") & (df["DT_INTER"].dt.month == 1)]
+        expected = KPICalculator().occupancy_rate(january, beds=30, days=31)
+        assert jan["occupancy_rate"] == pytest.approx(expected)
+        assert result.loc[("2000121", 202402), "bed_days"] == 30 * 29
+        assert result.loc[("2001586", 202401), "occupancy_rate"] == pytest.approx(20.0)
+        assert np.isnan(result.loc[("9999999", 202401), "occupancy_rate"])
+
+    def test_cube_matches_dataframe(self, lt_dir: Path, tmp_path: Path) -> None:
+        """Ocupação a partir do cubo igual à dos registros."""
+        capacity = BedCapacity.load(lt_dir, cache_dir=tmp_path)
+        df = stays()
+        cube = KPICube()
+        cube.update(df, state="AC", year=2024, month=1)
+
+        pd.testing.assert_frame_equal(
+            hospital_occupancy(cube, capacity),
+            hospital_occupancy(df, capacity),
+            check_index_type=False,  # CNES do cubo é string, dos registros é object
+        )
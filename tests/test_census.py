@@ -0,0 +1,104 @@
+"""Testes para o censo diário de leitos."""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from src.analytics.census import BedCensus, daily_census
+
+
+@pytest.fixture
+def stays() -> pd.DataFrame:
+    """Internações em dois hospitais, uma cruzando a virada do mês."""
+    return pd.DataFrame(
+        {
+            "CNES": ["1", "1", "1", "2", "2"],
+            "DT_INTER": pd.to_datetime(
+                ["2024-01-01", "2024-01-02", "2024-01-30", "2024-01-03", "2024-01-04"]
+            ),
+            "DT_SAIDA": pd.to_datetime(
+                ["2024-01-04", "2024-01-03", "2024-02-02", "2024-01-03", pd.NaT]
+            ),
+        }
+    )
+
+
+class TestBedCensus:
+    """Testes para BedCensus."""
+
+    def test_midnight_census(self, stays: pd.DataFrame) -> None:
+        """Leitos ocupados à meia-noite por hospital."""
+        census = BedCensus("2024-01-01", "2024-01-05").update(stays).census()
+
+        assert census["1"].tolist() == [1, 2, 1, 0, 0]
+        assert census["2"].tolist() == [0, 0, 0, 0, 0]  # alta no mesmo dia, NaT ignorado
+
+    def test_census_sums_to_stay_days(self, stays: pd.DataFrame) -> None:
+        """Soma do censo na janela completa equivale à soma de stay_days."""
+        complete = stays.dropna()
+        census = daily_census(complete)
+
+        expected = (complete["DT_SAIDA"] - complete["DT_INTER"]).dt.days.sum()
+        assert census.to_numpy().sum() == expected
+
+    def test_peak_counts_same_day_stays(self, stays: pd.DataFrame) -> None:
+        """Pico diário inclui admissões e altas do próprio dia."""
+        peak = BedCensus("2024-01-01", "2024-01-05").update(stays).peak()
+
+        assert peak["1"].tolist() == [1, 2, 2, 1, 0]
+        assert peak["2"].tolist() == [0, 0, 1, 0, 0]
+
+    def test_stays_clipped_to_window(self, stays: pd.DataFrame) -> None:
+        """Internação que cruza a virada do mês conta só nos dias da janela."""
+        january = BedCensus("2024-01-29", "2024-01-31").update(stays).census()
+        february = BedCensus("2024-02-01", "2024-02-03").update(stays).census()
+
+        assert january["1"].tolist() == [0, 1, 1]
+        assert february["1"].tolist() == [1, 0, 0]
+
+    def test_merge_matches_single_pass(self, stays: pd.DataFrame) -> None:
+        """Partições combinadas equivalem a um único update."""
+        left = BedCensus("2024-01-01", "2024-02-05").update(stays.iloc[:2])
+        right = BedCensus("2024-01-01", "2024-02-05").update(stays.iloc[2:])
+        full = BedCensus("2024-01-01", "2024-02-05").update(stays)
+
+        pd.testing.assert_frame_equal(left.merge(right).census(), full.census())
+
+    def test_accepts_arrow_batches(self, stays: pd.DataFrame) -> None:
+        """Aceita pyarrow RecordBatch."""
+        batch = pa.RecordBatch.from_pandas(stays, preserve_index=False)
+        census = BedCensus("2024-01-01", "2024-01-05").update(batch).census()
+
+        assert census["1"].tolist() == [1, 2, 1, 0, 0]
+
+    def test_monthly_splits_across_months(self, stays: pd.DataFrame) -> None:
+        """Dias-paciente atribuídos ao mês em que ocorreram."""
+        monthly = BedCensus("2024-01-01", "2024-02-29").update(stays).monthly()
+
+        assert monthly.loc[(202401, "1"), "patient_days"] == 3 + 1 + 2
+        assert monthly.loc[(202402, "1"), "patient_days"] == 1
+        assert monthly.loc[(202401, "1"), "max_census"] == 2
+
+    def test_occupancy_per_hospital_beds(self, stays: pd.DataFrame) -> None:
+        """Ocupação diária com leitos por hospital."""
+        occupancy = BedCensus("2024-01-01", "2024-01-02").update(stays).occupancy({"1": 4, "2": 2})
+
+        assert occupancy["1"].tolist() == [25.0, 50.0]
+
+    def test_occupancy_numpy_scalar_beds(self, stays: pd.DataFrame) -> None:
+        """Leitos como escalar numpy (ex: soma de uma coluna) valem para todos os hospitais."""
+        census = BedCensus("2024-01-01", "2024-01-02").update(stays)
+
+        pd.testing.assert_frame_equal(census.occupancy(np.int64(4)), census.occupancy(4))
+        assert census.occupancy(np.int64(4)).notna().all().all()
+
+    def test_invalid_window_raises(self) -> None:
+        """Erro quando a data final é anterior à inicial."""
+        with pytest.raises(ValueError, match="Data final"):
+            BedCensus("2024-02-01", "2024-01-01")
+
+    def test_missing_columns_raise(self, stays: pd.DataFrame) -> None:
+        """Erro quando faltam colunas de datas."""
+        with pytest.raises(KeyError, match="DT_SAIDA"):
+            BedCensus("2024-01-01", "2024-01-05").update(stays.drop(columns="DT_SAIDA"))
@@ -0,0 +1,95 @@
+"""Testes para composição de custos e indicadores de UTI."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.costs import cost_composition, cost_measures
+from src.analytics.cube import KPICube
+
+
+@pytest.fixture
+def stays() -> pd.DataFrame:
+    """Internações com componentes de valor e diárias de UTI."""
+    return pd.DataFrame(
+        {
+            "CNES": ["1", "1", "1", "2", "2"],
+            "ESPEC": ["01", "01", "03", "01", "01"],
+            "VAL_TOT": [1000.0, 3000.0, 500.0, 2000.0, np.nan],
+            "VAL_SH": [800.0, 2500.0, 400.0, 1500.0, 100.0],
+            "VAL_SP": [200.0, 500.0, 100.0, 500.0, 0.0],
+            "VAL_SADT": [50.0, 0.0, 0.0, 100.0, 0.0],
+            "VAL_UTI": [0.0, 1200.0, 0.0, 600.0, 0.0],
+            "UTI_MES_TO": ["0", "4", None, "2", "0"],
+            "stay_days": [3, 10, 2, 5, 1],
+            "DT_INTER": pd.to_datetime(
+                ["2024-01-05", "2024-01-20", "2024-02-01", "2024-01-10", "2024-02-15"]
+            ),
+        }
+    )
+
+
+class TestCostComposition:
+    """Testes para cost_composition."""
+
+    def test_shares_and_icu_by_hospital(self, stays: pd.DataFrame) -> None:
+        """Participações sobre VAL_TOT e indicadores de UTI por CNES."""
+        result = cost_composition(stays, group_by="CNES")
+        hospital = result.loc["1"]
+
+        assert hospital["records"] == 3
+        assert hospital["VAL_SH_share"] == pytest.approx(3700 / 4500 * 100)
+        assert hospital["VAL_UTI_share"] == pytest.approx(1200 / 4500 * 100)
+        assert hospital["icu_days"] == 4
+        assert hospital["icu_rate"] == pytest.approx(100 / 3)
+        assert hospital["icu_cost_per_day"] == 300.0
+        assert hospital["icu_days_per_stay"] == 4.0
+
+    def test_default_groups_hospital_specialty_month(self, stays: pd.DataFrame) -> None:
+        """Agrupamento padrão CNES × ESPEC × competencia."""
+        result = cost_composition(stays)
+
+        assert result.index.names == ["CNES", "ESPEC", "competencia"]
+        assert len(result) == 4
+        assert np.isnan(result.loc[("1", "03", 202402), "icu_cost_per_day"])
+
+    def test_measures_match_groupby(self, stays: pd.DataFrame) -> None:
+        """Somas fundidas iguais às de um groupby por coluna."""
+        measures = cost_measures(stays, group_by=["CNES", "ESPEC"])
+        expected = stays.groupby(["CNES", "ESPEC"])[["VAL_SH", "VAL_SP"]].sum()
+
+        np.testing.assert_allclose(measures["VAL_SH_sum"], expected["VAL_SH"])
+        np.testing.assert_allclose(measures["VAL_SP_sum"], expected["VAL_SP"])
+        assert measures["VAL_TOT_sum"].sum() == 6500.0
+
+    def test_overall_total(self, stays: pd.DataFrame) -> None:
+        """Sem agrupamento, uma linha com o total geral."""
+        result = cost_composition(stays, group_by=None)
+
+        assert result["records"].iloc[0] == 5
+        assert result["icu_days"].iloc[0] == 6
+
+    def test_cube_matches_dataframe(self, stays: pd.DataFrame) -> None:
+        """Medidas de custo do cubo iguais às dos registros."""
+        cube = KPICube()
+        cube.update(stays, state="AC", year=2024, month=2)
+
+        pd.testing.assert_frame_equal(
+            cost_composition(cube, group_by=["CNES", "competencia"]),
+            cost_composition(stays, group_by=["CNES", "competencia"]),
+            check_index_type=False,
+        )
+
+    def test_missing_columns_count_as_zero(self) -> None:
+        """Sem colunas de UTI, indicadores de UTI ficam zerados ou NaN."""
+        df = pd.DataFrame({"CNES": ["1"], "VAL_TOT": [100.0], "VAL_SH": [100.0]})
+        result = cost_composition(df, group_by="CNES")
+
+        assert result.loc["1", "VAL_SH_share"] == 100.0
+        assert result.loc["1", "icu_rate"] == 0.0
+        assert np.isnan(result.loc["1", "icu_cost_per_day"])
+
+    def test_invalid_group_raises(self, stays: pd.DataFrame) -> None:
+        """Erro para coluna de agrupamento inexistente."""
+        with pytest.raises(KeyError, match="DIAG_PRINC"):
+            cost_composition(stays, group_by="DIAG_PRINC")
@@ -0,0 +1,312 @@
+"""Testes para o cubo de KPIs pré-computado."""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.analytics.cube import KPICube
+from src.analytics.kpis import KPICalculator
+
+
+@pytest.fixture
+def partition_df() -> pd.DataFrame:
+    """Partição processada de exemplo."""
+    return pd.DataFrame(
+        {
+            "CNES": ["2000121", "2000121", "2001586", "2001586", "2001586"],
+            "MUNIC_RES": ["120040", "120040", "120040", "120020", "120030"],
+            "ESPEC": ["01", "01", "03", "03", "08"],
+            "SEXO": [1, 3, 1, 3, 3],
+            "stay_days": [5, 3, 7, 2, 3],
+            "VAL_TOT": [1000.0, 1500.0, 2000.0, 800.0, 1200.0],
+            "death": [False, True, False, False, False],
+            "age_group": pd.Categorical(
+                ["0-17", "18-29", "30-44", "45-59", "60+"],
+                categories=["0-17", "18-29", "30-44", "45-59", "60+"],
+            ),
+            "DT_INTER": pd.to_datetime(
+                ["2024-01-05", "2024-01-10", "2024-01-15", "2024-02-01", "2024-02-10"]
+            ),
+        }
+    )
+
+
+@pytest.fixture
+def cube(partition_df: pd.DataFrame) -> KPICube:
+    """Cubo com uma partição."""
+    cube = KPICube()
+    cube.update(partition_df, state="AC", year=2024, month=2)
+    return cube
+
+
+@pytest.fixture
+def calculator() -> KPICalculator:
+    """Instância do calculador de KPIs."""
+    return KPICalculator()
+
+
+class TestKPICubeAnswers:
+    """KPIs a partir do cubo equivalem aos calculados sobre registros."""
+
+    @pytest.mark.parametrize("group_by", [None, "ESPEC", "CNES", "month"])
+    def test_volume_matches_dataframe(
+        self,
+        cube: KPICube,
+        partition_df: pd.DataFrame,
+        calculator: KPICalculator,
+        group_by: str | None,
+    ) -> None:
+        """Volume do cubo igual ao volume dos registros."""
+        assert calculator.volume(cube, group_by) == calculator.volume(partition_df, group_by)
+
+    @pytest.mark.parametrize("group_by", [None, "ESPEC", "CNES"])
+    def test_revenue_and_alos_match_dataframe(
+        self,
+        cube: KPICube,
+        partition_df: pd.DataFrame,
+        calculator: KPICalculator,
+        group_by: str | None,
+    ) -> None:
+        """Receita e TMP do cubo iguais aos dos registros."""
+        assert calculator.revenue(cube, group_by) == calculator.revenue(partition_df, group_by)
+        assert calculator.average_length_of_stay(
+            cube, group_by
+        ) == calculator.average_length_of_stay(partition_df, group_by)
+
+    @pytest.mark.parametrize("group_by", [None, "CNES", ["month", "ESPEC"]])
+    def test_kpi_table_matches_dataframe(
+        self,
+        cube: KPICube,
+        partition_df: pd.DataFrame,
+        calculator: KPICalculator,
+        group_by: str | list[str] | None,
+    ) -> None:
+        """Tabela de KPIs do cubo igual à dos registros."""
+        pd.testing.assert_frame_equal(
+            calculator.kpi_table(cube, group_by),
+            calculator.kpi_table(partition_df, group_by),
+            check_index_type=False,
+        )
+
+    def test_summary_matches_dataframe(
+        self, cube: KPICube, partition_df: pd.DataFrame, calculator: KPICalculator
+    ) -> None:
+        """Resumo do cubo igual ao resumo dos registros."""
+        assert calculator.summary(cube, beds=10, days=30) == calculator.summary(
+            partition_df, beds=10, days=30
+        )
+
+    def test_empty_cube(self, calculator: KPICalculator) -> None:
+        """Cubo vazio retorna zeros."""
+        cube = KPICube()
+        assert calculator.volume(cube) == 0
+        assert calculator.revenue(cube) == 0.0
+        assert calculator.occupancy_rate(cube, beds=10, days=30) == 0.0
+        assert all(v == 0 for v in calculator.demographics(cube).values())
+
+    def test_invalid_group_by_raises(self, cube: KPICube, calculator: KPICalculator) -> None:
+        """Erro ao agrupar por dimensão inexistente no cubo."""
+        with pytest.raises(KeyError, match="DIAG_PRINC"):
+            calculator.volume(cube, group_by="DIAG_PRINC")
+
+
+class TestKPICubeQuantiles:
+    """Quantis a partir dos t-digests do cubo."""
+
+    @pytest.mark.parametrize("group_by", [None, "CNES", "ESPEC"])
+    @pytest.mark.parametrize("column", ["stay_days", "VAL_TOT"])
+    def test_quantiles_match_dataframe(
+        self,
+        cube: KPICube,
+        partition_df: pd.DataFrame,
+        calculator: KPICalculator,
+        column: str,
+        group_by: str | None,
+    ) -> None:
+        """Poucos valores por grupo: quantis do cubo iguais aos exatos."""
+        pd.testing.assert_frame_equal(
+            pd.json_normalize(calculator.quantiles(cube, column, group_by)),
+            pd.json_normalize(calculator.quantiles(partition_df, column, group_by)),
+        )
+
+    def test_daily_cost_derived(self, cube: KPICube, partition_df: pd.DataFrame) -> None:
+        """daily_cost derivado de VAL_TOT / stay_days quando ausente."""
+        daily_cost = partition_df["VAL_TOT"] / partition_df["stay_days"]
+        result = KPICalculator().quantiles(cube, "daily_cost")
+
+        assert result["p50"] == pytest.approx(daily_cost.median())
+
+    def test_quantiles_merge_partitions_and_filter(self, partition_df: pd.DataFrame) -> None:
+        """Quantis combinam partições e respeitam filtros."""
+        cube = KPICube()
+        cube.update(partition_df, state="AC", year=2024, month=2)
+        cube.update(partition_df.assign(stay_days=[10, 20, 30, 40, 50]), "SP", 2024, 2)
+
+        both = pd.concat([partition_df["stay_days"], pd.Series([10, 20, 30, 40, 50])])
+        calculator = KPICalculator()
+        assert calculator.quantiles(cube)["p90"] == pytest.approx(both.quantile(0.9))
+        assert calculator.quantiles(cube.filter(UF="SP"))["p50"] == 30.0
+
+    def test_unknown_measure_raises(self, cube: KPICube) -> None:
+        """Erro para medida sem sketch."""
+        with pytest.raises(KeyError, match="IDADE"):
+            cube.quantiles("IDADE")
+
+
+class TestKPICubeDistinct:
+    """Contagens de distintos a partir dos HyperLogLog do cubo."""
+
+    @pytest.mark.parametrize("group_by", [None, "CNES", "month"])
+    def test_distinct_matches_dataframe(
+        self,
+        cube: KPICube,
+        partition_df: pd.DataFrame,
+        calculator: KPICalculator,
+        group_by: str | None,
+    ) -> None:
+        """Poucos distintos: estimativa igual à contagem exata."""
+        expected = calculator.distinct_count(
+            partition_df.assign(month=partition_df["DT_INTER"].dt.month), "MUNIC_RES", group_by
+        )
+        if group_by == "month":
+            expected = {int(k): v for k, v in expected.items()}
+        assert calculator.distinct_count(cube, "MUNIC_RES", group_by) == expected
+
+    def test_distinct_union_across_partitions(self, partition_df: pd.DataFrame) -> None:
+        """Rollup entre partições conta a união, não a soma."""
+        cube = KPICube()
+        cube.update(partition_df, state="AC", year=2024, month=2)
+        cube.update(partition_df.assign(MUNIC_RES="355030"), state="SP", year=2024, month=2)
+
+        assert KPICalculator().distinct_count(cube, "MUNIC_RES") == 4
+        assert KPICalculator().distinct_count(cube, "MUNIC_RES", group_by="UF") == {
+            "AC": 3,
+            "SP": 1,
+        }
+
+    def test_unknown_column_raises(self, cube: KPICube) -> None:
+        """Erro para coluna sem HyperLogLog."""
+        with pytest.raises(KeyError, match="DIAG_PRINC"):
+            cube.distinct_count("DIAG_PRINC")
+
+
+class TestKPICubeHeavyHitters:
+    """Itens mais frequentes a partir dos contadores Space-Saving do cubo."""
+
+    @pytest.fixture
+    def diagnoses(self, partition_df: pd.DataFrame) -> pd.DataFrame:
+        """Partição com diagnóstico e procedimento."""
+        return partition_df.assign(
+            DIAG_PRINC=["J18", "J18", "I21", "J18", None],
+            PROC_REA=["0303", "0303", "0406", "0406", "0406"],
+        )
+
+    def test_top_k_matches_value_counts(self, diagnoses: pd.DataFrame) -> None:
+        """Poucos itens: contagens exatas e erro zero."""
+        cube = KPICube()
+        cube.update(diagnoses, state="AC", year=2024, month=2)
+        top = cube.top_k("DIAG_PRINC", k=2)
+
+        assert top["count"].to_dict() == {"J18": 3, "I21": 1}
+        assert (top["error"] == 0).all()
+        assert cube.top_k("PROC_REA", k=1)["count"].to_dict() == {"0406": 3}
+
+    def test_top_k_by_state_and_period(self, diagnoses: pd.DataFrame) -> None:
+        """Top-K por UF e competência após merge entre partições."""
+        cube = KPICube()
+        cube.update(diagnoses, state="AC", year=2024, month=2)
+        cube.update(diagnoses.assign(DIAG_PRINC="A09"), state="SP", year=2024, month=2)
+
+        top = cube.top_k("DIAG_PRINC", k=1, group_by=["UF", "competencia"])
+        assert top.index.names == ["UF", "competencia", "DIAG_PRINC"]
+        assert top["count"].to_dict() == {
+            ("AC", 202401, "J18"): 2,
+            ("AC", 202402, "J18"): 1,
+            ("SP", 202401, "A09"): 3,
+            ("SP", 202402, "A09"): 2,
+        }
+        assert cube.filter(UF="SP").top_k(k=5)["count"].to_dict() == {"A09": 5}
+
+    def test_save_and_load_roundtrip(self, diagnoses: pd.DataFrame, tmp_path: Path) -> None:
+        """Contadores persistidos ao lado do cubo."""
+        cube = KPICube()
+        cube.update(diagnoses, state="AC", year=2024, month=2)
+        loaded = KPICube.load(cube.save(tmp_path / "kpi_cube.parquet"))
+
+        pd.testing.assert_frame_equal(loaded.top_k(), cube.top_k())
+
+    def test_unknown_column_raises(self, cube: KPICube) -> None:
+        """Erro para coluna sem contadores."""
+        with pytest.raises(KeyError, match="MUNIC_RES"):
+            cube.top_k("MUNIC_RES")
+
+
+class TestKPICubeIncremental:
+    """Testes para atualização incremental e persistência."""
+
+    def test_partitions_are_merged(self, partition_df: pd.DataFrame) -> None:
+        """Partições de UFs diferentes somam no rollup."""
+        cube = KPICube()
+        cube.update(partition_df, state="AC", year=2024, month=2)
+        cube.update(partition_df, state="SP", year=2024, month=2)
+
+        assert KPICalculator().volume(cube, group_by="UF") == {"AC": 5, "SP": 5}
+        assert cube.aggregate()["deaths"].iloc[0] == 2
+
+    def test_reloading_partition_replaces_contribution(
+        self, cube: KPICube, partition_df: pd.DataFrame
+    ) -> None:
+        """Recarregar a mesma partição não duplica registros."""
+        cube.update(partition_df.head(2), state="AC", year=2024, month=2)
+        assert KPICalculator().volume(cube) == 2
+
+    def test_filter_by_dimension(self, cube: KPICube) -> None:
+        """Sub-cubo filtrado por dimensão."""
+        subset = cube.filter(CNES="2001586", competencia=[202402])
+        assert KPICalculator().volume(subset) == 2
+
+    def test_filter_invalid_dimension_raises(self, cube: KPICube) -> None:
+        """Erro ao filtrar por dimensão inexistente."""
+        with pytest.raises(KeyError, match="XYZ"):
+            cube.filter(XYZ="1")
+
+    def test_save_and_load_roundtrip(self, cube: KPICube, tmp_path: Path) -> None:
+        """Cubo persistido e recarregado preserva partições e medidas."""
+        path = cube.save(tmp_path / "kpi_cube.parquet")
+        loaded = KPICube.load(path)
+
+        assert loaded.partitions == ["AC_202402"]
+        assert KPICalculator().revenue(loaded) == 6500.0
+        assert KPICalculator().quantiles(loaded) == KPICalculator().quantiles(cube)
+        assert KPICalculator().distinct_count(loaded, group_by="CNES") == {
+            "2000121": 1,
+            "2001586": 3,
+        }
+
+    def test_load_cube_without_cost_measures(self, cube: KPICube, tmp_path: Path) -> None:
+        """Cubo salvo antes das medidas de custo carrega com medidas zeradas."""
+        path = cube.save(tmp_path / "kpi_cube.parquet")
+        table = pd.read_parquet(path)
+        table.drop(columns=["VAL_SH_sum", "icu_days"]).to_parquet(path, index=False)
+
+        loaded = KPICube.load(path)
+
+        assert loaded.aggregate()["icu_days"].iloc[0] == 0
+        assert KPICalculator().revenue(loaded) == 6500.0
+
+    def test_loader_updates_cube(
+        self, partition_df: pd.DataFrame, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Hook do DataLoader atualiza e persiste o cubo a cada partição."""
+        from src.load import loader as loader_module
+
+        monkeypatch.setattr(loader_module, "PROCESSED_DIR", str(tmp_path))
+        cube = KPICube(path=tmp_path / "kpi_cube.parquet")
+
+        loader_module.DataLoader(hooks=[cube.partition_written]).load(
+            partition_df, state="AC", year=2024, month=2
+        )
+
+        assert cube.partitions == ["AC_202402"]
+        assert KPICube.load(tmp_path / "kpi_cube.parquet").partitions == ["AC_202402"]
@@ -0,0 +1,183 @@
+"""Testes para o executor paralelo de KPIs."""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.analytics.accumulators import QuantileAccumulator, SumAccumulator
+from src.analytics.cube import KPICube
+from src.analytics.executor import (
+    MAX_BATCH_ROWS,
+    MIN_BATCH_ROWS,
+    ParallelKPIExecutor,
+    assign_partitions,
+    batch_rows,
+    map_partitions,
+)
+from src.analytics.kpis import KPICalculator
+from src.analytics.query import KPIQuery
+
+
+def _partition(offset: int, espec: list[str], competencia: str) -> pd.DataFrame:
+    start = pd.Timestamp(f"{competencia}01")
+    return pd.DataFrame(
+        {
+            "ESPEC": espec,
+            "DT_INTER": start + pd.to_timedelta([0, 3, 9, 20], unit="D"),
+            "stay_days": [2 + offset, 4, 6, 8],
+            "VAL_TOT": [100.0 * (offset + 1), 200.0, 300.0, 400.0],
+            "age_group": pd.Categorical(
+                ["0-17", "60+", "60+", "30-44"],
+                categories=["0-17", "18-29", "30-44", "45-59", "60+"],
+            ),
+        }
+    )
+
+
+@pytest.fixture
+def lake(tmp_path: Path) -> pd.DataFrame:
+    """Data lake com três partições; retorna o DataFrame completo."""
+    partitions = {
+        "SIH_AC_202401": _partition(0, ["01", "03", "03", "08"], "202401"),
+        "SIH_SP_202401": _partition(1, ["01", "01", "03", "03"], "202401"),
+        "SIH_SP_202402": _partition(2, ["08", "03", "01", "03"], "202402"),
+    }
+    for name, df in partitions.items():
+        df.to_parquet(tmp_path / f"{name}.parquet", index=False, row_group_size=2)
+    return pd.concat(partitions.values(), ignore_index=True)
+
+
+@pytest.fixture
+def executor(tmp_path: Path) -> ParallelKPIExecutor:
+    """Executor com dois workers sobre o data lake de teste."""
+    return ParallelKPIExecutor(workers=2, memory_limit=4 * 1024**3, source=tmp_path)
+
+
+class TestParallelKPIExecutor:
+    """KPIs em paralelo equivalem aos calculados sobre o DataFrame completo."""
+
+    @pytest.mark.parametrize("group_by", [None, "ESPEC"])
+    def test_kpis_match_calculator(
+        self, lake: pd.DataFrame, executor: ParallelKPIExecutor, group_by: str | None
+    ) -> None:
+        """Volume, receita e TMP iguais aos do KPICalculator."""
+        calculator = KPICalculator()
+
+        assert executor.volume(group_by=group_by) == calculator.volume(lake, group_by)
+        assert executor.revenue(group_by=group_by) == calculator.revenue(lake, group_by)
+        assert executor.average_length_of_stay(
+            group_by=group_by
+        ) == calculator.average_length_of_stay(lake, group_by)
+
+    @pytest.mark.parametrize("group_by", ["month", "competencia"])
+    def test_month_keys_derived_from_admission_date(
+        self, lake: pd.DataFrame, executor: ParallelKPIExecutor, group_by: str
+    ) -> None:
+        """'month' e 'competencia' derivadas de DT_INTER nos workers, como no KPICalculator."""
+        calculator = KPICalculator()
+        cube = KPICube()
+        for competencia, partition in lake.groupby(lake["DT_INTER"].dt.strftime("%Y%m")):
+            cube.update(
+                partition, state="BR", year=int(competencia[:4]), month=int(competencia[4:])
+            )
+
+        assert executor.volume(group_by=group_by) == calculator.volume(cube, group_by)
+        assert executor.revenue(group_by=group_by) == calculator.revenue(cube, group_by)
+        assert executor.average_length_of_stay(
+            group_by=group_by
+        ) == calculator.average_length_of_stay(cube, group_by)
+        if group_by == "month":
+            assert executor.volume(group_by="month") == calculator.volume(lake, "month")
+
+    def test_summary_matches_calculator(
+        self, lake: pd.DataFrame, executor: ParallelKPIExecutor
+    ) -> None:
+        """Resumo reduzido dos workers igual ao summary."""
+        expected = KPICalculator().summary(lake, beds=10, days=30)
+
+        assert executor.summary(None, beds=10, days=30) == expected
+
+    def test_query_filters_partitions(
+        self, lake: pd.DataFrame, executor: ParallelKPIExecutor, tmp_path: Path
+    ) -> None:
+        """Partições selecionadas por KPIQuery."""
+        query = KPIQuery(tmp_path).filter(uf="SP")
+
+        assert executor.volume(query) == 8
+
+    def test_query_column_filters_applied(
+        self, lake: pd.DataFrame, executor: ParallelKPIExecutor, tmp_path: Path
+    ) -> None:
+        """Filtros de coluna da KPIQuery aplicados nos workers (iguais ao KPIQuery)."""
+        query = KPIQuery(tmp_path).filter(uf="SP", ESPEC="03")
+        subset = lake.iloc[4:][lake.iloc[4:]["ESPEC"] == "03"]
+
+        assert executor.volume(query) == len(subset) == 4
+        assert executor.revenue(query, group_by="ESPEC") == query.revenue(group_by="ESPEC")
+        assert executor.summary(query, beds=10, days=30) == KPICalculator().summary(
+            subset, beds=10, days=30
+        )
+
+    def test_unknown_filter_column_raises(
+        self, lake: pd.DataFrame, executor: ParallelKPIExecutor, tmp_path: Path
+    ) -> None:
+        """Coluna de filtro inexistente gera KeyError em vez de ser ignorada."""
+        with pytest.raises(KeyError):
+            executor.volume(KPIQuery(tmp_path).filter(CID="J18"))
+
+    def test_run_accepts_any_accumulator(
+        self, lake: pd.DataFrame, executor: ParallelKPIExecutor
+    ) -> None:
+        """Acumuladores genéricos (t-digest) combinados entre workers."""
+        accumulator = executor.run(QuantileAccumulator("stay_days"), columns=["stay_days"])
+
+        assert accumulator.result() == KPICalculator().quantiles(lake, "stay_days")
+
+    def test_empty_source(self, tmp_path: Path) -> None:
+        """Sem partições, acumulador vazio."""
+        executor = ParallelKPIExecutor(workers=2, source=tmp_path / "vazio")
+
+        assert executor.volume() == 0
+
+    def test_invalid_configuration_raises(self) -> None:
+        """Erro com workers ou teto de memória inválidos."""
+        with pytest.raises(ValueError, match="workers"):
+            ParallelKPIExecutor(workers=-1)
+        with pytest.raises(ValueError, match="memória"):
+            ParallelKPIExecutor(memory_limit=-1)
+
+
+class TestPartitionPlanning:
+    """Testes para distribuição de partições e tamanho de batch."""
+
+    def test_assign_balances_bytes(self, tmp_path: Path) -> None:
+        """Arquivos maiores distribuídos primeiro ao worker menos carregado."""
+        paths = []
+        for name, size in [("a", 50), ("b", 40), ("c", 30), ("d", 20)]:
+            path = tmp_path / name
+            path.write_bytes(b"x" * size)
+            paths.append(path)
+
+        groups = assign_partitions(paths, workers=2)
+
+        assert [[p.name for p in g] for g in groups] == [["a", "d"], ["b", "c"]]
+        assert len(assign_partitions(paths[:1], workers=4)) == 1
+
+    def test_batch_rows_follow_memory_limit(self, lake: pd.DataFrame, tmp_path: Path) -> None:
+        """Teto menor produz batches menores, dentro dos limites."""
+        path = tmp_path / "SIH_AC_202401.parquet"
+
+        assert batch_rows(path, ["stay_days"], 0) == MAX_BATCH_ROWS
+        assert batch_rows(path, ["stay_days"], 1) == MIN_BATCH_ROWS
+        assert batch_rows(path, None, 1024**2) <= batch_rows(path, ["stay_days"], 1024**2)
+
+    def test_map_skips_missing_columns(self, lake: pd.DataFrame, tmp_path: Path) -> None:
+        """Colunas ausentes na partição não são lidas."""
+        accumulator = map_partitions(
+            SumAccumulator("VAL_TOT"),
+            [tmp_path / "SIH_AC_202401.parquet"],
+            columns=["VAL_TOT", "DIAG_PRINC"],
+        )
+
+        assert accumulator.result() == 1000.0
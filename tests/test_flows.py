@@ -0,0 +1,103 @@
+"""Testes para a matriz origem-destino de pacientes."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.flows import FlowMatrix
+
+
+@pytest.fixture
+def stays() -> pd.DataFrame:
+    """Internações de residentes de três municípios atendidos em dois polos."""
+    return pd.DataFrame(
+        {
+            "MUNIC_RES": ["120040", "120040", "1200203", "120020", "120030", "120040", None],
+            "MUNIC_MOV": ["120040", "120040", "120040", "120040", "120020", "120020", "120040"],
+            "ESPEC": ["01", "03", "01", "01", "03", "01", "01"],
+            "VAL_TOT": [100.0, 200.0, 300.0, 400.0, 500.0, 600.0, 700.0],
+            "DT_INTER": pd.to_datetime(
+                [
+                    "2024-01-05",
+                    "2024-01-09",
+                    "2024-01-10",
+                    "2024-02-02",
+                    "2024-02-03",
+                    "2024-02-20",
+                    "2024-02-21",
+                ]
+            ),
+        }
+    )
+
+
+class TestFlowMatrix:
+    """Testes para FlowMatrix."""
+
+    def test_flows_match_groupby(self, stays: pd.DataFrame) -> None:
+        """COO somado sobre camadas igual a um groupby origem × destino."""
+        flows = FlowMatrix(stays).flows()
+        known = stays.dropna(subset=["MUNIC_RES"])
+        expected = known.groupby([known["MUNIC_RES"].str[:6], "MUNIC_MOV"]).size()
+
+        assert flows["admissions"].tolist() == expected.tolist()
+        assert flows["admissions"].sum() == 6
+        assert flows["value"].sum() == 2100.0
+
+    def test_outflows_row_slice(self, stays: pd.DataFrame) -> None:
+        """Destinos dos residentes, com filtro de camada."""
+        flows = FlowMatrix(stays)
+
+        assert flows.outflows("120040")["admissions"].to_dict() == {"120040": 2, "120020": 1}
+        assert flows.outflows("1200401", competencia=202402)["admissions"].to_dict() == {
+            "120020": 1
+        }
+
+    def test_inflows_column_slice(self, stays: pd.DataFrame) -> None:
+        """Origens dos pacientes atendidos, por especialidade."""
+        flows = FlowMatrix(stays)
+        inflows = flows.inflows("120040", ESPEC="01")
+
+        assert inflows["admissions"].to_dict() == {"120020": 2, "120040": 1}
+        assert inflows.loc["120020", "value"] == 700.0
+        assert flows.inflows("120020", ESPEC=["01", "03"])["admissions"].sum() == 2
+
+    def test_top_flows_without_local(self, stays: pd.DataFrame) -> None:
+        """Maiores fluxos entre municípios diferentes."""
+        top = FlowMatrix(stays).top_flows(2, include_local=False)
+
+        assert top[["origin", "destination"]].values.tolist() == [
+            ["120020", "120040"],
+            ["120030", "120020"],
+        ]
+        assert top["admissions"].tolist() == [2, 1]
+
+    def test_national_scale_stays_sparse(self) -> None:
+        """5.570 × 5.570 municípios: apenas pares observados são guardados."""
+        rng = np.random.default_rng(0)
+        codes = np.char.add("1", np.arange(5570).astype(str).astype("U5")).astype(object)
+        n = 200_000
+        df = pd.DataFrame(
+            {
+                "MUNIC_RES": rng.choice(codes, n),
+                "MUNIC_MOV": rng.choice(codes[:500], n),
+                "ESPEC": rng.choice(["01", "03"], n),
+                "DT_INTER": pd.Timestamp("2024-01-01"),
+            }
+        )
+        flows = FlowMatrix(df)
+
+        assert len(flows.municipalities) == 5570
+        assert len(flows) <= n
+        origin = df["MUNIC_RES"].iloc[0]
+        assert flows.outflows(origin)["admissions"].sum() == (df["MUNIC_RES"] == origin).sum()
+
+    def test_invalid_queries_raise(self, stays: pd.DataFrame) -> None:
+        """Erro para coluna ausente, município sem fluxos ou critério fora das camadas."""
+        with pytest.raises(KeyError, match="MUNIC_MOV"):
+            FlowMatrix(stays.drop(columns="MUNIC_MOV"))
+        flows = FlowMatrix(stays, by="ESPEC")
+        with pytest.raises(KeyError, match="355030"):
+            flows.outflows("355030")
+        with pytest.raises(KeyError, match="competencia"):
+            flows.inflows("120040", competencia=202401)
@@ -0,0 +1,115 @@
+"""Testes para previsão de volume em lote."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.cube import KPICube
+from src.analytics.forecasting import (
+    forecast_volume,
+    holt_winters,
+    load_forecasts,
+    save_forecasts,
+    seasonal_naive,
+)
+
+
+def seasonal_stays(months: int = 36) -> pd.DataFrame:
+    """Internações mensais de dois hospitais com pico em julho; B cresce 1/mês."""
+    rows = []
+    for offset in range(months):
+        date = pd.Timestamp("2021-01-01") + pd.DateOffset(months=offset)
+        peak = 5 if date.month == 7 else 0
+        rows += [("A", date)] * (10 + peak) + [("B", date)] * (20 + offset + peak)
+    return pd.DataFrame(rows, columns=["CNES", "DT_INTER"])
+
+
+class TestSeasonalModels:
+    """Testes para os modelos em lote."""
+
+    def test_seasonal_naive_repeats_last_cycle(self) -> None:
+        """Previsão = mesmo período do último ciclo; resíduo zero em série periódica."""
+        y = np.tile(np.arange(7.0), (3, 3))
+        forecast, sigma = seasonal_naive(y, season=7, horizon=10)
+
+        np.testing.assert_array_equal(forecast[0], [0, 1, 2, 3, 4, 5, 6, 0, 1, 2])
+        assert (sigma == 0).all()
+
+    def test_holt_winters_tracks_trend_and_season(self) -> None:
+        """Tendência linear + sazonalidade: previsão próxima da continuação."""
+        t = np.arange(48.0)
+        pattern = np.sin(2 * np.pi * t / 12) * 10
+        y = np.vstack([100 + 2 * t + pattern, 50 + pattern])
+        forecast, sigma, params = holt_winters(y, season=12, horizon=12)
+
+        future = np.arange(48.0, 60.0)
+        expected = np.vstack(
+            [100 + 2 * future + np.sin(2 * np.pi * future / 12) * 10, 50 + pattern[:12]]
+        )
+        np.testing.assert_allclose(forecast, expected, atol=3.0)
+        assert params.shape == (2, 3)
+        assert (np.diff(sigma, axis=1) >= 0).all()
+
+    def test_batch_equals_single_series(self) -> None:
+        """Cada série é ajustada de forma independente no lote."""
+        rng = np.random.default_rng(1)
+        y = rng.poisson(30, size=(5, 36)).astype(float)
+        batch, _, _ = holt_winters(y, season=12, horizon=6)
+        single, _, _ = holt_winters(y[2:3], season=12, horizon=6)
+
+        np.testing.assert_allclose(batch[2:3], single)
+
+
+class TestForecastVolume:
+    """Testes para forecast_volume."""
+
+    def test_forecasts_per_hospital(self) -> None:
+        """Previsões com intervalos por CNES e método, sem laço por hospital."""
+        result = forecast_volume(seasonal_stays(), horizon=12)
+
+        assert list(result.columns) == ["CNES", "period", "method", "forecast", "lower", "upper"]
+        assert len(result) == 2 * 2 * 12
+        naive = result[(result["method"] == "seasonal_naive") & (result["CNES"] == "A")]
+        assert naive["period"].iloc[0] == pd.Timestamp("2024-01-01")
+        assert naive.set_index("period").loc["2024-07-01", "forecast"] == 15
+        assert (result["lower"] <= result["forecast"]).all()
+        assert (result["forecast"] <= result["upper"]).all()
+        assert (result["lower"] >= 0).all()
+
+    def test_cube_matches_dataframe(self) -> None:
+        """Previsões a partir do cubo iguais às dos registros."""
+        stays = seasonal_stays(24)
+        cube = KPICube()
+        cube.update(stays, state="AC", year=2022, month=12)
+
+        pd.testing.assert_frame_equal(
+            forecast_volume(cube, horizon=3),
+            forecast_volume(stays, horizon=3),
+            check_dtype=False,  # CNES do cubo é string, dos registros é object
+        )
+
+    def test_total_without_groups(self) -> None:
+        """Sem agrupamento, uma série total."""
+        result = forecast_volume(seasonal_stays(), group_by=None, methods=["holt_winters"])
+
+        assert list(result.columns) == ["period", "method", "forecast", "lower", "upper"]
+        assert len(result) == 12
+
+    def test_short_series_raises(self) -> None:
+        """Erro com menos de um ciclo sazonal ou método inválido."""
+        with pytest.raises(ValueError, match="ciclo"):
+            forecast_volume(seasonal_stays(6))
+        with pytest.raises(ValueError, match="arima"):
+            forecast_volume(seasonal_stays(), methods=["arima"])
+
+    def test_save_next_to_cube(self, tmp_path: Path) -> None:
+        """Previsões gravadas ao lado do arquivo do cubo."""
+        result = forecast_volume(seasonal_stays(), horizon=2)
+        path = save_forecasts(result, tmp_path / "kpi_cube.parquet")
+
+        assert path.name == "kpi_cube.forecast.parquet"
+        pd.testing.assert_frame_equal(load_forecasts(tmp_path / "kpi_cube.parquet"), result)
+        with pytest.raises(FileNotFoundError):
+            load_forecasts(tmp_path / "outro.parquet")
@@ -5,6 +5,7 @@ Referência: docs/DATA_GUIDE.md seção "KPIs Implementados"
 """
 
 import pandas as pd
+import pyarrow as pa
 import pytest
 
 from src.analytics.kpis import KPICalculator
@@ -208,6 +209,103 @@ class TestDemographics:
             calculator.demographics(df)
 
 
+class TestQuantiles:
+    """Testes para quantis de distribuição."""
+
+    def test_quantiles_overall(self, calculator: KPICalculator, sample_df: pd.DataFrame) -> None:
+        """Mediana, p90 e p99 de stay_days."""
+        result = calculator.quantiles(sample_df)
+        # stay_days ordenado: 2, 3, 3, 5, 7
+        assert result["p50"] == 3.0
+        assert result["p90"] == pytest.approx(6.2)
+        assert list(result) == ["p50", "p90", "p99"]
+
+    def test_quantiles_by_specialty(
+        self, calculator: KPICalculator, sample_df: pd.DataFrame
+    ) -> None:
+        """Quantis de VAL_TOT por especialidade."""
+        result = calculator.quantiles(sample_df, "VAL_TOT", group_by="ESPEC", quantiles=(0.5,))
+        assert result == {"01": {"p50": 1250.0}, "03": {"p50": 1400.0}, "08": {"p50": 1200.0}}
+
+    def test_quantiles_empty_df(self, calculator: KPICalculator) -> None:
+        """DataFrame vazio retorna NaN."""
+        result = calculator.quantiles(pd.DataFrame())
+        assert all(pd.isna(v) for v in result.values())
+
+
+class TestDistinctCount:
+    """Testes para contagem de distintos."""
+
+    def test_distinct_count_by_group(
+        self, calculator: KPICalculator, sample_df: pd.DataFrame
+    ) -> None:
+        """Valores distintos por grupo."""
+        assert calculator.distinct_count(sample_df, "stay_days") == 4
+        assert calculator.distinct_count(sample_df, "stay_days", group_by="ESPEC") == {
+            "01": 2,
+            "03": 2,
+            "08": 1,
+        }
+
+    def test_distinct_count_missing_column(self, calculator: KPICalculator) -> None:
+        """Erro quando a coluna não existe."""
+        with pytest.raises(KeyError, match="MUNIC_RES"):
+            calculator.distinct_count(pd.DataFrame({"x": [1]}))
+
+
+class TestKPITable:
+    """Testes para KPIs agrupados em formato colunar."""
+
+    def test_frame_matches_dict(self, calculator: KPICalculator, sample_df: pd.DataFrame) -> None:
+        """DataFrame com os mesmos valores dos dicts por grupo."""
+        table = calculator.kpi_table(sample_df, "ESPEC")
+
+        assert table["volume"].to_dict() == calculator.volume(sample_df, "ESPEC")
+        assert table["revenue"].to_dict() == calculator.revenue(sample_df, "ESPEC")
+        assert table["average_length_of_stay"].to_dict() == calculator.average_length_of_stay(
+            sample_df, "ESPEC"
+        )
+
+    def test_multiple_group_keys(self, calculator: KPICalculator, sample_df: pd.DataFrame) -> None:
+        """Agrupamento por mês e especialidade em um único groupby."""
+        table = calculator.volume(sample_df, ["month", "ESPEC"], output="frame")
+
+        assert table.index.names == ["month", "ESPEC"]
+        assert table["volume"].to_dict() == {(1, "01"): 2, (1, "03"): 1, (2, "03"): 1, (2, "08"): 1}
+
+    def test_group_by_competencia(self, calculator: KPICalculator, sample_df: pd.DataFrame) -> None:
+        """Competência (AAAAMM) derivada de DT_INTER."""
+        table = calculator.kpi_table(sample_df, "competencia", kpis=["volume"])
+
+        assert table["volume"].to_dict() == {202401: 3, 202402: 2}
+
+    def test_ungrouped_table(self, calculator: KPICalculator, sample_df: pd.DataFrame) -> None:
+        """Sem agrupamento, uma linha com os totais."""
+        table = calculator.kpi_table(sample_df, kpis=["volume", "average_ticket"])
+
+        assert table.iloc[0].to_dict() == {"volume": 5, "average_ticket": 1300.0}
+
+    def test_arrow_output(self, calculator: KPICalculator, sample_df: pd.DataFrame) -> None:
+        """Arrow Table com chaves de grupo como colunas."""
+        table = calculator.revenue(sample_df, "ESPEC", output="arrow")
+
+        assert isinstance(table, pa.Table)
+        assert table.column_names == ["ESPEC", "revenue"]
+        assert table.column("revenue").to_pylist() == [2500.0, 2800.0, 1200.0]
+
+    def test_unknown_kpi_raises(self, calculator: KPICalculator, sample_df: pd.DataFrame) -> None:
+        """Erro para KPI sem suporte colunar."""
+        with pytest.raises(ValueError, match="demographics"):
+            calculator.kpi_table(sample_df, kpis=["demographics"])
+
+    def test_multiple_keys_in_dict_mode_raise(
+        self, calculator: KPICalculator, sample_df: pd.DataFrame
+    ) -> None:
+        """Lista de colunas exige saída colunar."""
+        with pytest.raises(TypeError, match="output"):
+            calculator.volume(sample_df, ["month", "ESPEC"])  # type: ignore[call-overload]
+
+
 class TestKPISummary:
     """Testes para resumo consolidado de KPIs."""
 
@@ -232,3 +330,65 @@ class TestKPISummary:
         assert result["revenue"] == 6500.0
         assert result["average_ticket"] == 1300.0
         assert result["average_length_of_stay"] == 4.0
+
+    def test_summary_matches_individual_kpis(
+        self, calculator: KPICalculator, sample_df: pd.DataFrame
+    ) -> None:
+        """Resumo em passada única equivale aos métodos individuais (com nulos)."""
+        df = sample_df.copy()
+        df.loc[1, "VAL_TOT"] = None
+        df["stay_days"] = df["stay_days"].astype("Int64")
+        df.loc[2, "stay_days"] = pd.NA
+
+        result = calculator.summary(df, beds=10, days=30)
+
+        assert result["occupancy_rate"] == pytest.approx(calculator.occupancy_rate(df, 10, 30))
+        assert result["average_length_of_stay"] == pytest.approx(
+            calculator.average_length_of_stay(df)
+        )
+        assert result["volume"] == calculator.volume(df)
+        assert result["revenue"] == pytest.approx(calculator.revenue(df))
+        assert result["average_ticket"] == pytest.approx(calculator.average_ticket(df))
+        assert result["demographics"] == calculator.demographics(df)
+
+    @pytest.mark.parametrize("categorical", [True, False])
+    def test_summary_demographics_in_fused_pass(
+        self,
+        calculator: KPICalculator,
+        sample_df: pd.DataFrame,
+        monkeypatch: pytest.MonkeyPatch,
+        categorical: bool,
+    ) -> None:
+        """Faixas etárias contadas na passada única (sem chamar demographics)."""
+        df = sample_df.copy()
+        ages = ["0-17", None, "60+", "60+", "30-44"]
+        df["age_group"] = (
+            pd.Categorical(ages, categories=["0-17", "18-29", "30-44", "45-59", "60+"])
+            if categorical
+            else pd.Series(ages, dtype=object)
+        )
+        expected = calculator.demographics(df)
+
+        def scan(_: pd.DataFrame) -> dict[str, int]:
+            raise AssertionError("age_group relido fora da passada única")
+
+        monkeypatch.setattr(calculator, "demographics", scan)
+        assert calculator.summary(df, beds=10, days=30)["demographics"] == expected
+
+    def test_summary_empty_df(self, calculator: KPICalculator) -> None:
+        """Resumo com DataFrame vazio retorna zeros."""
+        df = pd.DataFrame({"stay_days": [], "VAL_TOT": [], "age_group": pd.Categorical([])})
+        result = calculator.summary(df, beds=10, days=30)
+
+        assert result["occupancy_rate"] == 0.0
+        assert result["average_length_of_stay"] == 0.0
+        assert result["volume"] == 0
+        assert result["revenue"] == 0.0
+        assert result["average_ticket"] == 0.0
+
+    def test_summary_zero_beds_raises(
+        self, calculator: KPICalculator, sample_df: pd.DataFrame
+    ) -> None:
+        """Erro ao gerar resumo com zero leitos."""
+        with pytest.raises(ValueError, match="leitos"):
+            calculator.summary(sample_df, beds=0, days=30)
@@ -43,6 +43,24 @@ class TestDataLoader:
         assert metadata["records"] == 2
         assert metadata["columns"] == 3
 
+    def test_post_write_hooks_called_in_order(self):
+        """Hooks recebem a partição gravada, na ordem de registro"""
+        df = pd.DataFrame({"col": [1, 2, 3]})
+        calls = []
+
+        def first(frame, state, year, month, path):
+            calls.append(("first", len(frame), state, year, month, os.path.exists(path)))
+
+        def second(frame, state, year, month, path):
+            calls.append(("second", len(frame), state, year, month, os.path.exists(path)))
+
+        DataLoader(hooks=[first, second]).load(df, state="AC", year=2024, month=3)
+
+        assert calls == [
+            ("first", 3, "AC", 2024, 3, True),
+            ("second", 3, "AC", 2024, 3, True),
+        ]
+
     def test_metadata_completeness(self):
         """Metadata deve conter todas informações necessárias"""
         df = pd.DataFrame({"col": [1, 2, 3]})
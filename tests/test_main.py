@@ -1,16 +1,56 @@
 """Testes para o módulo principal (main.py)."""
 
+from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pandas as pd
 import pytest
 
+from src.analytics.cache import KPICache
+from src.analytics.cube import KPICube
+from src.config import KPI_CUBE_CONFIG
 from src.main import main
 
 
+@pytest.fixture(autouse=True)
+def analytics_dirs(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    """Cubo e cache de KPIs em diretório temporário."""
+    monkeypatch.setitem(KPI_CUBE_CONFIG, "path", str(tmp_path / "kpi_cube.parquet"))
+    monkeypatch.setattr("src.main.KPICache", lambda: KPICache(tmp_path / "cache"))
+    return tmp_path
+
+
 class TestMain:
     """Testes para função main do pipeline."""
 
+    @patch("src.main.DataTransformer")
+    @patch("src.main.DataSUSExtractor")
+    def test_pipeline_updates_cube(
+        self,
+        mock_extractor_class: MagicMock,
+        mock_transformer_class: MagicMock,
+        analytics_dirs: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Partição carregada é incorporada ao cubo persistido."""
+        monkeypatch.setattr("src.load.loader.PROCESSED_DIR", str(analytics_dirs))
+        df = pd.DataFrame(
+            {
+                "ESPEC": ["01", "03"],
+                "DT_INTER": pd.to_datetime(["2024-01-05", "2024-01-20"]),
+                "stay_days": [2, 4],
+                "VAL_TOT": [100.0, 300.0],
+            }
+        )
+        mock_extractor_class.return_value.extract.return_value = df
+        mock_transformer_class.return_value.transform.return_value = df
+
+        main(state="AC", year=2024, month=1)
+
+        cube = KPICube.load(analytics_dirs / "kpi_cube.parquet")
+        assert cube.partitions == ["AC_202401"]
+        assert cube.aggregate()["VAL_TOT_sum"].iloc[0] == 400.0
+
     @patch("src.main.DataLoader")
     @patch("src.main.DataTransformer")
     @patch("src.main.DataSUSExtractor")
@@ -0,0 +1,121 @@
+"""Testes para consultas lazy de KPI sobre o data lake Parquet."""
+
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from src.analytics.kpis import KPICalculator
+from src.analytics.query import KPIQuery
+
+
+def _partition(offset: int, espec: list[str]) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "N_AIH": [f"{offset + i:013d}" for i in range(4)],
+            "ESPEC": espec,
+            "stay_days": [2 + offset, 4, 6, 8],
+            "VAL_TOT": [100.0 * (offset + 1), 200.0, 300.0, 400.0],
+            "DT_INTER": pd.to_datetime(["2024-01-03", "2024-01-20", "2024-02-01", "2024-02-15"]),
+        }
+    )
+
+
+@pytest.fixture
+def lake(tmp_path: Path) -> dict[str, pd.DataFrame]:
+    """Data lake com três partições (row groups de 2 linhas)."""
+    partitions = {
+        "SIH_AC_202401": _partition(0, ["01", "03", "03", "08"]),
+        "SIH_SP_202401": _partition(1, ["01", "01", "03", "03"]),
+        "SIH_SP_202402": _partition(2, ["08", "03", "01", "03"]),
+    }
+    for name, df in partitions.items():
+        df.to_parquet(tmp_path / f"{name}.parquet", index=False, row_group_size=2)
+    return partitions
+
+
+@pytest.fixture
+def calculator() -> KPICalculator:
+    """Instância do calculador de KPIs."""
+    return KPICalculator()
+
+
+class TestKPIQuery:
+    """KPIs lazy equivalem aos calculados sobre o DataFrame materializado."""
+
+    def test_partition_pruning(self, lake: dict[str, pd.DataFrame], tmp_path: Path) -> None:
+        """Filtro de UF/ano/mês seleciona partições pelo nome."""
+        query = KPIQuery(tmp_path).filter(uf="SP", year=2024)
+        assert [p.stem for p in query.partitions()] == ["SIH_SP_202401", "SIH_SP_202402"]
+
+        assert [p.stem for p in query.filter(month=2).partitions()] == ["SIH_SP_202402"]
+
+    @pytest.mark.parametrize("group_by", [None, "ESPEC", "month"])
+    def test_volume_matches_calculator(
+        self,
+        lake: dict[str, pd.DataFrame],
+        tmp_path: Path,
+        calculator: KPICalculator,
+        group_by: str | None,
+    ) -> None:
+        """Volume lazy igual ao volume materializado."""
+        df = pd.concat([lake["SIH_SP_202401"], lake["SIH_SP_202402"]], ignore_index=True)
+        query = KPIQuery(tmp_path, batch_size=3).filter(uf="SP")
+
+        assert query.volume(group_by) == calculator.volume(df, group_by)
+
+    @pytest.mark.parametrize("group_by", [None, "ESPEC"])
+    def test_revenue_and_alos_match_calculator(
+        self,
+        lake: dict[str, pd.DataFrame],
+        tmp_path: Path,
+        calculator: KPICalculator,
+        group_by: str | None,
+    ) -> None:
+        """Receita e TMP lazy iguais aos materializados (lake inteiro)."""
+        df = pd.concat(lake.values(), ignore_index=True)
+        query = KPIQuery(tmp_path, batch_size=3)
+
+        assert query.revenue(group_by) == pytest.approx(calculator.revenue(df, group_by))
+        assert query.average_length_of_stay(group_by) == pytest.approx(
+            calculator.average_length_of_stay(df, group_by)
+        )
+
+    def test_column_filter_pushdown(
+        self, lake: dict[str, pd.DataFrame], tmp_path: Path, calculator: KPICalculator
+    ) -> None:
+        """Filtro de coluna aplicado no scanner."""
+        df = pd.concat(lake.values(), ignore_index=True)
+        expected = calculator.revenue(df[df["ESPEC"].isin(["01", "08"])])
+
+        assert KPIQuery(tmp_path).filter(ESPEC=["01", "08"]).revenue() == pytest.approx(expected)
+
+    def test_ticket_and_occupancy(
+        self, lake: dict[str, pd.DataFrame], tmp_path: Path, calculator: KPICalculator
+    ) -> None:
+        """Ticket médio e ocupação lazy."""
+        df = lake["SIH_AC_202401"]
+        query = KPIQuery(tmp_path).filter(uf="AC")
+
+        assert query.average_ticket() == pytest.approx(calculator.average_ticket(df))
+        assert query.occupancy_rate(beds=2, days=31) == pytest.approx(
+            calculator.occupancy_rate(df, beds=2, days=31)
+        )
+
+    def test_no_matching_partition_returns_zero(
+        self, lake: dict[str, pd.DataFrame], tmp_path: Path
+    ) -> None:
+        """Sem partições selecionadas, KPIs retornam zero."""
+        query = KPIQuery(tmp_path).filter(uf="RJ")
+        assert query.volume() == 0
+        assert query.revenue(group_by="ESPEC") == 0.0
+
+    def test_invalid_group_by_raises(self, lake: dict[str, pd.DataFrame], tmp_path: Path) -> None:
+        """Erro ao agrupar por coluna inexistente."""
+        with pytest.raises(KeyError, match="INVALID"):
+            KPIQuery(tmp_path).volume(group_by="INVALID")
+
+    def test_occupancy_zero_beds_raises(self, tmp_path: Path) -> None:
+        """Erro com zero leitos."""
+        with pytest.raises(ValueError, match="leitos"):
+            KPIQuery(tmp_path).occupancy_rate(beds=0, days=30)
@@ -0,0 +1,66 @@
+"""Testes para o TMP ajustado por risco."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.risk_adjustment import expected_length_of_stay, los_benchmark
+
+
+@pytest.fixture
+def stays() -> pd.DataFrame:
+    """Hospital A com casos complexos e hospital B com casos simples."""
+    return pd.DataFrame(
+        {
+            "CNES": ["A", "A", "A", "B", "B", "B", "B"],
+            "DIAG_PRINC": ["I219", "I210", "I21", "J18", "J189", "I21", "J18"],
+            "age_group": ["60+", "60+", "60+", "0-17", "0-17", "60+", None],
+            "CAR_INT": ["02", "02", "02", "01", "01", "02", "01"],
+            "stay_days": [10, 8, 9, 2, 4, 13, 50],
+        }
+    )
+
+
+class TestExpectedLengthOfStay:
+    """Testes para expected_length_of_stay."""
+
+    def test_national_mean_of_risk_cell(self, stays: pd.DataFrame) -> None:
+        """Média da célula (categoria CID-10 × faixa × caráter); célula desconhecida = NaN."""
+        expected = expected_length_of_stay(stays)
+
+        assert expected.iloc[:6].tolist() == [10.0, 10.0, 10.0, 3.0, 3.0, 10.0]
+        assert np.isnan(expected.iloc[6])
+
+    def test_external_reference(self, stays: pd.DataFrame) -> None:
+        """Médias de uma referência externa alinhadas aos registros."""
+        reference = stays.assign(stay_days=stays["stay_days"] * 2)
+        expected = expected_length_of_stay(stays.iloc[3:5], reference=reference)
+
+        assert expected.tolist() == [6.0, 6.0]
+        assert list(expected.index) == [3, 4]
+
+    def test_missing_columns_raise(self, stays: pd.DataFrame) -> None:
+        """Erro sem CAR_INT."""
+        with pytest.raises(KeyError, match="CAR_INT"):
+            expected_length_of_stay(stays.drop(columns="CAR_INT"))
+
+
+class TestLOSBenchmark:
+    """Testes para los_benchmark."""
+
+    def test_case_mix_adjusted_ratio(self, stays: pd.DataFrame) -> None:
+        """Hospital com TMP bruto maior pode estar abaixo do esperado."""
+        result = los_benchmark(stays)
+
+        assert result.loc["A", "observed_los"] == 9.0
+        assert result.loc["A", "oe_ratio"] == pytest.approx(0.9)
+        assert result.loc["B", "admissions"] == 3  # célula desconhecida excluída
+        assert result.loc["B", "oe_ratio"] == pytest.approx(19 / 16)
+        assert list(result.index) == ["A", "B"]
+        assert result["percentile"].tolist() == [50.0, 100.0]
+
+    def test_min_admissions_excluded_from_ranking(self, stays: pd.DataFrame) -> None:
+        """Hospitais pequenos ficam sem percentil."""
+        result = los_benchmark(stays, min_admissions=4)
+
+        assert result["percentile"].isna().all()
@@ -0,0 +1,118 @@
+"""Testes para a simulação Monte Carlo de demanda de leitos."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.simulation import simulate_bed_demand, simulate_census
+
+
+def regular_stays(days: int = 60) -> pd.DataFrame:
+    """Hospital A: 1 internação/dia de 3 dias; hospital B: 2/dia de 1 dia."""
+    dates = pd.date_range("2024-01-01", periods=days, freq="D")
+    a = pd.DataFrame({"CNES": "A", "ESPEC": "01", "DT_INTER": dates, "stay_days": 3})
+    b = pd.DataFrame({"CNES": "B", "ESPEC": "03", "DT_INTER": dates.repeat(2), "stay_days": 1})
+    return pd.concat([a, b], ignore_index=True)
+
+
+class TestSimulateCensus:
+    """Testes para simulate_census."""
+
+    def test_deterministic_steady_state(self) -> None:
+        """Chegadas e permanência constantes: ocupação = chegadas × permanência."""
+        census = simulate_census(
+            np.array([2]), np.array([3]), scenarios=4, days=10, rng=np.random.default_rng(0)
+        )
+
+        assert census.shape == (4, 10)
+        assert census[:, 0].tolist() == [2] * 4
+        assert (census[:, 2:] == 6).all()
+
+    def test_littles_law(self) -> None:
+        """Ocupação média ≈ taxa de chegada × permanência média."""
+        rng = np.random.default_rng(3)
+        arrivals = rng.poisson(5, size=90)
+        stays = rng.integers(1, 10, size=500)
+        census = simulate_census(arrivals, stays, scenarios=2_000, days=60, rng=rng)[:, 20:]
+
+        assert census.mean() == pytest.approx(arrivals.mean() * stays.mean(), rel=0.03)
+
+
+class TestSimulateBedDemand:
+    """Testes para simulate_bed_demand."""
+
+    def test_probability_of_exceeding_capacity(self) -> None:
+        """Ocupação fixa em 3 (A) e 2 (B) leitos contra a capacidade informada."""
+        result = simulate_bed_demand(regular_stays(), beds=2, scenarios=50, workers=1, seed=1)
+
+        assert result.index.names == ["CNES", "ESPEC"]
+        a, b = result.loc[("A", "01")], result.loc[("B", "03")]
+        assert a["mean_census"] == 3.0
+        assert a["mean_occupancy"] == 150.0
+        assert a["prob_exceed"] == 1.0
+        assert b["prob_exceed"] == 0.0
+        assert b["prob_exceed_day"] == 0.0
+
+    def test_beds_per_unit(self) -> None:
+        """Leitos por unidade; unidades sem leitos não são simuladas."""
+        result = simulate_bed_demand(
+            regular_stays(), beds={"A": 4}, group_by="CNES", scenarios=20, workers=1
+        )
+
+        assert list(result.index) == ["A"]
+        assert result.loc["A", "mean_occupancy"] == 75.0
+        assert result.loc["A", "p95_peak"] == 3.0
+
+    def test_numpy_scalar_beds(self) -> None:
+        """Leitos como escalar numpy valem para todas as unidades."""
+        expected = simulate_bed_demand(regular_stays(), beds=2, scenarios=20, workers=1, seed=3)
+        result = simulate_bed_demand(
+            regular_stays(), beds=np.int64(2), scenarios=20, workers=1, seed=3
+        )
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_window_per_unit(self) -> None:
+        """Internação antiga de outra unidade não dilui as chegadas de A."""
+        stays = regular_stays()
+        outlier = pd.DataFrame(
+            {
+                "CNES": ["C"],
+                "ESPEC": ["01"],
+                "DT_INTER": [pd.Timestamp("2023-06-15")],
+                "stay_days": [200],
+            }
+        )
+        with_outlier = pd.concat([stays, outlier], ignore_index=True)
+
+        result = simulate_bed_demand(
+            with_outlier, beds=2, group_by="CNES", scenarios=50, workers=1, seed=1
+        )
+
+        assert result.loc["A", "mean_census"] == 3.0
+        assert result.loc["B", "mean_census"] == 2.0
+
+    def test_parallel_matches_single_process(self) -> None:
+        """Sementes por unidade: resultado independe do número de workers."""
+        rng = np.random.default_rng(5)
+        df = pd.DataFrame(
+            {
+                "CNES": rng.choice(["A", "B", "C"], 600),
+                "ESPEC": "01",
+                "DT_INTER": pd.Timestamp("2024-01-01")
+                + pd.to_timedelta(rng.integers(0, 60, 600), unit="D"),
+                "stay_days": rng.integers(0, 12, 600),
+            }
+        )
+        single = simulate_bed_demand(df, beds=15, scenarios=200, workers=1, seed=7)
+        parallel = simulate_bed_demand(df, beds=15, scenarios=200, workers=2, seed=7)
+
+        pd.testing.assert_frame_equal(single, parallel)
+        assert single["prob_exceed"].between(0, 1).all()
+
+    def test_invalid_arguments_raise(self) -> None:
+        """Erro para leitos não positivos ou colunas ausentes."""
+        with pytest.raises(ValueError, match="leitos"):
+            simulate_bed_demand(regular_stays(), beds={"A": 0}, group_by="CNES")
+        with pytest.raises(KeyError, match="stay_days"):
+            simulate_bed_demand(regular_stays().drop(columns="stay_days"), beds=10)
@@ -0,0 +1,151 @@
+"""Testes para sketches (t-digest, HyperLogLog e Space-Saving)."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.sketches import (
+    HyperLogLog,
+    SpaceSaving,
+    TDigest,
+    compress_centroids,
+    grouped_quantiles,
+)
+
+
+@pytest.fixture
+def skewed() -> np.ndarray:
+    """Amostra assimétrica (lognormal), como tempo de permanência."""
+    return np.random.default_rng(42).lognormal(mean=1.5, sigma=0.8, size=50_000)
+
+
+class TestTDigest:
+    """Testes para TDigest."""
+
+    def test_small_input_is_exact(self) -> None:
+        """Sem compressão, quantis iguais ao numpy (interpolação linear)."""
+        values = np.array([5.0, 3.0, 7.0, 2.0, 3.0, 10.0])
+        digest = TDigest().update(values)
+
+        np.testing.assert_allclose(
+            digest.quantile([0.5, 0.9, 0.99]), np.quantile(values, [0.5, 0.9, 0.99])
+        )
+
+    def test_quantiles_within_rank_error(self, skewed: np.ndarray) -> None:
+        """Quantis aproximados com erro de posição pequeno."""
+        digest = TDigest().update(skewed)
+
+        for q in (0.5, 0.9, 0.99):
+            estimate = digest.quantile(q)
+            rank = (skewed <= estimate).mean()
+            assert rank == pytest.approx(q, abs=0.01)
+        assert len(digest.means) < 100
+
+    def test_merge_matches_single_digest(self, skewed: np.ndarray) -> None:
+        """Digests combinados equivalem a um digest único."""
+        parts = [TDigest().update(chunk) for chunk in np.array_split(skewed, 8)]
+        merged = parts[0]
+        for part in parts[1:]:
+            merged.merge(part)
+
+        assert merged.count == len(skewed)
+        assert merged.quantile(0.9) == pytest.approx(np.quantile(skewed, 0.9), rel=0.02)
+
+    def test_nan_ignored_and_empty(self) -> None:
+        """NaN ignorado; digest vazio retorna NaN."""
+        assert TDigest().update([np.nan, 4.0]).quantile(0.5) == 4.0
+        assert np.isnan(TDigest().quantile(0.5))
+
+    def test_invalid_compression_raises(self) -> None:
+        """Erro com compressão não positiva."""
+        with pytest.raises(ValueError, match="Compressão"):
+            TDigest(compression=0)
+
+
+class TestGroupedDigests:
+    """Testes para compressão vetorizada de vários grupos."""
+
+    def test_grouped_matches_individual(self, skewed: np.ndarray) -> None:
+        """Compressão agrupada equivale a digests individuais."""
+        groups = np.arange(len(skewed), dtype=np.int64) % 3
+        compressed = compress_centroids(groups, skewed, np.ones(len(skewed)))
+        present, values = grouped_quantiles(*compressed, quantiles=[0.5, 0.99])
+
+        assert present.tolist() == [0, 1, 2]
+        for g in present:
+            expected = TDigest().update(skewed[groups == g]).quantile([0.5, 0.99])
+            np.testing.assert_allclose(values[g], expected)
+
+
+class TestHyperLogLog:
+    """Testes para HyperLogLog."""
+
+    @pytest.mark.parametrize("n", [1, 10, 1_000, 100_000])
+    def test_estimate_within_error(self, n: int) -> None:
+        """Estimativa dentro de ~3 erros-padrão (1.04 / sqrt(4096) ≈ 1.6%)."""
+        values = np.repeat(np.arange(n).astype(str), 3)  # duplicatas não contam
+        estimate = HyperLogLog().update(values).count()
+
+        assert estimate == pytest.approx(n, rel=0.05)
+
+    def test_merge_is_union(self) -> None:
+        """Merge equivale à união dos conjuntos."""
+        left = HyperLogLog().update(np.arange(0, 6_000).astype(str))
+        right = HyperLogLog().update(np.arange(4_000, 10_000).astype(str))
+
+        assert left.merge(right).count() == pytest.approx(10_000, rel=0.05)
+
+    def test_nulls_ignored(self) -> None:
+        """Nulos não contam como valor distinto."""
+        assert HyperLogLog().update(["1100015", None, np.nan, "1100015"]).count() == 1
+        assert HyperLogLog().count() == 0
+
+    def test_incompatible_precision_raises(self) -> None:
+        """Erro ao combinar sketches de precisões diferentes."""
+        with pytest.raises(ValueError, match="Precisão"):
+            HyperLogLog(precision=10).merge(HyperLogLog(precision=12))
+
+
+class TestSpaceSaving:
+    """Testes para Space-Saving (itens mais frequentes)."""
+
+    @pytest.fixture
+    def codes(self) -> np.ndarray:
+        """Códigos com frequência Zipf, como diagnósticos (CID-10)."""
+        return np.random.default_rng(7).zipf(1.3, size=20_000).astype(str)
+
+    def test_bounds_contain_true_counts(self, codes: np.ndarray) -> None:
+        """count - error <= frequência real <= count, em lotes e após merge."""
+        sketch = SpaceSaving(capacity=20)
+        for batch in np.array_split(codes[:10_000], 8):
+            sketch.update(batch)
+        sketch.merge(SpaceSaving(capacity=20).update(codes[10_000:]))
+
+        exact = pd.Series(codes).value_counts()
+        top = sketch.top(20)
+        truth = exact.reindex(top.index, fill_value=0)
+        assert (top["count"] - top["error"] <= truth).all()
+        assert (truth <= top["count"]).all()
+        assert exact.drop(top.index).max() <= sketch.floor
+
+    def test_frequent_items_are_kept(self, codes: np.ndarray) -> None:
+        """Itens com frequência > N / capacity estão no resumo, na ordem correta."""
+        sketch = SpaceSaving(capacity=50)
+        for batch in np.array_split(codes, 10):
+            sketch.update(batch)
+
+        exact = pd.Series(codes).value_counts()
+        assert set(exact[exact > len(codes) / 50].index) <= set(sketch.top(50).index)
+        assert list(sketch.top(3).index) == list(exact.index[:3])
+
+    def test_exact_below_capacity(self) -> None:
+        """Menos itens que a capacidade: contagens exatas; nulos ignorados."""
+        sketch = SpaceSaving().update(["J18", "I21", None, "J18"])
+
+        assert sketch.top(5)["count"].to_dict() == {"J18": 2, "I21": 1}
+        assert sketch.floor == 0
+
+    def test_invalid_capacity_raises(self) -> None:
+        """Erro para capacidade não positiva."""
+        with pytest.raises(ValueError, match="Capacidade"):
+            SpaceSaving(capacity=0)
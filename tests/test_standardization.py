@@ -0,0 +1,176 @@
+"""Testes para padronização por idade e sexo."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.standardization import (
+    PopulationTable,
+    hospitalization_rates,
+    mortality_ratios,
+    stratum_codes,
+)
+from src.transform.transformer import DataTransformer
+
+
+@pytest.fixture
+def stays() -> pd.DataFrame:
+    """Internações com óbitos em dois hospitais de perfis etários diferentes."""
+    return pd.DataFrame(
+        {
+            "CNES": ["A", "A", "A", "A", "B", "B", "B", "B", "B"],
+            "MUNIC_RES": ["120040"] * 5 + ["120020"] * 3 + ["999999"],
+            "age_group": ["60+", "60+", "60+", "0-17", "0-17", "0-17", "0-17", "60+", None],
+            "SEXO": [1, 3, 3, 1, 1, 3, 3, 1, 3],
+            "death": [True, True, False, False, False, False, True, True, False],
+        }
+    )
+
+
+@pytest.fixture
+def population_csv(tmp_path: Path) -> Path:
+    """Tabela do IBGE com idade simples, sexo 1/2 e código de 7 dígitos."""
+    rows = []
+    for munic, scale in [("1200401", 1000), ("1200203", 500)]:
+        for age, share in [(5, 3), (40, 2), (70, 1)]:
+            for sex in ("1", "2"):
+                rows.append(
+                    {
+                        "cod_municipio": munic,
+                        "ano": 2024,
+                        "sexo": sex,
+                        "idade": age,
+                        "populacao": share * scale,
+                    }
+                )
+    path = tmp_path / "populacao.csv"
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return path
+
+
+class TestStrata:
+    """Testes para códigos de estrato."""
+
+    def test_unknown_age_or_sex_excluded(self) -> None:
+        """Idade ou sexo desconhecido recebe código -1."""
+        codes = stratum_codes(
+            pd.Series(["0-17", "60+", None, "60+"]), pd.Series(["1", "F", "1", "9"])
+        )
+
+        assert codes.tolist() == [0, 9, -1, -1]
+
+
+class TestMortalityRatios:
+    """Testes para mortalidade padronizada."""
+
+    def test_expected_deaths_match_brute_force(self, stays: pd.DataFrame) -> None:
+        """Óbitos esperados = soma das taxas de referência do estrato de cada internação."""
+        result = mortality_ratios(stays, group_by="CNES")
+
+        known = stays.dropna(subset=["age_group"])
+        rates = known.groupby(["age_group", "SEXO"])["death"].transform("mean")
+        expected = rates.groupby(known["CNES"]).sum()
+
+        np.testing.assert_allclose(result["expected_deaths"], expected.to_numpy())
+        assert result["deaths"].tolist() == [2, 2]
+        np.testing.assert_allclose(result["smr"], result["deaths"] / expected.to_numpy())
+
+    def test_confidence_interval_contains_smr(self, stays: pd.DataFrame) -> None:
+        """Intervalo de Byar envolve a SMR."""
+        result = mortality_ratios(stays, group_by="CNES")
+
+        assert (result["smr_lower"] <= result["smr"]).all()
+        assert (result["smr"] <= result["smr_upper"]).all()
+
+    def test_direct_standardization(self, stays: pd.DataFrame) -> None:
+        """Taxas do estrato ponderadas pela distribuição de referência."""
+        result = mortality_ratios(stays, group_by="CNES")
+
+        # Referência: 0-17/M 2, 0-17/F 2, 60+/M 2, 60+/F 2 internações (pesos 1/4)
+        # Hospital A: 0-17/M 0%, 0-17/F sem casos, 60+/M 100%, 60+/F 50%
+        assert result.loc["A", "standardized_mortality"] == pytest.approx((0 + 100 + 50) / 4)
+        assert result.loc["A", "crude_mortality"] == 50.0
+
+    def test_missing_columns_raise(self, stays: pd.DataFrame) -> None:
+        """Erro sem a coluna de óbito."""
+        with pytest.raises(KeyError, match="death"):
+            mortality_ratios(stays.drop(columns="death"))
+
+
+class TestPopulationTable:
+    """Testes para a tabela de população."""
+
+    def test_normalizes_and_caches(self, population_csv: Path, tmp_path: Path) -> None:
+        """Códigos de 6 dígitos, sexo 1/3, faixas etárias e cache Parquet."""
+        table = PopulationTable.load(population_csv, cache_dir=tmp_path / "cache")
+
+        assert set(table.data["MUNIC_RES"]) == {"120040", "120020"}
+        assert set(table.data["SEXO"]) == {"1", "3"}
+        assert table.years == [2024]
+        assert (tmp_path / "cache" / "population_populacao.parquet").exists()
+
+        cached = PopulationTable.load(population_csv, cache_dir=tmp_path / "cache")
+        pd.testing.assert_frame_equal(cached.data, table.data)
+
+    def test_boundary_ages_match_records(self) -> None:
+        """Idades de fronteira caem no mesmo estrato na população e nas internações."""
+        ages = [0.0, 18.0, 30.0, 45.0, 60.0]
+        records = DataTransformer().enrich_data(pd.DataFrame({"IDADE": ages}))
+        population = PopulationTable.normalize(
+            pd.DataFrame(
+                {
+                    "MUNIC_RES": "120040",
+                    "SEXO": "1",
+                    "IDADE": ages,
+                    "population": [1, 10, 100, 1_000, 10_000],
+                }
+            )
+        )
+
+        expected = ["0-17", "18-29", "30-44", "45-59", "60+"]
+        assert records["age_group"].astype("string").tolist() == expected
+        by_group = population.set_index("age_group")["population"]
+        assert by_group.reindex(expected).tolist() == [1, 10, 100, 1_000, 10_000]
+
+    def test_missing_file_raises(self, tmp_path: Path) -> None:
+        """Erro quando o arquivo local não existe."""
+        with pytest.raises(FileNotFoundError):
+            PopulationTable.load(tmp_path / "nao_existe.csv", cache_dir=tmp_path)
+
+    def test_unknown_year_raises(self, population_csv: Path, tmp_path: Path) -> None:
+        """Erro quando o ano não existe na tabela."""
+        table = PopulationTable.load(population_csv, cache_dir=tmp_path)
+        with pytest.raises(ValueError, match="2010"):
+            table.matrix(2010)
+
+
+class TestHospitalizationRates:
+    """Testes para taxas de internação por município."""
+
+    def test_crude_and_standardized_rates(
+        self, stays: pd.DataFrame, population_csv: Path, tmp_path: Path
+    ) -> None:
+        """Taxas bruta, direta e indireta por 100 mil habitantes."""
+        table = PopulationTable.load(population_csv, cache_dir=tmp_path)
+        rates = hospitalization_rates(stays, table)
+
+        assert rates.loc["120040", "population"] == 12_000
+        assert rates.loc["120040", "admissions"] == 5
+        assert rates.loc["120040", "crude_rate"] == pytest.approx(5 / 12_000 * 100_000)
+
+        # Mesma composição etária nos dois municípios: direta e indireta = bruta
+        np.testing.assert_allclose(rates["direct_rate"], rates["crude_rate"])
+        np.testing.assert_allclose(rates["indirect_rate"], rates["crude_rate"])
+        assert rates["expected"].sum() == pytest.approx(rates["admissions"].sum())
+
+    def test_unmatched_municipalities_ignored(
+        self, stays: pd.DataFrame, population_csv: Path, tmp_path: Path
+    ) -> None:
+        """Municípios fora da tabela de população não entram nas taxas."""
+        table = PopulationTable.load(population_csv, cache_dir=tmp_path)
+        rates = hospitalization_rates(stays, table, year=2024, per=1000)
+
+        assert list(rates.index) == ["120020", "120040"]
+        assert rates.loc["120020", "crude_rate"] == pytest.approx(3 / 6000 * 1000)
@@ -0,0 +1,122 @@
+"""Testes para o índice de intervalos de internação."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.load.stay_index import StayIndex, StayLookup, stay_index_path_for
+
+
+def _stays(offset: int = 0) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "N_AIH": [f"{offset + i:013d}" for i in range(6)],
+            "CNES": ["100", "100", "100", "200", "200", "300"],
+            "DT_INTER": pd.to_datetime(
+                ["2024-01-01", "2024-01-05", "2024-01-10", "2024-01-02", "2023-12-01", "2024-01-07"]
+            ),
+            "DT_SAIDA": pd.to_datetime(
+                ["2024-01-03", "2024-01-05", "2024-01-20", "2024-01-09", "2024-01-06", pd.NaT]
+            ),
+        }
+    )
+
+
+@pytest.fixture
+def partition(tmp_path: Path) -> Path:
+    """Partição Parquet com row groups de 2 linhas."""
+    path = tmp_path / "SIH_SP_202401.parquet"
+    _stays().to_parquet(path, index=False, row_group_size=2)
+    return path
+
+
+def _brute_force(df: pd.DataFrame, start: str, end: str) -> pd.DataFrame:
+    first, last = pd.Timestamp(start), pd.Timestamp(end)
+    return df[(df["DT_INTER"] <= last) & (df["DT_SAIDA"] >= first)]
+
+
+class TestStayIndex:
+    """Testes para StayIndex."""
+
+    @pytest.mark.parametrize(
+        ("start", "end"),
+        [("2024-01-05", "2024-01-05"), ("2024-01-03", "2024-01-04"), ("2023-12-15", "2024-02-01")],
+    )
+    def test_rows_match_brute_force(self, partition: Path, start: str, end: str) -> None:
+        """Linhas encontradas iguais às de uma varredura completa."""
+        index = StayIndex.build(partition)
+        expected = _brute_force(_stays(), start, end).index.to_numpy()
+
+        np.testing.assert_array_equal(index.rows(start, end), expected)
+
+    def test_count_active_on_date(self, partition: Path) -> None:
+        """Contagem por CNES de internados na data."""
+        counts = StayIndex.build(partition).count("2024-01-05")
+
+        assert counts.to_dict() == {"100": 1, "200": 2}
+
+    def test_filter_by_cnes(self, partition: Path) -> None:
+        """Consulta restrita a um hospital."""
+        index = StayIndex.build(partition)
+
+        assert index.rows("2024-01-01", "2024-01-31", cnes="200").tolist() == [3, 4]
+        assert index.count("2024-01-05", cnes=["100", "999"]).to_dict() == {"100": 1}
+
+    def test_stays_reads_records(self, partition: Path) -> None:
+        """Registros lidos apenas dos row groups necessários."""
+        df = StayIndex.build(partition).stays("2024-01-15", columns=["N_AIH", "CNES"])
+
+        assert df.to_dict("records") == [{"N_AIH": "0000000000002", "CNES": "100"}]
+
+    def test_save_and_load_roundtrip(self, partition: Path) -> None:
+        """Índice salvo e carregado responde igual."""
+        saved = StayIndex.build(partition).save()
+        loaded = StayIndex.load(saved)
+
+        assert saved == stay_index_path_for(partition)
+        assert loaded.parquet_path == partition
+        assert loaded.count("2024-01-05").to_dict() == {"100": 1, "200": 2}
+
+    def test_missing_columns_raise(self) -> None:
+        """Erro quando faltam colunas de datas."""
+        with pytest.raises(KeyError, match="DT_SAIDA"):
+            StayIndex.from_frame(_stays().drop(columns="DT_SAIDA"), "x.parquet")
+
+
+class TestStayLookup:
+    """Testes para consulta em várias partições."""
+
+    def test_census_across_partitions(self, partition: Path, tmp_path: Path) -> None:
+        """Contagens somadas entre partições."""
+        StayIndex.build(partition).save()
+        other = tmp_path / "SIH_SP_202402.parquet"
+        _stays(100).to_parquet(other, index=False)
+        StayIndex.build(other).save()
+
+        lookup = StayLookup(tmp_path)
+
+        assert lookup.census("2024-01-05").to_dict() == {"100": 2, "200": 4}
+        assert len(lookup.active_on("2024-01-05", cnes="100")) == 2
+
+    def test_empty_directory(self, tmp_path: Path) -> None:
+        """Sem índices, consultas retornam vazio."""
+        lookup = StayLookup(tmp_path)
+
+        assert lookup.census("2024-01-05").empty
+        assert lookup.active_on("2024-01-05").empty
+
+
+class TestLoaderBuildsStayIndex:
+    """Testes de integração com o DataLoader."""
+
+    def test_load_writes_sidecar(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """DataLoader grava o índice de internações."""
+        from src.load import loader as loader_module
+
+        monkeypatch.setattr(loader_module, "PROCESSED_DIR", str(tmp_path))
+        metadata = loader_module.DataLoader().load(_stays(), state="SP", year=2024, month=1)
+
+        assert Path(metadata["stay_index_path"]).exists()
+        assert StayLookup(tmp_path).census("2024-01-15").to_dict() == {"100": 1}
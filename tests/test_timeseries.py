@@ -0,0 +1,127 @@
+"""Testes para séries temporais de KPIs."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.analytics.cube import KPICube
+from src.analytics.timeseries import KPITimeSeries, bucket_dates
+
+
+@pytest.fixture
+def stays() -> pd.DataFrame:
+    """Internações em dois hospitais ao longo de dois anos."""
+    return pd.DataFrame(
+        {
+            "CNES": ["1", "1", "2", "2", "1", "1"],
+            "ESPEC": ["01", "01", "03", "03", "01", "03"],
+            "stay_days": [2, 4, 3, 5, 6, 1],
+            "VAL_TOT": [100.0, 200.0, 300.0, 400.0, 500.0, 50.0],
+            "DT_INTER": pd.to_datetime(
+                [
+                    "2023-01-05",
+                    "2023-01-09",
+                    "2023-01-10",
+                    "2024-01-02",
+                    "2024-01-03",
+                    "2024-02-20",
+                ]
+            ),
+        }
+    )
+
+
+class TestBucketDates:
+    """Testes para bucket_dates."""
+
+    def test_month_and_day_buckets(self) -> None:
+        """Início do mês ou do dia; NaT preservado."""
+        dates = pd.Series(pd.to_datetime(["2024-01-15 10:00", "2023-12-31 00:00", pd.NaT]))
+
+        months = bucket_dates(dates, "month")
+        days = bucket_dates(dates, "day")
+
+        assert months.tolist()[:2] == [pd.Timestamp("2024-01-01"), pd.Timestamp("2023-12-01")]
+        assert days.iloc[0] == pd.Timestamp("2024-01-15")
+        assert pd.isna(months.iloc[2])
+
+    def test_invalid_frequency_raises(self) -> None:
+        """Erro para frequência não suportada."""
+        with pytest.raises(ValueError, match="Frequência"):
+            bucket_dates(pd.Series(pd.to_datetime(["2024-01-01"])), "week")  # type: ignore[arg-type]
+
+
+class TestKPITimeSeries:
+    """Testes para KPITimeSeries."""
+
+    def test_years_are_not_merged(self, stays: pd.DataFrame) -> None:
+        """Janeiro de 2023 e de 2024 são períodos distintos."""
+        frame = KPITimeSeries(stays).frame()
+
+        assert frame.loc[pd.Timestamp("2023-01-01"), "volume"] == 3
+        assert frame.loc[pd.Timestamp("2024-01-01"), "volume"] == 2
+        assert len(frame) == 14  # calendário completo jan/2023 a fev/2024
+        assert frame.loc[pd.Timestamp("2023-06-01"), "volume"] == 0
+
+    def test_grouped_frame(self, stays: pd.DataFrame) -> None:
+        """Índice (grupo, period) com TMP por período."""
+        frame = KPITimeSeries(stays, group_by="CNES").frame(["volume", "average_length_of_stay"])
+
+        assert frame.index.names == ["CNES", "period"]
+        assert frame.loc[("1", pd.Timestamp("2023-01-01")), "average_length_of_stay"] == 3.0
+        assert np.isnan(frame.loc[("2", pd.Timestamp("2023-02-01")), "average_length_of_stay"])
+
+    def test_rolling_window_days(self, stays: pd.DataFrame) -> None:
+        """Volume e receita em janela móvel de 7 dias."""
+        rolling = KPITimeSeries(stays, freq="day").rolling(7)
+
+        assert rolling.loc[pd.Timestamp("2023-01-10"), "volume_7d"] == 3
+        assert rolling.loc[pd.Timestamp("2023-01-12"), "volume_7d"] == 2
+        assert rolling.loc[pd.Timestamp("2023-01-12"), "revenue_7d"] == 500.0
+
+    def test_rolling_mean_uses_window_sums(self, stays: pd.DataFrame) -> None:
+        """TMP móvel é razão das somas, não média das médias diárias."""
+        rolling = KPITimeSeries(stays, freq="day").rolling(30, ["average_length_of_stay"])
+
+        assert rolling.loc[pd.Timestamp("2023-01-10"), "average_length_of_stay_30d"] == 3.0
+
+    def test_month_over_month_and_year_over_year(self, stays: pd.DataFrame) -> None:
+        """Variações MoM e YoY por grupo."""
+        deltas = KPITimeSeries(stays, group_by="CNES").deltas(["volume"])
+        january = deltas.loc[("1", pd.Timestamp("2024-01-01"))]
+        february = deltas.loc[("1", pd.Timestamp("2024-02-01"))]
+
+        assert january["volume_yoy"] == -1
+        assert january["volume_yoy_pct"] == -50.0
+        assert february["volume_mom"] == 0
+        assert np.isnan(deltas.loc[("1", pd.Timestamp("2023-01-01")), "volume_mom"])
+
+    def test_daily_deltas_use_monthly_totals(self, stays: pd.DataFrame) -> None:
+        """Série diária é somada por mês antes das variações."""
+        daily = KPITimeSeries(stays, freq="day").deltas(["revenue"])
+        monthly = KPITimeSeries(stays).deltas(["revenue"])
+
+        pd.testing.assert_frame_equal(daily, monthly, check_freq=False)
+
+    def test_cube_matches_dataframe(self, stays: pd.DataFrame) -> None:
+        """Série mensal do cubo igual à dos registros."""
+        cube = KPICube()
+        cube.update(stays, state="AC", year=2024, month=2)
+
+        pd.testing.assert_frame_equal(
+            KPITimeSeries(cube, group_by="CNES").deltas(),
+            KPITimeSeries(stays, group_by="CNES").deltas(),
+            check_index_type=False,
+        )
+
+    def test_cube_daily_raises(self) -> None:
+        """Cubo não tem granularidade diária."""
+        with pytest.raises(ValueError, match="mensais"):
+            KPITimeSeries(KPICube(), freq="day")
+
+    def test_missing_columns_raise(self, stays: pd.DataFrame) -> None:
+        """Erro sem DT_INTER ou coluna de agrupamento."""
+        with pytest.raises(KeyError, match="DT_INTER"):
+            KPITimeSeries(stays.drop(columns="DT_INTER"))
+        with pytest.raises(KeyError, match="DIAG_PRINC"):
+            KPITimeSeries(stays, group_by="DIAG_PRINC")
@@ -197,19 +197,20 @@ class TestEnrichData:
 
     def test_categorize_age_groups(self):
         """Deve categorizar idades em faixas corretas"""
-        df = pd.DataFrame({"IDADE": [10.0, 18.0, 25.0, 30.0, 45.0, 60.0, 85.0]})
+        df = pd.DataFrame({"IDADE": [0.0, 10.0, 18.0, 25.0, 30.0, 45.0, 60.0, 85.0]})
 
         transformer = DataTransformer()
         result = transformer.enrich_data(df)
 
         assert "age_group" in result.columns
-        assert str(result["age_group"].iloc[0]) == "0-17"
-        assert str(result["age_group"].iloc[1]) == "0-17"  # 18 está em (0,18]
-        assert str(result["age_group"].iloc[2]) == "18-29"
-        assert str(result["age_group"].iloc[3]) == "18-29"  # 30 está em (18,30]
-        assert str(result["age_group"].iloc[4]) == "30-44"  # 45 está em (30,45]
-        assert str(result["age_group"].iloc[5]) == "45-59"  # 60 está em (45,60]
-        assert str(result["age_group"].iloc[6]) == "60+"
+        assert str(result["age_group"].iloc[0]) == "0-17"  # 0 está em [0,18)
+        assert str(result["age_group"].iloc[1]) == "0-17"
+        assert str(result["age_group"].iloc[2]) == "18-29"  # 18 está em [18,30)
+        assert str(result["age_group"].iloc[3]) == "18-29"
+        assert str(result["age_group"].iloc[4]) == "30-44"  # 30 está em [30,45)
+        assert str(result["age_group"].iloc[5]) == "45-59"  # 45 está em [45,60)
+        assert str(result["age_group"].iloc[6]) == "60+"  # 60 está em [60,∞)
+        assert str(result["age_group"].iloc[7]) == "60+"
 
     def test_flag_death_true(self):
         """Deve marcar death=True quando MORTE=1"""
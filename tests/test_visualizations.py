@@ -5,7 +5,8 @@ from pathlib import Path
 import pandas as pd
 import pytest
 
-from src.visualizations.charts import ChartGenerator
+from src.analytics.cube import KPICube
+from src.visualizations.charts import ChartGenerator, chart_aggregates
 
 
 @pytest.fixture
@@ -130,6 +131,15 @@ class TestTopDiagnoses:
 
         assert filepath.exists()
 
+    def test_accepts_cube(self, sample_dataframe: pd.DataFrame, temp_output_dir: Path) -> None:
+        """Verifica se gera o gráfico a partir dos contadores do cubo."""
+        cube = KPICube()
+        cube.update(sample_dataframe, state="AC", year=2024, month=1)
+        generator = ChartGenerator(output_dir=temp_output_dir)
+        filepath = generator.top_diagnoses(cube, top_n=3)
+
+        assert filepath.exists()
+
 
 class TestVolumeByDay:
     """Testes para gráfico de volume diário."""
@@ -194,3 +204,88 @@ class TestGenerateAll:
 
         for chart, expected in zip(charts, expected_names, strict=False):
             assert chart.name == expected
+
+
+class TestChartAggregates:
+    """Testes para os agregados compartilhados dos gráficos."""
+
+    def test_matches_per_chart_aggregation(self, sample_dataframe: pd.DataFrame) -> None:
+        """Agregados do passe único iguais aos calculados por gráfico."""
+        aggregates = chart_aggregates(sample_dataframe, top_n=3)
+
+        assert aggregates["age"].to_dict() == sample_dataframe["age_group"].value_counts().to_dict()
+        pd.testing.assert_series_equal(
+            aggregates["revenue"],
+            sample_dataframe.groupby("ESPEC")["VAL_TOT"].sum().sort_values(),
+            check_names=False,
+        )
+        pd.testing.assert_series_equal(
+            aggregates["avg_stay"],
+            sample_dataframe.groupby("ESPEC")["stay_days"].mean().sort_values(),
+            check_names=False,
+        )
+        assert aggregates["gender"].to_dict() == {"Masculino": 60, "Feminino": 40}
+        assert aggregates["volume"].sum() == len(sample_dataframe)
+        assert list(aggregates["diagnoses"]) == [20, 20, 20]
+
+    def test_cube_matches_dataframe(self, sample_dataframe: pd.DataFrame) -> None:
+        """Agregados a partir do cubo iguais aos dos registros (volume mensal)."""
+        cube = KPICube()
+        cube.update(sample_dataframe, state="AC", year=2024, month=1)
+
+        from_cube = chart_aggregates(cube)
+        from_records = chart_aggregates(sample_dataframe)
+
+        for name in ("revenue", "avg_stay", "gender"):
+            pd.testing.assert_series_equal(
+                from_cube[name],
+                from_records[name],
+                check_names=False,
+                check_index_type=False,  # dimensões do cubo são string
+            )
+        assert from_cube["age"].to_dict() == from_records["age"].to_dict()
+        assert from_cube["volume"].index.name == "month"
+        assert from_cube["volume"].sum() == len(sample_dataframe)
+
+    def test_generate_all_from_cube(
+        self, sample_dataframe: pd.DataFrame, temp_output_dir: Path
+    ) -> None:
+        """Verifica se gera os 6 gráficos direto do cubo, com subtítulo próprio."""
+        cube = KPICube()
+        cube.update(sample_dataframe, state="AC", year=2024, month=1)
+        generator = ChartGenerator(output_dir=temp_output_dir, subtitle="AC - 2024")
+        charts = generator.generate_all(cube.filter(UF="AC"))
+
+        assert len(charts) == 6
+        assert all(chart.exists() for chart in charts)
+
+
+class TestParallelRendering:
+    """Testes para renderização em pool de processos."""
+
+    def test_generate_all_in_pool(
+        self, sample_dataframe: pd.DataFrame, temp_output_dir: Path
+    ) -> None:
+        """Verifica se o pool gera os mesmos arquivos, na mesma ordem."""
+        generator = ChartGenerator(output_dir=temp_output_dir)
+        charts = generator.generate_all(sample_dataframe, workers=2)
+
+        assert [c.name for c in charts] == [
+            c.name for c in generator.generate_all(sample_dataframe)
+        ]
+        assert all(chart.exists() for chart in charts)
+
+    def test_generate_many_per_state(
+        self, sample_dataframe: pd.DataFrame, temp_output_dir: Path
+    ) -> None:
+        """Verifica se gera um conjunto de gráficos por UF em subdiretórios."""
+        cube = KPICube()
+        cube.update(sample_dataframe, state="AC", year=2024, month=1)
+        cube.update(sample_dataframe.head(50), state="AM", year=2024, month=1)
+        generator = ChartGenerator(output_dir=temp_output_dir)
+        charts = generator.generate_many({uf: cube.filter(UF=uf) for uf in ("AC", "AM")}, workers=3)
+
+        assert list(charts) == ["AC", "AM"]
+        for uf, paths in charts.items():
+            assert len(paths) == 6
+            assert all(p.parent == temp_output_dir / uf and p.exists() for p in paths)
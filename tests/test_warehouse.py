@@ -0,0 +1,176 @@
+"""Testes para carga em star schema (SQLite como stand-in do Oracle)."""
+
+import sqlite3
+from collections.abc import Iterable, Iterator, Sequence
+
+import pandas as pd
+import pytest
+
+from src.load.warehouse import WarehouseLoader
+
+
+@pytest.fixture
+def connection() -> Iterator[sqlite3.Connection]:
+    """Conexão SQLite em memória."""
+    conn = sqlite3.connect(":memory:")
+    yield conn
+    conn.close()
+
+
+@pytest.fixture
+def processed_df() -> pd.DataFrame:
+    """DataFrame processado de exemplo."""
+    return pd.DataFrame(
+        {
+            "N_AIH": ["001", "002", "003", "004", "005"],
+            "CNES": ["2000121", "2000121", "2001586", "2001586", "2001586"],
+            "DIAG_PRINC": ["J18", "I21", "J18", "O80", None],
+            "PROC_REA": ["0303140151", "0303060212", "0303140151", "0310010039", "0310010039"],
+            "MUNIC_RES": ["120040", "120040", "120020", "120040", "120020"],
+            "ESPEC": ["03", "03", "03", "02", "02"],
+            "DT_INTER": pd.to_datetime(
+                ["2024-01-02", "2024-01-02", "2024-01-05", "2024-01-07", "2024-01-08"]
+            ),
+            "DT_SAIDA": pd.to_datetime(
+                ["2024-01-05", "2024-01-09", "2024-01-07", "2024-01-08", "2024-01-09"]
+            ),
+            "stay_days": [3, 7, 2, 1, 1],
+            "VAL_TOT": [1000.0, 5000.0, 900.0, 600.0, 650.0],
+            "death": [False, True, False, False, False],
+        }
+    )
+
+
+def _count(conn: sqlite3.Connection, table: str) -> int:
+    return int(conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0])
+
+
+class TestWarehouseLoader:
+    """Testes para WarehouseLoader."""
+
+    def test_load_builds_star_schema(
+        self, connection: sqlite3.Connection, processed_df: pd.DataFrame
+    ) -> None:
+        """Carga popula fato e todas as dimensões."""
+        loader = WarehouseLoader(connection, batch_size=2)
+        loader.create_schema()
+        metadata = loader.load(processed_df, state="AC", year=2024, month=1)
+
+        assert metadata["records"] == 5
+        assert _count(connection, "fact_internacao") == 5
+        assert _count(connection, "dim_hospital") == 2
+        assert _count(connection, "dim_diagnosis") == 3
+        assert _count(connection, "dim_procedure") == 3
+        assert _count(connection, "dim_municipality") == 2
+        assert _count(connection, "dim_specialty") == 2
+        # Datas distintas de DT_INTER e DT_SAIDA
+        assert _count(connection, "dim_date") == 5
+
+    def test_fact_joins_back_to_dimensions(
+        self, connection: sqlite3.Connection, processed_df: pd.DataFrame
+    ) -> None:
+        """Surrogate keys do fato resolvem para as chaves naturais."""
+        loader = WarehouseLoader(connection)
+        loader.create_schema()
+        loader.load(processed_df, state="AC", year=2024, month=1)
+
+        rows = connection.execute(
+            """SELECT h.cnes, SUM(f.val_tot), SUM(f.death)
+               FROM fact_internacao f JOIN dim_hospital h USING (sk_hospital)
+               GROUP BY h.cnes ORDER BY h.cnes"""
+        ).fetchall()
+        assert rows == [("2000121", 6000.0, 1), ("2001586", 2150.0, 0)]
+
+    def test_null_natural_key_gives_null_fk(
+        self, connection: sqlite3.Connection, processed_df: pd.DataFrame
+    ) -> None:
+        """Chave natural nula gera FK nula (sem membro na dimensão)."""
+        loader = WarehouseLoader(connection)
+        loader.create_schema()
+        loader.load(processed_df, state="AC", year=2024, month=1)
+
+        result = connection.execute(
+            "SELECT sk_diagnosis FROM fact_internacao WHERE n_aih = '005'"
+        ).fetchone()
+        assert result == (None,)
+
+    def test_surrogate_keys_stable_across_loads(
+        self, connection: sqlite3.Connection, processed_df: pd.DataFrame
+    ) -> None:
+        """Nova instância reaproveita SKs já persistidas."""
+        first = WarehouseLoader(connection)
+        first.create_schema()
+        first.load(processed_df, state="AC", year=2024, month=1)
+
+        second = WarehouseLoader(connection)
+        second.create_schema()
+        second.load(processed_df, state="AC", year=2024, month=2)
+
+        assert _count(connection, "dim_hospital") == 2
+        assert _count(connection, "fact_internacao") == 10
+
+    def test_failed_load_discards_new_keys(
+        self,
+        connection: sqlite3.Connection,
+        processed_df: pd.DataFrame,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Carga desfeita não deixa SKs órfãs no cache; a recarga reinsere as dimensões."""
+        loader = WarehouseLoader(connection)
+        loader.create_schema()
+        insert_many = loader._insert_many
+
+        def failing_insert(table: str, columns: Sequence[str], rows: Iterable[tuple]) -> int:
+            if table == "fact_internacao":
+                raise sqlite3.OperationalError("falha simulada")
+            return insert_many(table, columns, rows)
+
+        monkeypatch.setattr(loader, "_insert_many", failing_insert)
+        with pytest.raises(sqlite3.OperationalError):
+            loader.load(processed_df, state="AC", year=2024, month=1)
+        assert _count(connection, "dim_hospital") == 0
+
+        monkeypatch.setattr(loader, "_insert_many", insert_many)
+        loader.load(processed_df, state="AC", year=2024, month=1)
+
+        dangling = connection.execute(
+            """SELECT COUNT(*) FROM fact_internacao f
+               LEFT JOIN dim_hospital h USING (sk_hospital)
+               LEFT JOIN dim_date d ON d.date_key = f.date_key_inter
+               WHERE h.cnes IS NULL OR d.full_date IS NULL"""
+        ).fetchone()[0]
+        assert dangling == 0
+        assert _count(connection, "dim_hospital") == 2
+        assert _count(connection, "dim_date") == 5
+
+    def test_reload_partition_is_idempotent(
+        self, connection: sqlite3.Connection, processed_df: pd.DataFrame
+    ) -> None:
+        """Recarregar a mesma partição substitui os fatos."""
+        loader = WarehouseLoader(connection)
+        loader.create_schema()
+        loader.load(processed_df, state="AC", year=2024, month=1)
+        loader.load(processed_df, state="AC", year=2024, month=1)
+
+        assert _count(connection, "fact_internacao") == 5
+
+    def test_missing_dimension_column_tolerated(self, connection: sqlite3.Connection) -> None:
+        """Colunas ausentes geram FKs nulas sem erro."""
+        loader = WarehouseLoader(connection)
+        loader.create_schema()
+        metadata = loader.load(
+            pd.DataFrame({"N_AIH": ["1"], "VAL_TOT": [10.0]}), state="AC", year=2024, month=1
+        )
+
+        assert metadata["records"] == 1
+        assert _count(connection, "dim_hospital") == 0
+
+    def test_invalid_batch_size_raises(self, connection: sqlite3.Connection) -> None:
+        """Erro com tamanho de lote inválido."""
+        with pytest.raises(ValueError, match="lote"):
+            WarehouseLoader(connection, batch_size=0)
+
+    def test_numeric_paramstyle_placeholders(self, connection: sqlite3.Connection) -> None:
+        """Placeholders no estilo Oracle (:1, :2, ...)."""
+        loader = WarehouseLoader(connection, paramstyle="numeric")
+        assert loader._placeholders(3) == ":1, :2, :3"